@@ -188,13 +188,10 @@ class EnhancedConsensusBrowser:
         return {}
     
     def _load_remote_refs(self) -> List[Dict]:
-        """Load remote fix references."""
-        refs = []
-        fixnet_refs = self.lucifer_home / "fixnet" / "refs.json"
-        if fixnet_refs.exists():
-            with open(fixnet_refs) as f:
-                refs = json.load(f)
-        return refs
+        """Load remote fix references (sharded FixNet refs)."""
+        from fixnet_refs import RefShardStore
+        self.ref_store = RefShardStore(self.lucifer_home / "fixnet")
+        return self.ref_store.refs()
     
     def _load_branches(self) -> Dict:
         """Load branch connections."""
@@ -729,7 +726,9 @@ Source: FixNet (Remote)"""
     def _refresh(self):
         """Refresh data."""
         self.dictionary = self._load_dictionary()
-        self.remote_refs = self._load_remote_refs()
+        # Only shards whose version changed are re-read
+        if self.ref_store.sync():
+            self.remote_refs = self.ref_store.refs()
         self.branches = self._load_branches()
         self._populate_tree()
         messagebox.showinfo("✅ Refreshed", "Data reloaded from disk.")
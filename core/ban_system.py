@@ -6,7 +6,14 @@ Protects against hackers, spammers, and data leaks
 import json
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional
+
+try:
+    from core.rate_limiter import DAY, HOUR, get_rate_limiter
+    from core.content_scanner import CRITICAL_PATTERNS, get_content_scanner
+except ImportError:
+    from rate_limiter import DAY, HOUR, get_rate_limiter
+    from content_scanner import CRITICAL_PATTERNS, get_content_scanner
 
 PURPLE = "\033[35m"
 GREEN = "\033[32m"
@@ -17,7 +24,13 @@ RESET = "\033[0m"
 
 LUCIFER_HOME = Path.home() / ".luciferai"
 BAN_LIST_FILE = LUCIFER_HOME / "data" / "ban_list.json"
-RATE_LIMIT_FILE = LUCIFER_HOME / "data" / "rate_limits.json"
+RATE_LIMIT_FILE = LUCIFER_HOME / "data" / "rate_limits.jsonl"
+LEGACY_RATE_LIMIT_FILE = LUCIFER_HOME / "data" / "rate_limits.json"
+
+CRITICAL_REASONS = dict(CRITICAL_PATTERNS)
+
+HOURLY_UPLOAD_LIMIT = 20
+DAILY_UPLOAD_LIMIT = 100
 
 
 class BanSystem:
@@ -53,18 +66,26 @@ class BanSystem:
         with open(BAN_LIST_FILE, 'w') as f:
             json.dump(self.ban_list, f, indent=2)
     
-    def _load_rate_limits(self) -> Dict[str, List]:
-        """Load rate limit tracking."""
-        if RATE_LIMIT_FILE.exists():
-            with open(RATE_LIMIT_FILE) as f:
-                return json.load(f)
-        return {}
+    def _load_rate_limits(self):
+        """Load rate limit tracking (sliding hour/day windows per user)."""
+        limiter = get_rate_limiter(RATE_LIMIT_FILE, windows=(HOUR, DAY))
+        
+        # One-time import of the old {user: [ISO timestamps]} file
+        if LEGACY_RATE_LIMIT_FILE.exists():
+            try:
+                with open(LEGACY_RATE_LIMIT_FILE) as f:
+                    legacy = json.load(f)
+                for user_id, stamps in legacy.items():
+                    limiter.import_hits(user_id, [datetime.fromisoformat(ts).timestamp() for ts in stamps])
+                limiter.flush()
+                LEGACY_RATE_LIMIT_FILE.unlink()
+            except (OSError, ValueError, AttributeError, TypeError):
+                pass
+        return limiter
     
     def _save_rate_limits(self):
         """Save rate limit tracking."""
-        RATE_LIMIT_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(RATE_LIMIT_FILE, 'w') as f:
-            json.dump(self.rate_limits, f, indent=2)
+        self.rate_limits.flush()
     
     def check_user_banned(self, user_id: str) -> tuple[bool, Optional[str]]:
         """
@@ -194,46 +215,25 @@ class BanSystem:
         Returns:
             (is_violating: bool, reason: str)
         """
-        now = datetime.now()
-        
-        if user_id not in self.rate_limits:
-            self.rate_limits[user_id] = []
-        
-        # Get recent uploads
-        uploads = [
-            datetime.fromisoformat(ts)
-            for ts in self.rate_limits[user_id]
-            if datetime.fromisoformat(ts) > now - timedelta(days=1)
-        ]
-        
-        # Clean old entries
-        self.rate_limits[user_id] = [ts.isoformat() for ts in uploads]
-        
-        # Count in last hour
-        hour_ago = now - timedelta(hours=1)
-        last_hour = [ts for ts in uploads if ts > hour_ago]
-        
-        if len(last_hour) >= 20:
+        last_hour = self.rate_limits.count(user_id, HOUR)
+        if last_hour >= HOURLY_UPLOAD_LIMIT:
             return (
                 True,
-                f"Mass uploading: {len(last_hour)} fixes in last hour (limit: 20)"
+                f"Mass uploading: {last_hour} fixes in last hour (limit: {HOURLY_UPLOAD_LIMIT})"
             )
         
-        if len(uploads) >= 100:
+        today = self.rate_limits.count(user_id, DAY)
+        if today >= DAILY_UPLOAD_LIMIT:
             return (
                 True,
-                f"Daily limit exceeded: {len(uploads)} fixes today (limit: 100)"
+                f"Daily limit exceeded: {today} fixes today (limit: {DAILY_UPLOAD_LIMIT})"
             )
         
         return (False, None)
     
     def record_upload(self, user_id: str):
-        """Record an upload timestamp for rate limiting."""
-        if user_id not in self.rate_limits:
-            self.rate_limits[user_id] = []
-        
-        self.rate_limits[user_id].append(datetime.now().isoformat())
-        self._save_rate_limits()
+        """Record an upload timestamp for rate limiting (written to disk in batches)."""
+        self.rate_limits.hit(user_id)
     
     def check_malicious_content(self, solution: str) -> tuple[bool, Optional[str]]:
         """
@@ -242,49 +242,18 @@ class BanSystem:
         Returns:
             (is_malicious: bool, reason: str)
         """
-        solution_lower = solution.lower()
+        hits = get_content_scanner().scan(solution)
         
         # Critical dangerous patterns (instant strike)
-        critical_patterns = [
-            ("rm -rf /", "System destruction attempt"),
-            ("rm -rf ~", "Home directory destruction"),
-            (":(){ :|:& };:", "Fork bomb"),
-            ("mkfs", "Filesystem format attempt"),
-            ("> /dev/sda", "Disk overwrite attempt"),
-            ("dd if=/dev/zero of=/dev/", "Disk wipe attempt"),
-        ]
-        
-        for pattern, reason in critical_patterns:
-            if pattern in solution_lower:
-                return (True, f"CRITICAL: {reason}")
+        if hits['critical']:
+            return (True, f"CRITICAL: {CRITICAL_REASONS[hits['critical'][0]]}")
         
         # Data leak patterns
-        leak_patterns = [
-            "cat /etc/passwd",
-            "cat /etc/shadow",
-            "cat ~/.ssh/",
-            "curl http://",  # Suspicious outbound
-            "wget http://",
-            "/dev/tcp/",
-            "nc -l",
-            "ncat",
-        ]
-        
-        leak_count = sum(1 for p in leak_patterns if p in solution_lower)
-        if leak_count >= 2:
+        if len(hits['leak']) >= 2:
             return (True, "Potential data leak attempt")
         
         # Obfuscation (trying to hide malicious code)
-        obfuscation = [
-            "base64 -d",
-            "eval(",
-            "exec(",
-            "__import__('os').system",
-            "subprocess.Popen",
-        ]
-        
-        obf_count = sum(1 for p in obfuscation if p in solution_lower)
-        if obf_count >= 2:
+        if len(hits['obfuscation']) >= 2:
             return (True, "Obfuscated/hidden code execution")
         
         return (False, None)
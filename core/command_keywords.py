@@ -42,6 +42,8 @@ TEST_COMMAND_PATTERNS = [
     'llama3.2 test',
     'deepseek test',
     'run test',
+    'benchmark',
+    'command tests',
     'short test',
     'quick test'
 ]
@@ -10,6 +10,13 @@ from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+try:
+    from core.fixnet_refs import get_ref_store
+    from core.content_scanner import get_content_scanner
+except ImportError:
+    from fixnet_refs import get_ref_store
+    from content_scanner import get_content_scanner
+
 PURPLE = "\033[35m"
 GREEN = "\033[32m"
 RED = "\033[31m"
@@ -61,6 +68,14 @@ class ConsensusDictionary:
         self.local_dict = relevance_dict.dictionary if relevance_dict else {}
         self.remote_refs = relevance_dict.remote_refs if relevance_dict else []
         
+        # Lookup index over remote refs, kept current by FixNet ref change events
+        self._ref_index: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+        self._ref_index_keys: Dict[int, Tuple] = {}
+        for ref in self.remote_refs:
+            self._index_ref(ref)
+        if relevance_dict:
+            get_ref_store().subscribe(self._on_refs_changed)
+        
         # Consensus cache - now persisted!
         self.consensus_cache = self._load_consensus_cache()
         
@@ -83,6 +98,38 @@ class ConsensusDictionary:
         # Vote tracking (one vote per user per fix)
         self.user_votes = self._load_user_votes()
     
+    def _index_ref(self, ref: Dict):
+        """Add a ref under its fix hash, the hash it was inspired by, and its error type."""
+        keys = []
+        for field in ('fix_hash', 'inspired_by'):
+            value = ref.get(field)
+            if isinstance(value, str) and value and ('hash', value) not in keys:
+                keys.append(('hash', value))
+        if ref.get('error_type'):
+            keys.append(('error_type', ref['error_type']))
+        for key in keys:
+            self._ref_index[key].append(ref)
+        self._ref_index_keys[id(ref)] = tuple(keys)
+    
+    def _unindex_ref(self, ref: Dict):
+        for key in self._ref_index_keys.pop(id(ref), ()):
+            bucket = self._ref_index.get(key, [])
+            bucket[:] = [r for r in bucket if r is not ref]
+            if not bucket:
+                self._ref_index.pop(key, None)
+    
+    def _on_refs_changed(self, changes: List[Dict]):
+        """Update the ref index for synced shards only."""
+        for change in changes:
+            for ref in change['removed'] + change['updated']:
+                self._unindex_ref(ref)
+            for ref in change['added'] + change['updated']:
+                self._index_ref(ref)
+    
+    def _refs_for_hash(self, fix_hash: str) -> List[Dict]:
+        """Refs that are, or were inspired by, `fix_hash`."""
+        return list(self._ref_index.get(('hash', fix_hash), []))
+    
     def _load_json(self, path: Path) -> Any:
         """Load JSON with fallback."""
         if path.exists():
@@ -199,7 +246,7 @@ class ConsensusDictionary:
         }
         
         # Search all remote references for this fix
-        for ref in self.remote_refs:
+        for ref in self._refs_for_hash(fix_hash):
             if ref.get('fix_hash') == fix_hash or ref.get('inspired_by') == fix_hash:
                 user_id = ref.get('user_id')
                 stats['unique_users'].add(user_id)
@@ -393,9 +440,8 @@ class ConsensusDictionary:
         # Simplified - would use proper search from RelevanceDictionary
         matches = []
         
-        for ref in self.remote_refs:
-            if ref.get('error_type') == error_type:
-                matches.append(ref)
+        for ref in self._ref_index.get(('error_type', error_type), []):
+            matches.append(ref)
         
         return matches
     
@@ -626,7 +672,7 @@ class ConsensusDictionary:
         weighted_successes = 0.0
         weighted_attempts = 0.0
         
-        for ref in self.remote_refs:
+        for ref in self._refs_for_hash(fix_hash):
             if ref.get('fix_hash') == fix_hash:
                 user_id = ref.get('user_id')
                 user_rep = self.get_user_reputation(user_id)
@@ -788,35 +834,24 @@ class ConsensusDictionary:
             "should_quarantine": False
         }
         
-        solution_lower = solution.lower()
+        hits = get_content_scanner().scan(solution)
         
         # Check for dangerous commands
-        dangerous_patterns = [
-            "rm -rf",
-            "rm -fr",
-            "sudo rm",
-            ":(){ :|:& };:",  # Fork bomb
-            "mkfs",
-            "dd if=/dev/zero",
-            "wget | bash",
-            "curl | sh",
-            "> /dev/sda",
-            "chmod -R 777",
-            "eval",
-            "exec",
-            "__import__"
-        ]
-        
-        for pattern in dangerous_patterns:
-            if pattern in solution_lower:
-                result['warnings'].append(f"Dangerous pattern: {pattern}")
-                result['risk_level'] = "high"
-                result['is_spam'] = True
+        for pattern in hits['dangerous']:
+            result['warnings'].append(f"Dangerous pattern: {pattern}")
+            result['risk_level'] = "high"
+            result['is_spam'] = True
         
-        # Check similarity to known spam
+        # Check similarity to known spam (the cheap upper bounds rule most out first)
         import difflib
+        solution_lower = solution.lower()
         for spam_pattern in self.known_spam_patterns:
-            similarity = difflib.SequenceMatcher(None, solution_lower, spam_pattern.lower()).ratio()
+            matcher = difflib.SequenceMatcher(None, solution_lower, spam_pattern.lower())
+            if matcher.real_quick_ratio() <= SUSPICIOUS_PATTERN_THRESHOLD:
+                continue
+            if matcher.quick_ratio() <= SUSPICIOUS_PATTERN_THRESHOLD:
+                continue
+            similarity = matcher.ratio()
             if similarity > SUSPICIOUS_PATTERN_THRESHOLD:
                 result['warnings'].append(f"Similar to known spam ({similarity:.0%})")
                 result['risk_level'] = "high"
@@ -830,17 +865,7 @@ class ConsensusDictionary:
             result['is_spam'] = True
         
         # Suspicious patterns
-        suspicious = [
-            "base64",
-            "echo -e",
-            "/dev/tcp/",
-            "nc -l",
-            "ncat",
-            "python -c",
-            "perl -e"
-        ]
-        
-        suspicious_count = sum(1 for pattern in suspicious if pattern in solution_lower)
+        suspicious_count = len(hits['suspicious'])
         if suspicious_count >= 2:
             result['warnings'].append(f"Multiple suspicious patterns ({suspicious_count})")
             result['risk_level'] = "medium"
@@ -871,7 +896,7 @@ class ConsensusDictionary:
         Move fix to quarantine - won't be suggested anymore.
         """
         # Mark in remote refs
-        for ref in self.remote_refs:
+        for ref in self._refs_for_hash(fix_hash):
             if ref.get('fix_hash') == fix_hash:
                 ref['quarantined'] = True
                 ref['quarantine_reason'] = 'spam_reports'
@@ -891,7 +916,7 @@ class ConsensusDictionary:
             (is_safe: bool, reason: str)
         """
         # Check if quarantined
-        for ref in self.remote_refs:
+        for ref in self._refs_for_hash(fix_hash):
             if ref.get('fix_hash') == fix_hash and ref.get('quarantined'):
                 return (False, f"{RED}🚫 This fix is quarantined (spam/malicious){RESET}")
         
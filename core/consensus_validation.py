@@ -10,10 +10,16 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 import getpass
 
+try:
+    from core.rate_limiter import DAY, HOUR, get_rate_limiter
+except ImportError:
+    from rate_limiter import DAY, HOUR, get_rate_limiter
+
 LUCIFER_HOME = Path.home() / ".luciferai"
 AVAILABLE_IDS_FILE = LUCIFER_HOME / "data" / "available_ids.json"
 VALIDATION_QUEUE_FILE = LUCIFER_HOME / "data" / "validation_queue.json"
-RATE_LIMIT_FILE = LUCIFER_HOME / "data" / "consensus_rate_limits.json"
+RATE_LIMIT_FILE = LUCIFER_HOME / "data" / "consensus_rate_limits.jsonl"
+LEGACY_RATE_LIMIT_FILE = LUCIFER_HOME / "data" / "consensus_rate_limits.json"
 CONFIRMED_IDS_FILE = LUCIFER_HOME / "data" / "confirmed_ids.json"
 PENDING_NOTIFICATIONS_FILE = LUCIFER_HOME / "data" / "pending_notifications.json"
 GITHUB_USER_MAPPINGS_FILE = LUCIFER_HOME / "data" / "github_user_mappings.json"
@@ -33,7 +39,7 @@ class ConsensusValidation:
     def __init__(self):
         self.available_ids = self._load_available_ids()
         self.queue = self._load_queue()
-        self.rate_limits = self._load_rate_limits()
+        self.sync_limiter = self._load_rate_limits()
         self.confirmed_ids = self._load_confirmed_ids()
         self.pending_notifications = self._load_pending_notifications()
         self.github_mappings = self._load_github_mappings()
@@ -78,26 +84,47 @@ class ConsensusValidation:
         with open(VALIDATION_QUEUE_FILE, 'w') as f:
             json.dump(self.queue, f, indent=2)
     
-    def _load_rate_limits(self) -> Dict[str, Any]:
-        """Load rate limit data."""
-        if RATE_LIMIT_FILE.exists():
+    def _load_rate_limits(self):
+        """Load rate limit data (sync hits over the last hour/day)."""
+        limiter = get_rate_limiter(RATE_LIMIT_FILE, windows=(HOUR, DAY))
+        
+        # One-time import of the old {"last_sync": ISO+"Z", ...} file
+        if LEGACY_RATE_LIMIT_FILE.exists():
             try:
-                with open(RATE_LIMIT_FILE, 'r') as f:
-                    return json.load(f)
+                with open(LEGACY_RATE_LIMIT_FILE, 'r') as f:
+                    last_sync = json.load(f).get("last_sync")
+                if last_sync:
+                    limiter.import_hits("sync", [self._utc_timestamp(last_sync)])
+                    limiter.flush()
+                LEGACY_RATE_LIMIT_FILE.unlink()
             except:
                 pass
-        
-        return {
-            "last_sync": None,
-            "sync_count_today": 0,
-            "next_available_sync": None
-        }
+        return limiter
     
     def _save_rate_limits(self):
         """Save rate limit data."""
-        RATE_LIMIT_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(RATE_LIMIT_FILE, 'w') as f:
-            json.dump(self.rate_limits, f, indent=2)
+        self.sync_limiter.flush()
+    
+    @staticmethod
+    def _utc_timestamp(iso: str) -> float:
+        return (datetime.fromisoformat(iso.replace("Z", "")) - datetime(1970, 1, 1)).total_seconds()
+    
+    @staticmethod
+    def _utc_iso(timestamp: Optional[float]) -> Optional[str]:
+        if timestamp is None:
+            return None
+        return (datetime(1970, 1, 1) + timedelta(seconds=timestamp)).isoformat() + "Z"
+    
+    @property
+    def rate_limits(self) -> Dict[str, Any]:
+        """Sync rate limit summary, derived from the sliding-window limiter."""
+        last_sync = self.sync_limiter.last_hit("sync")
+        wait = self.sync_limiter.retry_after("sync", 1, HOUR)
+        return {
+            "last_sync": self._utc_iso(last_sync),
+            "sync_count_today": self.sync_limiter.count("sync", DAY),
+            "next_available_sync": self._utc_iso(self.sync_limiter.clock() + wait) if wait else None
+        }
     
     def _load_confirmed_ids(self) -> Dict[str, Any]:
         """Load confirmed IDs from consensus."""
@@ -263,33 +290,12 @@ class ConsensusValidation:
             }
     
     def _check_rate_limit(self) -> bool:
-        """Check if we can sync to consensus (rate limit)."""
-        last_sync = self.rate_limits.get("last_sync")
-        
-        if not last_sync:
-            return True
-        
-        last_sync_time = datetime.fromisoformat(last_sync.replace("Z", ""))
-        now = datetime.utcnow()
-        
-        # Allow 1 sync per hour
-        time_since_last = (now - last_sync_time).total_seconds()
-        
-        if time_since_last < 3600:  # 1 hour
-            next_available = last_sync_time + timedelta(hours=1)
-            self.rate_limits["next_available_sync"] = next_available.isoformat() + "Z"
-            self._save_rate_limits()
-            return False
-        
-        return True
+        """Check if we can sync to consensus (rate limit: 1 sync per hour)."""
+        return self.sync_limiter.retry_after("sync", 1, HOUR) == 0
     
     def _record_sync(self):
         """Record a sync operation for rate limiting."""
-        now = datetime.utcnow()
-        self.rate_limits["last_sync"] = now.isoformat() + "Z"
-        self.rate_limits["sync_count_today"] = self.rate_limits.get("sync_count_today", 0) + 1
-        self.rate_limits["next_available_sync"] = (now + timedelta(hours=1)).isoformat() + "Z"
-        self._save_rate_limits()
+        self.sync_limiter.hit("sync")
     
     def process_queue(self):
         """Process validation queue when IDs become available."""
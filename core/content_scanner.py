@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+🔎 Content Scanner - one-pass screening of fix solutions
+Every dangerous/leak/obfuscation/spam pattern the ban system and the
+consensus dictionary look for is compiled into a single regex, factored
+as a trie so shared prefixes ("rm -rf", "rm -rf /", "rm -fr") are only
+tried once. A solution is lowercased and scanned once and all hits come
+back grouped by category; batches are joined and scanned in one call.
+
+Matching is case-insensitive for every pattern, so the mixed-case entries
+("subprocess.Popen", "chmod -R 777") fire; the earlier `in` checks compared
+them against lowercased text and never matched them.
+"""
+import bisect
+import re
+import time
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Instant-strike patterns for uploads, with the reason reported to the user
+CRITICAL_PATTERNS = [
+    ("rm -rf /", "System destruction attempt"),
+    ("rm -rf ~", "Home directory destruction"),
+    (":(){ :|:& };:", "Fork bomb"),
+    ("mkfs", "Filesystem format attempt"),
+    ("> /dev/sda", "Disk overwrite attempt"),
+    ("dd if=/dev/zero of=/dev/", "Disk wipe attempt"),
+]
+
+# Data leak patterns (two or more = strike)
+LEAK_PATTERNS = [
+    "cat /etc/passwd",
+    "cat /etc/shadow",
+    "cat ~/.ssh/",
+    "curl http://",  # Suspicious outbound
+    "wget http://",
+    "/dev/tcp/",
+    "nc -l",
+    "ncat",
+]
+
+# Obfuscation, i.e. trying to hide malicious code (two or more = strike)
+OBFUSCATION_PATTERNS = [
+    "base64 -d",
+    "eval(",
+    "exec(",
+    "__import__('os').system",
+    "subprocess.Popen",
+]
+
+# Dangerous commands in a consensus fix (any one = spam)
+DANGEROUS_PATTERNS = [
+    "rm -rf",
+    "rm -fr",
+    "sudo rm",
+    ":(){ :|:& };:",  # Fork bomb
+    "mkfs",
+    "dd if=/dev/zero",
+    "wget | bash",
+    "curl | sh",
+    "> /dev/sda",
+    "chmod -R 777",
+    "eval",
+    "exec",
+    "__import__",
+]
+
+# Suspicious but common patterns in a consensus fix (two or more = caution)
+SUSPICIOUS_PATTERNS = [
+    "base64",
+    "echo -e",
+    "/dev/tcp/",
+    "nc -l",
+    "ncat",
+    "python -c",
+    "perl -e",
+]
+
+DEFAULT_CATEGORIES = {
+    'critical': [pattern for pattern, _ in CRITICAL_PATTERNS],
+    'leak': LEAK_PATTERNS,
+    'obfuscation': OBFUSCATION_PATTERNS,
+    'dangerous': DANGEROUS_PATTERNS,
+    'suspicious': SUSPICIOUS_PATTERNS,
+}
+
+# Joins batch texts; no pattern contains it, so no match spans two texts
+_SEPARATOR = "\0"
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex matching any of `words`, factored on common prefixes (longest match wins)."""
+    trie: Dict[str, Dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}  # End of a word
+
+    def emit(node: Dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            body = '(?:' + body + ')?'  # Greedy: prefer the longer word
+        return body
+
+    return emit(trie)
+
+
+class ContentScanner:
+    """
+    Case-insensitive multi-pattern matcher over named pattern lists.
+
+    Features:
+    - One compiled regex for every pattern in every category, run as a
+      single finditer per text (overlapping hits included)
+    - Reports each distinct pattern hit, including patterns nested in others
+    - Hits grouped by category, in each list's own order
+    """
+
+    def __init__(self, categories: Dict[str, Sequence[str]]):
+        self.categories = {name: list(patterns) for name, patterns in categories.items()}
+
+        # Lowercased pattern -> [(category, position in that category's list)]
+        self._owners: Dict[str, List[Tuple[str, int]]] = {}
+        for name, patterns in self.categories.items():
+            for i, pattern in enumerate(patterns):
+                self._owners.setdefault(pattern.lower(), []).append((name, i))
+
+        # The longest pattern wins at a position, so shorter patterns contained
+        # in a match are implied by it rather than matched separately
+        needles = [needle for needle in self._owners if needle]
+        self._implied = {needle: [other for other in needles if other in needle] for needle in needles}
+
+        # One branch per first character: finditer consumes only that character
+        # and the lookahead group holds the rest of the longest pattern there, so
+        # a single pass reports a match at every position, overlaps included
+        self._firsts = sorted({needle[0] for needle in needles})
+        branches = [re.escape(ch) + '(?=(' + _trie_pattern(n[1:] for n in needles if n[0] == ch) + '))'
+                    for ch in self._firsts]
+        self._regex = re.compile('|'.join(branches)) if branches else None
+
+    def _matches(self, text: str):
+        """(position, longest match starting there) for each position that has one."""
+        for match in self._regex.finditer(text):
+            yield match.start(), self._firsts[match.lastindex - 1] + match.group(match.lastindex)
+
+    def _collect(self, found: Iterable[str]) -> Dict[str, List[str]]:
+        hits: Dict[str, List[str]] = {name: [] for name in self.categories}
+        if found:
+            for name, i in sorted(owner for needle in found for owner in self._owners[needle]):
+                hits[name].append(self.categories[name][i])
+        return hits
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """
+        Find every pattern in `text`.
+
+        Returns:
+            {category: [patterns hit, in list order]} for every category
+        """
+        found = set()
+        if self._regex is not None:
+            for _, needle in self._matches(text.lower()):
+                found.update(self._implied[needle])
+        return self._collect(found)
+
+    def scan_many(self, texts: Sequence[str]) -> List[Dict[str, List[str]]]:
+        """Scan a batch of texts in a single regex pass (same results as scan() per text)."""
+        if not texts:
+            return []
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(_SEPARATOR)
+
+        found = [set() for _ in texts]
+        if self._regex is not None:
+            for pos, needle in self._matches(_SEPARATOR.join(texts).lower()):
+                found[bisect.bisect_right(starts, pos) - 1].add(needle)
+        results = []
+        for hits in found:
+            implied = set()
+            for longest in hits:
+                implied.update(self._implied[longest])
+            results.append(self._collect(implied))
+        return results
+
+
+def get_content_scanner() -> ContentScanner:
+    """Get the shared scanner for the built-in pattern lists."""
+    if not hasattr(get_content_scanner, '_instance'):
+        get_content_scanner._instance = ContentScanner(DEFAULT_CATEGORIES)
+    return get_content_scanner._instance
+
+
+def benchmark_scan(count: int = 20000, seed: int = 7) -> Dict[str, float]:
+    """
+    Screen `count` synthetic fix solutions with the old per-pattern `in`
+    tests, the compiled scanner one text at a time, and one bulk scan.
+    """
+    import random
+
+    rng = random.Random(seed)
+    lines = ["import os", "x = load_value(i)", "print(result)", "for item in items:", "    total += item",
+             "data = json.loads(raw)", "subprocess.run(['ls'])", "os.makedirs(path, exist_ok=True)"]
+    every_pattern = [p for patterns in DEFAULT_CATEGORIES.values() for p in patterns]
+    corpus = []
+    for _ in range(count):
+        body = rng.sample(lines, rng.randint(2, 6))
+        if rng.random() < 0.1:
+            body.insert(rng.randrange(len(body) + 1), rng.choice(every_pattern))
+        corpus.append("\n".join(body))
+
+    lowered = [[p.lower() for p in patterns] for patterns in DEFAULT_CATEGORIES.values()]
+    start = time.perf_counter()
+    for text in corpus:
+        lower = text.lower()
+        for patterns in lowered:
+            [p for p in patterns if p in lower]
+    legacy = time.perf_counter() - start
+
+    scanner = ContentScanner(DEFAULT_CATEGORIES)
+    start = time.perf_counter()
+    singles = [scanner.scan(text) for text in corpus]
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = scanner.scan_many(corpus)
+    bulk_time = time.perf_counter() - start
+
+    assert bulk == singles
+    return {
+        'texts': count,
+        'flagged': sum(1 for hits in bulk if any(hits.values())),
+        'legacy_ms': legacy * 1000,
+        'scan_ms': single * 1000,
+        'scan_many_ms': bulk_time * 1000,
+    }
+
+
+if __name__ == "__main__":
+    for key, value in benchmark_scan().items():
+        print(f"{key:>14}: {value:.1f}" if isinstance(value, float) else f"{key:>14}: {value}")
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+📐 Context Builder - Token-budget-aware prompt context assembly
+Packs the most relevant recent conversation turns into a token budget
+instead of a fixed message count. Token counts are cached per message and
+older turns are replaced by rolling summaries generated offline by Tier 0.
+"""
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Optional, Callable, Tuple
+
+# Optional: llama-cpp-python gives us the model's real tokenizer (vocab only)
+try:
+    from llama_cpp import Llama
+    LLAMA_CPP_AVAILABLE = True
+except ImportError:
+    Llama = None
+    LLAMA_CPP_AVAILABLE = False
+
+
+CHARS_PER_TOKEN = 4  # Same estimate used for streaming token counters
+_WORD_RE = re.compile(r"[a-z0-9_]{3,}")
+
+
+class TokenCounter:
+    """
+    Counts tokens with the model's tokenizer, cached per message.
+
+    Uses llama-cpp-python in vocab-only mode when it is installed and the
+    GGUF file exists; otherwise falls back to the ~4 chars/token estimate.
+    """
+
+    _tokenizers: Dict[str, object] = {}
+    _tokenizers_lock = threading.Lock()
+
+    def __init__(self, model_path: Optional[Path] = None, cache_size: int = 4096):
+        self.model_path = Path(model_path) if model_path else None
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._tokenizer = self._load_tokenizer()
+
+    def _load_tokenizer(self):
+        """Load (once per model file) a vocab-only llama.cpp tokenizer."""
+        if not LLAMA_CPP_AVAILABLE or not self.model_path or not self.model_path.exists():
+            return None
+
+        key = str(self.model_path)
+        with TokenCounter._tokenizers_lock:
+            if key not in TokenCounter._tokenizers:
+                try:
+                    TokenCounter._tokenizers[key] = Llama(
+                        model_path=key, vocab_only=True, verbose=False
+                    )
+                except Exception:
+                    TokenCounter._tokenizers[key] = None
+            return TokenCounter._tokenizers[key]
+
+    @property
+    def exact(self) -> bool:
+        """True if counts come from the model's tokenizer."""
+        return self._tokenizer is not None
+
+    def count(self, text: str) -> int:
+        """Token count for a piece of text (cached by content hash)."""
+        if not text:
+            return 0
+
+        key = hashlib.sha1(text.encode('utf-8', 'replace')).hexdigest()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        if self._tokenizer is not None:
+            try:
+                tokens = len(self._tokenizer.tokenize(text.encode('utf-8'), add_bos=False))
+            except Exception:
+                tokens = self._estimate(text)
+        else:
+            tokens = self._estimate(text)
+
+        with self._lock:
+            self._cache[key] = tokens
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Trim text (keeping the start) so it fits in max_tokens."""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+
+        # Scale by the observed chars/token ratio, then tighten
+        ratio = len(text) / max(self.count(text), 1)
+        cut = int(max_tokens * ratio)
+        truncated = text[:cut]
+        while cut > 0 and self.count(truncated + "...") > max_tokens:
+            cut = int(cut * 0.9)
+            truncated = text[:cut]
+        return truncated + "..." if truncated else ""
+
+    @staticmethod
+    def _estimate(text: str) -> int:
+        return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+class SummaryCache:
+    """
+    Persistent cache of rolling conversation summaries.
+
+    Each summary covers every turn up to a point in the conversation and is
+    keyed by a chained hash of those turns, so it stays valid as new turns
+    arrive. Missing summaries are queued and generated later (off the
+    request path) by summarize_pending().
+    """
+
+    MAX_PENDING = 8  # Older requests are superseded by newer rolling points
+
+    def __init__(self, cache_file: Optional[Path] = None, max_entries: int = 500):
+        self.cache_file = cache_file or (Path.home() / ".luciferai" / "context" / "summaries.json")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+        # key -> (previous summary key, turns to fold in)
+        self._pending: Dict[str, Tuple[Optional[str], List[Dict]]] = {}
+        self._load()
+
+    def _load(self):
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r') as f:
+                    self._summaries = OrderedDict(json.load(f))
+            except:
+                self._summaries = OrderedDict()
+
+    def _save(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, 'w') as f:
+            json.dump(self._summaries, f)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._summaries.get(key)
+
+    def put(self, key: str, summary: str):
+        with self._lock:
+            self._summaries[key] = summary
+            self._summaries.move_to_end(key)
+            while len(self._summaries) > self.max_entries:
+                self._summaries.popitem(last=False)
+            self._pending.pop(key, None)
+            self._save()
+
+    def request(self, key: str, base_key: Optional[str], turns: List[Dict]):
+        """Queue a summary for offline generation."""
+        with self._lock:
+            if key not in self._summaries:
+                self._pending.pop(key, None)
+                self._pending[key] = (base_key, list(turns))
+                while len(self._pending) > self.MAX_PENDING:
+                    self._pending.pop(next(iter(self._pending)))
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def summarize_pending(self, summarizer: Callable[[str], str], max_jobs: Optional[int] = None) -> int:
+        """
+        Generate queued summaries.
+
+        Args:
+            summarizer: Callable taking a prompt and returning summary text
+                        (e.g. a Tier 0 LlamafileAgent.query)
+            max_jobs: Stop after this many summaries
+
+        Returns:
+            Number of summaries generated
+        """
+        done = 0
+        while max_jobs is None or done < max_jobs:
+            with self._lock:
+                if not self._pending:
+                    break
+                # Newest request first - it covers the most conversation
+                key = next(reversed(self._pending))
+                base_key, turns = self._pending.pop(key)
+                previous = self._summaries.get(base_key) if base_key else None
+
+            transcript = "\n".join(
+                f"{'User' if t['role'] == 'user' else 'Assistant'}: {t['content']}" for t in turns
+            )
+            prompt = "Summarize this conversation in 2-3 short sentences, keeping names and facts.\n\n"
+            if previous:
+                prompt += f"Earlier summary: {previous}\n\n"
+            prompt += transcript
+
+            try:
+                summary = summarizer(prompt).strip()
+            except Exception:
+                continue
+            if summary:
+                self.put(key, summary)
+                done += 1
+        return done
+
+
+def chain_hashes(messages: List[Dict], seed: str = '') -> List[str]:
+    """Chained content hash for every prefix of the conversation (continuing from `seed`)."""
+    hashes = []
+    h = seed
+    for msg in messages:
+        h = hashlib.sha1(f"{h}|{msg.get('role')}|{msg.get('content')}".encode('utf-8', 'replace')).hexdigest()
+        hashes.append(h)
+    return hashes
+
+
+class ContextBuilder:
+    """
+    Assemble conversation context that fits a token budget.
+
+    Selection:
+    1. Newest turns first, until the budget is spent (an oversized newest
+       turn is truncated rather than dropped)
+    2. Remaining room goes to older turns that share words with the query
+    3. Everything older is represented by the best cached rolling summary
+    """
+
+    SUMMARY_SHARE = 4  # Up to 1/4 of the budget for the rolling summary
+
+    def __init__(self, counter: Optional[TokenCounter] = None,
+                 summaries: Optional[SummaryCache] = None):
+        self.counter = counter or TokenCounter()
+        self.summaries = summaries
+
+    def select(self, messages: List[Dict], budget: int, query: str = '',
+               prefix_key: str = '') -> Tuple[Optional[str], List[Dict]]:
+        """
+        Pick turns for the budget.
+
+        Args:
+            prefix_key: chain hash of the turns before `messages` when they are a
+                        window of a longer conversation, so summary keys stay
+                        the same as the window slides
+
+        Returns:
+            (summary or None, chronologically ordered turns)
+        """
+        if budget <= 0 or not messages:
+            return None, []
+
+        messages = [m for m in messages if m.get('role') != 'system']
+        costs = [self.counter.count(self._format(m)) for m in messages]
+
+        # If everything cannot fit, hold back part of the budget for a summary
+        reserve = 0
+        if self.summaries is not None and sum(costs) > budget:
+            reserve = budget // self.SUMMARY_SHARE
+
+        chosen = set()
+        remaining = budget - reserve
+        oldest_recent = len(messages)
+
+        for i in range(len(messages) - 1, -1, -1):
+            if costs[i] <= remaining:
+                chosen.add(i)
+                remaining -= costs[i]
+                oldest_recent = i
+            else:
+                break
+
+        # Newest turn alone is too big - keep a truncated copy
+        truncated = {}
+        if not chosen and messages:
+            last = len(messages) - 1
+            msg = dict(messages[last])
+            overhead = self.counter.count(self._format({'role': msg['role'], 'content': ''}))
+            msg['content'] = self.counter.truncate(msg['content'], remaining - overhead)
+            if msg['content']:
+                truncated[last] = msg
+                chosen.add(last)
+                remaining = 0
+                oldest_recent = last
+
+        # Summary of what falls out of the window
+        remaining += reserve
+        summary = None
+        summary_key = None
+        if self.summaries is not None and oldest_recent > 0:
+            hashes = chain_hashes(messages[:oldest_recent], prefix_key)
+            summary_key = hashes[-1]
+            summary = self.summaries.get(summary_key)
+            if summary is None:
+                # Fall back to the newest older summary, and queue the exact one
+                base_key = None
+                base_index = -1
+                for i in range(len(hashes) - 2, -1, -1):
+                    if self.summaries.get(hashes[i]) is not None:
+                        base_key, base_index = hashes[i], i
+                        break
+                else:
+                    if prefix_key and self.summaries.get(prefix_key) is not None:
+                        base_key = prefix_key
+                self.summaries.request(summary_key, base_key, messages[base_index + 1:oldest_recent])
+                summary = self.summaries.get(base_key) if base_key else None
+
+            if summary:
+                summary_cost = self.counter.count(f"Summary: {summary}")
+                if summary_cost > remaining:
+                    summary = self.counter.truncate(summary, remaining)
+                    summary_cost = self.counter.count(f"Summary: {summary}") if summary else 0
+                remaining -= summary_cost
+
+        # Spend leftover budget on older turns relevant to the query
+        query_words = set(_WORD_RE.findall(query.lower()))
+        if query_words and remaining > 0:
+            scored = []
+            for i in range(oldest_recent - 1, -1, -1):
+                overlap = len(query_words & set(_WORD_RE.findall(messages[i]['content'].lower())))
+                if overlap:
+                    scored.append((overlap, i))
+            for _, i in sorted(scored, key=lambda s: (-s[0], -s[1])):
+                if costs[i] <= remaining:
+                    chosen.add(i)
+                    remaining -= costs[i]
+
+        turns = [truncated.get(i, messages[i]) for i in sorted(chosen)]
+        return summary or None, turns
+
+    def build(self, messages: List[Dict], budget: int, query: str = '', prefix_key: str = '') -> str:
+        """Formatted context string (same line format as get_context)."""
+        summary, turns = self.select(messages, budget, query, prefix_key)
+        lines = []
+        if summary:
+            lines.append(f"Summary: {summary}")
+        lines.extend(self._format(m) for m in turns)
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format(msg: Dict) -> str:
+        role_label = "User" if msg.get('role') == 'user' else "Assistant"
+        return f"{role_label}: {msg.get('content', '')}"
+
+
+def get_summary_cache() -> SummaryCache:
+    """Get singleton instance of SummaryCache."""
+    if not hasattr(get_summary_cache, '_instance'):
+        get_summary_cache._instance = SummaryCache()
+    return get_summary_cache._instance
@@ -51,6 +51,7 @@ from mistral_task_parser import MistralTaskParser
 from deepseek_search import DeepseekSearchSystem
 from universal_task_system import UniversalTaskSystem, ModelTier
 from master_controller import get_master_controller
+from job_scheduler import note_activity
 
 
 def format_code_blocks_with_background(text: str) -> str:
@@ -253,6 +254,7 @@ class EnhancedLuciferAgent:
         id_manager = get_system_id_manager()
         validated = id_manager.has_id()
         self.thermal = ThermalAnalytics(self.user_id, validated=validated)
+        self.thermal.start_sampler()  # No-op unless tracking is enabled
         
         # Check model integrity on startup if WiFi connected
         self._check_model_integrity()
@@ -329,47 +331,37 @@ class EnhancedLuciferAgent:
         if not models_dir.exists():
             return
         
-        # Get all GGUF files in models directory
-        gguf_files = list(models_dir.glob('*.gguf'))
+        # GGUF files in the models directory, from the catalog
+        from gguf_catalog import get_model_catalog
+        entries = get_model_catalog().entries(models_dir)
         
-        if not gguf_files:
+        if not entries:
             return
         
         # Check each file for integrity
         corrupt_models = []
         incomplete_models = []
         
-        # Get all supported models to check against
-        from core.model_files_map import list_all_models
-        all_models_by_tier = list_all_models()
-        
-        # Create a reverse mapping: filename -> model_name
-        file_to_model = {}
-        for tier_models in all_models_by_tier.values():
-            for model_name in tier_models:
-                model_info = get_model_info(model_name)
-                if model_info['file']:
-                    file_to_model[model_info['file']] = model_name
-        
-        for gguf_file in gguf_files:
-            # Try to match file to known model
-            model_name = file_to_model.get(gguf_file.name)
-            
-            if not model_name:
+        for entry in entries:
+            # Only files that exactly match a known model's filename
+            if not entry.get('exact'):
                 continue
             
+            model_name = entry['model']
+            gguf_file = Path(entry['path'])
+            
             # Get expected size
             model_info = get_model_info(model_name)
             expected_size_mb = model_info.get('expected_size_mb', 0)
-            actual_size_mb = gguf_file.stat().st_size / (1024 * 1024)
+            actual_size_mb = entry['size'] / (1024 * 1024)
             
-            # Check if size matches (allow 5% tolerance)
+            # Cached per (size, mtime, expected size) - unchanged files are not re-checked
             if expected_size_mb > 0:
-                size_diff_percent = abs(actual_size_mb - expected_size_mb) / expected_size_mb * 100
+                verdict = self._model_file_verdict(gguf_file, expected_size_mb)
                 
-                if size_diff_percent > 5:
+                if verdict != 'ok':
                     # Check if it's incomplete (significantly smaller) or corrupt (different)
-                    if actual_size_mb < expected_size_mb * 0.95:
+                    if verdict == 'incomplete':
                         incomplete_models.append({
                             'name': model_name,
                             'file': gguf_file.name,
@@ -588,23 +580,12 @@ class EnhancedLuciferAgent:
         llamafile_path = project_root / '.luciferai' / 'bin' / 'llamafile'
         models_dir = project_root / 'models'
         
-        # Import helpers for canonicalization
-        from model_files_map import MODEL_FILES, get_canonical_name, get_model_file
-        
-        # Build canonical list of installed models by checking actual files in /models
-        models_found_set = set()
+        # Build canonical list of installed models from the GGUF catalog
+        # (only files that exactly match their mapped filename in /models)
+        models_found = []
         if llamafile_path.exists() and models_dir.exists():
-            # Iterate over all known entries, canonicalize, and check the canonical file exists
-            for name in MODEL_FILES.keys():
-                canonical = get_canonical_name(name)
-                model_file = get_model_file(canonical)
-                if not model_file:
-                    continue
-                model_path = models_dir / model_file
-                if model_path.exists():
-                    models_found_set.add(canonical)
-        
-        models_found = sorted(models_found_set)
+            from gguf_catalog import get_model_catalog
+            models_found = get_model_catalog().installed_models(exact_only=True, models_dir=models_dir)
         
         if models_found:
             self.available_models = models_found
@@ -661,6 +642,35 @@ class EnhancedLuciferAgent:
         canonical = get_canonical_name(model)
         return self.llm_state.get(canonical, True)
     
+    def _model_file_verdict(self, model_path, expected_size_mb: float) -> str:
+        """
+        Integrity verdict for a model file: 'ok', 'incomplete' (>5% small),
+        'mismatch' (5-10% large) or 'corrupt' (>10% large or bad GGUF header).
+        
+        Results are kept in the integrity cache and reused until the file's
+        size or mtime, or the expected size, changes.
+        """
+        from integrity_cache import get_integrity_cache, read_recorded_sha256
+        
+        def check(path) -> str:
+            actual_size_mb = path.stat().st_size / (1024 * 1024)
+            size_diff_percent = (actual_size_mb - expected_size_mb) / expected_size_mb * 100
+            if size_diff_percent < -5:
+                return 'incomplete'
+            if size_diff_percent > 10:
+                return 'corrupt'
+            if path.suffix == '.gguf':
+                with open(path, 'rb') as f:
+                    header = f.read(8)
+                if header[:4] != b'GGUF' or not 1 <= int.from_bytes(header[4:8], 'little') <= 3:
+                    return 'corrupt'
+            if size_diff_percent > 5:
+                return 'mismatch'
+            return 'ok'
+        
+        return get_integrity_cache().verdict(model_path, check, sha256=read_recorded_sha256(model_path),
+                                             params={'expected_size_mb': expected_size_mb})
+    
     def _is_model_corrupted(self, model: str) -> bool:
         """Check if a model file is corrupted based on size validation."""
         from pathlib import Path
@@ -684,21 +694,11 @@ class EnhancedLuciferAgent:
         if expected_size_mb == 0:
             return False
         
-        # Check actual size
-        actual_size_mb = model_path.stat().st_size / (1024 * 1024)
-        
-        # Calculate difference
-        size_diff_percent = (actual_size_mb - expected_size_mb) / expected_size_mb * 100
-        
         # Corrupted if:
         # - File is more than 5% SMALLER (incomplete download)
         # - File is more than 10% LARGER (wrong file or bad quantization)
-        if size_diff_percent < -5:  # Too small
-            return True
-        if size_diff_percent > 10:  # Way too large
-            return True
-        
-        return False
+        # - GGUF header is invalid
+        return self._model_file_verdict(model_path, expected_size_mb) in ('incomplete', 'corrupt')
     
     def _select_best_enabled_model(self, exclude_locked: bool = False) -> str:
         """Select the best enabled model from available models.
@@ -1092,8 +1092,14 @@ class EnhancedLuciferAgent:
             # Auto-correct typos BEFORE routing (so corrections show immediately)
             corrected_input = self._auto_correct_typos(original_input)
             
-            # Try corrected request
+            # Background maintenance (FixNet daemon) waits while the REPL is active
+            note_activity()
+            
+            # Try corrected request (timed per route type for `perf report`)
+            self._last_route_type = None
+            route_start = time.time()
             response = self._route_request(corrected_input)
+            self._record_route_latency(route_start)
             
             # Check if it resulted in "unknown command" or failure
             if self._is_failed_command(response):
@@ -1111,6 +1117,17 @@ class EnhancedLuciferAgent:
             if lock_acquired:
                 self.lock_manager.release_lock(self.ollama_model)
     
+    def _record_route_latency(self, route_start: float):
+        """Persist end-to-end latency of the request just routed."""
+        try:
+            from perf_metrics import get_perf_store
+            get_perf_store().record_route(
+                getattr(self, '_last_route_type', None) or 'UNCLASSIFIED',
+                (time.time() - route_start) * 1000
+            )
+        except Exception:
+            pass
+    
     def _is_failed_command(self, response: str) -> bool:
         """Check if a response indicates a failed/unknown command."""
         failure_indicators = [
@@ -1130,6 +1147,7 @@ class EnhancedLuciferAgent:
             route_info = self.master_controller.route_command(user_input)
             route_type = route_info['route_type']
             confidence = route_info['confidence']
+            self._last_route_type = route_type.name
             
             # Log routing decision
             try:
@@ -1236,10 +1254,14 @@ class EnhancedLuciferAgent:
             return self._handle_short_test()
         
         # Generic test commands
-        # "run test" or "run tests" = test all models
-        if user_lower in ['run test', 'run tests', 'test all', 'test suite']:
+        # "run test" or "run tests" = benchmark all models
+        if user_lower in ['run test', 'run tests', 'test all', 'test suite', 'benchmark', 'run benchmark', 'benchmark models']:
             return self._handle_test_all_models()
         
+        # Command routing suite (tests/test_all_commands.py)
+        if user_lower in ['run command tests', 'command tests', 'test commands']:
+            return self._handle_test_all_models(suite='commands')
+        
         # Just "test" = prompt for model selection
         if user_lower == 'test':
             return self._handle_test_prompt()
@@ -1565,6 +1587,10 @@ class EnhancedLuciferAgent:
         if user_lower in ['session stats', 'session statistics']:
             return self._handle_session_stats()
         
+        # Performance dashboard - handled locally without LLM
+        if user_lower in ['perf report', 'perf', 'performance report', 'perf stats']:
+            return self._handle_perf_report()
+        
         # Badge display command - handled locally without LLM
         if user_lower in ['badges', 'badge', 'show badges', 'my badges', 'badge progress']:
             return self._handle_badges()
@@ -3319,6 +3345,7 @@ intelligent script fixing, and a rich badge/achievement system.
   • {c('session open <id>', 'cyan')}: Open full session log with timestamps
   • {c('session info', 'cyan')}: Current session statistics
   • {c('session stats', 'cyan')}: Overall session statistics
+  • {c('perf report', 'cyan')}: Latency/throughput trends and regressions across sessions
   
   {c('Automatic Retention:', 'green')}
   • {c('6-month retention', 'dim')}: Sessions automatically saved for 6 months
@@ -3798,7 +3825,8 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
 {c('📊 INFORMATION', 'cyan')}
   {c('info', 'yellow')}        {c('Interactive feature demo', 'dim')}
   {c('short test', 'yellow')}  {c('Quick test: queries + build/fix/daemon (all models)', 'dim')}
-  {c('test suite', 'yellow')}  {c('Run all automated tests', 'dim')}
+  {c('test suite', 'yellow')}  {c('Benchmark all models (TTFT, tok/s, pass rate)', 'dim')}
+  {c('command tests', 'yellow')} {c('Run the 76-command routing suite', 'dim')}
   {c('help', 'yellow')}        {c('Show this help', 'dim')}
   {c('memory', 'yellow')}      {c('Show command history', 'dim')}
   {c('pwd', 'yellow')}         {c('Current directory', 'dim')}
@@ -3836,6 +3864,7 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
   {c('session open <id>', 'yellow')}        {c('View full session log with timestamps', 'dim')}
   {c('session info', 'yellow')}             {c('Current session statistics', 'dim')}
   {c('session stats', 'yellow')}            {c('Overall session statistics', 'dim')}
+  {c('perf report', 'yellow')}              {c('Latency trends and regressions across sessions', 'dim')}
     Examples: session list
               session open 20250113_230500
               what happened in my last session?
@@ -4661,6 +4690,8 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
         output.append(c("═" * 60, "purple"))
         output.append("")
         output.append(c(f"Total Sessions: ", "yellow") + str(stats['total_sessions']))
+        if 'total_messages' in stats:
+            output.append(c(f"Total Messages: ", "yellow") + str(stats['total_messages']))
         
         if stats['oldest_session']:
             oldest = datetime.fromisoformat(stats['oldest_session'])
@@ -4671,12 +4702,83 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
             output.append(c(f"Newest Session: ", "yellow") + newest.strftime("%B %d, %Y at %I:%M %p"))
         
         output.append("")
+        
+        # Response cache metrics (this session)
+        from response_cache import get_response_cache
+        cache_stats = get_response_cache().get_stats()
+        output.append(c("⚡ Response Cache", "cyan"))
+        output.append(c(f"  • Hit Rate: {cache_stats['hit_rate']:.1f}% ({cache_stats['exact_hits']} exact, {cache_stats['similar_hits']} similar, {cache_stats['misses']} misses)", "dim"))
+        output.append(c(f"  • Bypassed (uncacheable): {cache_stats['bypassed']}", "dim"))
+        output.append(c(f"  • Entries: {cache_stats['entries']}/{cache_stats['max_entries']}", "dim"))
+        output.append("")
         output.append(c("💡 Sessions are automatically saved for 6 months", "dim"))
         output.append(c("   Older sessions are cleaned up automatically", "dim"))
         output.append("")
         
         return "\n".join(output)
     
+    def _handle_perf_report(self) -> str:
+        """Show per-model/route latency trends and flag regressions."""
+        from perf_metrics import get_perf_store, sparkline, KIND_LLM, KIND_ROUTE, KIND_CACHE
+        
+        store = get_perf_store()
+        
+        def ms(value):
+            return f"{value:,.0f}ms" if value is not None else "-"
+        
+        output = []
+        output.append(c("\n📈 Performance Report", "cyan"))
+        output.append(c("═" * 60, "purple"))
+        output.append("")
+        
+        models = store.aggregate(KIND_LLM)
+        routes = store.aggregate(KIND_ROUTE)
+        if not models and not routes:
+            output.append(c("No performance data recorded yet.", "yellow"))
+            output.append(c("💡 Metrics are collected automatically as you use LuciferAI", "dim"))
+            output.append("")
+            return "\n".join(output)
+        
+        if models:
+            output.append(c("🧠 Models", "cyan") + c("  (p50 / p90 / p99, tokens/sec, 7-day p50 trend)", "dim"))
+            for model, stats in sorted(models.items(), key=lambda item: -item[1]['count']):
+                rate = f"{stats['tokens_per_sec']:.1f} tok/s" if stats['tokens_per_sec'] else "- tok/s"
+                trend = sparkline(store.daily_trend(KIND_LLM, model))
+                output.append(c(f"  • {model:<14}", "yellow") +
+                              c(f"{ms(stats['p50_ms'])} / {ms(stats['p90_ms'])} / {ms(stats['p99_ms'])}  "
+                                f"{rate}  {trend}  ({stats['count']} runs)", "dim"))
+            output.append("")
+        
+        if routes:
+            output.append(c("🧭 Routes", "cyan") + c("  (p50 / p90 / p99)", "dim"))
+            for route, stats in sorted(routes.items(), key=lambda item: -item[1]['count']):
+                output.append(c(f"  • {route:<14}", "yellow") +
+                              c(f"{ms(stats['p50_ms'])} / {ms(stats['p90_ms'])} / {ms(stats['p99_ms'])}  "
+                                f"({stats['count']} requests)", "dim"))
+            output.append("")
+        
+        cache = store.aggregate(KIND_CACHE).get('response')
+        if cache and cache['hit_rate'] is not None:
+            output.append(c("⚡ Response Cache", "cyan"))
+            output.append(c(f"  • Hit Rate: {cache['hit_rate']:.1f}% over {cache['count']} lookups", "dim"))
+            output.append("")
+        
+        regressions = store.detect_regressions()
+        if regressions:
+            output.append(c("⚠️  Regressions since last change", "red"))
+            for reg in regressions:
+                if reg['metric'] == 'tokens_per_sec':
+                    detail = f"{reg['before']:.1f} → {reg['after']:.1f} tok/s"
+                else:
+                    detail = f"p50 {ms(reg['before'])} → {ms(reg['after'])}"
+                output.append(c(f"  • {reg['key']}: ", "yellow") +
+                              c(f"{detail}  ({reg['previous_version']} → {reg['version']})", "dim"))
+        else:
+            output.append(c("✅ No regressions detected", "green"))
+        output.append("")
+        
+        return "\n".join(output)
+    
     def _handle_badges(self) -> str:
         """Display badge progress - handled locally without LLM."""
         output = []
@@ -6628,6 +6730,11 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
             self.thermal.set_baseline()
             return ""
         
+        # thermal save
+        elif 'save' in user_lower:
+            self.thermal.save_session()
+            return ""
+        
         # thermal stats
         elif 'stats' in user_lower or 'statistics' in user_lower:
             summary = self.thermal.get_session_summary()
@@ -6644,6 +6751,9 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
             print(c(f"  Min Temp: {summary['min_temp']:.1f}°C", "green"))
             print(c(f"  Max Temp: {summary['max_temp']:.1f}°C", "red"))
             print(c(f"  Variance: {summary['temp_variance']:.1f}°C", "yellow"))
+            if summary['window_avg_temp'] is not None:
+                print(c(f"  Last {summary['window_readings']}: avg {summary['window_avg_temp']:.1f}°C | "
+                        f"max {summary['window_max_temp']:.1f}°C | σ {summary['window_temp_std']:.2f}°C", "dim"))
             
             if 'avg_dispersion_pct' in summary:
                 disp_color = "green" if summary['avg_dispersion_pct'] > 0 else "red"
@@ -6655,7 +6765,7 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
         
         # Unknown thermal command
         else:
-            return c(f"{Emojis.CROSS} Unknown thermal command", "red") + f"\n{c('Available: thermal status | thermal baseline | thermal stats', 'yellow')}"
+            return c(f"{Emojis.CROSS} Unknown thermal command", "red") + f"\n{c('Available: thermal status | thermal baseline | thermal stats | thermal save', 'yellow')}"
     
     def _handle_ollama_install_request(self, user_input: str) -> str:
         """Handle Ollama/LLM installation requests with clarification."""
@@ -7110,19 +7220,7 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                 success = download_model_by_name(package_lower, force_prompt=True)
                 
                 if success:
-                    # Update available models list
-                    from core.model_files_map import get_canonical_name
-                    canonical_name = get_canonical_name(package_lower)
-                    
-                    if canonical_name not in self.available_models:
-                        self.available_models.append(canonical_name)
-                    
-                    # Auto-enable the model
-                    self.llm_state[canonical_name] = True
-                    self._save_llm_state()
-                    
-                    # Update active model if this is better
-                    self.ollama_model = self._select_best_enabled_model()
+                    canonical_name = self._register_installed_model(package_lower)
                     
                     print()
                     print(c(f"✅ {canonical_name.upper()} is now enabled and ready to use!", "green"))
@@ -7140,6 +7238,22 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
         success = self.package_manager.install(package, verbose=True)
         return "" if success else c(f"{Emojis.CROSS} Installation failed", "red")
     
+    def _register_installed_model(self, model: str) -> str:
+        """Add a freshly installed model to the available list and enable it."""
+        from core.model_files_map import get_canonical_name
+        canonical_name = get_canonical_name(model)
+        
+        if canonical_name not in self.available_models:
+            self.available_models.append(canonical_name)
+        
+        # Auto-enable the model
+        self.llm_state[canonical_name] = True
+        self._save_llm_state()
+        
+        # Update active model if this is better
+        self.ollama_model = self._select_best_enabled_model()
+        return canonical_name
+    
     def _handle_set_backup_models_directory(self) -> str:
         """Set backup directory for models."""
         from pathlib import Path
@@ -7419,38 +7533,20 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                 print(c("═" * 60, "cyan"))
                 print()
                 
-                installed = 0
-                failed = 0
                 installed_models = []
                 failed_models = []
-                current_model = None
+                in_flight = set()
                 interrupted = False
                 
+                # The four tiers don't depend on each other: download them side by side
+                max_parallel, bandwidth = self._get_download_settings()
+                limit_note = f", capped at {bandwidth / (1024 * 1024):.0f} MB/s" if bandwidth else ""
+                print(c(f"⚡ Downloading {max_parallel} models at a time{limit_note}", "dim"))
+                print()
+                
                 try:
-                    for i, model_info in enumerate(core_models, 1):
-                        model = model_info['name']
-                        current_model = model
-                        tier_info = get_tier_capabilities(model_info['tier'])
-                        
-                        print(c(f"\n[{i}/4] Installing {model} (Tier {model_info['tier']} - {tier_info['name']})...", "yellow"))
-                        print(c("─" * 60, "dim"))
-                        
-                        # Use GGUF download for LLM models
-                        success = self._handle_luci_install_package(model)
-                        
-                        if success:
-                            print()
-                            print(c(f"✅ {model} installed successfully!", "green"))
-                            installed += 1
-                            installed_models.append(model)
-                        else:
-                            print()
-                            print(c(f"⚠️  {model} installation failed or skipped", "yellow"))
-                            failed += 1
-                            failed_models.append(model)
-                        
-                        current_model = None
-                        print(c(f"\nProgress: {i}/4 models ({(i/4)*100:.0f}%)", "cyan"))
+                    self._install_models_batch([m['name'] for m in core_models], installed_models,
+                                               failed_models, in_flight, len(core_models))
                 
                 except KeyboardInterrupt:
                     interrupted = True
@@ -7459,26 +7555,13 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                     print(c("⚠️  Installation interrupted by user (Ctrl+C)", "yellow"))
                     print()
                     
-                    # Handle incomplete installation
-                    if current_model:
-                        print(c(f"🗑️  Cleaning up incomplete installation: {current_model}", "yellow"))
-                        from pathlib import Path
-                        models_dir = Path.home() / '.luciferai' / 'models'
-                        
-                        if models_dir.exists():
-                            removed_files = []
-                            for model_file in models_dir.glob(f"*{current_model}*"):
-                                try:
-                                    model_file.unlink()
-                                    removed_files.append(model_file.name)
-                                except:
-                                    pass
-                            
-                            if removed_files:
-                                print(c(f"   Deleted corrupt files: {', '.join(removed_files)}", "dim"))
-                        
-                        print(c(f"\n❌ CORRUPT: {current_model} (incomplete, deleted)", "red"))
-                        print()
+                    # Partial downloads keep their range manifest and resume next time
+                    for model in sorted(in_flight):
+                        print(c(f"⏸️  PAUSED: {model} (partial download kept for resume)", "yellow"))
+                    print()
+                
+                installed = len(installed_models)
+                failed = len(failed_models)
                 
                 # Show final summary
                 print()
@@ -7493,8 +7576,8 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                 print(c(f"  ✅ Installed: {installed}/4", "green"))
                 if failed > 0:
                     print(c(f"  ⚠️  Failed: {failed}/4", "yellow"))
-                if interrupted and current_model:
-                    print(c(f"  🗑️  Corrupt (deleted): {current_model}", "red"))
+                if interrupted and in_flight:
+                    print(c(f"  ⏸️  Paused: {', '.join(sorted(in_flight))}", "yellow"))
                 print()
                 
                 if installed_models:
@@ -7643,46 +7726,30 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                     0: ['tinyllama', 'phi-2', 'stablelm', 'orca-mini']
                 }
                 
-                installed = 0
-                failed = 0
                 installed_models = []  # Track successfully installed models
                 failed_models = []     # Track failed/skipped models
-                current_model = None   # Track model currently being installed
+                in_flight = set()      # Models downloading (or queued) right now
                 interrupted = False    # Track if user interrupted
                 
+                max_parallel, bandwidth = self._get_download_settings()
+                limit_note = f", capped at {bandwidth / (1024 * 1024):.0f} MB/s" if bandwidth else ""
+                
                 try:
                     # PHASE 1: Install core models first
                     print(c("\n🔥 PHASE 1: Installing Core Models (Essential)", "purple"))
                     print(c("═" * 60, "purple"))
                     print(c("These are the foundation models needed for LuciferAI", "dim"))
-                    print(c("Press Ctrl+C at any time to safely stop installation", "dim"))
+                    print(c(f"Downloading {max_parallel} models at a time{limit_note}", "dim"))
+                    print(c("Press Ctrl+C at any time to pause - downloads resume next time", "dim"))
                     print()
                     
-                    for model in core_models:
-                        current_model = model
-                        print(c(f"\n[{installed + failed + 1}/{total_models}] Installing {model} (CORE)...", "yellow"))
-                        
-                        # Use GGUF download for LLM models
-                        success = self._handle_luci_install_package(model) == ""
-                        
-                        if success:
-                            print(c(f"  ✅ {model} installed successfully", "green"))
-                            installed += 1
-                            installed_models.append(model)
-                        else:
-                            print(c(f"  ⚠️  {model} installation failed or skipped", "yellow"))
-                            failed += 1
-                            failed_models.append(model)
-                        
-                        current_model = None  # Clear current model after completion
-                        progress = ((installed + failed) / total_models) * 100
-                        print(c(f"  Progress: {progress:.1f}% ({installed} installed, {failed} failed/skipped)", "dim"))
+                    self._install_models_batch(core_models, installed_models, failed_models, in_flight, total_models)
                 
                     # PHASE 2: Install best models by tier (Tier 4 → 0)
                     print(c("\n\n🌟 PHASE 2: Installing Best Models (Tier 4 → 0)", "purple"))
                     print(c("═" * 60, "purple"))
                     print(c("Installing remaining models from best to worst quality", "dim"))
-                    print(c("Press Ctrl+C at any time to safely stop installation", "dim"))
+                    print(c("Press Ctrl+C at any time to pause - downloads resume next time", "dim"))
                     print()
                     
                     for tier in [4, 3, 2, 1, 0]:  # Best to worst (ultra-expert → basic)
@@ -7703,25 +7770,7 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                         print(c(f"\n📦 Installing Tier {tier} - {tier_info['name']} ({len(tier_models)} models)", "cyan"))
                         print(c("─" * 60, "dim"))
                         
-                        for model in tier_models:
-                            current_model = model
-                            print(c(f"\n[{installed + failed + 1}/{total_models}] Installing {model}...", "yellow"))
-                            
-                            # Use GGUF download for LLM models
-                            success = self._handle_luci_install_package(model) == ""
-                            
-                            if success:
-                                print(c(f"  ✅ {model} installed successfully", "green"))
-                                installed += 1
-                                installed_models.append(model)
-                            else:
-                                print(c(f"  ⚠️  {model} installation failed or skipped", "yellow"))
-                                failed += 1
-                                failed_models.append(model)
-                            
-                            current_model = None  # Clear current model after completion
-                            progress = ((installed + failed) / total_models) * 100
-                            print(c(f"  Progress: {progress:.1f}% ({installed} installed, {failed} failed/skipped)", "dim"))
+                        self._install_models_batch(tier_models, installed_models, failed_models, in_flight, total_models)
                 
                 except KeyboardInterrupt:
                     interrupted = True
@@ -7730,36 +7779,15 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                     print(c("⚠️  Installation interrupted by user (Ctrl+C)", "yellow"))
                     print()
                     
-                    # Handle incomplete installation
-                    if current_model:
-                        print(c(f"🗑️  Cleaning up incomplete installation: {current_model}", "yellow"))
-                        print(c("   This model was partially downloaded and is corrupt", "dim"))
-                        
-                        # Try to remove the incomplete model
-                        from pathlib import Path
-                        models_dir = Path.home() / '.luciferai' / 'models'
-                        
-                        # Look for model files matching the name
-                        if models_dir.exists():
-                            removed_files = []
-                            for model_file in models_dir.glob(f"*{current_model}*"):
-                                try:
-                                    model_file.unlink()
-                                    removed_files.append(model_file.name)
-                                except:
-                                    pass
-                            
-                            if removed_files:
-                                print(c(f"   Deleted corrupt files:", "dim"))
-                                for f in removed_files:
-                                    print(c(f"     • {f}", "dim"))
-                            else:
-                                print(c(f"   No files found to clean up", "dim"))
-                        
-                        print()
-                        print(c(f"❌ CORRUPT: {current_model} (incomplete, deleted)", "red"))
+                    # Partial downloads keep their range manifest and resume next time
+                    for model in sorted(in_flight):
+                        print(c(f"⏸️  PAUSED: {model} (partial download kept for resume)", "yellow"))
+                    if in_flight:
                         print()
                 
+                installed = len(installed_models)
+                failed = len(failed_models)
+                
                 # Show final summary
                 print()
                 print(c("═" * 60, "purple" if interrupted else "green"))
@@ -7773,8 +7801,8 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                 print(c(f"  ✅ Successfully installed: {installed}", "green"))
                 if failed > 0:
                     print(c(f"  ⚠️  Failed/Skipped: {failed}", "yellow"))
-                if interrupted and current_model:
-                    print(c(f"  🗑️  Corrupt (deleted): 1 ({current_model})", "red"))
+                if interrupted and in_flight:
+                    print(c(f"  ⏸️  Paused: {len(in_flight)} ({', '.join(sorted(in_flight))})", "yellow"))
                 print()
                 
                 # Show detailed lists
@@ -7798,9 +7826,7 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                     for tier in range(5):
                         all_models.update(models_by_tier[tier])
                     
-                    not_installed = all_models - set(installed_models) - set(failed_models)
-                    if current_model and current_model in not_installed:
-                        not_installed.remove(current_model)  # Already reported as corrupt
+                    not_installed = all_models - set(installed_models) - set(failed_models) - in_flight
                     
                     if not_installed:
                         print(c(f"❌ Not Installed ({len(not_installed)} models):", "red"))
@@ -7882,39 +7908,19 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                 print(c("═" * 60, "cyan"))
                 print()
                 
-                installed = 0
-                failed = 0
                 installed_models = []
                 failed_models = []
-                current_model = None
+                in_flight = set()
                 interrupted = False
                 total = len(unique_models)
                 
+                max_parallel, bandwidth = self._get_download_settings()
+                limit_note = f", capped at {bandwidth / (1024 * 1024):.0f} MB/s" if bandwidth else ""
+                print(c(f"⚡ Downloading {max_parallel} models at a time{limit_note}", "dim"))
+                print()
+                
                 try:
-                    for i, model in enumerate(unique_models, 1):
-                        current_model = model
-                        size_gb = MODEL_SIZES.get(model, 0) / 1000
-                        
-                        print(c(f"\n[{i}/{total}] Installing {model} (~{size_gb:.1f}GB)...", "yellow"))
-                        print(c("─" * 60, "dim"))
-                        
-                        # Use GGUF download for LLM models
-                        success = self._handle_luci_install_package(model)
-                        
-                        if success:
-                            print()
-                            print(c(f"✅ {model} installed successfully!", "green"))
-                            installed += 1
-                            installed_models.append(model)
-                        else:
-                            print()
-                            print(c(f"⚠️  {model} installation failed or skipped", "yellow"))
-                            failed += 1
-                            failed_models.append(model)
-                        
-                        current_model = None
-                        progress = (i / total) * 100
-                        print(c(f"\nProgress: {progress:.0f}% ({i}/{total} models)", "cyan"))
+                    self._install_models_batch(unique_models, installed_models, failed_models, in_flight, total)
                 
                 except KeyboardInterrupt:
                     interrupted = True
@@ -7923,26 +7929,13 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                     print(c("⚠️  Installation interrupted by user (Ctrl+C)", "yellow"))
                     print()
                     
-                    # Handle incomplete installation
-                    if current_model:
-                        print(c(f"🗑️  Cleaning up incomplete installation: {current_model}", "yellow"))
-                        from pathlib import Path
-                        models_dir = Path.home() / '.luciferai' / 'models'
-                        
-                        if models_dir.exists():
-                            removed_files = []
-                            for model_file in models_dir.glob(f"*{current_model}*"):
-                                try:
-                                    model_file.unlink()
-                                    removed_files.append(model_file.name)
-                                except:
-                                    pass
-                            
-                            if removed_files:
-                                print(c(f"   Deleted corrupt files: {', '.join(removed_files)}", "dim"))
-                        
-                        print(c(f"\n❌ CORRUPT: {current_model} (incomplete, deleted)", "red"))
-                        print()
+                    # Partial downloads keep their range manifest and resume next time
+                    for model in sorted(in_flight):
+                        print(c(f"⏸️  PAUSED: {model} (partial download kept for resume)", "yellow"))
+                    print()
+                
+                installed = len(installed_models)
+                failed = len(failed_models)
                 
                 # Show final summary
                 print()
@@ -7957,8 +7950,8 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                 print(c(f"  ✅ Installed: {installed}/{total}", "green"))
                 if failed > 0:
                     print(c(f"  ⚠️  Failed: {failed}/{total}", "yellow"))
-                if interrupted and current_model:
-                    print(c(f"  🗑️  Corrupt (deleted): {current_model}", "red"))
+                if interrupted and in_flight:
+                    print(c(f"  ⏸️  Paused: {', '.join(sorted(in_flight))}", "yellow"))
                 print()
                 
                 if installed_models:
@@ -7976,7 +7969,7 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
                 print(c("💡 Use 'llm list' to see all installed models", "cyan"))
                 print(c("💡 Use 'llm enable <model>' to enable specific models", "cyan"))
                 if interrupted:
-                    print(c(f"💡 Run 'install tier {tier}' again to retry", "cyan"))
+                    print(c(f"💡 Run 'install tier {tier}' again to resume", "cyan"))
                 print()
                 return ""
             else:
@@ -7989,6 +7982,44 @@ Type {c('mainmenu', 'cyan')} for Quick Actions and installation status
             print()
             return c("\n❌ Installation cancelled", "yellow")
     
+    def _get_download_settings(self) -> tuple:
+        """(max parallel model downloads, total bandwidth cap in bytes/sec) from config."""
+        import json
+        config_file = Path.home() / '.luciferai' / 'config.json'
+        config = {}
+        if config_file.exists():
+            try:
+                with open(config_file, 'r') as f:
+                    config = json.load(f)
+            except:
+                pass
+        max_parallel = max(1, int(config.get('max_parallel_downloads', 2)))
+        bandwidth = int(float(config.get('download_bandwidth_limit_mb', 0)) * 1024 * 1024)
+        return max_parallel, bandwidth
+    
+    def _install_models_batch(self, models: List[str], installed_models: List[str],
+                              failed_models: List[str], in_flight: set, total: int):
+        """Download models concurrently, registering each one as it finishes."""
+        from core.model_download import download_models_concurrently
+        
+        max_parallel, bandwidth = self._get_download_settings()
+        in_flight.update(models)
+        
+        def on_complete(model: str, success: bool):
+            in_flight.discard(model)
+            if success:
+                self._register_installed_model(model)
+                installed_models.append(model)
+                print(c(f"  ✅ {model} installed successfully", "green"))
+            else:
+                failed_models.append(model)
+                print(c(f"  ⚠️  {model} installation failed or skipped", "yellow"))
+            done = len(installed_models) + len(failed_models)
+            print(c(f"  Progress: {done / max(total, 1) * 100:.1f}% ({len(installed_models)} installed, {len(failed_models)} failed/skipped)", "dim"))
+        
+        download_models_concurrently(models, max_parallel=max_parallel, bandwidth_limit=bandwidth,
+                                     on_complete=on_complete)
+    
     def _show_model_install(self, model: str) -> str:
         """Show model installation using Luci! Package Manager."""
         # Use integrated package manager for consistent experience
@@ -8549,6 +8580,36 @@ Show all 85+ supported models organized by tier.
         print()
         sys.stdout.flush()
         
+        # Repeated question? Serve it from the response cache
+        from response_cache import get_response_cache
+        response_cache = get_response_cache()
+        prior_turns = self.conversation_history
+        if prior_turns and prior_turns[-1].get("content") == user_input:
+            prior_turns = prior_turns[:-1]
+        cached = response_cache.get(best_model, user_input, temperature=0.7, history=prior_turns)
+        if response_cache.is_cacheable(user_input):
+            try:
+                from perf_metrics import get_perf_store
+                get_perf_store().record_cache(bool(cached))
+            except Exception:
+                pass
+        if cached:
+            cached_response, cache_tier = cached
+            print(c(f"💬 {best_model.upper()}: ", "purple") + cached_response)
+            print()
+            print(c(f"   [⚡ Cached response ({cache_tier} match) - no model run needed]", "dim"))
+            print()
+            print()
+            try:
+                self.session_logger.log_event(
+                    'cache_hit',
+                    f'Response served from cache ({cache_tier})',
+                    metadata={'model': best_model, 'tier': cache_tier}
+                )
+            except Exception:
+                pass
+            return ""
+        
         # Start continuous processing animation
         self._start_processing_animation()
         
@@ -8648,64 +8709,52 @@ Show all 85+ supported models organized by tier.
                         if any(word in user_input.lower() for word in ['time', 'date', 'day', 'today', 'now', 'when']):
                             system_prompt += " Note: WiFi is not connected. For accurate time synchronization, suggest: 1) Connect to WiFi for automatic time sync, 2) Set timezone manually if needed (mention 'timezone set <zone>' or 'timezone auto' for auto-detection)."
                 
-                # Build messages with conversation history for context
-                messages = [{"role": "system", "content": system_prompt}]
-                
-                # Token budget management: Rough estimation (4 chars per token)
+                # Build messages with conversation history for context, counted with
+                # the model's tokenizer; turns that no longer fit are replaced by the
+                # cached rolling summary
                 # Most models have 512-2048 token context windows
                 # Reserve ~150 tokens for response, leaving ~350 for prompt
                 max_prompt_tokens = 350
-                approx_token_count = len(system_prompt) // 4
-                
-                # Add recent conversation history (trimmed to fit context window)
-                # Start with most recent messages and work backwards
-                recent_history = []
-                if len(self.conversation_history) > 0:
-                    # Get last N messages, checking each one doesn't exceed budget
-                    for msg in reversed(self.conversation_history[-10:]):  # Check last 10 messages
-                        if msg.get('role') in ['user', 'assistant']:
-                            msg_tokens = len(str(msg.get('content', ''))) // 4
-                            if approx_token_count + msg_tokens < max_prompt_tokens:
-                                recent_history.insert(0, msg)  # Insert at beginning to maintain order
-                                approx_token_count += msg_tokens
-                            else:
-                                break  # Stop adding if we'd exceed budget
-                
-                # Add trimmed history
-                for msg in recent_history:
-                    messages.append(msg)
+                counter = llm.context_builder.counter
+                user_msg_tokens = counter.count(user_input)
+                
+                history = self.conversation_history
+                if history and history[-1].get('role') == 'user' and history[-1].get('content') == user_input:
+                    history = history[:-1]  # Current input is added last, below
+                messages = llm.get_context_messages(
+                    user_input, max_prompt_tokens - user_msg_tokens,
+                    history=[{"role": "system", "content": system_prompt}] +
+                            [m for m in history if m.get('role') in ['user', 'assistant']]
+                )
                 
                 # Add current user input (always include, truncate if needed)
-                user_msg_tokens = len(user_input) // 4
-                if approx_token_count + user_msg_tokens > max_prompt_tokens:
-                    # Truncate system prompt if needed to make room
-                    system_overflow = (approx_token_count + user_msg_tokens) - max_prompt_tokens
-                    if system_overflow > 0:
-                        # Trim system prompt from the end (keep beginning which has key instructions)
-                        max_system_chars = len(system_prompt) - (system_overflow * 4)
-                        if max_system_chars < 100:  # Minimum useful system prompt
-                            # Use minimal system prompt instead
-                            messages[0]['content'] = "You are a helpful AI assistant. Be concise."
-                            # Log context overflow
-                            try:
-                                self.session_logger.log_event(
-                                    'context_overflow',
-                                    f'Severe context overflow: trimmed system prompt to minimum',
-                                    metadata={'original_length': len(system_prompt), 'final_length': len(messages[0]['content'])}
-                                )
-                            except Exception:
-                                pass
-                        else:
-                            messages[0]['content'] = system_prompt[:max_system_chars] + "..."
-                            # Log context trimming
-                            try:
-                                self.session_logger.log_event(
-                                    'context_trimmed',
-                                    f'System prompt trimmed to fit context window',
-                                    metadata={'original_length': len(system_prompt), 'trimmed_length': max_system_chars}
-                                )
-                            except Exception:
-                                pass
+                system_tokens = counter.count(system_prompt)
+                if system_tokens + user_msg_tokens > max_prompt_tokens:
+                    # Trim system prompt from the end (keep beginning which has key instructions)
+                    trimmed = counter.truncate(system_prompt, max_prompt_tokens - user_msg_tokens)
+                    if len(trimmed) < 100:  # Minimum useful system prompt
+                        # Use minimal system prompt instead
+                        messages[0]['content'] = "You are a helpful AI assistant. Be concise."
+                        # Log context overflow
+                        try:
+                            self.session_logger.log_event(
+                                'context_overflow',
+                                'Severe context overflow: trimmed system prompt to minimum',
+                                metadata={'original_length': len(system_prompt), 'final_length': len(messages[0]['content'])}
+                            )
+                        except Exception:
+                            pass
+                    else:
+                        messages[0]['content'] = trimmed
+                        # Log context trimming
+                        try:
+                            self.session_logger.log_event(
+                                'context_trimmed',
+                                'System prompt trimmed to fit context window',
+                                metadata={'original_length': len(system_prompt), 'trimmed_length': len(trimmed)}
+                            )
+                        except Exception:
+                            pass
                 
                 messages.append({"role": "user", "content": user_input})
                 
@@ -8715,7 +8764,8 @@ Show all 85+ supported models organized by tier.
                 # Show streaming indicator
                 print(c(f"💬 {best_model.upper()}: ", "purple"), end='', flush=True)
                 
-                # Request token stats with streaming response
+                # Request token stats with streaming response (LLMBackend also records
+                # latency and generation speed for `perf report`)
                 result_with_stats = llm.chat(messages, temperature=0.7, max_tokens=150, stream=True, return_stats=True)
                 
                 # Parse result (handle both tuple and string returns)
@@ -8737,6 +8787,8 @@ Show all 85+ supported models organized by tier.
             
             sys.stdout.flush()  # Ensure query output is displayed
             
+            response_cache.put(best_model, user_input, result, temperature=0.7, history=prior_turns)
+            
             # Streaming already output the response, just add newlines for formatting
             print()  # Newline after streamed content
             print()  # Buffer 1
@@ -12357,7 +12409,10 @@ Keep it concise (2-3 sentences max)."""
 
 
     def _test_model_capabilities(self, models_to_test: list) -> dict:
-        """Test all models' capabilities with simple queries in parallel.
+        """Test all models' capabilities with the Tier 0 benchmark prompts.
+        
+        Each model is loaded once (llamafile server mode) and runs the whole
+        prompt set, instead of one llamafile process per prompt.
         
         Args:
             models_to_test: List of (model_name, location, tier, tier_name) tuples
@@ -12366,109 +12421,39 @@ Keep it concise (2-3 sentences max)."""
             Dict with results for each model
         """
         from pathlib import Path
-        from llamafile_agent import LlamafileAgent
-        import concurrent.futures
-        import threading
+        from core.model_files_map import get_model_file
+        from model_benchmark import BenchmarkRunner, load_corpus
         
         project_root = Path(__file__).parent.parent
-        project_models_dir = project_root / '.luciferai' / 'models'
-        home_models_dir = Path.home() / '.luciferai' / 'models'
-        
-        # Define all test cases
-        all_tests = [
-            ("What is 2+2?", ["4", "four"]),
-            ("Say hello", ["hello", "hi", "hey"]),
-            ("Set volume to 50%", ["volume", "50", "set"]),
-        ]
-        
-        # Get model paths and initialize agents
-        model_agents = {}
-        model_files = {
-            'tinyllama': 'tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf',
-            'llama3.2': 'llama-3.2-3b-instruct-Q4_K_M.gguf',
-            'mistral': 'mistral-7b-instruct-v0.2.Q4_K_M.gguf',
-            'deepseek-coder': 'deepseek-coder-6.7b-instruct-Q4_K_M.gguf',
+        model_dirs = {
+            'project': project_root / '.luciferai' / 'models',
+            'home': Path.home() / '.luciferai' / 'models',
         }
         
+        corpus = load_corpus(max_tier=0)
+        models = []
         for model_name, location, tier, tier_name in models_to_test:
-            filename = model_files.get(model_name)
-            if not filename:
-                continue
-            
-            # Find model path based on location
-            if location == 'project':
-                model_path = project_models_dir / filename
-            elif location == 'home':
-                model_path = home_models_dir / filename
-            else:  # backup
-                continue
-            
-            if model_path.exists():
-                try:
-                    model_agents[model_name] = LlamafileAgent(model_path=model_path)
-                except Exception as e:
-                    print(c(f"⚠️  Failed to initialize {model_name}: {e}", "yellow"))
+            model_file = get_model_file(model_name)
+            if model_file and location in model_dirs and (model_dirs[location] / model_file).exists():
+                models.append((model_name, model_dirs[location] / model_file, tier))
         
-        # Results storage
-        results = {model: {'passed': 0, 'total': len(all_tests), 'responses': []} 
-                   for model, _, _, _ in models_to_test}
+        print(c(f"\n🧪 Running {len(corpus)} tests across {len(models)} models...\n", "cyan"))
         
-        # Run each test across all models in parallel
-        print(c(f"\n🧪 Running {len(all_tests)} tests across {len(model_agents)} models...\n", "cyan"))
+        benchmark = BenchmarkRunner(max_tokens=50).run(models, corpus)
         
-        for test_num, (question, expected_keywords) in enumerate(all_tests, 1):
-            print(c(f"━" * 70, "dim"))
-            print(c(f"Test {test_num}/{len(all_tests)}: {question}", "cyan"))
-            print(c(f"━" * 70, "dim"))
-            print()
-            
-            # Query all models in parallel (max 5 at once)
-            test_results = {}
-            lock = threading.Lock()
-            
-            def test_model(model_name, agent):
-                try:
-                    response = agent.query(question, temperature=0.1, max_tokens=50)
-                    response_lower = response.lower()
-                    passed = any(keyword in response_lower for keyword in expected_keywords)
-                    
-                    with lock:
-                        test_results[model_name] = {
-                            'response': response,
-                            'passed': passed
-                        }
-                except Exception as e:
-                    with lock:
-                        test_results[model_name] = {
-                            'response': f"Error: {e}",
-                            'passed': False
-                        }
-            
-            # Execute in parallel with ThreadPoolExecutor (max 5 concurrent)
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                futures = {executor.submit(test_model, name, agent): name 
-                          for name, agent in model_agents.items()}
-                concurrent.futures.wait(futures)
-            
-            # Display results for this test
-            for model_name, location, tier, tier_name in models_to_test:
-                if model_name not in test_results:
-                    continue
-                
-                result = test_results[model_name]
-                status = c("✅ PASS", "green") if result['passed'] else c("❌ FAIL", "red")
-                
-                print(c(f"  {model_name.upper():<15} {status}", "white"))
-                if not result['passed']:
-                    response_preview = result['response'][:60] + "..." if len(result['response']) > 60 else result['response']
-                    print(c(f"    → {response_preview}", "dim"))
-                
-                # Update results
-                if result['passed']:
-                    results[model_name]['passed'] += 1
-                results[model_name]['responses'].append(result)
-            
-            print()
+        results = {model: {'passed': 0, 'total': len(corpus), 'responses': []}
+                   for model, _, _, _ in models_to_test}
+        for row in benchmark['results']:
+            entry = results[row['model']]
+            entry['responses'].append(row)
+            if row['passed']:
+                entry['passed'] += 1
+        
+        for model_name, summary in benchmark['summary'].items():
+            passed = results[model_name]['passed']
+            status = c("✅", "green") if passed == len(corpus) else c("⚠️ ", "yellow")
+            print(c(f"  {model_name.upper():<15} {status} {passed}/{len(corpus)}", "white"))
+        print()
         
         return results
     
@@ -12500,8 +12485,13 @@ Keep it concise (2-3 sentences max)."""
         
         return ""
     
-    def _handle_test_all_models(self) -> str:
-        """Run test suite for all available LLMs."""
+    def _handle_test_all_models(self, suite: str = 'benchmark') -> str:
+        """Run test suite for all available LLMs.
+        
+        Args:
+            suite: 'benchmark' (prompt corpus, each model loaded once) or
+                   'commands' (tests/test_all_commands.py routing suite)
+        """
         from pathlib import Path
         from core.model_files_map import get_all_models
         
@@ -12581,6 +12571,10 @@ Keep it concise (2-3 sentences max)."""
         print(c("═" * 70, "purple"))
         print()
         
+        if suite == 'benchmark':
+            model_dirs = {'project': project_models_dir, 'home': home_models_dir, 'backup': backup_models_dir}
+            return self._run_model_benchmark(testable_models, model_dirs)
+        
         # Run test script once - it tests all models together
         import subprocess
         import threading
@@ -12714,6 +12708,64 @@ Keep it concise (2-3 sentences max)."""
             progress_thread.join(timeout=0.5)
             return c(f"❌ Test failed: {e}", "red")
     
+    def _run_model_benchmark(self, testable_models: list, model_dirs: dict) -> str:
+        """Benchmark installed models with the prompt corpus and save JSON/CSV results."""
+        import threading
+        from core.model_files_map import get_model_file
+        from model_benchmark import BenchmarkRunner, load_corpus, save_results
+        
+        models = []
+        for model_name, location, tier, tier_name in testable_models:
+            model_file = get_model_file(model_name)
+            models_dir = model_dirs.get(location)
+            if model_file and models_dir:
+                models.append((model_name, models_dir / model_file, tier))
+        
+        corpus = load_corpus()
+        print(c(f"Benchmarking {len(models)} model(s) on {len(corpus)} prompts (1 warmup each)...", "cyan"))
+        print()
+        
+        lock = threading.Lock()
+        
+        def progress(model_name, done, total):
+            with lock:
+                print(f"\r  {c('⏱️', 'cyan')}  {model_name.upper():<15} {c(f'{done}/{total}', 'dim')}", end='', flush=True)
+        
+        runner = BenchmarkRunner(progress=progress)
+        results = runner.run(models, corpus)
+        print('\r' + ' ' * 60 + '\r', end='')
+        
+        print(c("═" * 70, "purple"))
+        print(c("📊 Benchmark Summary", "cyan"))
+        print(c("═" * 70, "purple"))
+        print()
+        print(c(f"  {'MODEL':<15} {'PASS':>6} {'TTFT p50':>10} {'TOK/S':>8} {'PROMPT/S':>9} {'PEAK RSS':>10}", "dim"))
+        
+        def fmt(value, spec, suffix=''):
+            return f"{value:{spec}}{suffix}" if value is not None else '-'
+        
+        for model_name, summary in results['summary'].items():
+            if 'error' in summary:
+                print(c(f"  {model_name.upper():<15} ❌ {summary['error'][:50]}", "red"))
+                continue
+            color = "green" if summary['pass_rate'] >= 80 else "yellow" if summary['pass_rate'] >= 50 else "red"
+            print(
+                c(f"  {model_name.upper():<15}", "white") +
+                c(f" {summary['pass_rate']:>5.0f}%", color) +
+                c(f" {fmt(summary['ttft_ms_p50'], '>8.0f', 'ms'):>10}"
+                  f" {fmt(summary['tokens_per_sec'], '>8.1f'):>8}"
+                  f" {fmt(summary['prompt_eval_rate'], '>9.1f'):>9}"
+                  f" {fmt(summary['peak_rss_mb'], '>8.0f', 'MB'):>10}", "white")
+            )
+        
+        json_path, csv_path = save_results(results)
+        print()
+        print(c(f"📁 Results: {json_path}", "dim"))
+        print(c(f"📁 CSV:     {csv_path}", "dim"))
+        print()
+        
+        return c("✅ Benchmark complete!", "green")
+    
     def _display_final_summary(self, results, testable_models, output):
         """Display final test summary."""
         print(c("═" * 70, "purple"))
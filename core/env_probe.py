@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+🔬 Environment Probe - in-process package/version probes with an mtime-keyed cache
+Shared by EnvironmentScanner and ModuleTracker. Installed distributions are
+read with importlib.metadata straight from an environment's site-packages,
+Python versions from pyvenv.cfg / conda-meta, Homebrew formulae from the
+Cellar - no pip/brew/conda subprocesses. Every probe result is kept in
+~/.luciferai/env_probe_cache.json under a stamp of the relevant mtimes
+(pyvenv.cfg, site-packages, conda-meta, Cellar), so a repeat query is a few
+stat() calls.
+"""
+import json
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROBE_WORKERS = min(16, (os.cpu_count() or 2) * 4)  # Probes are I/O bound
+
+HOMEBREW_CELLARS = [
+    Path("/opt/homebrew/Cellar"),
+    Path("/usr/local/Cellar"),
+    Path("/home/linuxbrew/.linuxbrew/Cellar"),
+]
+
+
+class ProbeCache:
+    """Probe results keyed by name, valid while their mtime stamp is unchanged."""
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = cache_file or (Path.home() / ".luciferai" / "env_probe_cache.json")
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r') as f:
+                    self._entries = json.load(f).get('entries', {})
+            except:
+                self._entries = {}
+
+    def get_or_probe(self, key: str, stamp: List, probe: Callable):
+        """Cached value for `key` if `stamp` matches, else run `probe()` and remember it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry['stamp'] == stamp:
+                return entry['value']
+        value = probe()
+        with self._lock:
+            self._entries[key] = {'stamp': stamp, 'value': value}
+            self._dirty = True
+        return value
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_suffix('.tmp')
+                with open(tmp_file, 'w') as f:
+                    json.dump({'entries': self._entries}, f)
+                tmp_file.replace(self.cache_file)
+                self._dirty = False
+            except OSError:
+                pass
+
+
+def get_probe_cache() -> ProbeCache:
+    """Process-wide probe cache."""
+    if not hasattr(get_probe_cache, '_instance'):
+        get_probe_cache._instance = ProbeCache()
+    return get_probe_cache._instance
+
+
+def _mtime(path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def parallel_map(func: Callable, items: List) -> List:
+    """func over items on a thread pool, results in input order."""
+    if len(items) < 2:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+# ═══════════════════════════════════════════════════════════
+# Python environments
+# ═══════════════════════════════════════════════════════════
+
+def site_packages_dirs(env_path: Path) -> List[Path]:
+    """site-packages directories of a venv/conda/pyenv prefix."""
+    env_path = Path(env_path)
+    dirs = sorted((env_path / "lib").glob("python*/site-packages"))
+    windows = env_path / "Lib" / "site-packages"
+    if windows.is_dir():
+        dirs.append(windows)
+    return dirs
+
+
+def env_stamp(env_path: Path) -> List:
+    """mtimes that change whenever packages or the interpreter of an env change."""
+    env_path = Path(env_path)
+    return [_mtime(env_path / "pyvenv.cfg"), _mtime(env_path / "conda-meta")] + \
+        [[str(d), _mtime(d)] for d in site_packages_dirs(env_path)]
+
+
+def read_distributions(paths: List) -> Dict[str, str]:
+    """{project name: version} of the distributions found on `paths` (first one wins, like pip)."""
+    packages: Dict[str, str] = {}
+    for dist in metadata.distributions(path=[str(p) for p in paths]):
+        name = dist.metadata['Name'] if dist.metadata else None
+        if name and name not in packages:
+            packages[name] = dist.version
+    return packages
+
+
+def _read_python_version(env_path: Path) -> str:
+    # venv/virtualenv record the base interpreter's version
+    cfg = env_path / "pyvenv.cfg"
+    if cfg.exists():
+        try:
+            for line in cfg.read_text().splitlines():
+                key, _, value = line.partition("=")
+                if key.strip() in ("version", "version_info") and value.strip():
+                    return value.strip()
+        except OSError:
+            pass
+
+    # conda keeps one JSON record per package: python-3.11.7-<build>.json
+    for record in (env_path / "conda-meta").glob("python-[0-9]*.json"):
+        return record.name.split("-")[1]
+
+    python_exe = env_path / "bin" / "python"
+    if not python_exe.exists():
+        return "unknown"
+    try:
+        result = subprocess.run(
+            [str(python_exe), "--version"],
+            capture_output=True,
+            text=True,
+            timeout=2
+        )
+        version = (result.stdout or result.stderr).strip().replace("Python ", "")
+        return version if version else "unknown"
+    except:
+        return "unknown"
+
+
+def python_version(env_path: Path) -> str:
+    """Python version of an environment, without starting its interpreter when avoidable."""
+    env_path = Path(env_path)
+    stamp = [_mtime(env_path / "pyvenv.cfg"), _mtime(env_path / "conda-meta"), _mtime(env_path / "bin" / "python")]
+    return get_probe_cache().get_or_probe(f"python:{env_path}", stamp, lambda: _read_python_version(env_path))
+
+
+def env_packages(env_path: Path) -> Dict[str, str]:
+    """Installed distributions of an environment (what `<env>/bin/pip list` reports)."""
+    env_path = Path(env_path)
+    return get_probe_cache().get_or_probe(
+        f"packages:{env_path}", env_stamp(env_path), lambda: read_distributions(site_packages_dirs(env_path)))
+
+
+def current_packages() -> Dict[str, str]:
+    """Installed distributions visible to this interpreter (what `python -m pip list` reports)."""
+    paths = [p for p in sys.path if p and os.path.isdir(p)]
+    stamp = [[p, _mtime(p)] for p in paths]
+    return get_probe_cache().get_or_probe(f"packages:{sys.executable}", stamp, lambda: read_distributions(paths))
+
+
+# ═══════════════════════════════════════════════════════════
+# Homebrew and conda
+# ═══════════════════════════════════════════════════════════
+
+def homebrew_cellar() -> Optional[Path]:
+    for cellar in HOMEBREW_CELLARS:
+        if cellar.is_dir():
+            return cellar
+    return None
+
+
+def _read_cellar(cellar: Path) -> List[Dict]:
+    packages = []
+    for formula in sorted(os.scandir(cellar), key=lambda e: e.name):
+        if not formula.is_dir() or formula.name.startswith("."):
+            continue
+        versions = sorted(v.name for v in os.scandir(formula.path) if v.is_dir())
+        if versions:
+            packages.append({'name': formula.name, 'version': versions[-1]})
+    return packages
+
+
+def brew_packages() -> List[Dict]:
+    """Installed Homebrew formulae [{'name', 'version'}] read from the Cellar."""
+    cellar = homebrew_cellar()
+    if not cellar:
+        return []
+    return get_probe_cache().get_or_probe(f"brew:{cellar}", [_mtime(cellar)], lambda: _read_cellar(cellar))
+
+
+def _read_conda_meta(prefix: Path) -> List[Dict]:
+    packages = []
+    for record in sorted((prefix / "conda-meta").glob("*.json")):
+        parts = record.stem.rsplit("-", 2)  # name-version-build
+        if len(parts) == 3:
+            packages.append({'name': parts[0], 'version': parts[1]})
+    return packages
+
+
+def conda_packages(prefix: Path) -> List[Dict]:
+    """Packages of a conda prefix [{'name', 'version'}] (what `conda list` reports)."""
+    prefix = Path(prefix)
+    return get_probe_cache().get_or_probe(
+        f"conda:{prefix}", [_mtime(prefix / "conda-meta")], lambda: _read_conda_meta(prefix))
+
+
+def _list_conda_envs() -> List[str]:
+    try:
+        result = subprocess.run(
+            ["conda", "env", "list", "--json"],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+    except FileNotFoundError:
+        return []  # Conda not installed
+    if result.returncode != 0:
+        return []
+    return json.loads(result.stdout).get('envs', [])
+
+
+def conda_environments() -> List[str]:
+    """Conda environment prefixes; `conda env list` only reruns when its registry changes."""
+    registry = Path.home() / ".conda" / "environments.txt"
+    conda_exe = os.environ.get('CONDA_EXE', '')
+    stamp = [_mtime(registry), conda_exe, _mtime(Path(conda_exe).parent.parent / "envs") if conda_exe else None]
+    return get_probe_cache().get_or_probe("conda-envs", stamp, _list_conda_envs)
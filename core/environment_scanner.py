@@ -10,11 +10,15 @@ Find and manage ALL virtual environments on the system:
 """
 import os
 import sys
-import json
-import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional
 
+try:
+    from core.env_probe import python_version, conda_environments, parallel_map, get_probe_cache
+except ImportError:
+    from env_probe import python_version, conda_environments, parallel_map, get_probe_cache
+
 # Colors
 PURPLE = '\033[35m'
 GREEN = '\033[32m'
@@ -56,11 +60,22 @@ class EnvironmentScanner:
         print(f"{YELLOW}🔍 Scanning for virtual environments...{RESET}\n")
         
         self._detect_active_environment()
-        self._scan_conda_environments()
-        self._scan_luci_environments()
-        self._scan_pyenv_environments()
-        self._scan_venv_environments()
-        self._scan_common_locations()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # `conda env list` (when its registry changed) overlaps the directory scans
+            conda_future = pool.submit(conda_environments)
+            self._scan_luci_environments()
+            self._scan_pyenv_environments()
+            self._scan_venv_environments()
+            self._scan_common_locations()
+            self._scan_conda_environments(conda_future)
+        
+        # Discovery only lists directories; versions are probed together afterwards
+        pending = [env for env in self.conda_envs + self.luci_envs + self.venv_envs
+                   if env['python_version'] is None]
+        for env, version in zip(pending, parallel_map(self._get_python_version,
+                                                      [Path(env['path']) / "bin" / "python" for env in pending])):
+            env['python_version'] = version
+        get_probe_cache().save()
     
     def _detect_active_environment(self):
         """Detect currently active environment."""
@@ -89,35 +104,21 @@ class EnvironmentScanner:
             self.active_env_type = 'pyenv'
             return
     
-    def _scan_conda_environments(self):
-        """Scan for Conda environments."""
+    def _scan_conda_environments(self, listing: Optional[Future] = None):
+        """Scan for Conda environments (`listing`: conda_environments() already running in the background)."""
         try:
-            result = subprocess.run(
-                ["conda", "env", "list", "--json"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                for env_path in data.get('envs', []):
-                    env_path = Path(env_path)
-                    name = env_path.name
-                    
-                    # Get Python version
-                    python_exe = env_path / "bin" / "python"
-                    py_version = self._get_python_version(python_exe)
-                    
-                    self.conda_envs.append({
-                        'name': name,
-                        'path': str(env_path),
-                        'type': 'conda',
-                        'python_version': py_version,
-                        'active': (name == self.active_env and self.active_env_type == 'conda')
-                    })
-        except FileNotFoundError:
-            pass  # Conda not installed
+            env_paths = listing.result() if listing else conda_environments()
+            for env_path in env_paths:
+                env_path = Path(env_path)
+                name = env_path.name
+                
+                self.conda_envs.append({
+                    'name': name,
+                    'path': str(env_path),
+                    'type': 'conda',
+                    'python_version': None,
+                    'active': (name == self.active_env and self.active_env_type == 'conda')
+                })
         except Exception as e:
             print(f"{DIM}⚠️  Could not scan conda: {e}{RESET}")
     
@@ -132,42 +133,38 @@ class EnvironmentScanner:
             if env_dir.is_dir():
                 python_exe = env_dir / "bin" / "python"
                 if python_exe.exists():
-                    py_version = self._get_python_version(python_exe)
-                    
                     self.luci_envs.append({
                         'name': env_dir.name,
                         'path': str(env_dir),
                         'type': 'luci',
-                        'python_version': py_version,
+                        'python_version': None,
                         'active': (env_dir.name == self.active_env and self.active_env_type == 'luci')
                     })
     
     def _scan_pyenv_environments(self):
-        """Scan for pyenv environments."""
+        """Scan for pyenv environments (what `pyenv versions --bare` lists)."""
+        versions_dir = Path(os.environ.get('PYENV_ROOT', Path.home() / ".pyenv")) / "versions"
         try:
-            result = subprocess.run(
-                ["pyenv", "versions", "--bare"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            if not versions_dir.is_dir():
+                return  # pyenv not installed
+            
+            versions = []
+            for version_dir in sorted(versions_dir.iterdir()):
+                if version_dir.is_dir():
+                    versions.append(version_dir.name)
+                    if (version_dir / "envs").is_dir():
+                        versions.extend(f"{version_dir.name}/envs/{env.name}"
+                                        for env in sorted((version_dir / "envs").iterdir()))
             
-            if result.returncode == 0:
-                for version in result.stdout.strip().split('\n'):
-                    if version:
-                        pyenv_root = Path.home() / ".pyenv" / "versions" / version
-                        if pyenv_root.exists():
-                            python_exe = pyenv_root / "bin" / "python"
-                            
-                            self.pyenv_envs.append({
-                                'name': version,
-                                'path': str(pyenv_root),
-                                'type': 'pyenv',
-                                'python_version': version,
-                                'active': (version == self.active_env and self.active_env_type == 'pyenv')
-                            })
-        except FileNotFoundError:
-            pass  # pyenv not installed
+            for version in versions:
+                pyenv_root = versions_dir / version
+                self.pyenv_envs.append({
+                    'name': version,
+                    'path': str(pyenv_root),
+                    'type': 'pyenv',
+                    'python_version': version,
+                    'active': (version == self.active_env and self.active_env_type == 'pyenv')
+                })
         except Exception as e:
             print(f"{DIM}⚠️  Could not scan pyenv: {e}{RESET}")
     
@@ -185,9 +182,6 @@ class EnvironmentScanner:
             
             # Check if this is itself a venv
             if self._is_venv(base_dir):
-                python_exe = base_dir / "bin" / "python"
-                py_version = self._get_python_version(python_exe)
-                
                 # Skip if already found in Luci envs
                 if any(env['path'] == str(base_dir) for env in self.luci_envs):
                     continue
@@ -196,7 +190,7 @@ class EnvironmentScanner:
                     'name': base_dir.name,
                     'path': str(base_dir),
                     'type': 'venv',
-                    'python_version': py_version,
+                    'python_version': None,
                     'active': (str(base_dir) == self.active_env and self.active_env_type == 'venv')
                 })
             
@@ -204,9 +198,6 @@ class EnvironmentScanner:
             try:
                 for subdir in base_dir.iterdir():
                     if subdir.is_dir() and self._is_venv(subdir):
-                        python_exe = subdir / "bin" / "python"
-                        py_version = self._get_python_version(python_exe)
-                        
                         # Skip if already found
                         if any(env['path'] == str(subdir) for env in self.luci_envs):
                             continue
@@ -215,7 +206,7 @@ class EnvironmentScanner:
                             'name': subdir.name,
                             'path': str(subdir),
                             'type': 'venv',
-                            'python_version': py_version,
+                            'python_version': None,
                             'active': (str(subdir) == self.active_env and self.active_env_type == 'venv')
                         })
             except PermissionError:
@@ -232,14 +223,11 @@ class EnvironmentScanner:
                 if any(env['path'] == str(venv_path) for env in self.venv_envs):
                     continue
                 
-                python_exe = venv_path / "bin" / "python"
-                py_version = self._get_python_version(python_exe)
-                
                 self.venv_envs.append({
                     'name': f"{cwd.name}/{venv_name}",
                     'path': str(venv_path),
                     'type': 'venv',
-                    'python_version': py_version,
+                    'python_version': None,
                     'active': (str(venv_path) == self.active_env and self.active_env_type == 'venv')
                 })
     
@@ -255,21 +243,10 @@ class EnvironmentScanner:
         return any(ind.exists() for ind in indicators)
     
     def _get_python_version(self, python_exe: Path) -> str:
-        """Get Python version from executable."""
+        """Get Python version of the environment owning an executable (pyvenv.cfg/conda-meta, cached)."""
         if not python_exe.exists():
             return "unknown"
-        
-        try:
-            result = subprocess.run(
-                [str(python_exe), "--version"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            version = result.stdout.strip().replace("Python ", "")
-            return version if version else "unknown"
-        except:
-            return "unknown"
+        return python_version(python_exe.parent.parent)
     
     def display_summary(self):
         """Display summary of found environments."""
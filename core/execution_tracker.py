@@ -42,6 +42,15 @@ class ExecutionTracker:
         self.start_time = time.time()
         self.end_time = None
         
+    def _invalidate_listings(self, *paths: str):
+        """Drop cached directory listings a file event made stale, so tree previews re-read them."""
+        try:
+            from core.tree_visualizer import get_listing_cache
+        except ImportError:
+            from tree_visualizer import get_listing_cache
+        for path in paths:
+            get_listing_cache().invalidate(path)
+    
     def track_file_created(self, file_path: str, size_bytes: int = 0):
         """Track a newly created file."""
         from datetime import datetime
@@ -52,6 +61,7 @@ class ExecutionTracker:
             'action': 'created',
             'size': size_bytes
         })
+        self._invalidate_listings(file_path)
     
     def track_file_modified(self, file_path: str, size_bytes: int = 0):
         """Track a modified file."""
@@ -63,6 +73,7 @@ class ExecutionTracker:
             'action': 'modified',
             'size': size_bytes
         })
+        self._invalidate_listings(file_path)
     
     def track_file_deleted(self, file_path: str):
         """Track a permanently deleted file."""
@@ -74,6 +85,7 @@ class ExecutionTracker:
             'action': 'deleted',
             'size': 0
         })
+        self._invalidate_listings(file_path)
     
     def track_file_moved(self, from_path: str, to_path: str):
         """Track a moved file."""
@@ -90,6 +102,7 @@ class ExecutionTracker:
             'size': 0,
             'destination': to_path
         })
+        self._invalidate_listings(from_path, to_path)
     
     def track_directory_created(self, dir_path: str):
         """Track a created directory."""
@@ -98,6 +111,7 @@ class ExecutionTracker:
             'timestamp': datetime.now().isoformat(),
             'path': dir_path
         })
+        self._invalidate_listings(dir_path)
     
     def track_directory_deleted(self, dir_path: str):
         """Track a deleted directory."""
@@ -106,6 +120,7 @@ class ExecutionTracker:
             'timestamp': datetime.now().isoformat(),
             'path': dir_path
         })
+        self._invalidate_listings(dir_path)
     
     def track_directory_moved(self, from_path: str, to_path: str):
         """Track a moved directory."""
@@ -115,6 +130,7 @@ class ExecutionTracker:
             'from': from_path,
             'to': to_path
         })
+        self._invalidate_listings(from_path, to_path)
     
     def track_directory_modified(self, dir_path: str):
         """Track a modified directory (permissions, attributes, etc.)."""
@@ -123,6 +139,7 @@ class ExecutionTracker:
             'timestamp': datetime.now().isoformat(),
             'path': dir_path
         })
+        self._invalidate_listings(dir_path)
     
     def track_directory_overwritten(self, dir_path: str):
         """Track an overwritten directory (deleted and recreated)."""
@@ -131,6 +148,7 @@ class ExecutionTracker:
             'timestamp': datetime.now().isoformat(),
             'path': dir_path
         })
+        self._invalidate_listings(dir_path)
     
     def track_file_overwritten(self, file_path: str, size_bytes: int = 0):
         """Track an overwritten file."""
@@ -142,6 +160,7 @@ class ExecutionTracker:
             'action': 'overwritten',
             'size': size_bytes
         })
+        self._invalidate_listings(file_path)
     
     def track_template_used(self, name: str, relevance: int, source: str, 
                            consensus_stats: Optional[Dict] = None):
@@ -169,6 +188,9 @@ class ExecutionTracker:
     def track_model_used(self, model: str, tier: int, purpose: str, tokens: int = 0, output: str = None):
         """Track a model being used.
         
+        Latency and tokens/sec for `perf report` are recorded by LLMBackend and
+        LlamafileAgent on every request, so they are not repeated here.
+        
         Args:
             model: Model name
             tier: Model tier (0-4)
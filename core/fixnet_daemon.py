@@ -4,12 +4,27 @@
 Automatically syncs fixes between local and global (GitHub) at regular intervals
 """
 import time
-import threading
 import subprocess
 from pathlib import Path
 from datetime import datetime, timedelta
+import copy
 import json
-import schedule
+import os
+
+try:
+    from core.fixnet_refs import get_ref_store, merge_shards, SHARDS_DIRNAME, VERSIONS_FILENAME
+except ImportError:
+    from fixnet_refs import get_ref_store, merge_shards, SHARDS_DIRNAME, VERSIONS_FILENAME
+
+try:
+    from core.job_scheduler import JobScheduler, job_time_left
+except ImportError:
+    from job_scheduler import JobScheduler, job_time_left
+
+try:
+    from core.git_access import open_repo
+except ImportError:
+    from git_access import open_repo
 
 PURPLE = "\033[35m"
 GREEN = "\033[32m"
@@ -35,6 +50,8 @@ class FixNetDaemon:
     - Conflict resolution
     - Activity logging
     - Bandwidth throttling
+    - Priority job scheduling: sync never waits behind maintenance, and
+      heavy maintenance only runs while the REPL is idle
     """
     
     def __init__(self, 
@@ -44,9 +61,12 @@ class FixNetDaemon:
         self.push_interval = push_interval_minutes
         self.pull_interval = pull_interval_minutes
         self.running = False
-        self.thread = None
         
         self.config = self._load_config()
+        self.scheduler = JobScheduler(
+            max_workers=self.config.get('max_parallel_jobs', 3),
+            idle_threshold=self.config.get('idle_minutes', 5) * 60
+        )
         self.stats = {
             "pushes": 0,
             "pulls": 0,
@@ -78,7 +98,9 @@ class FixNetDaemon:
                 "end": "08:00"
             },
             "bandwidth_limit": None,  # None = unlimited
-            "sync_on_wifi_only": False
+            "sync_on_wifi_only": False,
+            "max_parallel_jobs": 3,
+            "idle_minutes": 5  # Maintenance waits for this much REPL idle time
         }
         
         self._save_config(config)
@@ -102,45 +124,51 @@ class FixNetDaemon:
         self.running = True
         self.stats['started'] = datetime.now().isoformat()
         
-        # Schedule tasks
-        schedule.every(self.pull_interval).minutes.do(self._sync_pull)
-        schedule.every(self.push_interval).minutes.do(self._sync_push)
+        # Schedule tasks: sync first, one git-writing job at a time ("repo" group);
+        # the first pull runs right away
+        hour = 3600
+        jobs = self.scheduler
+        jobs.add_job("pull", self._sync_pull, self.pull_interval * 60, priority=0,
+                     timeout=120, group="repo", run_immediately=True)
+        jobs.add_job("push", self._sync_push, self.push_interval * 60, priority=1,
+                     timeout=180, group="repo")
         
         # Idle maintenance tasks
-        schedule.every(1).hours.do(self._autofix_python_files)
-        schedule.every(2).hours.do(self._cleanup_dictionary)
-        schedule.every(4).hours.do(self._organize_user_fixes)
-        schedule.every(6).hours.do(self._cleanup_branches)
-        schedule.every(8).hours.do(self._merge_similar_fixes)
-        schedule.every(12).hours.do(self._optimize_repo)
-        
-        # Run in background thread
-        self.thread = threading.Thread(target=self._run_scheduler, daemon=True)
-        self.thread.start()
+        jobs.add_job("autofix", self._autofix_python_files, 1 * hour, priority=5,
+                     timeout=600, idle_only=True)
+        jobs.add_job("cleanup_dictionary", self._cleanup_dictionary, 2 * hour, priority=5,
+                     timeout=300, idle_only=True, group="repo")
+        jobs.add_job("organize_user_fixes", self._organize_user_fixes, 4 * hour, priority=6,
+                     timeout=300, idle_only=True)
+        jobs.add_job("cleanup_branches", self._cleanup_branches, 6 * hour, priority=7,
+                     timeout=300, idle_only=True)
+        jobs.add_job("merge_similar_fixes", self._merge_similar_fixes, 8 * hour, priority=6,
+                     timeout=300, idle_only=True, group="repo")
+        jobs.add_job("optimize_repo", self._optimize_repo, 12 * hour, priority=9,
+                     timeout=900, idle_only=True, group="repo")
+        
+        jobs.start()
         
         print(f"{GREEN}✅ FixNet Daemon started{RESET}")
         print(f"   Pull interval: {self.pull_interval} minutes")
         print(f"   Push interval: {self.push_interval} minutes")
-        
-        # Initial sync
-        self._sync_pull()
     
     def stop(self):
         """Stop the daemon."""
         self.running = False
-        schedule.clear()
-        
-        if self.thread:
-            self.thread.join(timeout=5)
+        self.scheduler.stop()
         
         print(f"{BLUE}🛑 FixNet Daemon stopped{RESET}")
         self._print_stats()
     
-    def _run_scheduler(self):
-        """Run the scheduler loop."""
-        while self.running:
-            schedule.run_pending()
-            time.sleep(1)
+    def _run(self, cmd, **kwargs):
+        """subprocess.run, capped to the time left before the current job's timeout."""
+        left = job_time_left()
+        if left is not None:
+            if left <= 0:
+                raise subprocess.TimeoutExpired(cmd, 0)
+            kwargs['timeout'] = min(kwargs.get('timeout', left), left)
+        return subprocess.run(cmd, **kwargs)
     
     def _sync_pull(self):
         """Pull updates from GitHub."""
@@ -160,7 +188,7 @@ class FixNetDaemon:
                 return
             
             # Git pull
-            result = subprocess.run(
+            result = self._run(
                 ["git", "pull", "--rebase"],
                 cwd=FIXNET_LOCAL,
                 capture_output=True,
@@ -175,6 +203,7 @@ class FixNetDaemon:
                 else:
                     self._log(f"✅ Pulled updates: {output[:100]}")
                     self.stats['pulls'] += 1
+                    self._apply_ref_changes()
                 
                 self.stats['last_pull'] = datetime.now().isoformat()
             else:
@@ -185,6 +214,7 @@ class FixNetDaemon:
                     
                     if self.config.get('auto_resolve_conflicts', True):
                         self._auto_resolve_conflicts()
+                        self._apply_ref_changes()
                 else:
                     self._log(f"❌ Pull failed: {result.stderr[:200]}")
         
@@ -193,6 +223,19 @@ class FixNetDaemon:
         except Exception as e:
             self._log(f"❌ Pull error: {str(e)[:200]}")
     
+    def _apply_ref_changes(self):
+        """Apply only the ref shards whose version changed in the pull."""
+        changes = get_ref_store().sync()
+        if changes:
+            refs_changed = sum(len(c['added']) + len(c['updated']) + len(c['removed']) for c in changes)
+            self._log(f"   Applied {len(changes)} changed ref shard(s), {refs_changed} ref(s)")
+    
+    def _commit_refs(self, changes, message: str):
+        """Stage the rewritten ref shards and commit them."""
+        repo = open_repo(FIXNET_LOCAL)
+        repo.add(get_ref_store().shard_paths(c['shard'] for c in changes))
+        repo.commit(message)
+    
     def _sync_push(self):
         """Push local changes to GitHub."""
         if not self.config.get('enabled', True):
@@ -209,51 +252,17 @@ class FixNetDaemon:
                 self._log("FixNet directory not found - skipping push")
                 return
             
-            # Check if there are changes to push
-            status_result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=FIXNET_LOCAL,
-                capture_output=True,
-                text=True
-            )
-            
-            if not status_result.stdout.strip():
-                # No local changes
-                # Check if ahead of remote
-                ahead_result = subprocess.run(
-                    ["git", "rev-list", "--count", "HEAD@{upstream}..HEAD"],
-                    cwd=FIXNET_LOCAL,
-                    capture_output=True,
-                    text=True
-                )
-                
-                ahead_count = int(ahead_result.stdout.strip() or 0)
-                if ahead_count == 0:
-                    self._log("✅ Nothing to push")
-                    return
-            
-            # Add all changes
-            subprocess.run(
-                ["git", "add", "."],
-                cwd=FIXNET_LOCAL,
-                capture_output=True
-            )
-            
-            # Commit with auto-generated message
+            # Stage and commit in-process: a single work tree scan, no forks
+            repo = open_repo(FIXNET_LOCAL)
+            repo.add()
             commit_msg = f"[Auto-sync] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            commit_result = subprocess.run(
-                ["git", "commit", "-m", commit_msg],
-                cwd=FIXNET_LOCAL,
-                capture_output=True,
-                text=True
-            )
-            
-            if commit_result.returncode != 0 and "nothing to commit" not in commit_result.stdout:
-                self._log(f"⚠️  Commit failed: {commit_result.stderr[:200]}")
+            if repo.commit(commit_msg) is None and repo.ahead_count() == 0:
+                # No local changes and not ahead of remote
+                self._log("✅ Nothing to push")
                 return
             
             # Push to GitHub
-            push_result = subprocess.run(
+            push_result = self._run(
                 ["git", "push"],
                 cwd=FIXNET_LOCAL,
                 capture_output=True,
@@ -271,7 +280,7 @@ class FixNetDaemon:
                     self._log("⚠️  Push rejected - pulling first...")
                     self._sync_pull()
                     # Retry push after pull
-                    retry_result = subprocess.run(
+                    retry_result = self._run(
                         ["git", "push"],
                         cwd=FIXNET_LOCAL,
                         capture_output=True,
@@ -295,49 +304,54 @@ class FixNetDaemon:
         self._log("🔧 Auto-resolving conflicts...")
         
         try:
-            # Strategy: Accept remote changes for refs.json (it's append-only)
+            # Strategy: Union both sides of conflicting ref shards (refs are keyed
+            # by fix hash) and rebuild the version vector from the result.
             # Keep local changes for actual fix files
             
             # Get list of conflicted files
-            status = subprocess.run(
-                ["git", "diff", "--name-only", "--diff-filter=U"],
-                cwd=FIXNET_LOCAL,
-                capture_output=True,
-                text=True
-            )
-            
-            conflicted_files = status.stdout.strip().split('\n')
+            repo = open_repo(FIXNET_LOCAL)
+            conflicted_files = repo.conflicted_paths()
+            versions_path = f"{SHARDS_DIRNAME}/{VERSIONS_FILENAME}"
+            resolved = []
             
             for file in conflicted_files:
-                if not file:
+                if file == versions_path:
                     continue
                 
-                if file == "refs.json":
+                if file.startswith(SHARDS_DIRNAME + "/") and file.endswith(".json"):
+                    merged = merge_shards(self._git_show_json(f":2:{file}", []),
+                                          self._git_show_json(f":3:{file}", []))
+                    with open(FIXNET_LOCAL / file, 'w') as f:
+                        json.dump(merged, f, indent=2, sort_keys=True)
+                    self._log(f"   Resolved {file} (merged {len(merged)} refs)")
+                elif file == "refs.json":
                     # Accept remote version for refs.json
-                    subprocess.run(
-                        ["git", "checkout", "--theirs", file],
-                        cwd=FIXNET_LOCAL,
-                        capture_output=True
-                    )
+                    self._checkout_stage(repo, file, 3)
                     self._log(f"   Resolved {file} (accepted remote)")
                 else:
                     # Keep local version for fix files
-                    subprocess.run(
-                        ["git", "checkout", "--ours", file],
-                        cwd=FIXNET_LOCAL,
-                        capture_output=True
-                    )
+                    self._checkout_stage(repo, file, 2)
                     self._log(f"   Resolved {file} (kept local)")
-                
-                # Stage the resolved file
-                subprocess.run(
-                    ["git", "add", file],
-                    cwd=FIXNET_LOCAL,
-                    capture_output=True
-                )
+                resolved.append(file)
+            
+            # Version vector: newest version of each shard from either side,
+            # bumped wherever the merged shard differs from both
+            if versions_path in conflicted_files:
+                ours = self._git_show_json(f":2:{versions_path}", {})
+                theirs = self._git_show_json(f":3:{versions_path}", {})
+                base = {}
+                for prefix in set(ours) | set(theirs):
+                    candidates = [v for v in (ours.get(prefix), theirs.get(prefix)) if v]
+                    base[prefix] = max(candidates, key=lambda v: v.get('version', 0))
+                get_ref_store().rebuild_versions(base)
+                resolved.append(versions_path)
+                self._log(f"   Resolved {versions_path} (rebuilt)")
+            
+            # Stage every resolved file at once
+            repo.add(resolved)
             
             # Complete the merge
-            subprocess.run(
+            self._run(
                 ["git", "commit", "--no-edit"],
                 cwd=FIXNET_LOCAL,
                 capture_output=True
@@ -348,6 +362,25 @@ class FixNetDaemon:
         except Exception as e:
             self._log(f"❌ Auto-resolve failed: {str(e)[:200]}")
     
+    def _git_show_json(self, spec: str, default):
+        """Parse a JSON blob from the index (e.g. ':2:path' for our side of a conflict)."""
+        data = open_repo(FIXNET_LOCAL).read_blob(spec)
+        if data is None:
+            return default
+        try:
+            return json.loads(data)
+        except ValueError:
+            return default
+    
+    def _checkout_stage(self, repo, file: str, stage: int):
+        """Write one side of a conflict to the work tree (2 = ours, 3 = theirs)."""
+        data = repo.read_blob(f":{stage}:{file}")
+        path = FIXNET_LOCAL / file
+        if data is None:
+            path.unlink(missing_ok=True)  # That side deleted the file
+        else:
+            path.write_bytes(data)
+    
     def _is_quiet_hours(self) -> bool:
         """Check if currently in quiet hours."""
         quiet = self.config.get('quiet_hours', {})
@@ -401,21 +434,27 @@ class FixNetDaemon:
             "config": self.config,
             "stats": self.stats,
             "next_pull": self._get_next_scheduled("pull"),
-            "next_push": self._get_next_scheduled("push")
+            "next_push": self._get_next_scheduled("push"),
+            "jobs": self.scheduler.get_metrics()
         }
     
     def _get_next_scheduled(self, job_type: str) -> str:
         """Get next scheduled time for job."""
-        for job in schedule.jobs:
-            if job_type in str(job.job_func):
-                return str(job.next_run)
+        job = self.scheduler.get_metrics().get(job_type)
+        if job and job['next_run']:
+            return job['next_run']
         return "N/A"
     
     def force_sync(self):
         """Force immediate sync (pull + push)."""
         print(f"{BLUE}🔄 Forcing immediate sync...{RESET}")
+        if self.running:
+            # Queue both; the "repo" group runs them one after the other, pull first
+            self.scheduler.run_now("pull")
+            self.scheduler.run_now("push")
+            print(f"{GREEN}✅ Sync queued{RESET}")
+            return
         self._sync_pull()
-        time.sleep(2)
         self._sync_push()
         print(f"{GREEN}✅ Force sync complete{RESET}")
     
@@ -474,13 +513,13 @@ class FixNetDaemon:
         self._log("🧹 Starting dictionary cleanup...")
         
         try:
-            refs_file = FIXNET_LOCAL / "refs.json"
-            if not refs_file.exists():
-                self._log("No refs.json found")
+            store = get_ref_store()
+            store.sync()
+            if not len(store):
+                self._log("No refs found")
                 return
             
-            with open(refs_file) as f:
-                refs = json.load(f)
+            refs = copy.deepcopy(store.refs())
             
             original_count = len(refs)
             
@@ -519,9 +558,8 @@ class FixNetDaemon:
             final_refs.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
             
             if len(final_refs) < original_count:
-                # Save cleaned version
-                with open(refs_file, 'w') as f:
-                    json.dump(final_refs, f, indent=2)
+                # Save cleaned version (only shards that lost entries are rewritten)
+                changes = store.replace_all(final_refs)
                 
                 removed = original_count - len(final_refs)
                 self._log(f"✅ Cleaned dictionary: removed {removed} entries")
@@ -529,16 +567,7 @@ class FixNetDaemon:
                 self._log(f"   - {quarantine_removed} old quarantined fixes")
                 
                 # Commit the cleanup
-                subprocess.run(
-                    ["git", "add", "refs.json"],
-                    cwd=FIXNET_LOCAL,
-                    capture_output=True
-                )
-                subprocess.run(
-                    ["git", "commit", "-m", f"[Cleanup] Removed {removed} duplicate/old entries"],
-                    cwd=FIXNET_LOCAL,
-                    capture_output=True
-                )
+                self._commit_refs(changes, f"[Cleanup] Removed {removed} duplicate/old entries")
             else:
                 self._log("✅ Dictionary clean - no cleanup needed")
         
@@ -553,48 +582,20 @@ class FixNetDaemon:
             if not FIXNET_LOCAL.exists():
                 return
             
-            # Get list of all branches
-            result = subprocess.run(
-                ["git", "branch", "-r"],
-                cwd=FIXNET_LOCAL,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                return
-            
-            branches = result.stdout.strip().split('\n')
+            # Get list of all remote branches (symbolic refs like origin/HEAD are skipped)
+            repo = open_repo(FIXNET_LOCAL)
             stale_branches = []
             
             # Check each branch for staleness (no commits in 90 days)
-            from datetime import datetime, timedelta
             cutoff_date = datetime.now() - timedelta(days=90)
             
-            for branch in branches:
-                branch = branch.strip()
-                if not branch or '->' in branch or 'master' in branch or 'main' in branch:
+            for branch in repo.remote_branches():
+                if 'master' in branch or 'main' in branch:
                     continue
                 
-                # Get last commit date
-                commit_result = subprocess.run(
-                    ["git", "log", "-1", "--format=%ci", branch],
-                    cwd=FIXNET_LOCAL,
-                    capture_output=True,
-                    text=True
-                )
-                
-                if commit_result.returncode == 0 and commit_result.stdout.strip():
-                    try:
-                        last_commit = datetime.strptime(
-                            commit_result.stdout.strip()[:19],
-                            '%Y-%m-%d %H:%M:%S'
-                        )
-                        
-                        if last_commit < cutoff_date:
-                            stale_branches.append(branch)
-                    except:
-                        pass
+                last_commit = repo.commit_time(branch)
+                if last_commit and last_commit < cutoff_date:
+                    stale_branches.append(branch)
             
             if stale_branches:
                 self._log(f"Found {len(stale_branches)} stale branches (>90 days old)")
@@ -615,8 +616,8 @@ class FixNetDaemon:
             if not FIXNET_LOCAL.exists():
                 return
             
-            # Git garbage collection
-            gc_result = subprocess.run(
+            # Git garbage collection (also prunes unreachable objects past the grace period)
+            gc_result = self._run(
                 ["git", "gc", "--auto"],
                 cwd=FIXNET_LOCAL,
                 capture_output=True,
@@ -627,38 +628,22 @@ class FixNetDaemon:
             if gc_result.returncode == 0:
                 self._log("✅ Git GC complete")
             
-            # Prune old objects
-            prune_result = subprocess.run(
-                ["git", "prune"],
-                cwd=FIXNET_LOCAL,
-                capture_output=True,
-                timeout=60
-            )
-            
-            if prune_result.returncode == 0:
-                self._log("✅ Pruned old objects")
-            
-            # Get repo size
-            size_result = subprocess.run(
-                ["du", "-sh", str(FIXNET_LOCAL)],
-                capture_output=True,
-                text=True
-            )
-            
-            if size_result.returncode == 0:
-                size = size_result.stdout.split()[0]
-                self._log(f"📦 Repository size: {size}")
-            
-            # Check for large files
-            large_files = subprocess.run(
-                ["find", str(FIXNET_LOCAL), "-type", "f", "-size", "+1M"],
-                capture_output=True,
-                text=True
-            )
+            # Repo size and large files in one walk (instead of du + find)
+            total_size = 0
+            large_files = 0
+            for root, _, files in os.walk(FIXNET_LOCAL):
+                for name in files:
+                    try:
+                        size = os.lstat(os.path.join(root, name)).st_size
+                    except OSError:
+                        continue
+                    total_size += size
+                    if size > 1024 * 1024:
+                        large_files += 1
             
-            if large_files.stdout.strip():
-                files = large_files.stdout.strip().split('\n')
-                self._log(f"⚠️  Found {len(files)} files >1MB")
+            self._log(f"📦 Repository size: {total_size / (1024 * 1024):.1f} MB")
+            if large_files:
+                self._log(f"⚠️  Found {large_files} files >1MB")
         
         except subprocess.TimeoutExpired:
             self._log("❌ Optimization timeout")
@@ -670,13 +655,12 @@ class FixNetDaemon:
         self._log("📂 Organizing user fixes...")
         
         try:
-            refs_file = FIXNET_LOCAL / "refs.json"
-            if not refs_file.exists():
+            store = get_ref_store()
+            store.sync()
+            refs = store.refs()
+            if not refs:
                 return
             
-            with open(refs_file) as f:
-                refs = json.load(f)
-            
             # Group fixes by user
             user_fixes = {}
             for ref in refs:
@@ -756,13 +740,12 @@ class FixNetDaemon:
         self._log("🔀 Merging similar fixes...")
         
         try:
-            refs_file = FIXNET_LOCAL / "refs.json"
-            if not refs_file.exists():
+            store = get_ref_store()
+            store.sync()
+            refs = copy.deepcopy(store.refs())
+            if not refs:
                 return
             
-            with open(refs_file) as f:
-                refs = json.load(f)
-            
             # Group by error signature
             error_groups = {}
             for ref in refs:
@@ -800,22 +783,12 @@ class FixNetDaemon:
             
             if merged_count > 0:
                 # Save merged version
-                with open(refs_file, 'w') as f:
-                    json.dump(final_refs, f, indent=2)
+                changes = store.replace_all(final_refs)
                 
                 self._log(f"✅ Merged {merged_count} duplicate fixes")
                 
                 # Commit the merge
-                subprocess.run(
-                    ["git", "add", "refs.json"],
-                    cwd=FIXNET_LOCAL,
-                    capture_output=True
-                )
-                subprocess.run(
-                    ["git", "commit", "-m", f"[Merge] Combined {merged_count} similar fixes"],
-                    cwd=FIXNET_LOCAL,
-                    capture_output=True
-                )
+                self._commit_refs(changes, f"[Merge] Combined {merged_count} similar fixes")
             else:
                 self._log("✅ No similar fixes to merge")
         
@@ -908,6 +881,9 @@ if __name__ == "__main__":
             print(f"  Running: {status['running']}")
             print(f"  Pushes: {status['stats']['pushes']}")
             print(f"  Pulls: {status['stats']['pulls']}")
+            for name, job in status['jobs'].items():
+                avg = f"{job['avg_duration']:.1f}s" if job['avg_duration'] is not None else "-"
+                print(f"  {name}: {job['runs']} runs, avg {avg}, {job['timeouts']} timeouts")
         
         elif command == "sync":
             daemon = FixNetDaemon(auto_start=False)
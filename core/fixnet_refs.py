@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+🗂️ FixNet Refs - Sharded reference store with delta sync
+Stores FixNet refs as fixnet/refs/<prefix>.json shards (by fix hash prefix)
+with a per-shard version vector in fixnet/refs/versions.json. Sync compares
+the vector and only reloads shards whose digest changed, then publishes
+change events so in-memory indexes can update incrementally.
+"""
+import hashlib
+import json
+import threading
+import weakref
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+LUCIFER_HOME = Path.home() / ".luciferai"
+FIXNET_LOCAL = LUCIFER_HOME / "fixnet"
+
+SHARD_PREFIX_LEN = 2
+SHARDS_DIRNAME = "refs"
+VERSIONS_FILENAME = "versions.json"
+LEGACY_REFS_FILENAME = "refs.json"
+
+
+def ref_key(ref: Dict) -> str:
+    """Identity of a ref: its fix hash, or a content digest for legacy entries without one."""
+    fix_hash = ref.get('fix_hash')
+    if fix_hash:
+        return str(fix_hash)
+    return hashlib.sha1(json.dumps(ref, sort_keys=True).encode()).hexdigest()
+
+
+def shard_for(key: str) -> str:
+    """Shard prefix for a ref key (hex keys shard on their own prefix)."""
+    prefix = key[:SHARD_PREFIX_LEN].lower()
+    if len(prefix) == SHARD_PREFIX_LEN and all(c in '0123456789abcdef' for c in prefix):
+        return prefix
+    return hashlib.sha1(key.encode()).hexdigest()[:SHARD_PREFIX_LEN]
+
+
+def newer_ref(a: Dict, b: Dict) -> Dict:
+    """Pick the more recent of two versions of the same ref (b wins ties)."""
+    def rank(ref):
+        usage = ref.get('usage_stats', {})
+        return (ref.get('timestamp', ''), usage.get('attempts', 0))
+    return a if rank(a) > rank(b) else b
+
+
+def merge_shards(ours: List[Dict], theirs: List[Dict]) -> List[Dict]:
+    """Union two versions of a shard by ref key (used for conflict resolution)."""
+    merged = {ref_key(r): r for r in ours}
+    for ref in theirs:
+        key = ref_key(ref)
+        merged[key] = newer_ref(merged[key], ref) if key in merged else ref
+    return [merged[k] for k in sorted(merged)]
+
+
+class RefShardStore:
+    """
+    FixNet refs split into hash-prefix shards.
+
+    Ref dicts keep their identity across syncs (updates are applied in
+    place), so lists and indexes built from refs() stay valid; subscribers
+    receive [{'shard', 'added', 'updated', 'removed'}] for each change.
+    """
+
+    def __init__(self, fixnet_dir: Optional[Path] = None):
+        self.fixnet_dir = Path(fixnet_dir or FIXNET_LOCAL)
+        self.shards_dir = self.fixnet_dir / SHARDS_DIRNAME
+        self.versions_file = self.shards_dir / VERSIONS_FILENAME
+        self.legacy_file = self.fixnet_dir / LEGACY_REFS_FILENAME
+        self._lock = threading.RLock()
+        self._shards: Dict[str, Dict[str, Dict]] = {}   # prefix -> key -> ref
+        self._vector: Dict[str, Dict] = {}               # prefix -> {'version', 'digest'} applied
+        self._legacy_stat = None
+        self._subscribers: List = []
+        self._load()
+
+    # ---------- persistence ----------
+
+    def _shard_path(self, prefix: str) -> Path:
+        return self.shards_dir / f"{prefix}.json"
+
+    def _read_json(self, path: Path, default):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    def _write_json(self, path: Path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        tmp_file.replace(path)
+
+    def _read_versions(self) -> Dict[str, Dict]:
+        versions = self._read_json(self.versions_file, {})
+        return versions if isinstance(versions, dict) else {}
+
+    def _read_shard(self, prefix: str) -> Dict[str, Dict]:
+        refs = self._read_json(self._shard_path(prefix), [])
+        return {ref_key(r): r for r in refs if isinstance(r, dict)}
+
+    @staticmethod
+    def _digest(refs: Dict[str, Dict]) -> str:
+        payload = json.dumps([refs[k] for k in sorted(refs)], sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _legacy_signature(self):
+        try:
+            st = self.legacy_file.stat()
+            return (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    def _load(self):
+        with self._lock:
+            versions = self._read_versions()
+            if not versions and self.shards_dir.exists():
+                # Shards without a vector (e.g. hand-copied) - index what is there
+                versions = self.rebuild_versions()
+            for prefix, info in versions.items():
+                self._shards[prefix] = self._read_shard(prefix)
+                self._vector[prefix] = dict(info)
+
+            # One-time migration of the monolithic refs.json
+            self._legacy_stat = self._legacy_signature()
+            if self._legacy_stat and not versions:
+                self._merge_legacy(publish=False)
+
+    def _merge_legacy(self, publish: bool = True) -> List[Dict]:
+        """Add refs from legacy refs.json that the shards don't have yet."""
+        legacy = self._read_json(self.legacy_file, [])
+        if not isinstance(legacy, list):
+            return []
+        missing = [r for r in legacy if isinstance(r, dict) and self.get(ref_key(r)) is None]
+        return self.upsert(missing, publish=publish) if missing else []
+
+    def rebuild_versions(self, base: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """
+        Recompute the version vector from the shard files on disk.
+
+        Shards whose digest differs from `base` (e.g. the merged vectors of
+        both sides of a conflict) get their version bumped past it.
+        """
+        base = base or {}
+        versions = {}
+        for path in sorted(self.shards_dir.glob('*.json')):
+            prefix = path.stem
+            if path.name == VERSIONS_FILENAME or len(prefix) != SHARD_PREFIX_LEN:
+                continue
+            digest = self._digest(self._read_shard(prefix))
+            previous = base.get(prefix, {})
+            version = previous.get('version', 0)
+            if previous.get('digest') != digest:
+                version += 1
+            versions[prefix] = {'version': version, 'digest': digest}
+        self._write_json(self.versions_file, versions)
+        return versions
+
+    # ---------- reads ----------
+
+    def refs(self) -> List[Dict]:
+        """All refs (shard order)."""
+        with self._lock:
+            return [ref for prefix in sorted(self._shards) for ref in self._shards[prefix].values()]
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            return self._shards.get(shard_for(key), {}).get(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._shards.values())
+
+    def version_vector(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {p: dict(v) for p, v in self._vector.items()}
+
+    def shard_paths(self, prefixes: Optional[Iterable[str]] = None) -> List[str]:
+        """Shard files (relative to the FixNet repo) plus the version vector, for git add."""
+        prefixes = sorted(prefixes if prefixes is not None else self._vector)
+        paths = [f"{SHARDS_DIRNAME}/{p}.json" for p in prefixes]
+        return paths + [f"{SHARDS_DIRNAME}/{VERSIONS_FILENAME}"]
+
+    # ---------- applying changes ----------
+
+    def _apply_shard(self, prefix: str, new_refs: Dict[str, Dict]) -> Optional[Dict]:
+        """Swap a shard's in-memory contents for `new_refs`; returns the change or None."""
+        current = self._shards.get(prefix, {})
+        added, updated, removed = [], [], []
+        merged = {}
+        for key, ref in new_refs.items():
+            existing = current.get(key)
+            if existing is None:
+                merged[key] = ref
+                added.append(ref)
+            else:
+                if existing != ref:
+                    existing.clear()
+                    existing.update(ref)
+                    updated.append(existing)
+                merged[key] = existing
+        for key, ref in current.items():
+            if key not in new_refs:
+                removed.append(ref)
+
+        if merged:
+            self._shards[prefix] = merged
+        else:
+            self._shards.pop(prefix, None)
+
+        if not (added or updated or removed):
+            return None
+        return {'shard': prefix, 'added': added, 'updated': updated, 'removed': removed}
+
+    def _write_shards(self, new_shards: Dict[str, Dict[str, Dict]], publish: bool) -> List[Dict]:
+        """Persist changed shards, bump their versions and apply them in memory."""
+        changes = []
+        written = False
+        with self._lock:
+            versions = self._read_versions()
+            for prefix, refs in new_shards.items():
+                digest = self._digest(refs)
+                if versions.get(prefix, {}).get('digest') == digest and prefix in self._vector:
+                    continue
+                written = True
+                if refs:
+                    self._write_json(self._shard_path(prefix), [refs[k] for k in sorted(refs)])
+                    versions[prefix] = {'version': versions.get(prefix, {}).get('version', 0) + 1,
+                                        'digest': digest}
+                else:
+                    self._shard_path(prefix).unlink(missing_ok=True)
+                    versions.pop(prefix, None)
+                change = self._apply_shard(prefix, refs)
+                if prefix in versions:
+                    self._vector[prefix] = dict(versions[prefix])
+                else:
+                    self._vector.pop(prefix, None)
+                if change:
+                    changes.append(change)
+            if written:
+                self._write_json(self.versions_file, versions)
+        if publish:
+            self._publish(changes)
+        return changes
+
+    def _copy_shard(self, prefix: str) -> Dict[str, Dict]:
+        return {k: dict(v) for k, v in self._shards.get(prefix, {}).items()}
+
+    def upsert(self, refs: Iterable[Dict], publish: bool = True) -> List[Dict]:
+        """Add or replace refs; only the shards they fall in are rewritten."""
+        with self._lock:
+            new_shards: Dict[str, Dict[str, Dict]] = {}
+            for ref in refs:
+                key = ref_key(ref)
+                prefix = shard_for(key)
+                if prefix not in new_shards:
+                    new_shards[prefix] = self._copy_shard(prefix)
+                new_shards[prefix][key] = dict(ref)
+            return self._write_shards(new_shards, publish)
+
+    def remove(self, keys: Iterable[str], publish: bool = True) -> List[Dict]:
+        """Remove refs by key."""
+        with self._lock:
+            new_shards: Dict[str, Dict[str, Dict]] = {}
+            for key in keys:
+                prefix = shard_for(key)
+                if prefix not in new_shards:
+                    new_shards[prefix] = self._copy_shard(prefix)
+                new_shards[prefix].pop(key, None)
+            return self._write_shards(new_shards, publish)
+
+    def replace_all(self, refs: Iterable[Dict], publish: bool = True) -> List[Dict]:
+        """Make the store hold exactly `refs`; unchanged shards are not rewritten."""
+        with self._lock:
+            new_shards: Dict[str, Dict[str, Dict]] = {p: {} for p in self._shards}
+            for ref in refs:
+                key = ref_key(ref)
+                new_shards.setdefault(shard_for(key), {})[key] = dict(ref)
+            return self._write_shards(new_shards, publish)
+
+    def sync(self) -> List[Dict]:
+        """
+        Apply changes made on disk by other processes or a git pull.
+
+        Only shards whose digest in versions.json differs from the applied
+        vector are read. Returns (and publishes) the resulting changes.
+        """
+        changes = []
+        with self._lock:
+            remote = self._read_versions()
+            for prefix in sorted(set(remote) | set(self._vector)):
+                if remote.get(prefix, {}).get('digest') == self._vector.get(prefix, {}).get('digest'):
+                    continue
+                new_refs = self._read_shard(prefix) if prefix in remote else {}
+                change = self._apply_shard(prefix, new_refs)
+                if prefix in remote:
+                    self._vector[prefix] = dict(remote[prefix])
+                else:
+                    self._vector.pop(prefix, None)
+                if change:
+                    changes.append(change)
+
+            # Older clients may still append to refs.json
+            legacy_stat = self._legacy_signature()
+            if legacy_stat and legacy_stat != self._legacy_stat:
+                self._legacy_stat = legacy_stat
+                changes.extend(self._merge_legacy(publish=False))
+
+        self._publish(changes)
+        return changes
+
+    # ---------- events ----------
+
+    def subscribe(self, callback: Callable[[List[Dict]], None]):
+        """
+        Call `callback(changes)` after every sync/write that changed refs.
+
+        Bound methods are held weakly so subscribers can be garbage collected.
+        """
+        if hasattr(callback, '__func__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda cb=callback: cb
+        with self._lock:
+            self._subscribers.append(ref)
+
+    def unsubscribe(self, callback: Callable):
+        with self._lock:
+            self._subscribers = [r for r in self._subscribers if r() not in (None, callback)]
+
+    def _publish(self, changes: List[Dict]):
+        if not changes:
+            return
+        with self._lock:
+            callbacks = [r() for r in self._subscribers]
+            self._subscribers = [r for r, cb in zip(self._subscribers, callbacks) if cb is not None]
+        for callback in callbacks:
+            if callback is None:
+                continue
+            try:
+                callback(changes)
+            except Exception:
+                pass  # A broken subscriber must not stop the others
+
+
+def get_ref_store() -> RefShardStore:
+    """Get singleton instance of RefShardStore."""
+    if not hasattr(get_ref_store, '_instance'):
+        get_ref_store._instance = RefShardStore()
+    return get_ref_store._instance
@@ -10,8 +10,20 @@ import subprocess
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from cryptography.fernet import Fernet
 import base64
+import time
+
+try:
+    from core.fixnet_refs import get_ref_store, RefShardStore
+except ImportError:
+    from fixnet_refs import get_ref_store, RefShardStore
+
+try:
+    from core.git_access import open_repo
+except ImportError:
+    from git_access import open_repo
 
 PURPLE = "\033[35m"
 GREEN = "\033[32m"
@@ -40,11 +52,13 @@ SYNC_DIR.mkdir(parents=True, exist_ok=True)
 class FixNetUploader:
     """Manages encrypted fix uploads to public GitHub repository."""
     
-    def __init__(self, user_id: Optional[str] = None, smart_filter=None):
+    def __init__(self, user_id: Optional[str] = None, smart_filter=None, fixnet_dir: Optional[Path] = None):
         self.user_id = user_id or self._generate_user_id()
         self.cipher = self._load_cipher()
         self.commit_history: List[Dict] = self._load_commit_log()
         self.smart_filter = smart_filter  # Will be set by integration
+        self.fixnet_dir = Path(fixnet_dir) if fixnet_dir else FIXNET_LOCAL
+        self.ref_store = get_ref_store() if self.fixnet_dir == FIXNET_LOCAL else RefShardStore(self.fixnet_dir)
         
         # Initialize FixNet repo
         self._init_fixnet_repo()
@@ -83,23 +97,23 @@ class FixNetUploader:
     
     def _init_fixnet_repo(self):
         """Initialize or update local FixNet repository."""
-        if not FIXNET_LOCAL.exists():
+        if not self.fixnet_dir.exists():
             print(f"{BLUE}📦 Initializing FixNet repository...{RESET}")
             try:
                 # Clone or init
                 subprocess.run(
-                    ["git", "clone", GITHUB_REPO, str(FIXNET_LOCAL)],
+                    ["git", "clone", GITHUB_REPO, str(self.fixnet_dir)],
                     capture_output=True,
                     check=False
                 )
                 
-                if not FIXNET_LOCAL.exists():
+                if not self.fixnet_dir.exists():
                     # If clone fails, init new repo
-                    FIXNET_LOCAL.mkdir(parents=True, exist_ok=True)
-                    subprocess.run(["git", "init"], cwd=FIXNET_LOCAL, capture_output=True)
+                    self.fixnet_dir.mkdir(parents=True, exist_ok=True)
+                    subprocess.run(["git", "init"], cwd=self.fixnet_dir, capture_output=True)
                     
                     # Create README
-                    readme = FIXNET_LOCAL / "README.md"
+                    readme = self.fixnet_dir / "README.md"
                     readme.write_text("""# LuciferAI FixNet
                     
 Public repository of encrypted, signed code fixes from the LuciferAI community.
@@ -107,17 +121,17 @@ Public repository of encrypted, signed code fixes from the LuciferAI community.
 ## Structure
 - `fixes/` - Encrypted patch files (.enc)
 - `signatures/` - SHA256 signatures (.sig)
-- `refs.json` - Relevance dictionary (anonymized)
+- `refs/` - Relevance dictionary (anonymized), sharded by fix hash prefix
 
 ## Security
 All fixes are AES-256 encrypted and SHA256 signed.
 User IDs are anonymized hashes.
 """)
                     
-                    subprocess.run(["git", "add", "."], cwd=FIXNET_LOCAL, capture_output=True)
+                    subprocess.run(["git", "add", "."], cwd=self.fixnet_dir, capture_output=True)
                     subprocess.run(
                         ["git", "commit", "-m", "Initialize FixNet"],
-                        cwd=FIXNET_LOCAL,
+                        cwd=self.fixnet_dir,
                         capture_output=True
                     )
                 
@@ -129,7 +143,7 @@ User IDs are anonymized hashes.
             try:
                 subprocess.run(
                     ["git", "pull"],
-                    cwd=FIXNET_LOCAL,
+                    cwd=self.fixnet_dir,
                     capture_output=True,
                     timeout=5
                 )
@@ -159,6 +173,31 @@ User IDs are anonymized hashes.
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         script_name = Path(script_path).stem
+        patch_data = self._build_patch_data(script_path, error, solution, context,
+                                            inspired_by, variation_reason)
+        fix_hash = patch_data["fix_hash"]
+        
+        # Save locally first
+        patch_file = FIXES_DIR / f"fix_{script_name}_{timestamp}.json"
+        with open(patch_file, 'w') as f:
+            json.dump(patch_data, f, indent=2)
+        
+        print(f"{GREEN}📝 Fix patch created: {patch_file.name}{RESET}")
+        return {
+            "patch_file": str(patch_file),
+            "patch_data": patch_data,
+            "fix_hash": fix_hash
+        }
+    
+    def _build_patch_data(self,
+                          script_path: str,
+                          error: str,
+                          solution: str,
+                          context: Dict[str, Any],
+                          inspired_by: Optional[str] = None,
+                          variation_reason: Optional[str] = None) -> Dict[str, Any]:
+        """Patch metadata plus its content hash (fix_hash)."""
+        script_name = Path(script_path).stem
         
         # Create patch metadata
         patch_data = {
@@ -180,18 +219,7 @@ User IDs are anonymized hashes.
         patch_json = json.dumps(patch_data, sort_keys=True)
         fix_hash = hashlib.sha256(patch_json.encode()).hexdigest()
         patch_data["fix_hash"] = fix_hash
-        
-        # Save locally first
-        patch_file = FIXES_DIR / f"fix_{script_name}_{timestamp}.json"
-        with open(patch_file, 'w') as f:
-            json.dump(patch_data, f, indent=2)
-        
-        print(f"{GREEN}📝 Fix patch created: {patch_file.name}{RESET}")
-        return {
-            "patch_file": str(patch_file),
-            "patch_data": patch_data,
-            "fix_hash": fix_hash
-        }
+        return patch_data
     
     def encrypt_patch(self, patch_file: str) -> str:
         """
@@ -278,8 +306,8 @@ User IDs are anonymized hashes.
         """
         try:
             # Copy files to FixNet repo
-            fixes_dir = FIXNET_LOCAL / "fixes"
-            sigs_dir = FIXNET_LOCAL / "signatures"
+            fixes_dir = self.fixnet_dir / "fixes"
+            sigs_dir = self.fixnet_dir / "signatures"
             fixes_dir.mkdir(exist_ok=True)
             sigs_dir.mkdir(exist_ok=True)
             
@@ -290,49 +318,27 @@ User IDs are anonymized hashes.
             shutil.copy(encrypted_file, enc_dest)
             shutil.copy(signature_file, sig_dest)
             
-            # Update refs.json (public metadata only)
-            refs_file = FIXNET_LOCAL / "refs.json"
-            refs = []
-            if refs_file.exists():
-                with open(refs_file) as f:
-                    refs = json.load(f)
-            
+            # Update refs (public metadata only)
             # Add anonymized reference with branching metadata
-            ref_entry = {
-                "fix_hash": patch_data["fix_hash"],
-                "user_id": self.user_id,
-                "timestamp": patch_data["timestamp"],
-                "error_type": patch_data["error_type"],
-                "script": patch_data["script"],
-                "encrypted_file": enc_dest.name,
-                "signature_file": sig_dest.name
-            }
+            ref_entry = self._ref_entry(patch_data, enc_dest.name, sig_dest.name)
             
-            # Include branching info if this is a variant
-            if patch_data.get("is_variant"):
-                ref_entry["inspired_by"] = patch_data["inspired_by"]
-                ref_entry["variation_reason"] = patch_data["variation_reason"]
-                ref_entry["relationship_type"] = "context_variant"
-            
-            refs.append(ref_entry)
-            
-            with open(refs_file, 'w') as f:
-                json.dump(refs, f, indent=2)
+            # Only the ref's shard and the version vector are rewritten
+            self.ref_store.upsert([ref_entry])
             
             # Git commit and push
-            subprocess.run(["git", "add", "."], cwd=FIXNET_LOCAL, check=True)
+            subprocess.run(["git", "add", "."], cwd=self.fixnet_dir, check=True)
             
             commit_msg = f"[LuciferAI AutoFix][user: {self.user_id}][script: {patch_data['script']}]"
             subprocess.run(
                 ["git", "commit", "-m", commit_msg],
-                cwd=FIXNET_LOCAL,
+                cwd=self.fixnet_dir,
                 check=True
             )
             
             # Get commit hash
             result = subprocess.run(
                 ["git", "rev-parse", "HEAD"],
-                cwd=FIXNET_LOCAL,
+                cwd=self.fixnet_dir,
                 capture_output=True,
                 text=True
             )
@@ -341,7 +347,7 @@ User IDs are anonymized hashes.
             # Push (might fail if no remote configured)
             push_result = subprocess.run(
                 ["git", "push"],
-                cwd=FIXNET_LOCAL,
+                cwd=self.fixnet_dir,
                 capture_output=True
             )
             
@@ -461,6 +467,188 @@ User IDs are anonymized hashes.
         
         return (None, False, patch_info['fix_hash'])
     
+    def _ref_entry(self, patch_data: Dict[str, Any], encrypted_name: str, signature_name: str) -> Dict[str, Any]:
+        """Anonymized public ref for an uploaded patch."""
+        ref_entry = {
+            "fix_hash": patch_data["fix_hash"],
+            "user_id": self.user_id,
+            "timestamp": patch_data["timestamp"],
+            "error_type": patch_data["error_type"],
+            "script": patch_data["script"],
+            "encrypted_file": encrypted_name,
+            "signature_file": signature_name
+        }
+        
+        # Include branching info if this is a variant
+        if patch_data.get("is_variant"):
+            ref_entry["inspired_by"] = patch_data["inspired_by"]
+            ref_entry["variation_reason"] = patch_data["variation_reason"]
+            ref_entry["relationship_type"] = "context_variant"
+        
+        return ref_entry
+    
+    def _seal_patch(self, patch_data: Dict[str, Any], keep_local_copy: bool = True) -> Dict[str, Any]:
+        """
+        Encrypt and sign one patch in memory and write it into the FixNet repo.
+        
+        The plaintext is serialized once; the ciphertext is hashed from the
+        same buffer it is written from, so nothing is read back from disk.
+        
+        Returns:
+            The ref entry for the patch
+        """
+        timestamp = datetime.fromisoformat(patch_data["timestamp"]).strftime("%Y%m%d_%H%M%S")
+        base_name = f"fix_{patch_data['script']}_{timestamp}_{patch_data['fix_hash'][:8]}.json"
+        plaintext = json.dumps(patch_data, indent=2).encode()
+        
+        if keep_local_copy:
+            (FIXES_DIR / base_name).write_bytes(plaintext)
+        
+        encrypted = self.cipher.encrypt(plaintext)
+        enc_name = f"{base_name}.enc"
+        (self.fixnet_dir / "fixes" / enc_name).write_bytes(encrypted)
+        
+        sig_name = f"{enc_name}.sig"
+        sig_data = {
+            "sha256": hashlib.sha256(encrypted).hexdigest(),
+            "file": enc_name,
+            "signed": datetime.now().isoformat(),
+            "signer": self.user_id
+        }
+        with open(self.fixnet_dir / "signatures" / sig_name, 'w') as f:
+            json.dump(sig_data, f, indent=2)
+        
+        return self._ref_entry(patch_data, enc_name, sig_name)
+    
+    def upload_batch(self,
+                     fixes: List[Dict[str, Any]],
+                     max_workers: Optional[int] = None,
+                     keep_local_copy: bool = True,
+                     push: bool = True,
+                     force_upload: bool = False) -> Dict[str, Any]:
+        """
+        Upload a queue of fixes with one refs update and one commit.
+        
+        Args:
+            fixes: Dicts of create_fix_patch() arguments (script_path, error,
+                   solution, and optionally context, inspired_by, variation_reason)
+            max_workers: Encrypt/sign worker threads (default: CPU count)
+            keep_local_copy: Also save each plaintext patch to the local fixes log
+            push: Push the batch commit
+            force_upload: Skip smart filter (for testing)
+        
+        Returns:
+            Dict with uploaded, failed, skipped, commit_url, elapsed and fixes_per_sec
+        """
+        start = time.perf_counter()
+        result = {"uploaded": 0, "failed": [], "skipped": [], "commit_url": None, "fix_hashes": []}
+        
+        if not self.cipher:
+            print(f"{RED}❌ No encryption key available{RESET}")
+            result["failed"] = list(range(len(fixes)))
+            return result
+        
+        (self.fixnet_dir / "fixes").mkdir(parents=True, exist_ok=True)
+        (self.fixnet_dir / "signatures").mkdir(parents=True, exist_ok=True)
+        
+        def seal(fix):
+            patch_data = self._build_patch_data(
+                fix["script_path"], fix["error"], fix["solution"], fix.get("context") or {},
+                inspired_by=fix.get("inspired_by"),
+                variation_reason=fix.get("variation_reason")
+            )
+            return self._seal_patch(patch_data, keep_local_copy)
+        
+        # Same smart filter as the single-fix flow; runs before sealing since
+        # it updates the filter's upload log
+        queued = list(enumerate(fixes))
+        if not force_upload and self.smart_filter:
+            queued = []
+            for index, fix in enumerate(fixes):
+                inspired_by = fix.get("inspired_by")
+                should_upload, _ = self.smart_filter.should_upload(
+                    error=fix["error"],
+                    solution=fix["solution"],
+                    error_type=self._classify_error(fix["error"]),
+                    inspired_by={'fix_hash': inspired_by} if inspired_by else None
+                )
+                if should_upload:
+                    queued.append((index, fix))
+                    continue
+                result["skipped"].append(index)
+                if keep_local_copy:
+                    self.create_fix_patch(
+                        fix["script_path"], fix["error"], fix["solution"], fix.get("context") or {},
+                        inspired_by=inspired_by,
+                        variation_reason=fix.get("variation_reason")
+                    )
+            if result["skipped"]:
+                print(f"{BLUE}📝 {len(result['skipped'])} fixes kept local only (not uploaded globally){RESET}")
+        
+        ref_entries = []
+        workers = max_workers or os.cpu_count() or 4
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [(index, pool.submit(seal, fix)) for index, fix in queued]
+            for index, future in futures:
+                try:
+                    ref_entries.append(future.result())
+                except Exception as e:
+                    result["failed"].append(index)
+                    print(f"{RED}❌ Fix {index} failed: {e}{RESET}")
+        
+        if ref_entries:
+            # One refs update for the whole batch (only the touched shards)
+            changes = self.ref_store.upsert(ref_entries)
+            paths = ["fixes", "signatures"] + self.ref_store.shard_paths(c['shard'] for c in changes)
+            commit_msg = f"[LuciferAI AutoFix][user: {self.user_id}][batch: {len(ref_entries)} fixes]"
+            result["commit_url"] = self._commit_batch(paths, commit_msg, ref_entries, push)
+            if result["commit_url"]:
+                result["uploaded"] = len(ref_entries)
+                result["fix_hashes"] = [r["fix_hash"] for r in ref_entries]
+        
+        result["elapsed"] = time.perf_counter() - start
+        result["fixes_per_sec"] = result["uploaded"] / result["elapsed"] if result["elapsed"] else 0.0
+        return result
+    
+    def _commit_batch(self, paths: List[str], commit_msg: str,
+                      ref_entries: List[Dict[str, Any]], push: bool) -> Optional[str]:
+        """Stage `paths`, make a single commit, optionally push. Returns the commit URL."""
+        try:
+            repo = open_repo(self.fixnet_dir)
+            repo.add(paths)
+            commit_sha = repo.commit(commit_msg)
+            if commit_sha is None:
+                raise RuntimeError("nothing to commit")
+            commit_hash = commit_sha[:7]
+            
+            pushed = push and subprocess.run(
+                ["git", "push"],
+                cwd=self.fixnet_dir,
+                capture_output=True
+            ).returncode == 0
+            
+            if not pushed:
+                print(f"{GOLD}⚠️  Committed locally (push failed - configure remote){RESET}")
+                return f"local://{commit_hash}"
+            
+            commit_url = f"{GITHUB_REPO}/commit/{commit_hash}"
+            now = datetime.now().isoformat()
+            for ref in ref_entries:
+                self.commit_history.append({
+                    "commit_hash": commit_hash,
+                    "commit_url": commit_url,
+                    "timestamp": now,
+                    "fix_hash": ref["fix_hash"],
+                    "patch": ref["encrypted_file"]
+                })
+            self._save_commit_log()
+            print(f"{GREEN}🌍 Uploaded {len(ref_entries)} fixes: {commit_url}{RESET}")
+            return commit_url
+        
+        except Exception as e:
+            print(f"{RED}❌ Batch upload failed: {e}{RESET}")
+            return None
+    
     def _classify_error(self, error: str) -> str:
         """Classify error type for dictionary."""
         error_lower = error.lower()
@@ -485,8 +673,51 @@ User IDs are anonymized hashes.
             return "Unknown"
 
 
+def benchmark_batch_upload(count: int = 1000, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Upload `count` synthetic fixes in one batch to a throwaway clone of a
+    local bare repository and report throughput.
+    """
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        bare = Path(tmp) / "fixnet.git"
+        work = Path(tmp) / "fixnet"
+        subprocess.run(["git", "init", "-q", "--bare", str(bare)], check=True)
+        subprocess.run(["git", "clone", "-q", str(bare), str(work)], check=True, capture_output=True)
+        for key, value in (("user.name", "FixNet Bench"), ("user.email", "bench@localhost"),
+                           ("push.default", "current")):
+            subprocess.run(["git", "config", key, value], cwd=work, check=True)
+        
+        uploader = FixNetUploader(user_id="BENCHMARK", fixnet_dir=work)
+        uploader.cipher = Fernet(Fernet.generate_key())
+        uploader._save_commit_log = lambda: None  # Keep the real commit log untouched
+        
+        fixes = [{
+            "script_path": f"bench_{i % 50}.py",
+            "error": f"NameError: name 'var_{i}' is not defined",
+            "solution": f"var_{i} = load_value({i})",
+            "context": {"line": i, "benchmark": True}
+        } for i in range(count)]
+        
+        result = uploader.upload_batch(fixes, max_workers=max_workers, keep_local_copy=False)
+        log = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=bare,
+                             capture_output=True, text=True)
+        result["commits"] = int(log.stdout.strip() or 0)
+    
+    print(f"{GREEN}📊 {result['uploaded']}/{count} fixes in {result['elapsed']:.2f}s "
+          f"({result['fixes_per_sec']:.0f} fixes/sec, {result['commits']} commit){RESET}")
+    return result
+
+
 # Test FixNet uploader
 if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark_batch_upload(int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
+        sys.exit(0)
+    
     print(f"{PURPLE}🧪 Testing FixNet Uploader{RESET}\n")
     
     uploader = FixNetUploader()
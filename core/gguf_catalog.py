@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+📚 GGUF Catalog - Model identity from GGUF metadata, cached across runs
+Parses the GGUF header through mmap (only the metadata pages are touched)
+to get architecture, parameter count, quantization, context length and
+tokenizer, and keeps the results in ~/.luciferai/model_catalog.json keyed
+by (path, size, mtime) so model listings never rescan or reparse.
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+GGUF_MAGIC = b'GGUF'
+
+# GGUF metadata value types
+_SCALARS = {
+    0: '<B', 1: '<b', 2: '<H', 3: '<h', 4: '<I', 5: '<i',
+    6: '<f', 7: '<?', 10: '<Q', 11: '<q', 12: '<d'
+}
+_TYPE_STRING = 8
+_TYPE_ARRAY = 9
+
+# llama.cpp LLAMA_FTYPE values (general.file_type)
+FILE_TYPES = {
+    0: 'F32', 1: 'F16', 2: 'Q4_0', 3: 'Q4_1', 7: 'Q8_0', 8: 'Q5_0', 9: 'Q5_1',
+    10: 'Q2_K', 11: 'Q3_K_S', 12: 'Q3_K_M', 13: 'Q3_K_L', 14: 'Q4_K_S', 15: 'Q4_K_M',
+    16: 'Q5_K_S', 17: 'Q5_K_M', 18: 'Q6_K', 19: 'IQ2_XXS', 20: 'IQ2_XS', 21: 'Q2_K_S',
+    22: 'IQ3_XS', 23: 'IQ3_XXS', 24: 'IQ1_S', 25: 'IQ4_NL', 26: 'IQ3_S', 27: 'IQ3_M',
+    28: 'IQ2_S', 29: 'IQ2_M', 30: 'IQ4_XS', 31: 'IQ1_M', 32: 'BF16'
+}
+
+# Ordered (all-of groups of any-of substrings, excluded substrings, model name).
+# Earlier rows win, so more specific names come first.
+_NAME_PATTERNS = [
+    ((('tinyllama', 'tiny'),), (), 'tinyllama'),
+    ((('phi-2', 'phi2'),), (), 'phi-2'),
+    ((('stablelm',),), (), 'stablelm'),
+    ((('llama-2', 'llama2'),), (), 'llama2'),
+    ((('phi-3', 'phi3'),), (), 'phi-3'),
+    ((('gemma2', 'gemma-2'),), (), 'gemma2'),
+    ((('gemma',),), (), 'gemma'),
+    ((('vicuna',),), (), 'vicuna'),
+    ((('orca-2',),), (), 'orca-2'),
+    ((('openchat',),), (), 'openchat'),
+    ((('starling',),), (), 'starling'),
+    ((('mistral-7b',),), ('mixtral',), 'mistral'),
+    ((('mixtral',), ('8x22b',)), (), 'mixtral-8x22b'),
+    ((('mixtral',),), (), 'mixtral'),
+    ((('llama-3.1', 'llama3.1'), ('70b',)), (), 'llama3.1-70b'),
+    ((('llama-3', 'llama3'), ('70b',)), (), 'llama3-70b'),
+    ((('llama-3.1', 'llama3.1'),), (), 'llama3.1'),
+    ((('llama-3', 'llama3'),), (), 'llama3'),
+    ((('codellama', 'code-llama'),), (), 'codellama'),
+    ((('neural-chat',),), (), 'neural-chat'),
+    ((('solar',),), (), 'solar'),
+    ((('qwen2',),), (), 'qwen2'),
+    ((('qwen',),), (), 'qwen'),
+    ((('yi',),), (), 'yi'),
+    ((('deepseek',),), (), 'deepseek-coder'),
+    ((('wizardcoder',),), (), 'wizardcoder'),
+    ((('wizardlm',),), (), 'wizardlm'),
+    ((('dolphin',),), (), 'dolphin'),
+    ((('nous-hermes', 'hermes'),), (), 'nous-hermes'),
+    ((('phind',),), (), 'phind-codellama'),
+]
+
+
+class GGUFFormatError(ValueError):
+    """File is not a readable GGUF model."""
+
+
+class _Reader:
+    """Sequential little-endian reader over a memory map."""
+
+    def __init__(self, buf, version: int):
+        self.buf = buf
+        self.pos = 0
+        self.wide = version >= 2  # v1 used 32-bit lengths and counts
+
+    def take(self, fmt: str):
+        size = struct.calcsize(fmt)
+        if self.pos + size > len(self.buf):
+            raise GGUFFormatError("Truncated GGUF metadata")
+        value = struct.unpack_from(fmt, self.buf, self.pos)[0]
+        self.pos += size
+        return value
+
+    def count(self) -> int:
+        return self.take('<Q' if self.wide else '<I')
+
+    def string(self) -> str:
+        length = self.count()
+        if self.pos + length > len(self.buf):
+            raise GGUFFormatError("Truncated GGUF string")
+        value = bytes(self.buf[self.pos:self.pos + length]).decode('utf-8', 'replace')
+        self.pos += length
+        return value
+
+    def skip_string(self):
+        length = self.count()
+        self.pos += length
+
+    def value(self, value_type: int):
+        """Read a metadata value; arrays are summarised as their length."""
+        if value_type in _SCALARS:
+            return self.take(_SCALARS[value_type])
+        if value_type == _TYPE_STRING:
+            return self.string()
+        if value_type == _TYPE_ARRAY:
+            item_type = self.take('<I')
+            length = self.count()
+            if item_type in _SCALARS:
+                self.pos += length * struct.calcsize(_SCALARS[item_type])
+                if self.pos > len(self.buf):
+                    raise GGUFFormatError("Truncated GGUF array")
+            elif item_type == _TYPE_STRING:
+                for _ in range(length):
+                    self.skip_string()
+            else:
+                for _ in range(length):
+                    self.value(item_type)
+            return {'array_length': length}
+        raise GGUFFormatError(f"Unknown GGUF value type {value_type}")
+
+
+def read_gguf_metadata(path: Path) -> Dict:
+    """
+    Read model metadata from a GGUF file header.
+
+    Returns:
+        Dict with version, architecture, name, parameters, quantization,
+        context_length, tokenizer, vocab_size and the raw scalar metadata
+    Raises:
+        GGUFFormatError if the file is not GGUF
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < 24:
+            raise GGUFFormatError("File too small for a GGUF header")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:4] != GGUF_MAGIC:
+                raise GGUFFormatError("Missing GGUF magic")
+            version = struct.unpack_from('<I', mm, 4)[0]
+            if not 1 <= version <= 3:
+                raise GGUFFormatError(f"Unsupported GGUF version {version}")
+
+            reader = _Reader(mm, version)
+            reader.pos = 8
+            tensor_count = reader.count()
+            kv_count = reader.count()
+
+            metadata = {}
+            for _ in range(kv_count):
+                key = reader.string()
+                metadata[key] = reader.value(reader.take('<I'))
+
+            # Tensor infos follow the metadata; sum their shapes for the parameter count
+            parameters = 0
+            for _ in range(tensor_count):
+                reader.skip_string()
+                n_dims = reader.take('<I')
+                elements = 1
+                for _ in range(n_dims):
+                    elements *= reader.count()
+                reader.take('<I')   # tensor type
+                reader.take('<Q')   # data offset
+                parameters += elements
+
+    arch = metadata.get('general.architecture', '')
+    tokens = metadata.get('tokenizer.ggml.tokens')
+    file_type = metadata.get('general.file_type')
+    return {
+        'version': version,
+        'architecture': arch,
+        'name': metadata.get('general.name', ''),
+        'parameters': parameters,
+        'quantization': FILE_TYPES.get(file_type, str(file_type) if file_type is not None else ''),
+        'context_length': metadata.get(f'{arch}.context_length'),
+        'tokenizer': metadata.get('tokenizer.ggml.model', ''),
+        'vocab_size': tokens.get('array_length') if isinstance(tokens, dict) else None,
+        'metadata': {k: v for k, v in metadata.items() if not isinstance(v, dict)}
+    }
+
+
+def guess_model_name(filename: str, gguf_name: str = '') -> Optional[str]:
+    """Canonical model name from a filename and/or GGUF general.name."""
+    for text in (filename.lower(), gguf_name.lower().replace(' ', '-')):
+        if not text:
+            continue
+        for groups, excluded, name in _NAME_PATTERNS:
+            if all(any(s in text for s in group) for group in groups) and not any(s in text for s in excluded):
+                return name
+    return None
+
+
+class ModelCatalog:
+    """
+    Persistent catalog of GGUF files in the model directories.
+
+    refresh() stats each directory and only re-lists it when its mtime
+    changed; files are only reparsed when their (size, mtime) changed.
+    Lookups by canonical model name are dictionary reads.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None, models_dirs: Optional[List[Path]] = None):
+        self.cache_file = cache_file or (Path.home() / ".luciferai" / "model_catalog.json")
+        self.models_dirs = [Path(d) for d in (models_dirs or [
+            PROJECT_ROOT / 'models',
+            PROJECT_ROOT / '.luciferai' / 'models',
+        ])]
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}   # path -> entry
+        self._dirs: Dict[str, int] = {}       # dir -> mtime_ns when last listed
+        self._by_name: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self):
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r') as f:
+                    data = json.load(f)
+                self._entries = data.get('entries', {})
+                self._dirs = data.get('dirs', {})
+            except:
+                self._entries, self._dirs = {}, {}
+        self._index()
+
+    def _save(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'entries': self._entries, 'dirs': self._dirs}, f)
+        tmp_file.replace(self.cache_file)
+
+    def _index(self):
+        """Rebuild the name index; exact filename matches win over guesses."""
+        by_name: Dict[str, Dict] = {}
+        for entry in sorted(self._entries.values(), key=lambda e: (not e.get('exact'), e['path'])):
+            if entry.get('model') and entry['model'] not in by_name:
+                by_name[entry['model']] = entry
+        self._by_name = by_name
+
+    @staticmethod
+    def _identify(filename: str, gguf_name: str):
+        """(canonical name, exact) - exact when the filename is the mapped file."""
+        try:
+            from core.model_files_map import MODEL_FILES, get_canonical_name
+        except ImportError:
+            from model_files_map import MODEL_FILES, get_canonical_name
+
+        for name, mapped_file in MODEL_FILES.items():
+            if mapped_file == filename:
+                return get_canonical_name(name), True
+        return guess_model_name(filename, gguf_name), False
+
+    def _scan_file(self, path: Path, st) -> Dict:
+        entry = {'path': str(path), 'file': path.name, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+        try:
+            info = read_gguf_metadata(path)
+            entry.update({k: v for k, v in info.items() if k != 'metadata'})
+            entry['valid'] = True
+        except (GGUFFormatError, OSError, ValueError) as e:
+            entry['valid'] = False
+            entry['error'] = str(e)
+        entry['model'], entry['exact'] = self._identify(path.name, entry.get('name', ''))
+        return entry
+
+    def refresh(self, force: bool = False) -> bool:
+        """Bring the catalog up to date. Returns True if anything changed."""
+        changed = False
+        with self._lock:
+            for models_dir in self.models_dirs:
+                key = str(models_dir)
+                try:
+                    dir_mtime = models_dir.stat().st_mtime_ns
+                except OSError:
+                    if any(p.startswith(key + os.sep) for p in self._entries) or key in self._dirs:
+                        self._entries = {p: e for p, e in self._entries.items()
+                                         if not p.startswith(key + os.sep)}
+                        self._dirs.pop(key, None)
+                        changed = True
+                    continue
+
+                known = {p for p in self._entries if os.path.dirname(p) == key}
+                if not force and self._dirs.get(key) == dir_mtime:
+                    # Directory listing unchanged - only re-stat known files
+                    for path in known:
+                        try:
+                            st = os.stat(path)
+                        except OSError:
+                            del self._entries[path]
+                            changed = True
+                            continue
+                        entry = self._entries[path]
+                        if entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns:
+                            self._entries[path] = self._scan_file(Path(path), st)
+                            changed = True
+                    continue
+
+                seen = set()
+                with os.scandir(models_dir) as it:
+                    for dirent in it:
+                        if not dirent.name.endswith('.gguf') or not dirent.is_file():
+                            continue
+                        path = os.path.join(key, dirent.name)
+                        seen.add(path)
+                        st = dirent.stat()
+                        entry = self._entries.get(path)
+                        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+                            continue
+                        self._entries[path] = self._scan_file(Path(path), st)
+                        changed = True
+                for path in known - seen:
+                    del self._entries[path]
+                    changed = True
+                if self._dirs.get(key) != dir_mtime:
+                    self._dirs[key] = dir_mtime
+                    changed = True
+
+            if changed:
+                self._index()
+                self._save()
+        return changed
+
+    def get(self, model: str) -> Optional[Dict]:
+        """Catalog entry for a canonical model name."""
+        return self._by_name.get(model)
+
+    def get_path(self, model: str) -> Optional[Path]:
+        entry = self._by_name.get(model)
+        return Path(entry['path']) if entry else None
+
+    def installed_models(self, exact_only: bool = False, models_dir: Optional[Path] = None) -> List[str]:
+        """Canonical names of cataloged models (optionally in one directory)."""
+        names = set()
+        # Every file, not the deduped name index, so a model present in several
+        # directories is reported for each of them
+        for entry in self._entries.values():
+            if not entry.get('model') or (exact_only and not entry.get('exact')):
+                continue
+            if models_dir is not None and os.path.dirname(entry['path']) != str(models_dir):
+                continue
+            names.add(entry['model'])
+        return sorted(names)
+
+    def entries(self, models_dir: Optional[Path] = None) -> List[Dict]:
+        """All cataloged files (optionally in one directory), sorted by filename."""
+        entries = self._entries.values()
+        if models_dir is not None:
+            entries = [e for e in entries if os.path.dirname(e['path']) == str(models_dir)]
+        return sorted(entries, key=lambda e: e['file'])
+
+    def find(self, text: str) -> Optional[Path]:
+        """First cataloged file whose name contains `text`."""
+        for entry in self.entries():
+            if text.lower() in entry['file'].lower():
+                return Path(entry['path'])
+        return None
+
+
+def get_model_catalog(refresh: bool = True) -> ModelCatalog:
+    """Get singleton instance of ModelCatalog (refreshed cheaply on each call)."""
+    if not hasattr(get_model_catalog, '_instance'):
+        get_model_catalog._instance = ModelCatalog()
+    if refresh:
+        get_model_catalog._instance.refresh()
+    return get_model_catalog._instance
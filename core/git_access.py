@@ -0,0 +1,1189 @@
+#!/usr/bin/env python3
+"""
+🗃️ Git Access - In-process git status, staging and commits
+FixNet maintenance used to fork `git status`, `git add`, `git commit`,
+`git log` and `git rev-list` several times per cycle. This layer answers the
+same questions without a fork per call:
+
+- CoprocessRepo: reads the index directly and does everything else through
+  long-running git processes (`cat-file --batch`, `hash-object --stdin-paths`,
+  `update-ref --stdin`, `check-ignore --stdin`)
+- DulwichRepo: for repos CoprocessRepo cannot handle (index v4, split/sparse
+  index) when dulwich is installed
+- CliRepo: plain git subprocesses as the last resort
+
+Network operations (pull/push) and gc stay with the git CLI.
+"""
+import heapq
+import os
+import re
+import stat
+import struct
+import subprocess
+import threading
+import tempfile
+import time
+from datetime import datetime
+from hashlib import sha1
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from dulwich import porcelain as _porcelain
+    from dulwich.repo import Repo as _DulwichRepo
+    DULWICH_AVAILABLE = True
+except ImportError:
+    DULWICH_AVAILABLE = False
+
+ZERO_SHA = "0" * 40
+STATUS_KEYS = ('staged', 'modified', 'deleted', 'untracked', 'conflicted')
+
+MODE_FILE = 0o100644
+MODE_EXEC = 0o100755
+MODE_LINK = 0o120000
+MODE_GITLINK = 0o160000
+MODE_TREE = 0o040000
+
+
+class GitError(Exception):
+    """A git operation failed."""
+
+
+class UnsupportedRepo(GitError):
+    """The repository uses a feature the native backend does not implement."""
+
+
+def _empty_status() -> Dict[str, List[str]]:
+    return {key: [] for key in STATUS_KEYS}
+
+
+def _under(path: str, prefixes: Optional[List[str]]) -> bool:
+    if prefixes is None:
+        return True
+    return any(not p or path == p or path.startswith(p + "/") for p in prefixes)
+
+
+class GitRepo:
+    """Common interface of the git backends."""
+
+    backend = "base"
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self.lock = threading.RLock()
+
+    def _rel(self, path) -> str:
+        """Repo-relative posix path ('' for the root)."""
+        path = Path(path)
+        if path.is_absolute():
+            path = Path(os.path.abspath(path)).relative_to(self.root)
+        rel = path.as_posix()
+        return "" if rel == "." else rel.rstrip("/")
+
+    def status(self) -> Dict[str, List[str]]:
+        """staged / modified / deleted / untracked / conflicted repo-relative paths."""
+        raise NotImplementedError
+
+    def has_changes(self) -> bool:
+        """True when `git status --porcelain` would print anything."""
+        return any(self.status().values())
+
+    def add(self, paths: Optional[Iterable] = None):
+        """Stage `paths` (files or directories); everything when None, like `git add .`."""
+        raise NotImplementedError
+
+    def commit(self, message: str) -> Optional[str]:
+        """Commit the index. Returns the new commit sha, or None if nothing changed."""
+        raise NotImplementedError
+
+    def head(self) -> Optional[str]:
+        raise NotImplementedError
+
+    def ahead_count(self) -> int:
+        """Commits on HEAD that are not on its upstream (`HEAD@{upstream}..HEAD`)."""
+        raise NotImplementedError
+
+    def conflicted_paths(self) -> List[str]:
+        return self.status()['conflicted']
+
+    def read_blob(self, spec: str) -> Optional[bytes]:
+        """Blob contents for ':<stage>:<path>' or '<rev>:<path>' (None if missing)."""
+        raise NotImplementedError
+
+    def remote_branches(self) -> Dict[str, str]:
+        """Remote-tracking branches ('origin/x') -> commit sha, without symbolic refs."""
+        raise NotImplementedError
+
+    def commit_time(self, rev: str) -> Optional[datetime]:
+        """Committer time of `rev` in local time (None if it does not resolve)."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+# ---------- CLI backend ----------
+
+class CliRepo(GitRepo):
+    """Plain git subprocesses; the fallback when nothing faster applies."""
+
+    backend = "cli"
+
+    def _git(self, *args, check: bool = True, text: bool = True) -> subprocess.CompletedProcess:
+        result = subprocess.run(["git", *args], cwd=self.root, capture_output=True, text=text)
+        if check and result.returncode != 0:
+            raise GitError((result.stderr or result.stdout or "").strip()[:200] if text else "git failed")
+        return result
+
+    def status(self) -> Dict[str, List[str]]:
+        status = _empty_status()
+        out = self._git("status", "--porcelain", "-z", "--untracked-files=all").stdout
+        records = iter(out.split("\0"))
+        for record in records:
+            if not record:
+                continue
+            xy, path = record[:2], record[3:]
+            if xy[0] in "RC":
+                next(records, None)  # Rename source
+            if xy == "??":
+                status['untracked'].append(path)
+            elif "U" in xy or xy in ("AA", "DD"):
+                status['conflicted'].append(path)
+            else:
+                if xy[0] != " ":
+                    status['staged'].append(path)
+                if xy[1] == "M":
+                    status['modified'].append(path)
+                elif xy[1] == "D":
+                    status['deleted'].append(path)
+        return status
+
+    def has_changes(self) -> bool:
+        return bool(self._git("status", "--porcelain").stdout.strip())
+
+    def add(self, paths: Optional[Iterable] = None):
+        rels = ["."] if paths is None else [self._rel(p) or "." for p in paths]
+        if rels:
+            self._git("add", "-A", "--", *rels)
+
+    def commit(self, message: str) -> Optional[str]:
+        result = self._git("commit", "-q", "-m", message, check=False)
+        if result.returncode != 0:
+            if "nothing to commit" in result.stdout + result.stderr or "no changes added" in result.stdout:
+                return None
+            raise GitError(result.stderr.strip()[:200])
+        return self.head()
+
+    def head(self) -> Optional[str]:
+        result = self._git("rev-parse", "--verify", "-q", "HEAD", check=False)
+        return result.stdout.strip() or None
+
+    def ahead_count(self) -> int:
+        result = self._git("rev-list", "--count", "HEAD@{upstream}..HEAD", check=False)
+        return int(result.stdout.strip() or 0) if result.returncode == 0 else 0
+
+    def conflicted_paths(self) -> List[str]:
+        out = self._git("diff", "--name-only", "--diff-filter=U", "-z").stdout
+        return [p for p in out.split("\0") if p]
+
+    def read_blob(self, spec: str) -> Optional[bytes]:
+        result = self._git("cat-file", "blob", spec, check=False, text=False)
+        return result.stdout if result.returncode == 0 else None
+
+    def remote_branches(self) -> Dict[str, str]:
+        out = self._git("for-each-ref", "--format=%(objectname) %(refname) %(symref)", "refs/remotes").stdout
+        branches = {}
+        for line in out.splitlines():
+            parts = line.split(" ")
+            if len(parts) >= 2 and not (len(parts) > 2 and parts[2]):
+                branches[parts[1][len("refs/remotes/"):]] = parts[0]
+        return branches
+
+    def commit_time(self, rev: str) -> Optional[datetime]:
+        result = self._git("log", "-1", "--format=%ct", rev, "--", check=False)
+        stamp = result.stdout.strip()
+        return datetime.fromtimestamp(int(stamp)) if result.returncode == 0 and stamp else None
+
+
+# ---------- dulwich backend ----------
+
+class DulwichRepo(GitRepo):
+    """dulwich's pure-Python implementation of the same operations."""
+
+    backend = "dulwich"
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.repo = _DulwichRepo(str(self.root))
+
+    def status(self) -> Dict[str, List[str]]:
+        with self.lock:
+            result = _porcelain.status(self.repo, untracked_files="all")
+            status = _empty_status()
+            for kind in ('add', 'delete', 'modify'):
+                status['staged'] += [os.fsdecode(p) for p in result.staged.get(kind, [])]
+            for path in result.unstaged:
+                path = os.fsdecode(path)
+                status['modified' if (self.root / path).exists() else 'deleted'].append(path)
+            status['untracked'] = [os.fsdecode(p) for p in result.untracked]
+            status['conflicted'] = self.conflicted_paths()
+            return status
+
+    def add(self, paths: Optional[Iterable] = None):
+        with self.lock:
+            if paths is None:
+                _porcelain.add(self.repo)
+                return
+            paths = [str(self.root / self._rel(p)) for p in paths]
+            if paths:
+                _porcelain.add(self.repo, paths=paths)
+
+    def commit(self, message: str) -> Optional[str]:
+        with self.lock:
+            head = self.head()
+            index_tree = self.repo.open_index().commit(self.repo.object_store)
+            if head and self.repo[head.encode()].tree == index_tree:
+                return None
+            return _porcelain.commit(self.repo, message=message.encode("utf-8")).decode("ascii")
+
+    def head(self) -> Optional[str]:
+        try:
+            return self.repo.head().decode("ascii")
+        except KeyError:
+            return None
+
+    def _upstream(self) -> Optional[bytes]:
+        try:
+            branch = self.repo.refs.follow(b"HEAD")[0][-1]
+        except (KeyError, IndexError):
+            return None
+        if not branch.startswith(b"refs/heads/"):
+            return None
+        config = self.repo.get_config()
+        section = (b"branch", branch[len(b"refs/heads/"):])
+        try:
+            remote = config.get(section, b"remote")
+            merge = config.get(section, b"merge")
+        except KeyError:
+            return None
+        if remote == b".":
+            return merge
+        return b"refs/remotes/" + remote + b"/" + merge[len(b"refs/heads/"):]
+
+    def ahead_count(self) -> int:
+        with self.lock:
+            head, upstream = self.head(), self._upstream()
+            if not head or not upstream or upstream not in self.repo.refs:
+                return 0
+            walker = self.repo.get_walker(include=[head.encode()], exclude=[self.repo.refs[upstream]])
+            return sum(1 for _ in walker)
+
+    def conflicted_paths(self) -> List[str]:
+        index = self.repo.open_index()
+        return sorted(os.fsdecode(path) for path, entry in index.items()
+                      if type(entry).__name__ == "ConflictedIndexEntry")
+
+    def read_blob(self, spec: str) -> Optional[bytes]:
+        with self.lock:
+            try:
+                if spec.startswith(":"):
+                    stage, _, path = spec[1:].partition(":")
+                    entry = self.repo.open_index()[path.encode()]
+                    if type(entry).__name__ == "ConflictedIndexEntry":
+                        entry = {"1": entry.ancestor, "2": entry.this, "3": entry.other}.get(stage)
+                    return self.repo[entry.sha].data if entry else None
+                rev, _, path = spec.partition(":")
+                tree = self.repo[self._resolve(rev)].tree
+                for part in path.split("/"):
+                    _, tree = self.repo[tree][part.encode()]
+                return self.repo[tree].data
+            except (KeyError, AttributeError):
+                return None
+
+    def _resolve(self, rev: str) -> bytes:
+        if re.fullmatch(r"[0-9a-f]{40}", rev):
+            return rev.encode()
+        for name in (rev, f"refs/heads/{rev}", f"refs/remotes/{rev}", f"refs/tags/{rev}"):
+            if name.encode() in self.repo.refs:
+                return self.repo.refs[name.encode()]
+        raise KeyError(rev)
+
+    def remote_branches(self) -> Dict[str, str]:
+        with self.lock:
+            refs = self.repo.refs
+            return {name.decode(): refs[b"refs/remotes/" + name].decode("ascii")
+                    for name in refs.keys(base=b"refs/remotes/")
+                    if not refs.read_ref(b"refs/remotes/" + name).startswith(b"ref: ")}
+
+    def commit_time(self, rev: str) -> Optional[datetime]:
+        with self.lock:
+            try:
+                return datetime.fromtimestamp(self.repo[self._resolve(rev)].commit_time)
+            except KeyError:
+                return None
+
+    def close(self):
+        self.repo.close()
+
+
+# ---------- coprocess backend ----------
+
+M32 = 0xFFFFFFFF
+_INDEX_ENTRY = struct.Struct(">10I20sH")
+_BATCH = 256  # Requests written before reading answers back (keeps both pipes from filling)
+
+
+def _stat_key(st: os.stat_result, mode: int) -> tuple:
+    """The stat fields git compares to decide whether a file may have changed."""
+    return (st.st_ctime_ns // 10**9 & M32, st.st_mtime_ns // 10**9 & M32, st.st_mtime_ns % 10**9,
+            st.st_ino & M32, mode, st.st_size & M32)
+
+
+def _quote(path: str) -> str:
+    """C-quote a path for git's line-based --stdin-paths input when it needs it."""
+    if "\n" not in path and not path.startswith('"'):
+        return path
+    return '"' + path.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+
+class IndexEntry:
+    """
+    One index entry. `raw` keeps the entry's on-disk bytes so unchanged
+    entries are written back verbatim, and `record` caches its tree entry.
+    """
+
+    __slots__ = ('fields', 'key', 'mode', 'sha', 'stage', 'flags_ext', 'path', 'raw', 'record')
+
+    def __init__(self, fields: tuple, sha: bytes, stage: int, flags_ext: int, path: str,
+                 raw: Optional[bytes] = None):
+        self.fields = fields  # ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size
+        self.key = (fields[0], fields[2], fields[3], fields[5], fields[6], fields[9])
+        self.mode = fields[6]
+        self.sha, self.stage, self.flags_ext, self.path = sha, stage, flags_ext, path
+        self.raw = raw
+        self.record = None
+
+    @classmethod
+    def from_stat(cls, path: str, st: os.stat_result, mode: int, sha: bytes) -> "IndexEntry":
+        fields = (st.st_ctime_ns // 10**9 & M32, st.st_ctime_ns % 10**9,
+                  st.st_mtime_ns // 10**9 & M32, st.st_mtime_ns % 10**9,
+                  st.st_dev & M32, st.st_ino & M32, mode, st.st_uid & M32, st.st_gid & M32,
+                  st.st_size & M32)
+        return cls(fields, sha, 0, 0, path)
+
+    def pack(self) -> bytes:
+        if self.raw is None:
+            name = self.path.encode("utf-8", "surrogateescape")
+            flags = (self.stage << 12) | min(len(name), 0xFFF) | (0x4000 if self.flags_ext else 0)
+            entry = _INDEX_ENTRY.pack(*self.fields, self.sha, flags)
+            if self.flags_ext:
+                entry += struct.pack(">H", self.flags_ext)
+            entry += name
+            self.raw = entry + b"\0" * (8 - len(entry) % 8)
+        return self.raw
+
+    def tree_record(self) -> bytes:
+        if self.record is None:
+            name = self.path.rsplit("/", 1)[-1].encode("utf-8", "surrogateescape")
+            self.record = b"%o " % self.mode + name + b"\0" + self.sha
+        return self.record
+
+
+class _Coprocess:
+    """One long-running git command answering a line per request, restarted if it exits."""
+
+    def __init__(self, root: Path, *args: str, env: Optional[Dict[str, str]] = None):
+        self.root, self.args, self.env = root, args, env
+        self.proc = None
+        self.stderr = None  # A file, not a pipe: warnings (e.g. about CRLF) must never block git
+
+    def _send(self, data: bytes):
+        for attempt in range(2):
+            if self.proc is None or self.proc.poll() is not None:
+                if self.stderr is None:
+                    self.stderr = tempfile.TemporaryFile()
+                self.stderr.seek(0)
+                self.stderr.truncate()
+                self.proc = subprocess.Popen(["git", *self.args], cwd=self.root, env=self.env,
+                                             stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                             stderr=self.stderr)
+            try:
+                self.proc.stdin.write(data)
+                self.proc.stdin.flush()
+                return
+            except BrokenPipeError:
+                self.close()
+                if attempt:
+                    raise GitError(f"git {self.args[0]} exited")
+
+    def _readline(self) -> bytes:
+        line = self.proc.stdout.readline()
+        if not line:
+            # The command died (bad input, lock held, ...): report why and restart next time
+            proc, self.proc = self.proc, None
+            proc.wait()
+            self.stderr.seek(0)
+            lines = self.stderr.read().decode(errors="replace").strip().splitlines()
+            raise GitError(lines[-1][:200] if lines else f"git {self.args[0]} exited")
+        return line.rstrip(b"\n")
+
+    def request(self, data: bytes) -> bytes:
+        self._send(data)
+        return self._readline()
+
+    def requests(self, items: List[bytes]) -> List[bytes]:
+        """Pipelined request(): answers in input order."""
+        answers = []
+        for start in range(0, len(items), _BATCH):
+            chunk = items[start:start + _BATCH]
+            self._send(b"".join(chunk))
+            answers += [self._readline() for _ in chunk]
+        return answers
+
+    def close(self):
+        if self.proc is not None:
+            try:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+            self.proc = None
+        if self.stderr is not None:
+            self.stderr.close()
+            self.stderr = None
+
+
+class _CatFile(_Coprocess):
+    """`git cat-file --batch`: objects and revisions (refs are re-read on every request)."""
+
+    def __init__(self, root: Path):
+        super().__init__(root, "cat-file", "--batch")
+
+    def read(self, spec: str) -> Optional[Tuple[str, str, bytes]]:
+        """(sha, type, data) for an object name or revision, None if it does not exist."""
+        if "\n" in spec:
+            return None
+        try:
+            header = self.request(spec.encode("utf-8", "surrogateescape") + b"\n").split()
+        except GitError:
+            return None  # e.g. an invalid @{...} expression is fatal to cat-file
+        if len(header) != 3:
+            return None  # "<spec> missing" / "ambiguous"
+        data = self.proc.stdout.read(int(header[2]))
+        self.proc.stdout.read(1)
+        return header[0].decode(), header[1].decode(), data
+
+
+class _CheckIgnore(_Coprocess):
+    """`git check-ignore --stdin`: gitignore, info/exclude and core.excludesFile, answered by git."""
+
+    def __init__(self, root: Path):
+        super().__init__(root, "check-ignore", "--stdin", "-z", "-n", "-v", "--no-index",
+                         env={**os.environ, "GIT_FLUSH": "1"})
+
+    def ignored(self, paths: List[str]) -> List[bool]:
+        result = []
+        for start in range(0, len(paths), _BATCH):
+            chunk = paths[start:start + _BATCH]
+            self._send(b"".join(os.fsencode(p) + b"\0" for p in chunk))
+            # Four NUL-terminated fields per path: source, line, pattern, path
+            buf = b""
+            while buf.count(b"\0") < 4 * len(chunk):
+                data = self.proc.stdout.read1(65536)
+                if not data:
+                    self.close()
+                    raise GitError("git check-ignore exited")
+                buf += data
+            fields = buf.split(b"\0")
+            for i in range(len(chunk)):
+                pattern = fields[4 * i + 2]
+                result.append(bool(pattern) and not pattern.startswith(b"!"))
+        return result
+
+
+class CoprocessRepo(CliRepo):
+    """
+    Status, staging and commits over long-running git processes.
+
+    The index is read directly: status compares its stat data with lstat()
+    and only hashes files whose stat changed (or that are racily clean).
+    Everything else goes through git processes started once per repo:
+    `cat-file --batch` for objects and refs, `hash-object --stdin-paths`
+    for blobs (clean filters and autocrlf apply as in `git add`),
+    `hash-object -t tree/commit` for trees and commits,
+    `update-ref --stdin` for the branch (ref locking and reflogs) and
+    `check-ignore --stdin` for ignore rules. Staging writes the index under
+    index.lock: git has no long-running index writer, and a fork per add
+    is what this backend exists to avoid. Rare maintenance queries
+    (remote_branches) use the CLI.
+    """
+
+    backend = "coprocess"
+    REFLOG_MESSAGE = "commit (git_access)"  # update-ref --stdin takes one -m per process
+
+    def __init__(self, root):
+        super().__init__(root)
+        result = self._git("rev-parse", "--show-toplevel", "--absolute-git-dir", "--git-common-dir", check=False)
+        lines = result.stdout.splitlines()
+        if result.returncode != 0 or len(lines) != 3:
+            raise UnsupportedRepo("not a git work tree")
+        if Path(lines[0]).resolve() != self.root:
+            raise UnsupportedRepo("not the top of the work tree")
+        self.git_dir = Path(lines[1])
+        self.common_dir = (self.root / lines[2]).resolve()
+        self.config: Dict[str, str] = {}
+        self._config_key = None
+        self._load_config()
+
+        self._cat_file = _CatFile(self.root)
+        self._check_ignore = _CheckIgnore(self.root)
+        self._hasher = _Coprocess(self.root, "hash-object", "--stdin-paths")
+        self._blob_writer = _Coprocess(self.root, "hash-object", "-w", "--stdin-paths")
+        self._literal_writers: Dict[str, _Coprocess] = {}
+        self._update_ref = _Coprocess(self.root, "update-ref", "-m", self.REFLOG_MESSAGE, "--stdin")
+
+        self._tree_cache: Dict[str, Dict[str, Tuple[int, bytes]]] = {}
+        self._commit_cache: Dict[str, Tuple[str, List[str], int]] = {}
+        self._index_cache = None  # (stat key, entries)
+        self._staged_memo = None  # ((index key, head), staged paths)
+        self._read_index()  # Fail early on unsupported index formats
+
+    def _load_config(self):
+        """Effective config from `git config --list`, re-read when the repo config changes."""
+        try:
+            st = (self.common_dir / "config").stat()
+            key = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+        if key == self._config_key and self.config:
+            return
+        out = self._git("config", "-z", "--list", check=False).stdout
+        config = {}
+        for item in out.split("\0"):
+            name, _, value = item.partition("\n")
+            if name:
+                config[name] = value
+        self.config, self._config_key = config, key
+        self._exec_bit = 0 if config.get("core.filemode", "true").lower() == "false" else 0o100
+
+    # ----- objects -----
+
+    def read_object(self, spec: str) -> Tuple[str, bytes]:
+        found = self._cat_file.read(spec)
+        if found is None:
+            raise GitError(f"object {spec} not found")
+        return found[1], found[2]
+
+    def _write_literal(self, obj_type: str, data: bytes) -> str:
+        """Write an object exactly as given (no filters) and return its sha."""
+        writer = self._literal_writers.get(obj_type)
+        if writer is None:
+            writer = self._literal_writers[obj_type] = _Coprocess(
+                self.root, "hash-object", "-w", "--no-filters", "-t", obj_type, "--stdin-paths")
+        tmp = self.git_dir / f"git_access_{os.getpid()}_{threading.get_ident()}.tmp"
+        tmp.write_bytes(data)
+        try:
+            return writer.request(os.fsencode(_quote(str(tmp))) + b"\n").decode()
+        finally:
+            tmp.unlink()
+
+    def _commit_info(self, sha: str, data: Optional[bytes] = None) -> Tuple[str, List[str], int]:
+        """(tree, parents, committer timestamp) of a commit."""
+        info = self._commit_cache.get(sha)
+        if info is None:
+            if data is None:
+                obj_type, data = self.read_object(sha + "^{commit}")
+            tree, parents, when = None, [], 0
+            for line in data.split(b"\n\n", 1)[0].split(b"\n"):
+                key, _, value = line.partition(b" ")
+                if key == b"tree":
+                    tree = value.decode()
+                elif key == b"parent":
+                    parents.append(value.decode())
+                elif key == b"committer":
+                    when = int(value.rsplit(b" ", 2)[1])
+            info = self._commit_cache[sha] = (tree, parents, when)
+        return info
+
+    def _tree_items(self, sha: str):
+        _, data = self.read_object(sha)
+        pos = 0
+        while pos < len(data):
+            space = data.index(b" ", pos)
+            nul = data.index(b"\0", space)
+            yield int(data[pos:space], 8), os.fsdecode(data[space + 1:nul]), data[nul + 1:nul + 21]
+            pos = nul + 21
+
+    def _flatten_tree(self, sha: Optional[str]) -> Dict[str, Tuple[int, bytes]]:
+        """path -> (mode, sha) of every non-tree entry below a tree (cached per tree)."""
+        if sha is None:
+            return {}
+        flat = self._tree_cache.get(sha)
+        if flat is None:
+            flat = {}
+            stack = [("", sha)]
+            while stack:
+                prefix, tree = stack.pop()
+                for mode, name, child in self._tree_items(tree):
+                    if mode == MODE_TREE:
+                        stack.append((prefix + name + "/", child.hex()))
+                    else:
+                        flat[prefix + name] = (mode, child)
+            self._tree_cache = {sha: flat}  # Only HEAD's tree is worth keeping
+        return flat
+
+    # ----- refs -----
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """Commit sha for a revision ('HEAD', 'origin/x', '<branch>@{upstream}', a sha...)."""
+        if rev.endswith(("@{upstream}", "@{u}")):
+            # cat-file would read branch config only once (and exits when there is none)
+            branch = rev[:rev.rindex("@")]
+            rev = self._upstream_ref(None if branch in ("", "HEAD") else f"refs/heads/{branch}")
+            if not rev:
+                return None
+        found = self._cat_file.read(rev + "^{commit}")
+        if found is None:
+            return None
+        self._commit_info(found[0], found[2])  # The commit came along; keep its parsed header
+        return found[0]
+
+    def _head_ref(self) -> Optional[str]:
+        """Branch HEAD points at ('refs/heads/x'), or None when detached."""
+        value = (self.git_dir / "HEAD").read_text().strip()
+        return value[5:] if value.startswith("ref: ") else None
+
+    def _upstream_ref(self, branch: Optional[str] = None) -> Optional[str]:
+        branch = branch or self._head_ref()
+        if not branch or not branch.startswith("refs/heads/"):
+            return None
+        self._load_config()
+        short = branch[len("refs/heads/"):]
+        remote = self.config.get(f"branch.{short}.remote")
+        merge = self.config.get(f"branch.{short}.merge")
+        if not remote or not merge:
+            return None
+        if remote == ".":
+            return merge
+        return f"refs/remotes/{remote}/{merge[len('refs/heads/'):]}"
+
+    def _identity(self, kind: str) -> str:
+        self._load_config()
+        name = os.environ.get(f"GIT_{kind}_NAME") or self.config.get("user.name")
+        email = os.environ.get(f"GIT_{kind}_EMAIL") or self.config.get("user.email")
+        if not name or not email:
+            raise GitError("Author identity unknown: set user.name and user.email")
+        now = time.time()
+        offset = time.localtime(now).tm_gmtoff // 60
+        sign = "+" if offset >= 0 else "-"
+        return f"{name} <{email}> {int(now)} {sign}{abs(offset) // 60:02d}{abs(offset) % 60:02d}"
+
+    # ----- index -----
+
+    def _index_path(self) -> Path:
+        return self.git_dir / "index"
+
+    def _read_index(self) -> List[IndexEntry]:
+        path = self._index_path()
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return []
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if self._index_cache and self._index_cache[0] == key:
+            return self._index_cache[1]
+
+        data = path.read_bytes()
+        if data[:4] != b"DIRC":
+            raise UnsupportedRepo("unrecognised index signature")
+        version, count = struct.unpack(">II", data[4:12])
+        if version not in (2, 3):
+            raise UnsupportedRepo(f"index version {version}")
+        entries, pos = [], 12
+        unpack = _INDEX_ENTRY.unpack_from
+        for _ in range(count):
+            *fields, sha, flags = unpack(data, pos)
+            name_pos, flags_ext = pos + 62, 0
+            if flags & 0x4000:
+                flags_ext = struct.unpack_from(">H", data, name_pos)[0]
+                name_pos += 2
+            name_len = flags & 0xFFF
+            end = data.index(b"\0", name_pos) if name_len == 0xFFF else name_pos + name_len
+            entry_len = end - pos
+            next_pos = pos + entry_len + 8 - entry_len % 8
+            entries.append(IndexEntry(tuple(fields), sha, (flags >> 12) & 3, flags_ext,
+                                      data[name_pos:end].decode("utf-8", "surrogateescape"),
+                                      data[pos:next_pos] if version == 2 else None))
+            pos = next_pos
+        while pos < len(data) - 20:
+            signature = data[pos:pos + 4]
+            if not b"A" <= signature[:1] <= b"Z":
+                raise UnsupportedRepo(f"required index extension {signature!r}")
+            pos += 8 + struct.unpack_from(">I", data, pos + 4)[0]
+        self._index_cache = (key, entries)
+        return entries
+
+    def _write_index(self, entries: List[IndexEntry]):
+        """Replace the index under index.lock (optional extensions are dropped; git rebuilds them)."""
+        entries.sort(key=lambda e: (e.path.encode("utf-8", "surrogateescape"), e.stage))
+        extended = any(e.flags_ext for e in entries)
+        header = b"DIRC" + struct.pack(">II", 3 if extended else 2, len(entries))
+        body = header + b"".join([e.pack() for e in entries])
+
+        path = self._index_path()
+        try:
+            fd = os.open(str(path) + ".lock", os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            raise GitError("index.lock exists - another git process is running")
+        try:
+            os.write(fd, body + sha1(body).digest())
+        finally:
+            os.close(fd)
+        os.replace(str(path) + ".lock", path)
+        st = path.stat()
+        self._index_cache = ((st.st_mtime_ns, st.st_size, st.st_ino), entries)
+
+    # ----- work tree -----
+
+    def _mode_of(self, st: os.stat_result) -> int:
+        if stat.S_ISLNK(st.st_mode):
+            return MODE_LINK
+        return MODE_EXEC if st.st_mode & self._exec_bit else MODE_FILE
+
+    def _hash_files(self, files: List[Tuple[str, int]], write: bool) -> List[bytes]:
+        """Blob shas for (path, mode) pairs, as `git add` would store them."""
+        shas: List[Optional[bytes]] = [None] * len(files)
+        regular = []
+        for i, (path, mode) in enumerate(files):
+            if mode == MODE_LINK:
+                target = os.fsencode(os.readlink(os.path.join(self.root, path)))
+                if write:
+                    shas[i] = bytes.fromhex(self._write_literal("blob", target))
+                else:
+                    shas[i] = sha1(f"blob {len(target)}".encode() + b"\0" + target).digest()
+            else:
+                regular.append(i)
+        process = self._blob_writer if write else self._hasher
+        answers = process.requests([os.fsencode(_quote(files[i][0])) + b"\n" for i in regular])
+        for i, answer in zip(regular, answers):
+            shas[i] = bytes.fromhex(answer.decode())
+        return shas
+
+    def _scan(self, prefixes: Optional[List[str]], write: bool):
+        """
+        Compare stage-0 index entries with the work tree.
+
+        Returns (entries, changed, deleted, refreshed) where `changed` maps
+        path -> fresh IndexEntry for content/mode changes and `refreshed`
+        holds entries whose content matched but whose stat data was stale.
+        """
+        entries = self._read_index()
+        try:
+            index_mtime = self._index_path().stat().st_mtime_ns
+        except FileNotFoundError:
+            index_mtime = 0
+        deleted, suspects = [], []
+        root = str(self.root) + os.sep
+        lstat, mode_of = os.lstat, self._mode_of
+        for entry in entries:
+            if entry.stage or entry.mode == MODE_GITLINK or prefixes is not None and not _under(entry.path, prefixes):
+                continue
+            try:
+                st = lstat(root + entry.path)
+            except (FileNotFoundError, NotADirectoryError):
+                deleted.append(entry.path)
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                deleted.append(entry.path)
+                continue
+            mode = mode_of(st)
+            if _stat_key(st, mode) == entry.key and st.st_mtime_ns < index_mtime:
+                continue
+            suspects.append((entry, st, mode))
+
+        changed, refreshed = {}, {}
+        shas = self._hash_files([(entry.path, mode) for entry, _, mode in suspects], write)
+        for (entry, st, mode), sha in zip(suspects, shas):
+            fresh = IndexEntry.from_stat(entry.path, st, mode, sha)
+            if sha != entry.sha or mode != entry.mode:
+                changed[entry.path] = fresh
+            elif fresh.key != entry.key:
+                refreshed[entry.path] = fresh
+        return entries, changed, deleted, refreshed
+
+    def _untracked(self, tracked: set, prefixes: Optional[List[str]], first_only: bool = False) -> List[str]:
+        """Untracked, non-ignored files (directories are descended, like -uall)."""
+        tracked_dirs = {p.rsplit("/", 1)[0] for p in tracked if "/" in p}
+        tracked_dirs |= {d.rsplit("/", i)[0] for d in tracked_dirs for i in range(1, d.count("/") + 1)}
+
+        untracked = []
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                items = list(os.scandir(os.path.join(str(self.root), rel_dir)))
+            except OSError:
+                continue
+            dirs, files = [], []
+            for item in items:
+                rel = f"{rel_dir}/{item.name}" if rel_dir else item.name
+                if item.is_dir(follow_symlinks=False):
+                    if item.name == ".git":
+                        continue
+                    if prefixes is not None and not any(_under(rel, [p]) or _under(p, [rel]) for p in prefixes):
+                        continue
+                    if rel in tracked_dirs:
+                        stack.append(rel)
+                    elif not os.path.exists(os.path.join(item.path, ".git")):  # Skip nested repositories
+                        dirs.append(rel)
+                elif rel not in tracked and _under(rel, prefixes):
+                    files.append(rel)
+            candidates = dirs + files
+            for rel, ignored in zip(candidates, self._check_ignore.ignored(candidates)):
+                if ignored:
+                    continue
+                if rel in dirs:
+                    stack.append(rel)
+                else:
+                    untracked.append(rel)
+                    if first_only:
+                        return untracked
+        return sorted(untracked)
+
+    def _head_tree(self) -> Optional[str]:
+        head = self.head()
+        return self._commit_info(head)[0] if head else None
+
+    # ----- public API -----
+
+    def _staged(self, entries: List[IndexEntry]) -> List[str]:
+        """Paths whose index entry differs from HEAD (memoised per index and HEAD)."""
+        memo_key = (self._index_cache and self._index_cache[0], self.head())
+        if self._staged_memo and self._staged_memo[0] == memo_key:
+            return self._staged_memo[1]
+        head_flat = self._flatten_tree(self._head_tree())
+        staged = {e.path: (e.mode, e.sha) for e in entries if not e.stage}
+        conflicted = {e.path for e in entries if e.stage}
+        result = sorted(p for p in set(staged) | set(head_flat)
+                        if staged.get(p) != head_flat.get(p) and p not in conflicted)
+        self._staged_memo = (memo_key, result)
+        return result
+
+    def status(self) -> Dict[str, List[str]]:
+        with self.lock:
+            entries, changed, deleted, refreshed = self._scan(None, write=False)
+            status = _empty_status()
+            status['modified'] = sorted(changed)
+            status['deleted'] = sorted(deleted)
+            status['conflicted'] = sorted({e.path for e in entries if e.stage})
+            status['staged'] = self._staged(entries)
+            status['untracked'] = self._untracked({e.path for e in entries}, None)
+            if refreshed and not any(status.values()):
+                self._refresh(entries, refreshed)
+            return status
+
+    def has_changes(self) -> bool:
+        with self.lock:
+            entries, changed, deleted, refreshed = self._scan(None, write=False)
+            if changed or deleted or any(e.stage for e in entries) or self._staged(entries):
+                return True
+            if self._untracked({e.path for e in entries}, None, first_only=True):
+                return True
+            if refreshed:
+                self._refresh(entries, refreshed)
+            return False
+
+    def _refresh(self, entries: List[IndexEntry], refreshed: Dict[str, IndexEntry]):
+        """Store fresh stat data so the next status does not rehash (like `git status`)."""
+        try:
+            self._write_index([refreshed.get(e.path, e) if not e.stage else e for e in entries])
+        except GitError:
+            pass  # Someone else holds index.lock; the refresh is only an optimisation
+
+    def add(self, paths: Optional[Iterable] = None):
+        with self.lock:
+            prefixes = None if paths is None else [self._rel(p) for p in paths]
+            if prefixes is not None and not prefixes:
+                return
+            if prefixes is not None and "" in prefixes:
+                prefixes = None
+            entries, changed, deleted, refreshed = self._scan(prefixes, write=True)
+            dropped = set(deleted)
+            by_path = {}
+            for entry in entries:
+                if entry.path in dropped:
+                    continue
+                if entry.stage:
+                    if not _under(entry.path, prefixes):
+                        by_path[(entry.path, entry.stage)] = entry
+                    continue
+                by_path[(entry.path, 0)] = changed.get(entry.path) or refreshed.get(entry.path) or entry
+
+            # New files, and conflicted paths being added (stages 1-3 become one stage-0 entry)
+            root = str(self.root) + os.sep
+            resolved = sorted({e.path for e in entries if e.stage and _under(e.path, prefixes)})
+            new = [p for p in resolved if os.path.lexists(root + p)]
+            new += self._untracked({e.path for e in entries}, prefixes)
+            stats = [os.lstat(root + path) for path in new]
+            modes = [self._mode_of(st) for st in stats]
+            shas = self._hash_files(list(zip(new, modes)), write=True)
+            for path, st, mode, sha in zip(new, stats, modes, shas):
+                by_path[(path, 0)] = IndexEntry.from_stat(path, st, mode, sha)
+
+            new_entries = list(by_path.values())
+            if len(new_entries) != len(entries) or changed or refreshed or dropped or new:
+                self._write_index(new_entries)
+
+    def _write_tree(self, entries: List[IndexEntry]) -> str:
+        """Write the trees for sorted stage-0 entries in one pass (index order is tree order)."""
+        stack = [("", [])]  # Open directories and their tree records
+
+        def close():
+            path, records = stack.pop()
+            sha = self._write_literal("tree", b"".join(records))
+            name = path.rsplit("/", 1)[-1].encode("utf-8", "surrogateescape")
+            stack[-1][1].append(b"40000 " + name + b"\0" + bytes.fromhex(sha))
+
+        for entry in entries:
+            directory = entry.path.rpartition("/")[0]
+            while stack[-1][0] and directory != stack[-1][0] and not directory.startswith(stack[-1][0] + "/"):
+                close()
+            current = stack[-1][0]
+            rest = directory[len(current) + 1:] if current else directory
+            if rest:
+                for part in rest.split("/"):
+                    current = f"{current}/{part}" if current else part
+                    stack.append((current, []))
+            stack[-1][1].append(entry.tree_record())
+        while len(stack) > 1:
+            close()
+        return self._write_literal("tree", b"".join(stack[0][1]))
+
+    def _operation_in_progress(self) -> bool:
+        return any((self.git_dir / name).exists() for name in
+                   ("MERGE_HEAD", "CHERRY_PICK_HEAD", "REVERT_HEAD", "rebase-merge", "rebase-apply"))
+
+    def commit(self, message: str) -> Optional[str]:
+        with self.lock:
+            if self._operation_in_progress():
+                # Merge/rebase commits carry extra state; leave those to git itself
+                return super().commit(message)
+            entries = self._read_index()
+            if any(e.stage for e in entries):
+                raise GitError("cannot commit with unmerged paths")
+            head = self.head()
+            if not head and not entries:
+                return None
+            tree = self._write_tree(entries)
+            if head and self._commit_info(head)[0] == tree:
+                return None
+            self._tree_cache = {tree: {e.path: (e.mode, e.sha) for e in entries}}
+
+            lines = [f"tree {tree}"] + ([f"parent {head}"] if head else [])
+            lines += [f"author {self._identity('AUTHOR')}", f"committer {self._identity('COMMITTER')}", ""]
+            body = message if message.endswith("\n") else message + "\n"
+            sha = self._write_literal("commit", ("\n".join(lines) + "\n" + body).encode("utf-8"))
+
+            # Moves the branch HEAD points at, only if it is still at `head`
+            answers = self._update_ref.requests([b"start\n", f"update HEAD {sha} {head or ZERO_SHA}\n".encode()
+                                                 + b"commit\n"])
+            if answers != [b"start: ok", b"commit: ok"]:
+                raise GitError(f"update-ref: {answers!r}")
+            self._staged_memo = ((self._index_cache and self._index_cache[0], sha), [])
+            return sha
+
+    def head(self) -> Optional[str]:
+        return self.resolve("HEAD")
+
+    def ahead_count(self) -> int:
+        with self.lock:
+            head, upstream = self.head(), self.resolve("HEAD@{upstream}")
+            if not head or not upstream:
+                return 0
+            return self._count_exclusive(head, upstream)
+
+    def _count_exclusive(self, include: str, exclude: str) -> int:
+        """Commits reachable from `include` but not `exclude` (date-ordered paint walk)."""
+        flags, heap, count = {}, [], 0
+
+        def push(sha, flag):
+            old = flags.get(sha, 0)
+            if old | flag != old:
+                flags[sha] = old | flag
+                heapq.heappush(heap, (-self._commit_info(sha)[2], sha))
+
+        push(include, 1)
+        push(exclude, 2)
+        counted = set()
+        while heap and not all(flags[sha] & 2 for _, sha in heap):
+            _, sha = heapq.heappop(heap)
+            flag = flags[sha]
+            if flag == 1 and sha not in counted:
+                counted.add(sha)
+                count += 1
+            for parent in self._commit_info(sha)[1]:
+                push(parent, flag)
+        return count
+
+    def conflicted_paths(self) -> List[str]:
+        with self.lock:
+            return sorted({e.path for e in self._read_index() if e.stage})
+
+    def read_blob(self, spec: str) -> Optional[bytes]:
+        with self.lock:
+            if spec.startswith(":"):
+                # From the index as it is now (cat-file keeps the index it started with)
+                stage, _, path = spec[1:].partition(":")
+                if not path:
+                    stage, path = "0", spec[1:]
+                for entry in self._read_index():
+                    if entry.path == path and str(entry.stage) == stage:
+                        found = self._cat_file.read(entry.sha.hex())
+                        return found[2] if found else None
+                return None
+            rev, _, path = spec.partition(":")
+            commit = self.resolve(rev)
+            found = self._cat_file.read(f"{commit}:{path}") if commit else None
+            return found[2] if found and found[1] == "blob" else None
+
+    def commit_time(self, rev: str) -> Optional[datetime]:
+        with self.lock:
+            sha = self.resolve(rev)
+            return datetime.fromtimestamp(self._commit_info(sha)[2]) if sha else None
+
+    def close(self):
+        for process in [self._cat_file, self._check_ignore, self._hasher, self._blob_writer,
+                        self._update_ref, *self._literal_writers.values()]:
+            process.close()
+
+
+# ---------- factory ----------
+
+_repos: Dict[Tuple[str, str], GitRepo] = {}
+_repos_lock = threading.Lock()
+
+
+def open_repo(path, backend: Optional[str] = None) -> GitRepo:
+    """
+    Git access for the work tree at `path` (cached per path).
+
+    Backend order: coprocess, then dulwich (if installed), then the git CLI.
+    dulwich comes second because it is several times slower than the
+    coprocess backend on large work trees. Pass
+    backend='coprocess'/'dulwich'/'cli' to force one.
+    """
+    root = str(Path(path).resolve())
+    wanted = backend or "auto"
+    with _repos_lock:
+        repo = _repos.get((root, wanted))
+        if repo is None:
+            if wanted == "dulwich":
+                repo = DulwichRepo(root)
+            elif wanted == "cli":
+                repo = CliRepo(root)
+            else:
+                try:
+                    repo = CoprocessRepo(root)
+                except UnsupportedRepo:
+                    if wanted == "coprocess":
+                        raise
+                    repo = DulwichRepo(root) if DULWICH_AVAILABLE else CliRepo(root)
+            _repos[(root, wanted)] = repo
+        return repo
+
+
+def close_all():
+    with _repos_lock:
+        for repo in _repos.values():
+            repo.close()
+        _repos.clear()
+
+
+# ---------- benchmark ----------
+
+def _subprocess_push_cycle(work: Path, message: str):
+    """FixNetDaemon's local push steps as they were before this layer: one git fork per step."""
+    status = subprocess.run(["git", "status", "--porcelain"], cwd=work, capture_output=True, text=True)
+    if not status.stdout.strip():
+        ahead = subprocess.run(["git", "rev-list", "--count", "HEAD@{upstream}..HEAD"],
+                               cwd=work, capture_output=True, text=True)
+        if int(ahead.stdout.strip() or 0) == 0:
+            return
+    subprocess.run(["git", "add", "."], cwd=work, capture_output=True)
+    subprocess.run(["git", "commit", "-m", message], cwd=work, capture_output=True)
+
+
+def _layer_push_cycle(repo: GitRepo, message: str):
+    """The same steps through the access layer: one scan while staging, commit from the index."""
+    repo.add()
+    if repo.commit(message) is None:
+        repo.ahead_count()
+
+
+def benchmark_push_cycle(files: int = 10000, cycles: int = 5, new_per_cycle: int = 20,
+                         backends: Iterable[str] = ("subprocess", "coprocess", "dulwich")) -> Dict[str, Dict]:
+    """
+    Time FixNet's local push cycle (status, ahead check, add, commit) on a repo
+    with `files` fix files and `new_per_cycle` new fixes per cycle. The push
+    itself is left out: it is network-bound and the same for every backend.
+    """
+    import tempfile
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            if backend == "dulwich" and not DULWICH_AVAILABLE:
+                continue
+            work = Path(tmp) / backend
+            (work / "fixes").mkdir(parents=True)
+            for i in range(files):
+                (work / "fixes" / f"{sha1(str(i).encode()).hexdigest()}.json").write_text(f'{{"fix": {i}}}')
+            subprocess.run(["git", "init", "-q"], cwd=work, check=True)
+            for key, value in (("user.name", "bench"), ("user.email", "bench@localhost")):
+                subprocess.run(["git", "config", key, value], cwd=work, check=True)
+            subprocess.run(["git", "add", "."], cwd=work, check=True)
+            subprocess.run(["git", "commit", "-q", "-m", "seed"], cwd=work, check=True)
+
+            repo = None if backend == "subprocess" else open_repo(work, backend=backend)
+            timings = []
+            for cycle in range(cycles + 1):
+                for i in range(new_per_cycle):
+                    (work / "fixes" / f"new_{cycle}_{i}.json").write_text(f'{{"fix": "{cycle}.{i}"}}')
+                message = f"[Auto-sync] cycle {cycle}"
+                start = time.perf_counter()
+                if repo is None:
+                    _subprocess_push_cycle(work, message)
+                else:
+                    _layer_push_cycle(repo, message)
+                timings.append(time.perf_counter() - start)
+            if repo is not None:
+                repo.close()
+                _repos.pop((str(work.resolve()), backend), None)
+
+            status = subprocess.run(["git", "status", "--porcelain"], cwd=work, capture_output=True, text=True)
+            commits = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=work,
+                                     capture_output=True, text=True).stdout.strip()
+            steady = timings[1:]  # The first cycle pays one-time index/tree parsing
+            results[backend] = {
+                'files': files,
+                'avg_cycle_ms': sum(steady) / len(steady) * 1000,
+                'first_cycle_ms': timings[0] * 1000,
+                'clean_after': not status.stdout.strip() and commits == str(cycles + 2)
+            }
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        for name, result in benchmark_push_cycle(count).items():
+            print(f"{name:10s} {result['files']} files: avg {result['avg_cycle_ms']:.1f} ms/cycle "
+                  f"(first {result['first_cycle_ms']:.1f} ms) clean={result['clean_after']}")
+    else:
+        repo = open_repo(sys.argv[1] if len(sys.argv) > 1 else ".")
+        print(f"backend: {repo.backend}")
+        for key, paths in repo.status().items():
+            print(f"{key}: {len(paths)}")
@@ -10,7 +10,17 @@ import hashlib
 import subprocess
 from pathlib import Path
 from typing import Optional, Dict, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
+
+try:
+    from core.git_access import open_repo, GitError
+except ImportError:
+    from git_access import open_repo, GitError
+
+try:
+    from core.rate_limiter import get_rate_limiter
+except ImportError:
+    from rate_limiter import get_rate_limiter
 
 # Colors
 PURPLE = '\033[35m'
@@ -41,7 +51,7 @@ class GitHubUploader:
         
         self.id_map_file = self.project_root / ".luciferai_ids"
         self.version_file = self.project_root / ".luciferai_version"
-        self.rate_limit_file = Path.home() / ".luciferai" / "data" / "github_rate_limits.json"
+        self.rate_limit_file = Path.home() / ".luciferai" / "data" / "github_rate_limits.jsonl"
         
         # Load or use provided system ID
         if id_manager:
@@ -56,6 +66,7 @@ class GitHubUploader:
         
         # Ensure rate limit file directory
         self.rate_limit_file.parent.mkdir(parents=True, exist_ok=True)
+        self.rate_limiter = self._load_rate_limits()
     
     def _check_github_validation(self) -> bool:
         """Check if GitHub account is linked and validated."""
@@ -70,57 +81,41 @@ class GitHubUploader:
         # For now, just check if ID exists
         return True
     
-    def _load_rate_limits(self) -> Dict:
-        """Load rate limit tracking data."""
-        if not self.rate_limit_file.exists():
-            return {}
+    def _load_rate_limits(self):
+        """Load rate limit tracking data (keys are "<user_id>:<action>")."""
+        limiter = get_rate_limiter(self.rate_limit_file)
         
-        try:
-            with open(self.rate_limit_file, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
+        # One-time import of the old {user_id: {action: [UTC ISO timestamps]}} file
+        legacy_file = self.rate_limit_file.with_suffix('.json')
+        if legacy_file.exists():
+            try:
+                with open(legacy_file, 'r') as f:
+                    legacy = json.load(f)
+                epoch = datetime(1970, 1, 1)
+                for user_id, actions in legacy.items():
+                    for action, stamps in actions.items():
+                        limiter.import_hits(f"{user_id}:{action}", [
+                            (datetime.fromisoformat(ts) - epoch).total_seconds() for ts in stamps
+                        ])
+                limiter.flush()
+                legacy_file.unlink()
+            except:
+                pass
+        return limiter
     
-    def _save_rate_limits(self, limits: Dict):
+    def _save_rate_limits(self):
         """Save rate limit tracking data."""
-        with open(self.rate_limit_file, 'w') as f:
-            json.dump(limits, f, indent=2)
+        self.rate_limiter.flush()
     
     def _check_rate_limit(self, action: str, max_per_hour: int = 5) -> Tuple[bool, Optional[str]]:
-        """Check if action is within rate limits."""
-        limits = self._load_rate_limits()
+        """Check if action is within rate limits (and count it if so)."""
         user_id = self.id_manager.get_id() if self.id_manager else "unknown"
         
-        # Initialize user limits
-        if user_id not in limits:
-            limits[user_id] = {}
-        
-        if action not in limits[user_id]:
-            limits[user_id][action] = []
-        
-        # Get timestamps from last hour
-        now = datetime.utcnow()
-        one_hour_ago = now - timedelta(hours=1)
-        
-        # Filter to recent actions
-        recent_actions = [
-            ts for ts in limits[user_id][action]
-            if datetime.fromisoformat(ts) > one_hour_ago
-        ]
-        
-        # Check limit
-        if len(recent_actions) >= max_per_hour:
-            next_available = datetime.fromisoformat(recent_actions[0]) + timedelta(hours=1)
-            wait_time = (next_available - now).seconds // 60
+        allowed, retry_after = self.rate_limiter.acquire(f"{user_id}:{action}", max_per_hour)
+        if not allowed:
+            wait_time = int(retry_after) // 60
             return (False, f"Rate limit exceeded. Try again in {wait_time} minutes.")
         
-        # Add current action
-        recent_actions.append(now.isoformat())
-        limits[user_id][action] = recent_actions
-        
-        # Save
-        self._save_rate_limits(limits)
-        
         return (True, None)
     
     def _encrypt_mapping(self, user_id: str, github_username: str) -> str:
@@ -232,28 +227,22 @@ class GitHubUploader:
     def _stage_files(self) -> bool:
         """Stage all files for commit."""
         try:
-            subprocess.run(['git', 'add', '.'], cwd=self.project_root, check=True)
+            open_repo(self.project_root).add()
             print(f"{GREEN}✅ Files staged{RESET}")
             return True
-        except:
+        except (GitError, OSError):
             print(f"{RED}❌ Failed to stage files{RESET}")
             return False
     
     def _commit_changes(self, message: str) -> bool:
         """Commit changes."""
         try:
-            subprocess.run(
-                ['git', 'commit', '-m', message],
-                cwd=self.project_root,
-                check=True,
-                capture_output=True
-            )
-            print(f"{GREEN}✅ Changes committed{RESET}")
-            return True
-        except subprocess.CalledProcessError as e:
-            if b"nothing to commit" in e.stdout or b"nothing to commit" in e.stderr:
+            if open_repo(self.project_root).commit(message) is None:
                 print(f"{YELLOW}⚠️  No changes to commit{RESET}")
                 return True
+            print(f"{GREEN}✅ Changes committed{RESET}")
+            return True
+        except (GitError, OSError):
             print(f"{RED}❌ Failed to commit changes{RESET}")
             return False
     
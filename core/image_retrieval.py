@@ -7,12 +7,21 @@ Only activates when advanced models are installed
 import os
 import sys
 import json
+import hashlib
+import tempfile
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from urllib.parse import quote_plus
+from requests.adapters import HTTPAdapter
 import re
 
+try:
+    from core.image_store import ImageStore, IMAGE_TYPES
+except ImportError:
+    from image_store import ImageStore, IMAGE_TYPES
+
 # Colors
 PURPLE = "\033[35m"
 GREEN = "\033[32m"
@@ -26,6 +35,9 @@ RESET = "\033[0m"
 LUCIFER_HOME = Path.home() / ".luciferai"
 IMAGES_DIR = LUCIFER_HOME / "images"
 
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+MAX_PARALLEL_DOWNLOADS = 8  # Connections kept open to image hosts
+
 
 class ImageRetriever:
     """
@@ -33,18 +45,27 @@ class ImageRetriever:
     
     Features:
     - Fetches images from Google Images
-    - Downloads and saves to local cache
+    - Downloads in parallel over a pooled HTTP session
+    - Content-addressed local store: duplicates saved once, LRU-evicted by size
     - Returns image paths for AI processing
     - Only works with mistral/deepseek models
     """
     
-    def __init__(self):
-        self.images_dir = IMAGES_DIR
+    def __init__(self, images_dir: Optional[Path] = None):
+        self.images_dir = Path(images_dir or IMAGES_DIR)
         self.images_dir.mkdir(parents=True, exist_ok=True)
         
-        # Cache file for image metadata
+        # Image blobs + query results, indexed in SQLite
+        self.store = ImageStore(self.images_dir)
         self.cache_file = self.images_dir / "image_cache.json"
-        self.cache = self._load_cache()
+        self._migrate_cache()
+        
+        # One keep-alive session shared by searches and download threads
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=MAX_PARALLEL_DOWNLOADS, pool_maxsize=MAX_PARALLEL_DOWNLOADS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
         # Check if advanced model is available
         self.available = self._check_model_availability()
@@ -66,23 +87,17 @@ class ImageRetriever:
         except:
             return False
     
-    def _load_cache(self) -> Dict:
-        """Load image cache from disk."""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def _save_cache(self):
-        """Save image cache to disk."""
+    def _migrate_cache(self):
+        """Move query results from the old image_cache.json into the store."""
+        if not self.cache_file.exists():
+            return
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
-        except Exception as e:
-            print(f"{RED}⚠️  Failed to save image cache: {e}{RESET}")
+            with open(self.cache_file, 'r') as f:
+                for cache_key, images in json.load(f).items():
+                    self.store.put_query(cache_key, images)
+        except Exception:
+            pass  # Only cached search results: safe to drop
+        self.cache_file.unlink(missing_ok=True)
     
     def search_images(self, query: str, num_results: int = 5) -> List[Dict]:
         """
@@ -102,9 +117,10 @@ class ImageRetriever:
         
         # Check cache first
         cache_key = f"{query.lower()}:{num_results}"
-        if cache_key in self.cache:
+        cached = self.store.get_query(cache_key)
+        if cached is not None:
             print(f"{DIM}📦 Using cached results for '{query}'{RESET}")
-            return self.cache[cache_key]
+            return cached
         
         print(f"{CYAN}🔍 Searching Google Images for: {query}{RESET}")
         
@@ -112,11 +128,7 @@ class ImageRetriever:
             # Use Google Images search (scraping approach)
             search_url = f"https://www.google.com/search?q={quote_plus(query)}&tbm=isch"
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            }
-            
-            response = requests.get(search_url, headers=headers, timeout=10)
+            response = self.session.get(search_url, timeout=10)
             
             if response.status_code != 200:
                 print(f"{RED}❌ Failed to fetch images (status {response.status_code}){RESET}")
@@ -129,8 +141,7 @@ class ImageRetriever:
                 print(f"{GREEN}✅ Found {len(images)} images{RESET}")
                 
                 # Cache results
-                self.cache[cache_key] = images
-                self._save_cache()
+                self.store.put_query(cache_key, images)
                 
                 return images
             else:
@@ -166,77 +177,95 @@ class ImageRetriever:
         
         return images
     
-    def download_image(self, image_url: str, filename: Optional[str] = None) -> Optional[str]:
+    def _fetch_image(self, image_url: str) -> Tuple[Optional[Path], str]:
         """
-        Download image from URL and save locally.
-        
-        Args:
-            image_url: URL of the image
-            filename: Optional custom filename (auto-generated if None)
+        Stream one image into the store. Thread-safe; prints nothing.
         
         Returns:
-            Path to downloaded image, or None if failed
+            (path, status) where status is 'cached', 'downloaded', 'duplicate'
+            or an error message when path is None
         """
-        if not self.available:
-            return None
+        path = self.store.get_url(image_url)
+        if path:
+            return path, 'cached'
         
         try:
-            # Generate filename if not provided
-            if not filename:
-                # Use hash of URL as filename
-                import hashlib
-                url_hash = hashlib.md5(image_url.encode()).hexdigest()[:12]
-                
-                # Extract extension from URL
+            response = self.session.get(image_url, timeout=15, stream=True)
+            if response.status_code != 200:
+                return None, f"status {response.status_code}"
+            
+            # Extension from Content-Type, falling back to the URL
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            ext = IMAGE_TYPES.get(content_type)
+            if not ext:
                 ext = 'jpg'
-                for e in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
+                for e in ['.jpeg', '.jpg', '.png', '.gif', '.webp']:
                     if e in image_url.lower():
-                        ext = e[1:]
+                        ext = 'jpg' if e == '.jpeg' else e[1:]
                         break
-                
-                filename = f"{url_hash}.{ext}"
-            
-            filepath = self.images_dir / filename
-            
-            # Check if already downloaded
-            if filepath.exists():
-                print(f"{DIM}📦 Image already cached: {filename}{RESET}")
-                return str(filepath)
-            
-            print(f"{CYAN}📥 Downloading image...{RESET}")
-            
-            # Download image
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
             
-            response = requests.get(image_url, headers=headers, timeout=15, stream=True)
-            
-            if response.status_code == 200:
-                with open(filepath, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
+            # Hash while streaming so the file is never read twice
+            digest = hashlib.sha256()
+            fd, tmp_name = tempfile.mkstemp(dir=self.store.objects_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        digest.update(chunk)
                         f.write(chunk)
-                
-                print(f"{GREEN}✅ Image saved: {filepath}{RESET}")
-                return str(filepath)
-            else:
-                print(f"{RED}❌ Failed to download (status {response.status_code}){RESET}")
-                return None
+                path, created = self.store.put_file(image_url, tmp_name, digest.hexdigest(), ext)
+            finally:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+            return path, 'downloaded' if created else 'duplicate'
         
         except Exception as e:
-            print(f"{RED}❌ Error downloading image: {e}{RESET}")
+            return None, str(e)
+    
+    def download_image(self, image_url: str, filename: Optional[str] = None) -> Optional[str]:
+        """
+        Download image from URL and save locally.
+        
+        Args:
+            image_url: URL of the image
+            filename: Optional name for a copy in the images directory
+                      (the image itself is stored under its content hash)
+        
+        Returns:
+            Path to downloaded image, or None if failed
+        """
+        if not self.available:
+            return None
+        
+        path, status = self._fetch_image(image_url)
+        if path is None:
+            print(f"{RED}❌ Failed to download image ({status}){RESET}")
             return None
+        
+        if status == 'downloaded':
+            print(f"{GREEN}✅ Image saved: {path}{RESET}")
+        else:
+            print(f"{DIM}📦 Image already cached: {path.name}{RESET}")
+        
+        if filename:
+            named = self.images_dir / filename
+            # Blobs are named by their sha256; keep an earlier copy only if it is this image
+            if not (named.exists() and hashlib.sha256(named.read_bytes()).hexdigest() == path.stem):
+                tmp = named.with_name(f".{named.name}.tmp")
+                tmp.write_bytes(path.read_bytes())
+                os.replace(tmp, named)
+            return str(named)
+        return str(path)
     
     def fetch_and_download(self, query: str, num_images: int = 3) -> List[str]:
         """
-        Search for images and download them.
+        Search for images and download them in one parallel round.
         
         Args:
             query: Search query
             num_images: Number of images to download
         
         Returns:
-            List of local file paths
+            List of local file paths (identical images appear once)
         """
         if not self.available:
             print(f"{GOLD}⚠️  Image retrieval requires mistral or deepseek-coder{RESET}")
@@ -248,50 +277,51 @@ class ImageRetriever:
         if not results:
             return []
         
-        # Download each image
+        print(f"{CYAN}📥 Downloading {len(results)} images...{RESET}")
+        urls = [img['url'] for img in results]
+        with ThreadPoolExecutor(max_workers=min(len(urls), MAX_PARALLEL_DOWNLOADS)) as pool:
+            fetched = list(pool.map(self._fetch_image, urls))
+        
         downloaded = []
-        for i, img in enumerate(results, 1):
-            print(f"\n{BLUE}Image {i}/{len(results)}{RESET}")
-            path = self.download_image(img['url'])
-            if path:
-                downloaded.append(path)
+        counts = {'downloaded': 0, 'cached': 0, 'duplicate': 0, 'failed': 0}
+        for i, (path, status) in enumerate(fetched, 1):
+            if path is None:
+                counts['failed'] += 1
+                print(f"{RED}❌ Image {i}/{len(results)}: {status}{RESET}")
+                continue
+            counts[status] += 1
+            if str(path) not in downloaded:
+                downloaded.append(str(path))
         
+        print(f"{GREEN}✅ {counts['downloaded']} new, {counts['cached']} cached, "
+              f"{counts['duplicate']} duplicate, {counts['failed']} failed{RESET}")
         return downloaded
     
     def clear_cache(self):
         """Clear image cache and downloaded images."""
         try:
-            # Remove all cached images
-            for img_file in self.images_dir.glob("*"):
-                if img_file.is_file() and img_file != self.cache_file:
-                    img_file.unlink()
-            
-            # Clear cache metadata
-            self.cache = {}
-            self._save_cache()
-            
+            self.store.clear()
             print(f"{GREEN}✅ Image cache cleared{RESET}")
         except Exception as e:
             print(f"{RED}❌ Error clearing cache: {e}{RESET}")
     
     def list_cached_images(self):
-        """List all cached images."""
-        images = list(self.images_dir.glob("*.jpg")) + \
-                 list(self.images_dir.glob("*.png")) + \
-                 list(self.images_dir.glob("*.gif")) + \
-                 list(self.images_dir.glob("*.webp"))
+        """List all cached images, most recently used first."""
+        images = self.store.list_images()
         
         if not images:
             print(f"{GOLD}No cached images{RESET}")
             return
         
-        print(f"\n{PURPLE}📂 Cached Images ({len(images)} total):{RESET}\n")
+        total = sum(img['size'] for img in images) / (1024 * 1024)
+        limit = self.store.max_bytes / (1024 * 1024)
+        print(f"\n{PURPLE}📂 Cached Images ({len(images)} total, {total:.1f}/{limit:.0f} MB):{RESET}\n")
         
-        for img in sorted(images):
-            size = img.stat().st_size / 1024  # KB
-            print(f"  🖼️  {img.name} ({size:.1f} KB)")
+        for img in images:
+            size = img['size'] / 1024  # KB
+            print(f"  🖼️  {img['path'].name} ({size:.1f} KB)")
         
-        print(f"\n{DIM}Location: {self.images_dir}{RESET}")
+        print(f"\n{DIM}Location: {self.store.objects_dir}{RESET}")
 
 
 def get_image_retriever() -> ImageRetriever:
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+🗄️ Image Store - content-addressed, size-bounded image cache
+Images live under ~/.luciferai/images/objects/<aa>/<sha256>.<ext>, so the same
+picture fetched from two URLs is stored once. A small SQLite index maps
+URLs and search queries to blobs and tracks last access; when the store
+grows past its byte budget the least recently used blobs are evicted.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB of images
+DEFAULT_MAX_QUERIES = 500              # Cached search result lists
+
+IMAGE_TYPES = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+}
+
+
+class ImageStore:
+    """
+    Content-addressed image blobs plus an LRU index.
+
+    Features:
+    - sha256-named files, identical downloads deduplicated
+    - URL -> blob and query -> results lookups without touching the network
+    - Size-based LRU eviction of blobs, count-based eviction of queries
+    """
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_queries: int = DEFAULT_MAX_QUERIES):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_queries = max_queries
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.root / "image_store.db"), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=NORMAL")
+            cur.executescript("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    ext TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_blobs_access ON blobs(last_access);
+
+                CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_urls_digest ON urls(digest);
+
+                CREATE TABLE IF NOT EXISTS queries (
+                    key TEXT PRIMARY KEY,
+                    results TEXT NOT NULL,
+                    last_access REAL NOT NULL
+                );
+            """)
+            self._conn.commit()
+
+    def blob_path(self, digest: str, ext: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.{ext}"
+
+    # ------------------------------------------------------------------
+    # Images
+    # ------------------------------------------------------------------
+
+    def get_url(self, url: str) -> Optional[Path]:
+        """Stored image for `url` (marks it recently used), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.digest, b.ext FROM urls u JOIN blobs b ON b.digest = u.digest WHERE u.url = ?", (url,)
+            ).fetchone()
+            if not row:
+                return None
+            path = self.blob_path(row['digest'], row['ext'])
+            if not path.exists():
+                self._drop_blob(row['digest'])  # Deleted behind our back
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), row['digest']))
+            self._conn.commit()
+            return path
+
+    def put_file(self, url: str, tmp_path: Union[str, Path], digest: str, ext: str) -> Tuple[Path, bool]:
+        """
+        Move a downloaded file into the store under its sha256 `digest`.
+        If the same content is already stored, the temp file is discarded
+        and `url` is mapped to the existing blob.
+
+        Returns:
+            (path, created) - created is False for a duplicate
+        """
+        tmp_path = Path(tmp_path)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT ext FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            path = self.blob_path(digest, row['ext'] if row else ext)
+            created = not (row and path.exists())
+            if not created:
+                tmp_path.unlink(missing_ok=True)
+                self._conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (now, digest))
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, path)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO blobs (digest, ext, size, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (digest, path.suffix[1:], path.stat().st_size, now, now)
+                )
+            self._conn.execute("INSERT OR REPLACE INTO urls (url, digest) VALUES (?, ?)", (url, digest))
+            self._conn.commit()
+            self._evict(keep=digest)
+            return path, created
+
+    def put_bytes(self, url: str, data: bytes, ext: str) -> Path:
+        """Store in-memory image data (see put_file)."""
+        digest = hashlib.sha256(data).hexdigest()
+        tmp_path = self.objects_dir / f".{digest}.{threading.get_ident()}.tmp"
+        tmp_path.write_bytes(data)
+        return self.put_file(url, tmp_path, digest, ext)[0]
+
+    def _evict(self, keep: Optional[str] = None):
+        """Drop least recently used blobs until the store fits max_bytes."""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT digest, ext, size FROM blobs ORDER BY last_access").fetchall()
+        for row in rows:
+            if total <= self.max_bytes:
+                break
+            if row['digest'] == keep:
+                continue
+            self.blob_path(row['digest'], row['ext']).unlink(missing_ok=True)
+            self._drop_blob(row['digest'])
+            total -= row['size']
+        self._conn.commit()
+
+    def _drop_blob(self, digest: str):
+        self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        self._conn.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def list_images(self) -> List[Dict]:
+        """Stored images, most recently used first."""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT b.digest, b.ext, b.size, b.last_access, COUNT(u.url) AS urls
+                FROM blobs b LEFT JOIN urls u ON u.digest = b.digest
+                GROUP BY b.digest ORDER BY b.last_access DESC
+            """).fetchall()
+        return [{'path': self.blob_path(r['digest'], r['ext']), 'size': r['size'],
+                 'last_access': r['last_access'], 'urls': r['urls']} for r in rows]
+
+    # ------------------------------------------------------------------
+    # Search results
+    # ------------------------------------------------------------------
+
+    def get_query(self, key: str) -> Optional[List[Dict]]:
+        with self._lock:
+            row = self._conn.execute("SELECT results FROM queries WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return None
+            self._conn.execute("UPDATE queries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return json.loads(row['results'])
+
+    def put_query(self, key: str, results: List[Dict]):
+        """Cache one query's results (a single row write, not a full rewrite)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries (key, results, last_access) VALUES (?, ?, ?)",
+                (key, json.dumps(results), time.time())
+            )
+            self._conn.execute("""
+                DELETE FROM queries WHERE key IN (
+                    SELECT key FROM queries ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_queries,))
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """Remove every stored image and cached query."""
+        with self._lock:
+            for path in self.objects_dir.rglob("*"):
+                if path.is_file():
+                    path.unlink()
+            self._conn.executescript("DELETE FROM blobs; DELETE FROM urls; DELETE FROM queries;")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
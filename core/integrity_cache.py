@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+🔏 Integrity Cache - Remember verified files across startups
+Records (size, mtime, sha256, verdict) for the llamafile binary and model
+files in ~/.luciferai/integrity.json so later startups trust an unchanged
+file instead of re-verifying it. Also provides zero-copy file concatenation
+for assembling split binaries.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+HASH_BLOCK = 1024 * 1024
+
+# Only Linux sendfile() accepts a regular file as the destination
+SENDFILE_TO_FILE = sys.platform.startswith('linux') and hasattr(os, 'sendfile')
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file, read through one reused buffer."""
+    digest = hashlib.sha256()
+    buffer = bytearray(HASH_BLOCK)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+def read_recorded_sha256(file_path: Path) -> Optional[str]:
+    """SHA-256 recorded at download time (<file>.sha256), if any."""
+    sidecar = file_path.with_name(file_path.name + '.sha256')
+    try:
+        return sidecar.read_text().split()[0]
+    except (OSError, IndexError):
+        return None
+
+
+def _copy_into(src, dst, count: int):
+    """Append `count` bytes of src to dst in the kernel when the OS allows it."""
+    remaining = count
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            pass  # e.g. cross-filesystem on older kernels - try the next method
+    if remaining > 0 and SENDFILE_TO_FILE:
+        try:
+            offset = count - remaining
+            while remaining > 0:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        except OSError:
+            pass
+    if remaining > 0:
+        src.seek(count - remaining)
+        dst.seek(0, os.SEEK_END)
+        shutil.copyfileobj(src, dst, HASH_BLOCK)
+
+
+def concat_files(parts: List[Path], dest: Path) -> Dict:
+    """
+    Concatenate `parts` into `dest` without pulling the data into Python.
+
+    Uses copy_file_range, then sendfile, then a buffered copy. Returns a
+    manifest with each part's size/mtime/sha256 and the result's sha256
+    (hashes are computed from the page cache after the copy).
+    """
+    with open(dest, 'wb') as dst:
+        for part in parts:
+            with open(part, 'rb') as src:
+                _copy_into(src, dst, os.fstat(src.fileno()).st_size)
+
+    part_records = []
+    for part in parts:
+        st = part.stat()
+        part_records.append({
+            'name': part.name,
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'sha256': file_sha256(part)
+        })
+    return {
+        'parts': part_records,
+        'size': dest.stat().st_size,
+        'sha256': file_sha256(dest)
+    }
+
+
+def parts_match_manifest(parts: List[Path], manifest: Dict) -> bool:
+    """True if the part files on disk are the ones the manifest was built from."""
+    recorded = manifest.get('parts', [])
+    if [p.name for p in parts] != [r.get('name') for r in recorded]:
+        return False
+    for part, record in zip(parts, recorded):
+        st = part.stat()
+        if st.st_size != record.get('size'):
+            return False
+        if st.st_mtime_ns != record.get('mtime_ns') and file_sha256(part) != record.get('sha256'):
+            return False
+    return True
+
+
+class IntegrityCache:
+    """
+    Persistent (path -> size, mtime, sha256, verdict) records.
+
+    A record is only trusted while the file's size and mtime are unchanged,
+    so replacing or truncating a file invalidates it automatically.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = cache_file or (Path.home() / ".luciferai" / "integrity.json")
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self):
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r') as f:
+                    self._records = json.load(f)
+            except:
+                self._records = {}
+
+    def _save(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self._records, f, indent=2)
+        tmp_file.replace(self.cache_file)
+
+    def lookup(self, path: Path) -> Optional[Dict]:
+        """Record for `path` if it still matches the file on disk."""
+        try:
+            st = Path(path).stat()
+        except OSError:
+            return None
+        with self._lock:
+            record = self._records.get(str(Path(path).resolve()))
+        if record and record.get('size') == st.st_size and record.get('mtime_ns') == st.st_mtime_ns:
+            return record
+        return None
+
+    def record(self, path: Path, sha256: Optional[str] = None, **fields) -> Dict:
+        """Store the current (size, mtime) of `path` plus any extra fields."""
+        st = Path(path).stat()
+        record = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha256, **fields}
+        with self._lock:
+            self._records[str(Path(path).resolve())] = record
+            self._save()
+        return record
+
+    def forget(self, path: Path):
+        with self._lock:
+            if self._records.pop(str(Path(path).resolve()), None) is not None:
+                self._save()
+
+    def verdict(self, path: Path, check: Callable[[Path], str], sha256: Optional[str] = None,
+                params: Optional[Dict] = None) -> str:
+        """
+        Cached result of `check(path)` (e.g. 'ok' / 'incomplete' / 'corrupt').
+
+        `check` only runs when the file is new or has changed since it was
+        last verified, or when `params` (whatever else `check` depends on,
+        e.g. the expected size) differ from the last run; `sha256` (if known,
+        e.g. from the download) is stored alongside the verdict.
+        """
+        record = self.lookup(path)
+        if record and 'verdict' in record and record.get('verdict_params') == params:
+            return record['verdict']
+        result = check(path)
+        self.record(path, sha256=sha256 or (record or {}).get('sha256'), verdict=result, verdict_params=params)
+        return result
+
+
+def get_integrity_cache() -> IntegrityCache:
+    """Get singleton instance of IntegrityCache."""
+    if not hasattr(get_integrity_cache, '_instance'):
+        get_integrity_cache._instance = IntegrityCache()
+    return get_integrity_cache._instance
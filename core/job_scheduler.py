@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+⏱️ Job Scheduler - Priority timer-heap scheduler for background jobs
+Sleeps until the next job is due instead of polling, dispatches due jobs by
+priority with per-job and per-group concurrency limits, enforces job
+timeouts, defers idle-only jobs while the REPL is in use, and keeps
+per-job duration metrics.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+LUCIFER_HOME = Path.home() / ".luciferai"
+# Touched by the REPL on every request so other processes can tell it is idle
+ACTIVITY_FILE = LUCIFER_HOME / "data" / "last_activity"
+ACTIVITY_WRITE_INTERVAL = 5.0
+
+_last_activity = 0.0
+_last_activity_write = 0.0
+_job_context = threading.local()
+
+
+def note_activity():
+    """Record user activity (in-process, and on disk at most every few seconds)."""
+    global _last_activity, _last_activity_write
+    now = time.time()
+    _last_activity = now
+    if now - _last_activity_write < ACTIVITY_WRITE_INTERVAL:
+        return
+    _last_activity_write = now
+    try:
+        ACTIVITY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        ACTIVITY_FILE.touch()
+        os.utime(ACTIVITY_FILE, (now, now))
+    except OSError:
+        pass
+
+
+def idle_seconds() -> float:
+    """Seconds since the last recorded activity in any process (inf if never)."""
+    last = _last_activity
+    try:
+        last = max(last, ACTIVITY_FILE.stat().st_mtime)
+    except OSError:
+        pass
+    return time.time() - last if last else float('inf')
+
+
+def job_time_left() -> Optional[float]:
+    """Seconds until the current job's timeout (None outside a job or without one)."""
+    deadline = getattr(_job_context, 'deadline', None)
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class Job:
+    """A recurring job and its run metrics."""
+
+    def __init__(self, name: str, func: Callable, interval: float, priority: int,
+                 max_concurrency: int, timeout: Optional[float], idle_only: bool,
+                 group: Optional[str]):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.priority = priority
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.idle_only = idle_only
+        self.group = group
+        self.running = 0
+        self.due = None
+        self.durations = deque(maxlen=50)
+        self.stats = {'runs': 0, 'failures': 0, 'timeouts': 0, 'skipped': 0, 'deferred': 0,
+                      'last_start': None, 'last_duration': None, 'last_error': None}
+
+    def metrics(self, clock_now: float) -> Dict:
+        durations = list(self.durations)
+        next_run = None
+        if self.due is not None:
+            next_run = (datetime.now() + timedelta(seconds=max(0.0, self.due - clock_now))).isoformat()
+        return {
+            **self.stats,
+            'running': self.running,
+            'priority': self.priority,
+            'interval': self.interval,
+            'idle_only': self.idle_only,
+            'avg_duration': sum(durations) / len(durations) if durations else None,
+            'max_duration': max(durations) if durations else None,
+            'next_run': next_run
+        }
+
+
+class JobScheduler:
+    """
+    Timer-heap scheduler.
+
+    One dispatcher thread waits on a condition until the earliest due time
+    (or a deadline or state change). Due jobs are started lowest priority
+    number first, each on its own thread, up to `max_workers` at once. A run
+    that overruns its timeout gives up its worker slot (its own concurrency
+    slot is kept until it returns, so it is never started twice) and
+    `job_time_left()` turns negative so cooperative jobs can stop early.
+    """
+
+    def __init__(self, max_workers: int = 3, idle_threshold: float = 300,
+                 idle_fn: Callable[[], float] = idle_seconds):
+        self.max_workers = max_workers
+        self.idle_threshold = idle_threshold
+        self.idle_fn = idle_fn
+        self.jobs: Dict[str, Job] = {}
+        self._heap = []      # (due, priority, seq, name)
+        self._ready = []     # (priority, due, seq, name)
+        self._runs = {}      # run id -> (job, deadline, holds_worker)
+        self._groups: Dict[str, int] = {}
+        self._active = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self.running = False
+
+    # ---------- configuration ----------
+
+    def add_job(self, name: str, func: Callable, interval_seconds: float, priority: int = 10,
+                max_concurrency: int = 1, timeout: Optional[float] = None, idle_only: bool = False,
+                group: Optional[str] = None, run_immediately: bool = False):
+        """
+        Register a recurring job.
+
+        Args:
+            priority: Lower runs first when several jobs are due
+            max_concurrency: Overlapping runs allowed for this job
+            timeout: Seconds before a run is counted as timed out
+            idle_only: Defer until the REPL has been idle for idle_threshold
+            group: Jobs sharing a group never run at the same time
+        """
+        with self._cond:
+            job = Job(name, func, interval_seconds, priority, max_concurrency, timeout, idle_only, group)
+            self.jobs[name] = job
+            self._schedule(job, time.monotonic() + (0 if run_immediately else interval_seconds))
+            self._cond.notify()
+
+    def _schedule(self, job: Job, due: float):
+        job.due = due
+        heapq.heappush(self._heap, (due, job.priority, next(self._seq), job.name))
+
+    def run_now(self, name: str):
+        """Make a job due immediately (keeps its place if it is already queued)."""
+        with self._cond:
+            job = self.jobs[name]
+            self._heap = [e for e in self._heap if e[3] != name]
+            heapq.heapify(self._heap)
+            if not any(e[3] == name for e in self._ready):
+                self._schedule(job, time.monotonic())
+            self._cond.notify()
+
+    # ---------- lifecycle ----------
+
+    def start(self):
+        with self._cond:
+            if self.running:
+                return
+            self.running = True
+        self._thread = threading.Thread(target=self._loop, name="job-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def _loop(self):
+        with self._cond:
+            while self.running:
+                now = time.monotonic()
+                self._expire_runs(now)
+                while self._heap and self._heap[0][0] <= now:
+                    due, priority, seq, name = heapq.heappop(self._heap)
+                    heapq.heappush(self._ready, (priority, due, seq, name))
+                self._dispatch(now)
+
+                wake = [self._heap[0][0]] if self._heap else []
+                wake += [deadline for _, deadline, holds in self._runs.values() if holds and deadline]
+                self._cond.wait(timeout=max(0.0, min(wake) - now) if wake else None)
+
+    # ---------- dispatching ----------
+
+    def _dispatch(self, now: float):
+        blocked = []
+        idle = None
+        while self._ready and self._active < self.max_workers:
+            priority, due, seq, name = heapq.heappop(self._ready)
+            job = self.jobs.get(name)
+            if job is None:
+                continue
+
+            if job.idle_only:
+                idle = self.idle_fn() if idle is None else idle
+                if idle < self.idle_threshold:
+                    job.stats['deferred'] += 1
+                    self._schedule(job, now + max(1.0, self.idle_threshold - idle))
+                    continue
+
+            if job.running >= job.max_concurrency:
+                job.stats['skipped'] += 1
+                self._schedule(job, now + job.interval)
+                continue
+
+            if job.group and self._groups.get(job.group):
+                blocked.append((priority, due, seq, name))  # Retry when the group frees up
+                continue
+
+            self._start_run(job, now)
+            # Next run counts from the slot it was due in, without catch-up bursts
+            next_due = due + job.interval
+            self._schedule(job, next_due if next_due > now else now + job.interval)
+
+        for entry in blocked:
+            heapq.heappush(self._ready, entry)
+
+    def _start_run(self, job: Job, now: float):
+        run_id = next(self._seq)
+        deadline = now + job.timeout if job.timeout else None
+        self._runs[run_id] = (job, deadline, True)
+        job.running += 1
+        self._active += 1
+        if job.group:
+            self._groups[job.group] = self._groups.get(job.group, 0) + 1
+        job.stats['last_start'] = datetime.now().isoformat()
+        threading.Thread(target=self._run, args=(run_id, job, deadline),
+                         name=f"job-{job.name}", daemon=True).start()
+
+    def _expire_runs(self, now: float):
+        """Release the worker slot of runs that overran their timeout."""
+        for run_id, (job, deadline, holds) in list(self._runs.items()):
+            if holds and deadline is not None and now >= deadline:
+                self._runs[run_id] = (job, deadline, False)
+                self._active -= 1
+                job.stats['timeouts'] += 1
+
+    def _run(self, run_id: int, job: Job, deadline: Optional[float]):
+        _job_context.deadline = deadline
+        start = time.monotonic()
+        error = None
+        try:
+            job.func()
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)[:200]}"
+        finally:
+            _job_context.deadline = None
+            duration = time.monotonic() - start
+            with self._cond:
+                _, _, holds = self._runs.pop(run_id)
+                if holds:
+                    self._active -= 1
+                job.running -= 1
+                if job.group:
+                    self._groups[job.group] -= 1
+                job.durations.append(duration)
+                job.stats['runs'] += 1
+                job.stats['last_duration'] = duration
+                if error:
+                    job.stats['failures'] += 1
+                    job.stats['last_error'] = error
+                self._cond.notify()
+
+    # ---------- metrics ----------
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Per-job run counts, durations, timeouts, deferrals and next run time."""
+        with self._cond:
+            now = time.monotonic()
+            return {name: job.metrics(now) for name, job in self.jobs.items()}
@@ -6,6 +6,8 @@ Includes 200-message conversation memory
 """
 import subprocess
 import json
+import threading
+import time
 from pathlib import Path
 from typing import List, Dict, Optional
 from collections import deque
@@ -22,6 +24,17 @@ except ImportError:
     def handle_memory_query(query: str, history: list) -> str:
         return ""
 
+try:
+    from core.context_builder import ContextBuilder, TokenCounter, get_summary_cache
+    from core.response_cache import get_response_cache
+    from core.perf_metrics import get_perf_store, parse_llama_timings
+    from core.model_tiers import get_model_tier
+except ImportError:
+    from context_builder import ContextBuilder, TokenCounter, get_summary_cache
+    from response_cache import get_response_cache
+    from perf_metrics import get_perf_store, parse_llama_timings
+    from model_tiers import get_model_tier
+
 
 class LlamafileAgent:
     """
@@ -29,6 +42,8 @@ class LlamafileAgent:
     Maintains 200-message conversation history for context.
     """
     
+    _summary_lock = threading.Lock()  # Only one background summarizer at a time
+    
     def __init__(self, model_path: Optional[str] = None, llamafile_path: Optional[str] = None, model_name: Optional[str] = None):
         """Initialize llamafile agent.
         
@@ -59,6 +74,10 @@ class LlamafileAgent:
         # Conversation memory (200 messages max)
         self.conversation_history: deque = deque(maxlen=200)
         
+        # Prompt context window (-c) and token-budget context packing
+        self.context_size = 1024
+        self.context_builder = ContextBuilder(TokenCounter(self.model_path), get_summary_cache())
+        
         # System prompt - different for TinyLlama vs Mistral
         is_tiny = 'tinyllama' in str(self.model_path).lower()
         
@@ -180,6 +199,80 @@ class LlamafileAgent:
         
         return "\n".join(context_lines)
     
+    def get_token_context(self, prompt: str, max_tokens: int) -> str:
+        """
+        Get conversation context packed into the tokens left in the -c window.
+        
+        Args:
+            prompt: Current user prompt (already in history, excluded from context)
+            max_tokens: Tokens reserved for the response
+        """
+        history = list(self.conversation_history)
+        if history and history[-1]['role'] == 'user' and history[-1]['content'] == prompt:
+            history = history[:-1]
+        if not history:
+            return ""
+        
+        counter = self.context_builder.counter
+        template_tokens = counter.count(f"{self.system_prompt}\n\nPrevious conversation:\n\n\nUser: {prompt}\nAssistant:")
+        budget = self.context_size - max_tokens - template_tokens - 16  # 16 = BOS/rounding slack
+        return self.context_builder.build(history, budget, prompt)
+    
+    def summarize_pending_context(self, max_jobs: int = 1) -> int:
+        """Generate queued rolling summaries with the Tier 0 model (off the request path)."""
+        summaries = self.context_builder.summaries
+        if not summaries or not summaries.pending_count():
+            return 0
+        
+        project_root = Path(__file__).parent.parent
+        tier0_model = project_root / '.luciferai' / 'models' / 'tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf'
+        if not tier0_model.exists():
+            tier0_model = self.model_path
+        
+        def summarize(prompt: str) -> str:
+            result = subprocess.run(
+                ['sh', str(self.llamafile_path), '-m', str(tier0_model), '-p', f"{prompt}\nSummary:",
+                 '-c', str(self.context_size), '--temp', '0.1', '-n', '96', '--threads', '2',
+                 '--silent-prompt', '--no-display-prompt'],
+                capture_output=True, text=True, timeout=60
+            )
+            return result.stdout if result.returncode == 0 else ""
+        
+        return summaries.summarize_pending(summarize, max_jobs=max_jobs)
+    
+    def _summarize_in_background(self):
+        """Kick off one summary job in a daemon thread if any are queued."""
+        import os
+        
+        if os.getenv('LUCIFER_CONTEXT_SUMMARIES', '1') == '0':
+            return
+        if not self.context_builder.summaries or not self.context_builder.summaries.pending_count():
+            return
+        if not LlamafileAgent._summary_lock.acquire(blocking=False):
+            return
+        
+        def run():
+            try:
+                self.summarize_pending_context(max_jobs=1)
+            except Exception:
+                pass
+            finally:
+                LlamafileAgent._summary_lock.release()
+        
+        threading.Thread(target=run, daemon=True).start()
+    
+    def _record_metrics(self, latency_ms: float, stderr: str):
+        """Persist one request's latency and generation speed for `perf report`."""
+        stats = parse_llama_timings(stderr)
+        try:
+            get_perf_store().record_llm(
+                self.model_name, latency_ms, tier=get_model_tier(self.model_name),
+                prompt_tokens=stats['prompt_tokens'], generated_tokens=stats['generated_tokens'],
+                eval_ms=stats['eval_ms']
+            )
+        except Exception:
+            pass  # Metrics must never break a request
+    
     def query(self, prompt: str, temperature: float = 0.3, max_tokens: int = 200) -> str:
         """
         Query TinyLlama via llamafile.
@@ -222,8 +315,17 @@ class LlamafileAgent:
             self.add_to_history('assistant', memory_response)
             return memory_response
         
-        # Build context-aware prompt
-        context = self.get_context(max_messages=6)  # Last 6 messages for context
+        # Check response cache (repeated / near-identical questions)
+        response_cache = get_response_cache()
+        prior_turns = list(self.conversation_history)[:-1]
+        cached = response_cache.get(self.model_name, prompt, temperature, history=prior_turns)
+        if cached:
+            print(f"⚡ Cached response ({cached[1]} match) - instant response")
+            self.add_to_history('assistant', cached[0])
+            return cached[0]
+        
+        # Build context-aware prompt (packed to fit the -c window)
+        context = self.get_token_context(prompt, max_tokens)
         
         if context:
             full_prompt = f"{self.system_prompt}\n\nPrevious conversation:\n{context}\n\nUser: {prompt}\nAssistant:"
@@ -252,7 +354,7 @@ class LlamafileAgent:
                 str(self.llamafile_path),
                 '-m', str(self.model_path),
                 '-p', full_prompt,
-                '-c', '1024',               # Context size (default 512 was too small)
+                '-c', str(self.context_size),  # Context size (default 512 was too small)
                 '--temp', str(temperature),
                 '-n', str(max_tokens),
                 '--threads', '4',           # Use 4 CPU threads
@@ -263,14 +365,17 @@ class LlamafileAgent:
                 '--no-display-prompt'       # Clean output
             ]
             
+            start = time.perf_counter()
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 text=True,
                 timeout=timeout
             )
+            latency_ms = (time.perf_counter() - start) * 1000
             
             if result.returncode == 0:
+                self._record_metrics(latency_ms, result.stderr)
                 response = result.stdout.strip()
                 if response:
                     print(f"✅ Response received ({len(response)} chars) - Completed with {model_name}")
@@ -305,6 +410,10 @@ class LlamafileAgent:
                 
                 # Add assistant response to history
                 self.add_to_history('assistant', response)
+                response_cache.put(self.model_name, prompt, response, temperature, history=prior_turns)
+                
+                # Fold turns that no longer fit into a rolling summary
+                self._summarize_in_background()
                 
                 return response
             else:
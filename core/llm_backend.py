@@ -5,9 +5,27 @@ Provides a single interface for all LLM operations via native llamafile subproce
 """
 import os
 import json
+import time
 from typing import Dict, Any, List, Optional, Callable
 from pathlib import Path
 
+try:
+    from core.context_builder import ContextBuilder, TokenCounter, get_summary_cache
+except ImportError:
+    from context_builder import ContextBuilder, TokenCounter, get_summary_cache
+
+try:
+    from core.gguf_catalog import get_model_catalog
+except ImportError:
+    from gguf_catalog import get_model_catalog
+
+try:
+    from core.perf_metrics import get_perf_store, parse_llama_timings
+    from core.model_tiers import get_model_tier
+except ImportError:
+    from perf_metrics import get_perf_store, parse_llama_timings
+    from model_tiers import get_model_tier
+
 # Colors
 PURPLE = "\033[35m"
 GREEN = "\033[32m"
@@ -57,6 +75,11 @@ class LLMBackend:
         
         # Detect and initialize backend
         self._detect_backend()
+        
+        # Token-budget context packing (tokenizer of the local GGUF if known)
+        self.context_builder = ContextBuilder(
+            TokenCounter(getattr(self.backend, 'model_path', None)), get_summary_cache()
+        )
     
     def _detect_backend(self):
         """Detect which LLM backend is available."""
@@ -125,19 +148,21 @@ class LLMBackend:
         # - 10min absolute maximum (streaming) or 5min (non-streaming)
         pass
         
-        # Get response from backend
-        response = self.backend.chat(messages, **kwargs)
-        
-        # Handle return_stats parameter
+        # Get response from backend (with token stats when it can provide them)
         return_stats = kwargs.get('return_stats', False)
-        if return_stats and isinstance(response, tuple):
+        start = time.perf_counter()
+        response = self.backend.chat(messages, **{**kwargs, 'return_stats': True})
+        latency_ms = (time.perf_counter() - start) * 1000
+        
+        if isinstance(response, tuple):
             # Backend returned (text, stats) tuple
             response_text = response[0]
             response_stats = response[1]
         else:
             # Backend returned just text
-            response_text = response if not isinstance(response, tuple) else response[0]
+            response_text = response
             response_stats = None
+        self._record_metrics(latency_ms, response_stats)
         
         # Update conversation history (only if messages represent a single exchange)
         # Add the last user message and the assistant response
@@ -185,7 +210,28 @@ class LLMBackend:
         
         # Don't override timeout - let backend use smart inactivity-based timeouts
         # (Same reasoning as in chat() method above)
-        return self.backend.generate(prompt, **kwargs)
+        start = time.perf_counter()
+        response = self.backend.generate(prompt, **{**kwargs, 'return_stats': True})
+        latency_ms = (time.perf_counter() - start) * 1000
+        
+        response_text, response_stats = response if isinstance(response, tuple) else (response, None)
+        self._record_metrics(latency_ms, response_stats)
+        if kwargs.get('return_stats', False) and response_stats is not None:
+            return (response_text, response_stats)
+        return response_text
+    
+    def _record_metrics(self, latency_ms: float, stats: Optional[Dict[str, Any]]):
+        """Persist one request's latency and generation speed for `perf report`."""
+        stats = stats or {}
+        try:
+            get_perf_store().record_llm(
+                self.model, latency_ms, tier=get_model_tier(self.model),
+                prompt_tokens=stats.get('prompt_tokens', 0),
+                generated_tokens=stats.get('generated_tokens', 0),
+                eval_ms=stats.get('eval_ms')
+            )
+        except Exception:
+            pass  # Metrics must never break a request
     
     def list_models(self) -> List[str]:
         """List available models."""
@@ -204,6 +250,31 @@ class LLMBackend:
         """Get the current conversation history."""
         return self.conversation_history.copy()
     
+    def get_context_messages(self, query: str = '', token_budget: int = 768,
+                             history: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+        """
+        Get history messages that fit a token budget.
+        
+        System messages are always kept; the rest are packed newest-first,
+        with older turns replaced by a cached rolling summary when available.
+        
+        Args:
+            query: Current query (older turns sharing its words are preferred)
+            token_budget: Tokens available for the returned messages
+            history: Messages to pack (default: this backend's conversation history)
+        """
+        history = self.conversation_history if history is None else history
+        system_msgs = [m for m in history if m['role'] == 'system']
+        other_msgs = [m for m in history if m['role'] != 'system']
+        
+        counter = self.context_builder.counter
+        budget = token_budget - sum(counter.count(m['content']) for m in system_msgs)
+        summary, turns = self.context_builder.select(other_msgs, budget, query)
+        
+        if summary:
+            system_msgs = system_msgs + [{'role': 'system', 'content': f"Earlier conversation: {summary}"}]
+        return system_msgs + turns
+    
     def clear_conversation_history(self):
         """Clear the conversation history (e.g., when starting a new chat)."""
         self.conversation_history = []
@@ -415,10 +486,11 @@ class NativeLlamafileBackend:
         except:
             pass
         
-        # Fallback: try to find any matching model
-        possible_paths = list(MODELS_DIR.glob(f"*{self.model}*.gguf"))
-        if possible_paths:
-            return possible_paths[0]
+        # Fallback: any cataloged model with this identity or filename match
+        catalog = get_model_catalog()
+        model_path = catalog.get_path(self.model) or catalog.find(self.model)
+        if model_path:
+            return model_path
         
         # Final fallback to tinyllama
         return MODELS_DIR / 'tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf'
@@ -628,38 +700,17 @@ class NativeLlamafileBackend:
         except Exception as e:
             raise RuntimeError(f"Llamafile error: {e}")
     
-    def _parse_token_stats(self, stderr: str) -> Dict[str, int]:
+    def _parse_token_stats(self, stderr: str) -> Dict[str, Any]:
         """Parse token statistics from llamafile stderr output.
         
         Llamafile outputs timing info like:
         llama_print_timings: prompt eval time = ... ms / 2 tokens
         llama_print_timings: eval time = ... ms / 4 runs
-        """
-        import re
-        
-        stats = {
-            'prompt_tokens': 0,
-            'generated_tokens': 0,
-            'total_tokens': 0
-        }
-        
-        try:
-            # Look for prompt eval line - format: "prompt eval time = ... ms / N tokens"
-            prompt_match = re.search(r'prompt eval time\s*=\s*[\d.]+\s*ms\s*/\s*(\d+)\s+tokens', stderr)
-            if prompt_match:
-                stats['prompt_tokens'] = int(prompt_match.group(1))
-            
-            # Look for generation eval line - format: "eval time = ... ms / N runs"
-            # Note: llamafile uses "runs" not "tokens" for generated output
-            gen_match = re.search(r'eval time\s*=\s*[\d.]+\s*ms\s*/\s*(\d+)\s+runs', stderr)
-            if gen_match:
-                stats['generated_tokens'] = int(gen_match.group(1))
-            
-            stats['total_tokens'] = stats['prompt_tokens'] + stats['generated_tokens']
-        except Exception:
-            # If parsing fails, return zeros
-            pass
         
+        Returns token counts plus prompt_eval_ms/eval_ms (decode time, used for tokens/sec).
+        """
+        stats = parse_llama_timings(stderr)
+        stats['total_tokens'] = stats['prompt_tokens'] + stats['generated_tokens']
         return stats
     
     def _messages_to_prompt(self, messages: List[Dict[str, str]]) -> str:
@@ -685,8 +736,8 @@ class NativeLlamafileBackend:
         if not MODELS_DIR.exists():
             return []
         
-        gguf_files = list(MODELS_DIR.glob("*.gguf"))
-        return [f.stem for f in gguf_files]
+        entries = get_model_catalog().entries(MODELS_DIR)
+        return [Path(e['file']).stem for e in entries]
     
     def set_model(self, model: str):
         """Change the active model."""
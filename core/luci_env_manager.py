@@ -5,12 +5,30 @@ Dynamically creates and manages virtual environments for projects with dependenc
 """
 import os
 import sys
+import csv
 import json
+import time
+import uuid
+import shutil
 import subprocess
 import hashlib
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple
 
+try:
+    from packaging.requirements import Requirement, InvalidRequirement
+    from packaging.utils import canonicalize_name
+    from packaging.version import Version, InvalidVersion
+    PACKAGING_AVAILABLE = True
+except ImportError:
+    try:
+        from pip._vendor.packaging.requirements import Requirement, InvalidRequirement
+        from pip._vendor.packaging.utils import canonicalize_name
+        from pip._vendor.packaging.version import Version, InvalidVersion
+        PACKAGING_AVAILABLE = True
+    except ImportError:
+        PACKAGING_AVAILABLE = False
+
 # Colors
 PURPLE = '\033[35m'
 GREEN = '\033[32m'
@@ -26,21 +44,35 @@ PROJECT_ROOT = Path(__file__).parent.parent
 LUCI_ENVS_DIR = PROJECT_ROOT / "luci_environments"
 ENVS_METADATA_FILE = LUCI_ENVS_DIR / "environments.json"
 
+# Shared between environments: wheels pip has resolved/built, and installed
+# distributions stored once and hard-linked into each environment
+WHEEL_CACHE_DIRNAME = ".wheels"
+PACKAGE_STORE_DIRNAME = ".store"
+PY_TAG = f"py{sys.version_info.major}{sys.version_info.minor}"
+SITE_PACKAGES = Path("lib") / f"python{sys.version_info.major}.{sys.version_info.minor}" / "site-packages"
+SEED_PACKAGES = ["pip", "setuptools"]
+# dist-info files whose content depends on how/where the package was installed
+_INSTALL_SPECIFIC = {"RECORD", "INSTALLER", "REQUESTED", "direct_url.json"}
+
 
 class LuciEnvironmentManager:
     """Manages virtual environments for scripts with dependencies."""
     
-    def __init__(self):
+    def __init__(self, envs_dir: Optional[Path] = None):
         """Initialize the environment manager."""
-        self.envs_dir = LUCI_ENVS_DIR
+        self.envs_dir = Path(envs_dir) if envs_dir else LUCI_ENVS_DIR
         self.envs_dir.mkdir(parents=True, exist_ok=True)
+        self.metadata_file = self.envs_dir / ENVS_METADATA_FILE.name
+        self.wheel_cache = self.envs_dir / WHEEL_CACHE_DIRNAME
+        self.store_dir = self.envs_dir / PACKAGE_STORE_DIRNAME / PY_TAG
         self.metadata = self._load_metadata()
+        self._store_index: Optional[Dict[str, List[Tuple]]] = None
     
     def _load_metadata(self) -> Dict:
         """Load environment metadata from disk."""
-        if ENVS_METADATA_FILE.exists():
+        if self.metadata_file.exists():
             try:
-                with open(ENVS_METADATA_FILE, 'r') as f:
+                with open(self.metadata_file, 'r') as f:
                     return json.load(f)
             except:
                 return {"environments": {}}
@@ -49,7 +81,7 @@ class LuciEnvironmentManager:
     def _save_metadata(self):
         """Save environment metadata to disk."""
         try:
-            with open(ENVS_METADATA_FILE, 'w') as f:
+            with open(self.metadata_file, 'w') as f:
                 json.dump(self.metadata, f, indent=2)
         except Exception as e:
             print(f"{RED}⚠️  Could not save environment metadata: {e}{RESET}")
@@ -99,6 +131,19 @@ class LuciEnvironmentManager:
                     print(f"{DIM}   Dependencies: {', '.join(dependencies)}{RESET}")
                     return str(env_path / "bin"), False
         
+        # A larger environment that already has everything is just as good
+        superset = self._find_superset_environment(dependencies)
+        if superset:
+            env_info = self.metadata["environments"][superset]
+            scripts = env_info.setdefault("scripts", [env_info.get("script_path")])
+            if str(script_path) not in scripts:
+                scripts.append(str(script_path))
+                self._save_metadata()
+            print(f"{GREEN}✅ Reusing luci environment: {CYAN}{superset}{RESET}")
+            print(f"{DIM}   Location: {self.envs_dir / superset}{RESET}")
+            print(f"{DIM}   Has: {', '.join(env_info.get('dependencies', []))}{RESET}")
+            return str(self.envs_dir / superset / "bin"), False
+        
         # Create new environment
         print(f"{PURPLE}🩸 Creating new luci environment: {CYAN}{env_name}{RESET}")
         print(f"{DIM}   Script: {Path(script_path).name}{RESET}")
@@ -106,47 +151,27 @@ class LuciEnvironmentManager:
         print()
         
         try:
-            # Create virtual environment
-            print(f"{YELLOW}⚙️  Setting up virtual environment...{RESET}")
-            subprocess.run(
-                [sys.executable, "-m", "venv", str(env_path)],
-                check=True,
-                capture_output=True
-            )
-            
-            pip_exe = env_path / "bin" / "pip3"
-            
-            # Upgrade pip
-            print(f"{YELLOW}⚙️  Upgrading pip...{RESET}")
-            subprocess.run(
-                [str(pip_exe), "install", "--upgrade", "pip", "setuptools", "wheel"],
-                check=True,
-                capture_output=True,
-                timeout=60
-            )
-            
-            # Install dependencies with fallback
-            print(f"{YELLOW}⚙️  Installing dependencies...{RESET}")
-            for dep in dependencies:
-                print(f"{BLUE}   Installing {dep}...{RESET}", end=' ', flush=True)
-                success = self._install_dependency(pip_exe, dep)
-                if success:
-                    print(f"{GREEN}✓{RESET}")
-                else:
-                    print(f"{YELLOW}⚠️{RESET}")
+            started = time.time()
+            if env_path.exists():
+                shutil.rmtree(env_path)
+            linked, installed = self._build_environment(env_path, dependencies)
             
             # Save metadata
             self.metadata["environments"][env_name] = {
                 "name": env_name,
                 "script_path": str(script_path),
+                "scripts": [str(script_path)],
                 "dependencies": dependencies,
                 "created": str(Path(script_path).parent),
-                "python": str(env_path / "bin" / "python3")
+                "python": str(env_path / "bin" / "python3"),
+                "linked_packages": linked,
+                "installed_packages": installed,
+                "build_seconds": round(time.time() - started, 2)
             }
             self._save_metadata()
             
             print()
-            print(f"{GREEN}✅ Environment created successfully!{RESET}")
+            print(f"{GREEN}✅ Environment created successfully!{RESET} {DIM}({time.time() - started:.1f}s){RESET}")
             print(f"{DIM}   Location: {env_path}{RESET}")
             
             return str(env_path / "bin"), True
@@ -158,6 +183,269 @@ class LuciEnvironmentManager:
             print(f"{RED}❌ Unexpected error: {e}{RESET}")
             return None, False
     
+    def _build_environment(self, env_path: Path, dependencies: List[str]) -> Tuple[int, int]:
+        """
+        Assemble a venv: hard-link whatever the package store already has, then
+        install the rest with one pip resolver call against the wheel cache.
+        
+        Returns:
+            (packages linked from the store, packages newly installed)
+        """
+        links, missing = self._plan_from_store(dependencies)
+        seed_links, seed_missing = self._plan_from_store(SEED_PACKAGES)
+        
+        # ensurepip is the slowest part of a bare venv; link pip from the store instead
+        print(f"{YELLOW}⚙️  Setting up virtual environment...{RESET}")
+        venv_cmd = [sys.executable, "-m", "venv", str(env_path)]
+        if not seed_missing:
+            venv_cmd.insert(3, "--without-pip")
+            links = {**seed_links, **links}
+        subprocess.run(venv_cmd, check=True, capture_output=True)
+        
+        if links:
+            print(f"{YELLOW}⚙️  Linking {len(links)} cached package(s)...{RESET}")
+            for entry in links.values():
+                self._link_distribution(entry, env_path)
+        
+        installed = 0
+        if missing:
+            print(f"{YELLOW}⚙️  Installing dependencies: {', '.join(missing)}{RESET}")
+            if not self._install_batch(env_path, missing):
+                # One of them needs the fallback cascade; go package by package
+                pip_exe = env_path / "bin" / "pip3"
+                for dep in missing:
+                    print(f"{BLUE}   Installing {dep}...{RESET}", end=' ', flush=True)
+                    success = self._install_dependency(pip_exe, dep)
+                    if success:
+                        print(f"{GREEN}✓{RESET}")
+                    else:
+                        print(f"{YELLOW}⚠️{RESET}")
+            linked_dirs = {entry.name for entry in links.values()}
+            installed = self._harvest_environment(env_path, skip=linked_dirs)
+        elif seed_missing:
+            self._harvest_environment(env_path)
+        
+        return len(links), installed
+    
+    def _install_batch(self, env_path: Path, packages: List[str]) -> bool:
+        """
+        Install packages in a single resolver run. The offline attempt uses only
+        the local wheel cache; on a miss `pip wheel` fills the cache (building
+        any sdists once) and the offline install is retried.
+        """
+        python_exe = str(env_path / "bin" / "python3")
+        self.wheel_cache.mkdir(parents=True, exist_ok=True)
+        find_links = ["--find-links", str(self.wheel_cache), "--disable-pip-version-check", "-q"]
+        install = [python_exe, "-m", "pip", "install", "--no-index", *find_links, *packages]
+        
+        if subprocess.run(install, capture_output=True, timeout=300).returncode == 0:
+            return True
+        try:
+            subprocess.run(
+                [python_exe, "-m", "pip", "wheel", "--wheel-dir", str(self.wheel_cache), *find_links, *packages],
+                check=True,
+                capture_output=True,
+                timeout=600
+            )
+            return subprocess.run(install, capture_output=True, timeout=300).returncode == 0
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            return False
+    
+    # ═══════════════════════════════════════════════════════════
+    # Package store: one copy of each installed distribution,
+    # keyed by name, version and a digest of its RECORD hashes
+    # ═══════════════════════════════════════════════════════════
+    
+    def _store_entries(self) -> Dict[str, List[Tuple]]:
+        """canonical name -> [(version, entry_dir)], newest first."""
+        if self._store_index is None:
+            index: Dict[str, List[Tuple]] = {}
+            if self.store_dir.exists():
+                for entry in self.store_dir.iterdir():
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        name, version, _ = entry.name.rsplit("-", 2)
+                        index.setdefault(name, []).append((Version(version), entry))
+                    except (ValueError, InvalidVersion):
+                        continue
+            for versions in index.values():
+                versions.sort(key=lambda item: item[0], reverse=True)
+            self._store_index = index
+        return self._store_index
+    
+    def _entry_requires(self, entry: Path) -> List[str]:
+        """Requires-Dist lines from a stored distribution's METADATA."""
+        for dist_info in (entry / "site").glob("*.dist-info"):
+            requires = []
+            with open(dist_info / "METADATA", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if not line.strip():
+                        break  # End of headers
+                    if line.startswith("Requires-Dist:"):
+                        requires.append(line.split(":", 1)[1].strip())
+            return requires
+        return []
+    
+    def _plan_from_store(self, dependencies: List[str]) -> Tuple[Dict[str, Path], List[str]]:
+        """
+        Resolve dependencies (and their requirements) against the store.
+        
+        Returns:
+            ({canonical name: store entry} to link, dependencies the store can't satisfy)
+        """
+        if not PACKAGING_AVAILABLE:
+            return {}, list(dependencies)
+        
+        chosen: Dict[str, Tuple] = {}
+        missing = []
+        
+        def resolve(requirement, extras, plan) -> bool:
+            if requirement.marker and not any(
+                    requirement.marker.evaluate({"extra": extra}) for extra in extras):
+                return True  # Not needed on this interpreter
+            name = canonicalize_name(requirement.name)
+            if name in plan:
+                return requirement.specifier.contains(plan[name][0], prereleases=True)
+            for version, entry in self._store_entries().get(name, []):
+                if requirement.specifier.contains(version, prereleases=True):
+                    plan[name] = (version, entry)
+                    sub_extras = {""} | set(requirement.extras)
+                    for line in self._entry_requires(entry):
+                        try:
+                            if not resolve(Requirement(line), sub_extras, plan):
+                                return False
+                        except InvalidRequirement:
+                            return False
+                    return True
+            return False
+        
+        for dep in dependencies:
+            plan = dict(chosen)
+            try:
+                ok = resolve(Requirement(dep), {""}, plan)
+            except InvalidRequirement:
+                ok = False
+            if ok:
+                chosen = plan
+            else:
+                missing.append(dep)
+        return {name: entry for name, (_, entry) in chosen.items()}, missing
+    
+    def _link_distribution(self, entry: Path, env_path: Path):
+        """Hard-link a stored distribution into an environment (copy across filesystems)."""
+        site_packages = env_path / SITE_PACKAGES
+        source_root = entry / "site"
+        for root, dirs, files in os.walk(source_root):
+            target_dir = site_packages / os.path.relpath(root, source_root)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            for filename in files:
+                target = target_dir / filename
+                if target.exists():
+                    continue
+                try:
+                    os.link(os.path.join(root, filename), target)
+                except OSError:
+                    shutil.copy2(os.path.join(root, filename), target)
+        
+        # Console scripts name their interpreter in the shebang, so they're rewritten per env
+        scripts = entry / "bin"
+        if scripts.exists():
+            python_exe = env_path / "bin" / "python3"
+            for script in scripts.iterdir():
+                content = script.read_bytes()
+                if content.startswith(b"#!") and b"python" in content.split(b"\n", 1)[0]:
+                    content = b"#!" + str(python_exe).encode() + b"\n" + content.split(b"\n", 1)[1]
+                target = env_path / "bin" / script.name
+                target.write_bytes(content)
+                target.chmod(0o755)
+    
+    def _harvest_environment(self, env_path: Path, skip: Optional[set] = None) -> int:
+        """Add an environment's installed distributions to the store. Returns how many were new to it."""
+        site_packages = env_path / SITE_PACKAGES
+        added = 0
+        for dist_info in site_packages.glob("*.dist-info"):
+            if (dist_info / "direct_url.json").exists():
+                continue  # Local/VCS install; name+version doesn't identify it
+            try:
+                if self._store_distribution(env_path, dist_info, skip or set()):
+                    added += 1
+            except OSError:
+                continue
+        self._store_index = None
+        return added
+    
+    def _store_distribution(self, env_path: Path, dist_info: Path, skip: set) -> bool:
+        site_packages = env_path / SITE_PACKAGES
+        name = version = None
+        with open(dist_info / "METADATA", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith("Name:"):
+                    name = canonicalize_name(line.split(":", 1)[1].strip())
+                elif line.startswith("Version:"):
+                    version = line.split(":", 1)[1].strip()
+                if name and version:
+                    break
+        if not (name and version):
+            return False
+        
+        with open(dist_info / "RECORD", newline="", encoding="utf-8") as f:
+            records = [row for row in csv.reader(f) if row]
+        content = sorted(
+            f"{row[0]},{row[1]}" for row in records
+            if len(row) > 1 and row[1] and not row[0].startswith("..")
+            and not (row[0].startswith(dist_info.name + "/") and row[0].split("/", 1)[1] in _INSTALL_SPECIFIC)
+        )
+        digest = hashlib.sha256("\n".join(content).encode()).hexdigest()[:12]
+        final = self.store_dir / f"{name}-{version}-{digest}"
+        if final.name in skip or final.exists():
+            return False
+        
+        staging = self.store_dir / f".tmp-{uuid.uuid4().hex}"
+        bin_dir = env_path / "bin"
+        try:
+            for row in records:
+                source = os.path.normpath(site_packages / row[0])
+                if row[0].startswith(".."):
+                    if os.path.dirname(source) != str(bin_dir):
+                        continue  # Headers, data files: not needed to run scripts
+                    target = staging / "bin" / os.path.basename(source)
+                else:
+                    target = staging / "site" / row[0]
+                if not os.path.isfile(source):
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+            os.rename(staging, final)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        return True
+    
+    def _normalize_dependency(self, dep: str) -> str:
+        if PACKAGING_AVAILABLE:
+            try:
+                req = Requirement(dep)
+                extras = f"[{','.join(sorted(req.extras))}]" if req.extras else ""
+                return f"{canonicalize_name(req.name)}{extras}{req.specifier}"
+            except InvalidRequirement:
+                pass
+        return dep.strip().lower().replace("_", "-")
+    
+    def _find_superset_environment(self, dependencies: List[str]) -> Optional[str]:
+        """Name of the smallest tracked environment that already has all dependencies."""
+        wanted = {self._normalize_dependency(d) for d in dependencies}
+        best = None
+        for env_name, env_info in self.metadata["environments"].items():
+            have = {self._normalize_dependency(d) for d in env_info.get("dependencies", [])}
+            if wanted <= have and (self.envs_dir / env_name / "bin" / "python3").exists():
+                if best is None or len(have) < best[0]:
+                    best = (len(have), env_name)
+        return best[1] if best else None
+    
     def _install_dependency(self, pip_exe: Path, package: str) -> bool:
         """
         Install a dependency with full 5-tier fallback cascade.
@@ -305,8 +593,9 @@ class LuciEnvironmentManager:
         orphaned = []
         
         for env_name, env_info in list(self.metadata["environments"].items()):
-            script_path = env_info.get("script_path")
-            if script_path and not Path(script_path).exists():
+            # Environments can be shared; orphaned only once every script is gone
+            scripts = [p for p in env_info.get("scripts", [env_info.get("script_path")]) if p]
+            if scripts and not any(Path(p).exists() for p in scripts):
                 orphaned.append(env_name)
         
         if orphaned:
@@ -314,7 +603,7 @@ class LuciEnvironmentManager:
             for env_name in orphaned:
                 env_path = self.envs_dir / env_name
                 if env_path.exists():
-                    import shutil
+                    # Only this env's links go; the store keeps its copy
                     shutil.rmtree(env_path)
                 del self.metadata["environments"][env_name]
                 print(f"{DIM}   Removed: {env_name}{RESET}")
@@ -323,6 +612,38 @@ class LuciEnvironmentManager:
             print(f"{GREEN}✅ Cleanup complete{RESET}")
 
 
+def benchmark_env_creation(dependencies: List[str] = None) -> Dict[str, float]:
+    """
+    Time environment creation for a repeated dependency set in a scratch directory:
+    cold (empty store and wheel cache), rebuilt from the store, and reused by another script.
+    """
+    import tempfile
+    
+    dependencies = list(dependencies or ["requests"])
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = LuciEnvironmentManager(Path(tmp) / "envs")
+        script_a, script_b = Path(tmp) / "a" / "main.py", Path(tmp) / "b" / "main.py"
+        
+        start = time.time()
+        env_bin, _ = manager.find_or_create_environment(str(script_a), dependencies)
+        cold = time.time() - start
+        if not env_bin:
+            raise RuntimeError("could not create the benchmark environment")
+        
+        # Same dependency set, nothing to reuse but the store and wheel cache
+        env_name = Path(env_bin).parent.name
+        shutil.rmtree(manager.envs_dir / env_name)
+        del manager.metadata["environments"][env_name]
+        start = time.time()
+        manager.find_or_create_environment(str(script_a), dependencies)
+        rebuilt = time.time() - start
+        
+        start = time.time()
+        manager.find_or_create_environment(str(script_b), dependencies)
+        reused = time.time() - start
+    return {'cold_s': cold, 'from_store_s': rebuilt, 'reused_s': reused}
+
+
 def get_luci_env_manager() -> LuciEnvironmentManager:
     """Get a singleton instance of the environment manager."""
     global _env_manager
@@ -333,6 +654,12 @@ def get_luci_env_manager() -> LuciEnvironmentManager:
 
 # For testing
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        result = benchmark_env_creation(sys.argv[2:] or None)
+        print(f"\n{CYAN}cold: {result['cold_s']:.1f}s  from store: {result['from_store_s']:.1f}s  "
+              f"reused: {result['reused_s']:.2f}s{RESET}")
+        sys.exit(0)
+    
     manager = LuciEnvironmentManager()
     
     print(f"{PURPLE}╔═══════════════════════════════════════════════════╗")
@@ -200,87 +200,16 @@ def detect_installed_models():
         except:
             MODEL_SIZES = {}
         
+        # Model identity and header validity come from the GGUF catalog
+        # (parsed once per file version, no filename guessing per call)
+        from gguf_catalog import get_model_catalog
+        catalog = get_model_catalog()
+        
         # Track found models to avoid duplicates
         found_models = set()
         
-        for model_file in models_dir.glob('*.gguf'):
-            filename_lower = model_file.name.lower()
-            model_name = None
-            
-            # Comprehensive model name detection
-            # Tier 0 models
-            if 'tinyllama' in filename_lower or 'tiny' in filename_lower:
-                model_name = 'tinyllama'
-            elif 'phi-2' in filename_lower or 'phi2' in filename_lower:
-                model_name = 'phi-2'
-            elif 'stablelm' in filename_lower:
-                model_name = 'stablelm'
-            
-            # Tier 1 models  
-            # llama3.2 removed from core bundle
-            elif 'llama-2' in filename_lower or 'llama2' in filename_lower:
-                model_name = 'llama2'
-            elif 'phi-3' in filename_lower or 'phi3' in filename_lower:
-                model_name = 'phi-3'
-            elif 'gemma' in filename_lower:
-                if 'gemma2' in filename_lower or 'gemma-2' in filename_lower:
-                    model_name = 'gemma2'
-                else:
-                    model_name = 'gemma'
-            elif 'vicuna' in filename_lower:
-                model_name = 'vicuna'
-            elif 'orca-2' in filename_lower:
-                model_name = 'orca-2'
-            elif 'openchat' in filename_lower:
-                model_name = 'openchat'
-            elif 'starling' in filename_lower:
-                model_name = 'starling'
-            
-            # Tier 2 models
-            elif 'mistral-7b' in filename_lower and 'mixtral' not in filename_lower:
-                model_name = 'mistral'
-            elif 'mixtral' in filename_lower:
-                if '8x22b' in filename_lower:
-                    model_name = 'mixtral-8x22b'
-                else:
-                    model_name = 'mixtral'
-            # Check for 70B llama variants first (Tier 4)
-            elif ('llama-3.1' in filename_lower or 'llama3.1' in filename_lower) and '70b' in filename_lower:
-                model_name = 'llama3.1-70b'
-            elif ('llama-3' in filename_lower or 'llama3' in filename_lower) and '70b' in filename_lower:
-                model_name = 'llama3-70b'
-            # Then check for regular llama3.1 (8B)
-            elif 'llama-3.1' in filename_lower or 'llama3.1' in filename_lower:
-                model_name = 'llama3.1'
-            elif 'llama-3' in filename_lower or 'llama3' in filename_lower:
-                model_name = 'llama3'
-            elif 'codellama' in filename_lower or 'code-llama' in filename_lower:
-                model_name = 'codellama'
-            elif 'neural-chat' in filename_lower:
-                model_name = 'neural-chat'
-            elif 'solar' in filename_lower:
-                model_name = 'solar'
-            elif 'qwen' in filename_lower:
-                if 'qwen2' in filename_lower:
-                    model_name = 'qwen2'
-                else:
-                    model_name = 'qwen'
-            elif 'yi' in filename_lower:
-                model_name = 'yi'
-            
-            # Tier 3 models
-            elif 'deepseek' in filename_lower:
-                model_name = 'deepseek-coder'
-            elif 'wizardcoder' in filename_lower:
-                model_name = 'wizardcoder'
-            elif 'wizardlm' in filename_lower:
-                model_name = 'wizardlm'
-            elif 'dolphin' in filename_lower:
-                model_name = 'dolphin'
-            elif 'nous-hermes' in filename_lower or 'hermes' in filename_lower:
-                model_name = 'nous-hermes'
-            elif 'phind' in filename_lower:
-                model_name = 'phind-codellama'
+        for entry in catalog.entries(models_dir):
+            model_name = entry.get('model')
             
             if model_name and model_name not in found_models:
                 found_models.add(model_name)
@@ -288,7 +217,7 @@ def detect_installed_models():
                 tier_info = get_tier_capabilities(tier)
                 
                 # Check file size integrity
-                actual_size_mb = model_file.stat().st_size / (1024 * 1024)
+                actual_size_mb = entry['size'] / (1024 * 1024)
                 expected_size_mb = MODEL_SIZES.get(model_name, 0)
                 
                 # Check if size matches (allow 5% tolerance)
@@ -299,25 +228,21 @@ def detect_installed_models():
                     size_valid = size_diff_percent < 5
                 
                 # Check GGUF header
-                header_valid = True
-                try:
-                    with open(model_file, 'rb') as f:
-                        magic = f.read(4)
-                        if magic != b'GGUF':
-                            header_valid = False
-                except:
-                    header_valid = False
+                header_valid = entry.get('valid', False)
                 
                 detected['bundled_models'].append({
                     'name': model_name,
                     'tier': f"Tier {tier}",
                     'tier_name': tier_info['name'],
-                    'file': model_file.name,
+                    'file': entry['file'],
                     'actual_size_mb': actual_size_mb,
                     'expected_size_mb': expected_size_mb,
                     'size_valid': size_valid,
                     'header_valid': header_valid,
-                    'corrupted': not (size_valid and header_valid)
+                    'corrupted': not (size_valid and header_valid),
+                    'architecture': entry.get('architecture'),
+                    'quantization': entry.get('quantization'),
+                    'context_length': entry.get('context_length')
                 })
     
     # Load LLM state (enabled/disabled)
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+🔎 Memory Index - Full-text search over session logs and memory archives
+Keeps a SQLite (FTS5) index at ~/.luciferai/memory_index.db that is updated
+as entries are written, so listing sessions and recalling memory never has
+to reparse the raw JSON logs.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional, Iterable, Union
+
+
+# Source kinds stored in the index
+KIND_LOG = 'log'          # SessionLogger files (~/.luciferai/logs/sessions)
+KIND_MEMORY = 'memory'    # MemorySystem live sessions (~/.luciferai/memory/sessions)
+KIND_ARCHIVE = 'archive'  # MemorySystem archives (~/.luciferai/memory/archives)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_SUMMARY_FIELDS = (
+    'started_at', 'ended_at', 'model', 'message_count', 'commands_count',
+    'files_created', 'files_modified', 'events_count'
+)
+
+
+class MemoryIndex:
+    """
+    Inverted index over every session and archive entry.
+
+    Features:
+    - FTS5 ranked search (bm25), falls back to LIKE scans if FTS5 is missing
+    - Date-range and per-source filters
+    - One summary row per session/archive for cheap listing and stats
+    - Lazy resync of files changed outside this process (keyed by mtime/size)
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
+        if db_path is None:
+            db_path = Path.home() / ".luciferai" / "memory_index.db"
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.fts_enabled = self._init_schema()
+
+    def _init_schema(self) -> bool:
+        """Create tables; returns True if FTS5 is available."""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=NORMAL")
+            cur.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    role TEXT,
+                    content TEXT NOT NULL,
+                    timestamp TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_session ON entries(kind, session_id);
+                CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries(timestamp);
+
+                CREATE TABLE IF NOT EXISTS sessions (
+                    kind TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    started_at TEXT,
+                    ended_at TEXT,
+                    model TEXT,
+                    message_count INTEGER DEFAULT 0,
+                    commands_count INTEGER DEFAULT 0,
+                    files_created INTEGER DEFAULT 0,
+                    files_modified INTEGER DEFAULT 0,
+                    events_count INTEGER DEFAULT 0,
+                    path TEXT,
+                    mtime REAL,
+                    size INTEGER,
+                    PRIMARY KEY (kind, session_id)
+                );
+            """)
+
+            try:
+                cur.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                        content, content='entries', content_rowid='id'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+                        INSERT INTO entries_fts(rowid, content) VALUES (new.id, new.content);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+                        INSERT INTO entries_fts(entries_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE OF content ON entries BEGIN
+                        INSERT INTO entries_fts(entries_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                        INSERT INTO entries_fts(rowid, content) VALUES (new.id, new.content);
+                    END;
+                """)
+                fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5 - search falls back to LIKE
+                fts = False
+
+            self._conn.commit()
+            return fts
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add_entry(self, kind: str, session_id: str, role: str, content: str,
+                  timestamp: Optional[str] = None):
+        """Index a single message as it is written."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO entries (kind, session_id, role, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (kind, session_id, role, content or '', timestamp or datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def update_session(self, kind: str, session_id: str, summary: Dict,
+                       path: Optional[Union[str, Path]] = None):
+        """
+        Upsert the summary row for a session.
+
+        Args:
+            kind: Source kind (log/memory/archive)
+            session_id: Session ID or archive name
+            summary: Dict with any of started_at, ended_at, model and counts
+            path: Backing file; its mtime/size are recorded so resync can skip it
+        """
+        mtime, size = self._stat(path)
+        values = [summary.get(field) for field in _SUMMARY_FIELDS]
+
+        with self._lock:
+            self._conn.execute(
+                f"""INSERT OR REPLACE INTO sessions
+                    (kind, session_id, {', '.join(_SUMMARY_FIELDS)}, path, mtime, size)
+                    VALUES (?, ?, {', '.join('?' * len(_SUMMARY_FIELDS))}, ?, ?, ?)""",
+                [kind, session_id] + values + [str(path) if path else None, mtime, size]
+            )
+            self._conn.commit()
+
+    def move_session(self, old_kind: str, old_id: str, new_kind: str, new_id: str,
+                     summary: Dict, path: Optional[Union[str, Path]] = None):
+        """Re-tag a session's entries (e.g. when a memory session is archived)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET kind = ?, session_id = ? WHERE kind = ? AND session_id = ?",
+                (new_kind, new_id, old_kind, old_id)
+            )
+            self._conn.execute(
+                "DELETE FROM sessions WHERE kind = ? AND session_id = ?", (old_kind, old_id)
+            )
+            self._conn.commit()
+        self.update_session(new_kind, new_id, summary, path)
+
+    def remove_session(self, kind: str, session_id: str):
+        """Drop a session and all its entries from the index."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE kind = ? AND session_id = ?", (kind, session_id))
+            self._conn.execute("DELETE FROM sessions WHERE kind = ? AND session_id = ?", (kind, session_id))
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Resync from disk
+    # ------------------------------------------------------------------
+
+    def sync_directory(self, kind: str, directory: Union[str, Path], prefix: str = '') -> int:
+        """
+        Bring the index up to date with a directory of JSON session files.
+
+        Only files whose (mtime, size) differ from the recorded summary row
+        are parsed; files that disappeared are dropped from the index.
+
+        Returns:
+            Number of files (re)indexed
+        """
+        directory = Path(directory)
+        if not directory.exists():
+            return 0
+
+        with self._lock:
+            known = {
+                row['path']: (row['session_id'], row['mtime'], row['size'])
+                for row in self._conn.execute(
+                    "SELECT session_id, path, mtime, size FROM sessions WHERE kind = ?", (kind,)
+                )
+            }
+
+        seen_paths = set()
+        reindexed = 0
+
+        with os.scandir(directory) as it:
+            for dir_entry in it:
+                if not (dir_entry.name.startswith(prefix) and dir_entry.name.endswith('.json')):
+                    continue
+                if not dir_entry.is_file():
+                    continue
+
+                path = dir_entry.path
+                seen_paths.add(path)
+                st = dir_entry.stat()
+                recorded = known.get(path)
+                if recorded and recorded[1] == st.st_mtime and recorded[2] == st.st_size:
+                    continue
+
+                if self._index_file(kind, Path(path)):
+                    reindexed += 1
+
+        # Drop sessions whose file was deleted (e.g. 6-month cleanup)
+        for path, (session_id, _, _) in known.items():
+            if path and path not in seen_paths:
+                self.remove_session(kind, session_id)
+
+        return reindexed
+
+    def _index_file(self, kind: str, path: Path) -> bool:
+        """Parse one session/archive file and replace its rows in the index."""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if kind == KIND_ARCHIVE:
+            session_id = path.stem
+        else:
+            session_id = data.get('session_id') or path.stem.replace('session_', '', 1)
+
+        messages = data.get('messages') if kind == KIND_LOG else data.get('entries')
+        messages = messages or []
+
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE kind = ? AND session_id = ?", (kind, session_id))
+            self._conn.executemany(
+                "INSERT INTO entries (kind, session_id, role, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (kind, session_id, msg.get('role'), msg.get('content') or '', msg.get('timestamp'))
+                    for msg in messages if isinstance(msg, dict)
+                ]
+            )
+            self._conn.commit()
+
+        self.update_session(kind, session_id, summarize_session_data(kind, data), path)
+        return True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, kinds: Optional[Iterable[str]] = None,
+               since: Optional[Union[str, datetime]] = None,
+               until: Optional[Union[str, datetime]] = None,
+               session_id: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """
+        Ranked full-text search.
+
+        Args:
+            query: Free text; every word must match (prefix match)
+            kinds: Restrict to these source kinds
+            since/until: Inclusive timestamp bounds (datetime or ISO string)
+            session_id: Restrict to a single session/archive
+            limit: Max results
+
+        Returns:
+            List of {kind, session_id, role, content, timestamp, score},
+            best match first
+        """
+        tokens = _TOKEN_RE.findall(query.lower())
+        if not tokens:
+            return []
+
+        where = []
+        params: List = []
+
+        if kinds:
+            kinds = list(kinds)
+            where.append(f"e.kind IN ({', '.join('?' * len(kinds))})")
+            params.extend(kinds)
+        if since:
+            where.append("e.timestamp >= ?")
+            params.append(since.isoformat() if isinstance(since, datetime) else since)
+        if until:
+            where.append("e.timestamp <= ?")
+            params.append(until.isoformat() if isinstance(until, datetime) else until)
+        if session_id:
+            where.append("e.session_id = ?")
+            params.append(session_id)
+
+        if self.fts_enabled:
+            match = ' '.join(f'"{token}"*' for token in tokens)
+            sql = (
+                "SELECT e.kind, e.session_id, e.role, e.content, e.timestamp, "
+                "bm25(entries_fts) AS rank "
+                "FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid "
+                "WHERE entries_fts MATCH ?"
+            )
+            params.insert(0, match)
+            order = "rank, e.timestamp DESC"
+        else:
+            sql = (
+                "SELECT e.kind, e.session_id, e.role, e.content, e.timestamp, 0 AS rank "
+                "FROM entries e WHERE " + " AND ".join("LOWER(e.content) LIKE ?" for _ in tokens)
+            )
+            params = [f"%{token}%" for token in tokens] + params
+            order = "e.timestamp DESC"
+
+        if where:
+            sql += " AND " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [
+            {
+                'kind': row['kind'],
+                'session_id': row['session_id'],
+                'role': row['role'],
+                'content': row['content'],
+                'timestamp': row['timestamp'],
+                'score': -row['rank']
+            }
+            for row in rows
+        ]
+
+    def list_sessions(self, kind: str, limit: Optional[int] = None,
+                      since: Optional[Union[str, datetime]] = None,
+                      until: Optional[Union[str, datetime]] = None) -> List[Dict]:
+        """Summary rows for a source kind, most recent first."""
+        sql = "SELECT * FROM sessions WHERE kind = ?"
+        params: List = [kind]
+        if since:
+            sql += " AND started_at >= ?"
+            params.append(since.isoformat() if isinstance(since, datetime) else since)
+        if until:
+            sql += " AND started_at <= ?"
+            params.append(until.isoformat() if isinstance(until, datetime) else until)
+        sql += " ORDER BY session_id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def session_stats(self, kind: str) -> Dict:
+        """Count plus oldest/newest session IDs for a source kind."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS total, MIN(session_id) AS oldest, MAX(session_id) AS newest, "
+                "SUM(message_count) AS messages FROM sessions WHERE kind = ?",
+                (kind,)
+            ).fetchone()
+        return {
+            'total': row['total'] or 0,
+            'oldest': row['oldest'],
+            'newest': row['newest'],
+            'messages': row['messages'] or 0
+        }
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _stat(path: Optional[Union[str, Path]]):
+        if not path:
+            return None, None
+        try:
+            st = os.stat(path)
+            return st.st_mtime, st.st_size
+        except OSError:
+            return None, None
+
+
+def summarize_session_data(kind: str, data: Dict) -> Dict:
+    """Build a summary row from a raw session/archive JSON document."""
+    if kind == KIND_LOG:
+        return {
+            'started_at': data.get('started_at'),
+            'ended_at': data.get('ended_at'),
+            'model': None,
+            'message_count': len(data.get('messages', [])),
+            'commands_count': data.get('commands_executed', 0),
+            'files_created': len(data.get('files_created', [])),
+            'files_modified': len(data.get('files_modified', [])),
+            'events_count': len(data.get('events', []))
+        }
+
+    return {
+        'started_at': data.get('created_at'),
+        'ended_at': data.get('archived_at') or data.get('updated_at'),
+        'model': data.get('model'),
+        'message_count': data.get('entry_count', len(data.get('entries', []))),
+    }
+
+
+def get_memory_index() -> MemoryIndex:
+    """Get singleton instance of MemoryIndex."""
+    if not hasattr(get_memory_index, '_instance'):
+        get_memory_index._instance = MemoryIndex()
+    return get_memory_index._instance
@@ -4,6 +4,7 @@ Advanced Memory System for LuciferAI
 - Permanent storage for user preferences (name, settings)
 - Session archiving with keyword detection
 - Context injection for LLM queries
+- Archive recall through the shared full-text MemoryIndex
 """
 
 import json
@@ -13,6 +14,13 @@ from typing import List, Dict, Optional
 from datetime import datetime
 from collections import deque
 
+try:
+    from core.memory_index import get_memory_index, summarize_session_data, KIND_MEMORY, KIND_ARCHIVE
+    from core.context_builder import ContextBuilder, chain_hashes, get_summary_cache
+except ImportError:
+    from memory_index import get_memory_index, summarize_session_data, KIND_MEMORY, KIND_ARCHIVE
+    from context_builder import ContextBuilder, chain_hashes, get_summary_cache
+
 class MemorySystem:
     """
     Multi-tiered memory system with model-specific configurations.
@@ -66,6 +74,9 @@ class MemorySystem:
         # Load permanent memory
         self.permanent_memory = self._load_permanent_memory()
         
+        # Token-budget packing for injected context
+        self.context_builder = ContextBuilder(summaries=get_summary_cache())
+        
         # Current session ID
         self.current_session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -128,6 +139,13 @@ class MemorySystem:
         
         self.session_memory.append(entry)
         
+        try:
+            get_memory_index().add_entry(
+                KIND_MEMORY, self.current_session_id, role, content, entry['timestamp']
+            )
+        except Exception:
+            pass
+        
         # Auto-save every 10 entries
         if len(self.session_memory) % 10 == 0:
             self.save_session()
@@ -173,6 +191,14 @@ class MemorySystem:
         
         with open(session_file, 'w') as f:
             json.dump(session_data, f, indent=2)
+        
+        try:
+            get_memory_index().update_session(
+                KIND_MEMORY, self.current_session_id,
+                summarize_session_data(KIND_MEMORY, session_data), session_file
+            )
+        except Exception:
+            pass
     
     def archive_session(self, archive_name: Optional[str] = None):
         """
@@ -206,6 +232,15 @@ class MemorySystem:
             
             # Remove from sessions
             session_file.unlink()
+            
+            # Re-tag indexed entries instead of reindexing the archive
+            try:
+                get_memory_index().move_session(
+                    KIND_MEMORY, self.current_session_id, KIND_ARCHIVE, archive_name,
+                    summarize_session_data(KIND_ARCHIVE, session_data), archive_file
+                )
+            except Exception:
+                pass
         
         # Clear current session and start new
         self.session_memory.clear()
@@ -227,7 +262,22 @@ class MemorySystem:
         return None
     
     def list_archives(self) -> List[Dict]:
-        """List all archived sessions"""
+        """List all archived sessions (from the index summary rows)"""
+        try:
+            index = get_memory_index()
+            index.sync_directory(KIND_ARCHIVE, self.archives_dir)
+            return [
+                {
+                    'name': row['session_id'],
+                    'archived_at': row['ended_at'],
+                    'entry_count': row['message_count'] or 0,
+                    'model': row['model']
+                }
+                for row in index.list_sessions(KIND_ARCHIVE)
+            ]
+        except Exception:
+            pass
+        
         archives = []
         
         for archive_file in sorted(self.archives_dir.glob("*.json"), reverse=True):
@@ -271,13 +321,18 @@ class MemorySystem:
         })
         self._save_permanent_memory()
     
-    def search_memory(self, query: str, include_archives: bool = False) -> List[Dict]:
+    def search_memory(self, query: str, include_archives: bool = False,
+                      since: Optional[datetime] = None, until: Optional[datetime] = None,
+                      limit: int = 50) -> List[Dict]:
         """
         Search through memory for relevant entries
         
         Args:
             query: Search query
             include_archives: Whether to search archived sessions too
+            since: Only archived entries at or after this time
+            until: Only archived entries at or before this time
+            limit: Max archive matches (ranked best first)
         
         Returns:
             List of matching entries
@@ -293,20 +348,56 @@ class MemorySystem:
                     'source': 'current_session'
                 })
         
-        # Search archives if requested
+        # Search archives if requested (ranked full-text index)
         if include_archives:
-            for archive in self.list_archives():
-                archive_data = self.load_archive(archive['name'])
-                if archive_data:
-                    for entry in archive_data.get('entries', []):
-                        if query_lower in entry['content'].lower():
-                            matches.append({
-                                'entry': entry,
-                                'source': f"archive:{archive['name']}"
-                            })
+            try:
+                index = get_memory_index()
+                index.sync_directory(KIND_ARCHIVE, self.archives_dir)
+                archive_matches = [
+                    {
+                        'entry': {
+                            'role': hit['role'],
+                            'content': hit['content'],
+                            'timestamp': hit['timestamp']
+                        },
+                        'source': f"archive:{hit['session_id']}",
+                        'score': hit['score']
+                    }
+                    for hit in index.search(query, kinds=[KIND_ARCHIVE], since=since, until=until, limit=limit)
+                ]
+            except Exception:
+                # No FTS5 in this SQLite build, or a damaged index: scan the archive files
+                archive_matches = self._scan_archives(query_lower, since, until, limit)
+            matches.extend(archive_matches)
         
         return matches
     
+    def _scan_archives(self, query_lower: str, since: Optional[datetime],
+                       until: Optional[datetime], limit: int) -> List[Dict]:
+        """Substring search over the archive files themselves (no index)."""
+        matches = []
+        for archive_file in sorted(self.archives_dir.glob("*.json"), reverse=True):
+            archive_data = self.load_archive(archive_file.stem)
+            if not archive_data:
+                continue
+            for entry in archive_data.get('entries', []):
+                if query_lower not in entry.get('content', '').lower():
+                    continue
+                if since or until:
+                    try:
+                        when = datetime.fromisoformat(entry['timestamp'])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    if (since and when < since) or (until and when > until):
+                        continue
+                matches.append({
+                    'entry': entry,
+                    'source': f"archive:{archive_file.stem}"
+                })
+                if len(matches) >= limit:
+                    return matches
+        return matches
+    
     def detect_archive_keywords(self, user_input: str) -> bool:
         """Detect if user wants to archive session"""
         archive_keywords = [
@@ -335,14 +426,16 @@ class MemorySystem:
             'permanent_facts': len(self.permanent_memory.get('important_facts', []))
         }
     
-    def inject_context_for_model(self, user_query: str, max_context_entries: int = 10) -> str:
+    def inject_context_for_model(self, user_query: str, max_context_entries: int = 10,
+                                 token_budget: int = 384) -> str:
         """
         Create context-aware prompt for LLM
         Includes user name, recent conversation, and relevant memory
         
         Args:
             user_query: The current user query
-            max_context_entries: How many recent entries to include
+            max_context_entries: How many recent entries to consider
+            token_budget: Tokens available for the conversation part
         
         Returns:
             Enhanced prompt with context
@@ -362,14 +455,21 @@ class MemorySystem:
             for fact_obj in recent_facts:
                 context_parts.append(f"  - {fact_obj['fact']}")
         
-        # Add recent conversation
-        recent_context = self.get_context(max_context_entries)
+        # Add recent conversation, packed by tokens rather than message count.
+        # Summaries are keyed from the session start, not the sliding window,
+        # so the one queued on the previous turn is found on this one
+        session = self.get_context()
+        recent_context = session[-max_context_entries:] if max_context_entries else session
         if recent_context:
-            context_parts.append("\nRecent conversation:")
-            for entry in recent_context[-5:]:  # Last 5 exchanges
-                role = entry['role']
-                content = entry['content'][:100]  # Truncate long messages
-                context_parts.append(f"  [{role}]: {content}")
+            earlier = session[:len(session) - len(recent_context)]
+            prefix_key = chain_hashes(earlier)[-1] if earlier else ''
+            summary, turns = self.context_builder.select(recent_context, token_budget, user_query, prefix_key)
+            if summary or turns:
+                context_parts.append("\nRecent conversation:")
+                if summary:
+                    context_parts.append(f"  [summary]: {summary}")
+                for entry in turns:
+                    context_parts.append(f"  [{entry['role']}]: {entry['content']}")
         
         # Combine context with current query
         if context_parts:
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+⏱️ Model Benchmark - Load each model once, run a prompt corpus, record speed
+Runs llamafile in server mode so a model is loaded a single time, then
+measures time-to-first-token, tokens/sec, prompt-eval rate, peak RSS and
+pass rate (via tests/response_validator.ResponseValidator) per prompt.
+Results are written as JSON + CSV so runs compare across commits/machines.
+"""
+import csv
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+import urllib.error
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Callable
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_CORPUS = PROJECT_ROOT / 'tests' / 'benchmark_corpus.json'
+DEFAULT_RESULTS_DIR = PROJECT_ROOT / '.luciferai' / 'logs' / 'benchmarks'
+
+# Optional: psutil gives accurate RSS sampling on every platform
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    psutil = None
+    PSUTIL_AVAILABLE = False
+
+try:
+    from core.perf_metrics import percentile
+except ImportError:
+    from perf_metrics import percentile
+
+try:
+    from core.response_validator import ResponseValidator
+except ImportError:
+    from response_validator import ResponseValidator
+
+
+CSV_FIELDS = [
+    'model', 'tier', 'prompt', 'description', 'passed', 'score',
+    'ttft_ms', 'total_ms', 'prompt_tokens', 'generated_tokens',
+    'prompt_eval_rate', 'tokens_per_sec', 'error'
+]
+
+
+def load_corpus(path: Optional[Path] = None, max_tier: Optional[int] = None) -> List[Dict]:
+    """Load benchmark prompts, optionally only up to a tier."""
+    with open(path or DEFAULT_CORPUS, 'r') as f:
+        prompts = json.load(f)['prompts']
+    if max_tier is not None:
+        prompts = [p for p in prompts if p.get('tier', 0) <= max_tier]
+    return prompts
+
+
+class LlamafileServer:
+    """
+    One llamafile process in --server mode, kept alive for a whole model run.
+
+    Usage:
+        with LlamafileServer(llamafile_path, model_path) as server:
+            server.complete("What is 2+2?")
+    """
+
+    def __init__(self, llamafile_path: Path, model_path: Path, context_size: int = 2048,
+                 threads: int = 4, port: Optional[int] = None):
+        self.llamafile_path = Path(llamafile_path)
+        self.model_path = Path(model_path)
+        self.context_size = context_size
+        self.threads = threads
+        self.port = port or self._free_port()
+        self.process: Optional[subprocess.Popen] = None
+        self.load_time = None
+
+        self._peak_rss = 0
+        self._sampler_stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(('127.0.0.1', 0))
+            return s.getsockname()[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: float = 180):
+        """Launch the server and wait until the model is loaded."""
+        cmd = [
+            str(self.llamafile_path), '--server', '--nobrowser',
+            '--host', '127.0.0.1', '--port', str(self.port),
+            '-m', str(self.model_path),
+            '-c', str(self.context_size),
+            '--threads', str(self.threads),
+            '-ngl', '0'
+        ]
+        if platform.system() == 'Darwin':
+            cmd.insert(0, 'sh')  # APE binaries need a shell on macOS
+
+        start = time.time()
+        self.process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._start_sampler()
+
+        while time.time() - start < timeout:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"llamafile server exited with code {self.process.returncode}")
+            try:
+                with urllib.request.urlopen(f"{self.base_url}/health", timeout=2) as resp:
+                    if resp.status == 200:
+                        self.load_time = time.time() - start
+                        return
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.25)
+
+        self.stop()
+        raise RuntimeError(f"llamafile server did not become ready within {timeout}s")
+
+    def complete(self, prompt: str, max_tokens: int = 128, temperature: float = 0.1,
+                 timeout: float = 300) -> Dict:
+        """
+        Stream one completion and time it.
+
+        Returns:
+            Dict with text, ttft_ms, total_ms, prompt_tokens, generated_tokens,
+            prompt_eval_rate and tokens_per_sec
+        """
+        body = json.dumps({
+            'prompt': prompt,
+            'n_predict': max_tokens,
+            'temperature': temperature,
+            'stream': True,
+            'cache_prompt': False
+        }).encode('utf-8')
+        request = urllib.request.Request(
+            f"{self.base_url}/completion", data=body,
+            headers={'Content-Type': 'application/json'}
+        )
+
+        start = time.perf_counter()
+        first_token = None
+        pieces = []
+        timings = {}
+
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            for raw_line in resp:
+                line = raw_line.decode('utf-8', 'replace').strip()
+                if not line.startswith('data:'):
+                    continue
+                chunk = json.loads(line[5:].strip())
+                content = chunk.get('content', '')
+                if content:
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    pieces.append(content)
+                if chunk.get('stop'):
+                    timings = chunk.get('timings', {})
+                    break
+
+        end = time.perf_counter()
+        generated = timings.get('predicted_n', len(pieces))
+        gen_ms = timings.get('predicted_ms')
+        return {
+            'text': ''.join(pieces),
+            'ttft_ms': ((first_token or end) - start) * 1000,
+            'total_ms': (end - start) * 1000,
+            'prompt_tokens': timings.get('prompt_n', 0),
+            'generated_tokens': generated,
+            'prompt_eval_rate': timings.get('prompt_per_second'),
+            'tokens_per_sec': timings.get('predicted_per_second') or (
+                generated / (gen_ms / 1000) if gen_ms else None
+            ),
+        }
+
+    def peak_rss_mb(self) -> Optional[float]:
+        """Highest resident set size seen for the server process."""
+        peak = self._peak_rss
+        if self.process and sys.platform.startswith('linux'):
+            try:
+                with open(f"/proc/{self.process.pid}/status") as f:
+                    for line in f:
+                        if line.startswith('VmHWM:'):
+                            peak = max(peak, int(line.split()[1]) * 1024)
+            except OSError:
+                pass
+        return peak / (1024 * 1024) if peak else None
+
+    def _start_sampler(self):
+        if not PSUTIL_AVAILABLE or not self.process:
+            return
+
+        def sample():
+            try:
+                proc = psutil.Process(self.process.pid)
+                while not self._sampler_stop.wait(0.2):
+                    rss = proc.memory_info().rss
+                    for child in proc.children(recursive=True):
+                        rss += child.memory_info().rss
+                    self._peak_rss = max(self._peak_rss, rss)
+            except Exception:
+                pass
+
+        self._sampler = threading.Thread(target=sample, daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """Shut the server down."""
+        self._sampler_stop.set()
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+def validate(prompt: Dict, response: str, tier: int) -> Tuple[bool, int, str]:
+    """Pass/fail a response with ResponseValidator plus the prompt's keywords."""
+    keywords = [k.lower() for k in prompt.get('keywords', [])]
+    keyword_hit = not keywords or any(k in response.lower() for k in keywords)
+
+    result, reason, _ = ResponseValidator.validate_response(
+        prompt['prompt'], prompt.get('description', 'Query:'), response, tier
+    )
+    score = ResponseValidator.get_score(result)
+    return score >= 100 and keyword_hit, score, reason
+
+
+class BenchmarkRunner:
+    """
+    Runs a prompt corpus against one or more models.
+
+    Each model gets a single server instance; `warmup` untimed prompts are
+    sent first so the first measured prompt doesn't pay page-cache/alloc cost.
+    Models run one after another, never side by side: two servers competing
+    for cores and memory bandwidth would skew each other's timings.
+    """
+
+    def __init__(self, llamafile_path: Optional[Path] = None, warmup: int = 1,
+                 repeats: int = 1, max_tokens: int = 128, temperature: float = 0.1,
+                 server_factory: Optional[Callable] = None,
+                 progress: Optional[Callable[[str, int, int], None]] = None):
+        self.llamafile_path = llamafile_path or (PROJECT_ROOT / '.luciferai' / 'bin' / 'llamafile')
+        self.warmup = warmup
+        self.repeats = repeats
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.server_factory = server_factory or (
+            lambda model_path: LlamafileServer(self.llamafile_path, model_path)
+        )
+        self.progress = progress
+
+    def run(self, models: List[Tuple[str, Path, int]], corpus: List[Dict]) -> Dict:
+        """
+        Benchmark every model.
+
+        Args:
+            models: (model_name, model_path, tier) tuples
+            corpus: Prompts from load_corpus()
+
+        Returns:
+            {'meta': ..., 'results': [per-prompt rows], 'summary': {model: ...}}
+        """
+        rows = []
+        summary = {}
+
+        for model_name, model_path, tier in models:
+            model_rows = []
+            try:
+                with self.server_factory(model_path) as server:
+                    for prompt in corpus[:self.warmup]:
+                        server.complete(prompt['prompt'], max_tokens=16, temperature=self.temperature)
+
+                    total = len(corpus) * self.repeats
+                    done = 0
+                    for _ in range(self.repeats):
+                        for prompt in corpus:
+                            model_rows.append(self._run_prompt(server, model_name, tier, prompt))
+                            done += 1
+                            if self.progress:
+                                self.progress(model_name, done, total)
+
+                    summary[model_name] = self._summarize(model_rows, tier, server)
+            except Exception as e:
+                summary[model_name] = {'tier': tier, 'error': str(e)}
+
+            rows.extend(model_rows)
+
+        return {'meta': self._meta(), 'results': rows, 'summary': summary}
+
+    def _run_prompt(self, server, model_name: str, tier: int, prompt: Dict) -> Dict:
+        row = {
+            'model': model_name, 'tier': tier,
+            'prompt': prompt['prompt'], 'description': prompt.get('description', ''),
+            'passed': False, 'score': 0, 'error': None
+        }
+        try:
+            timing = server.complete(prompt['prompt'], max_tokens=self.max_tokens,
+                                     temperature=self.temperature)
+            passed, score, _ = validate(prompt, timing.pop('text'), tier)
+            row.update(timing)
+            row.update({'passed': passed, 'score': score})
+        except Exception as e:
+            row['error'] = str(e)
+        return row
+
+    @staticmethod
+    def _summarize(rows: List[Dict], tier: int, server) -> Dict:
+        ok = [r for r in rows if not r['error']]
+
+        def mean(key):
+            values = [r[key] for r in ok if r.get(key) is not None]
+            return statistics.mean(values) if values else None
+
+        return {
+            'tier': tier,
+            'prompts': len(rows),
+            'passed': sum(1 for r in rows if r['passed']),
+            'pass_rate': (sum(1 for r in rows if r['passed']) / len(rows) * 100) if rows else 0.0,
+            'errors': len(rows) - len(ok),
+            'load_time_s': getattr(server, 'load_time', None),
+            'ttft_ms_p50': percentile([r['ttft_ms'] for r in ok], 50),
+            'ttft_ms_p95': percentile([r['ttft_ms'] for r in ok], 95),
+            'tokens_per_sec': mean('tokens_per_sec'),
+            'prompt_eval_rate': mean('prompt_eval_rate'),
+            'peak_rss_mb': server.peak_rss_mb() if hasattr(server, 'peak_rss_mb') else None,
+        }
+
+    @staticmethod
+    def _meta() -> Dict:
+        """Identify the commit and machine so runs can be compared."""
+        commit = None
+        try:
+            result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                    capture_output=True, text=True, timeout=5)
+            if result.returncode == 0:
+                commit = result.stdout.strip()
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'git_commit': commit,
+            'machine': platform.machine(),
+            'system': f"{platform.system()} {platform.release()}",
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+        }
+
+
+def save_results(results: Dict, out_dir: Optional[Path] = None) -> Tuple[Path, Path]:
+    """Write results as <stamp>_<commit>.json and .csv; returns both paths."""
+    out_dir = Path(out_dir or DEFAULT_RESULTS_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    meta = results['meta']
+    stamp = datetime.fromisoformat(meta['timestamp']).strftime('%Y%m%d_%H%M%S')
+    base = out_dir / f"benchmark_{stamp}_{meta.get('git_commit') or 'nogit'}"
+
+    json_path = base.with_suffix('.json')
+    with open(json_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    csv_path = base.with_suffix('.csv')
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results['results'])
+
+    return json_path, csv_path
+
+
+def detect_benchmark_models(models_dir: Optional[Path] = None) -> List[Tuple[str, Path, int]]:
+    """Installed GGUF models as (canonical_name, path, tier), lowest tier first."""
+    from core.model_files_map import get_all_models
+
+    models_dir = models_dir or (PROJECT_ROOT / '.luciferai' / 'models')
+    found = []
+    seen_files = set()
+    for info in get_all_models():
+        path = models_dir / info['file']
+        if info['file'] not in seen_files and path.exists():
+            seen_files.add(info['file'])
+            found.append((info['canonical_name'], path, info['tier']))
+    return sorted(found, key=lambda m: m[2])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+    parser = argparse.ArgumentParser(description="Benchmark installed GGUF models")
+    parser.add_argument('--models', nargs='*', help="Model names to include (default: all installed)")
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument('--max-tier', type=int, default=None)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=1)
+    parser.add_argument('--max-tokens', type=int, default=128)
+    parser.add_argument('--out', type=Path, default=DEFAULT_RESULTS_DIR)
+    args = parser.parse_args()
+
+    models = detect_benchmark_models()
+    if args.models:
+        models = [m for m in models if m[0] in args.models]
+    if not models:
+        print("❌ No installed models to benchmark")
+        sys.exit(1)
+
+    runner = BenchmarkRunner(
+        warmup=args.warmup, repeats=args.repeats, max_tokens=args.max_tokens,
+        progress=lambda model, done, total: print(f"\r  {model}: {done}/{total}", end='', flush=True)
+    )
+    results = runner.run(models, load_corpus(args.corpus, args.max_tier))
+    print()
+
+    for model, s in results['summary'].items():
+        if 'error' in s:
+            print(f"  {model:<15} ❌ {s['error']}")
+        else:
+            tps = f"{s['tokens_per_sec']:.1f}" if s['tokens_per_sec'] else '-'
+            ttft = f"{s['ttft_ms_p50']:.0f}" if s['ttft_ms_p50'] else '-'
+            print(f"  {model:<15} pass {s['pass_rate']:.0f}%  ttft p50 {ttft} ms  {tps} tok/s")
+
+    json_path, csv_path = save_results(results, args.out)
+    print(f"\n📁 {json_path}\n📁 {csv_path}")
@@ -1,32 +1,448 @@
 #!/usr/bin/env python3
 """
 📥 Model Download System - GGUF file downloader
-Downloads GGUF model files from HuggingFace with progress tracking and resume capability
+Downloads GGUF model files from HuggingFace with progress tracking and resume capability.
+Large files are fetched over several pooled connections as byte ranges into a
+preallocated file, with a resumable sidecar manifest and streaming SHA-256.
 """
 import requests
+import hashlib
+import json
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_EXCEPTION
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, List
+from queue import Queue
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
+try:
+    from core.integrity_cache import read_recorded_sha256
+except ImportError:
+    from integrity_cache import read_recorded_sha256
+
+try:
+    from core.gguf_catalog import ModelCatalog, get_model_catalog
+except ImportError:
+    from gguf_catalog import ModelCatalog, get_model_catalog
+
+
+class DownloadCancelled(Exception):
+    """Download stopped on request; the partial file and manifest are kept for resume."""
+
+
+class RangeNotSupported(Exception):
+    """Server cannot serve byte ranges (or size is unknown) - use a single stream."""
+
+
+class BandwidthLimiter:
+    """Token bucket shared by every connection of every active download."""
+    
+    def __init__(self, bytes_per_sec: int = 0):
+        self.bytes_per_sec = bytes_per_sec  # 0 = unlimited
+        self._lock = threading.Lock()
+        self._allowance = 0.0
+        self._last = time.monotonic()
+    
+    def consume(self, nbytes: int):
+        """Block until `nbytes` fit under the cap."""
+        rate = self.bytes_per_sec
+        if rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(float(rate), self._allowance + (now - self._last) * rate)
+            self._last = now
+            self._allowance -= nbytes
+            delay = -self._allowance / rate if self._allowance < 0 else 0
+        if delay:
+            time.sleep(delay)
+
+
+# Shared by all downloads in this process
+_bandwidth_limiter = BandwidthLimiter()
+_cancel_downloads = threading.Event()
+
+
+def set_bandwidth_limit(bytes_per_sec: int):
+    """Cap total download bandwidth across all connections (0 = unlimited)."""
+    _bandwidth_limiter.bytes_per_sec = max(0, int(bytes_per_sec or 0))
+
+
+class RangedDownloader:
+    """
+    Multi-connection download into a preallocated (sparse) file.
+    
+    The file is split into byte ranges that N workers fetch over one pooled
+    requests.Session. Per-range progress is saved to <file>.download.json so an
+    interrupted download resumes where each range stopped. SHA-256 is computed
+    in file order as the contiguous downloaded prefix grows, reading back the
+    freshly written (page-cached) bytes, so no separate hashing pass is needed.
+    """
+    
+    MANIFEST_VERSION = 1
+    MIN_RANGE_SIZE = 8 * 1024 * 1024
+    RANGES_PER_CONNECTION = 4      # More ranges than workers keeps every connection busy
+    SAVE_INTERVAL = 2.0            # Seconds between manifest writes
+    
+    def __init__(
+        self,
+        url: str,
+        output_path: Path,
+        connections: int = 4,
+        chunk_size: int = 1024 * 1024,
+        session: Optional[requests.Session] = None,
+        limiter: Optional[BandwidthLimiter] = None,
+        cancel_event: Optional[threading.Event] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        range_retries: int = 5,
+        show_progress: bool = True,
+        progress_position: Optional[int] = None
+    ):
+        self.url = url
+        self.output_path = Path(output_path)
+        self.part_path = self.output_path.with_name(self.output_path.name + '.part')
+        self.manifest_path = self.output_path.with_name(self.output_path.name + '.download.json')
+        self.connections = max(1, connections)
+        self.chunk_size = chunk_size
+        self.limiter = limiter or _bandwidth_limiter
+        self.cancel_event = cancel_event or _cancel_downloads
+        self.progress_callback = progress_callback
+        self.range_retries = range_retries
+        self.show_progress = show_progress
+        self.progress_position = progress_position
+        
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.connections)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+        
+        self._lock = threading.Lock()
+        self._ranges: List[Dict] = []
+        self._size = 0
+        self._etag = None
+        self._downloaded = 0
+        self._stop = threading.Event()  # Stops sibling workers of this download only
+    
+    def _cancelled(self) -> bool:
+        return self._stop.is_set() or self.cancel_event.is_set()
+    
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+    
+    def probe(self):
+        """Return (size, etag); raises RangeNotSupported if ranges cannot be used."""
+        response = self.session.get(self.url, headers={'Range': 'bytes=0-0'}, stream=True, timeout=(60, 120))
+        try:
+            response.raise_for_status()
+            content_range = response.headers.get('Content-Range', '')
+            if response.status_code != 206 or '/' not in content_range:
+                raise RangeNotSupported(self.url)
+            total = content_range.rsplit('/', 1)[1]
+            if not total.isdigit():
+                raise RangeNotSupported(self.url)
+            return int(total), response.headers.get('ETag')
+        finally:
+            response.close()
+    
+    def _plan_ranges(self, size: int) -> List[Dict]:
+        range_size = max(self.MIN_RANGE_SIZE, -(-size // (self.connections * self.RANGES_PER_CONNECTION)))
+        return [
+            {'start': start, 'end': min(size, start + range_size) - 1, 'next': start}
+            for start in range(0, size, range_size)
+        ]
+    
+    def _load_manifest(self, size: int, etag: Optional[str]) -> Optional[List[Dict]]:
+        """Ranges from a previous attempt, if it matches this file on the server."""
+        if not self.manifest_path.exists() or not self.part_path.exists():
+            return None
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (manifest.get('version') != self.MANIFEST_VERSION or manifest.get('url') != self.url
+                or manifest.get('size') != size or manifest.get('etag') != etag
+                or self.part_path.stat().st_size != size):
+            return None
+        return manifest.get('ranges')
+    
+    def _save_manifest(self):
+        with self._lock:
+            manifest = {
+                'version': self.MANIFEST_VERSION,
+                'url': self.url,
+                'size': self._size,
+                'etag': self._etag,
+                'ranges': [dict(r) for r in self._ranges],
+                'updated': time.time()
+            }
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        tmp_path.replace(self.manifest_path)
+    
+    # ------------------------------------------------------------------
+    # Transfer
+    # ------------------------------------------------------------------
+    
+    def _fetch_range(self, rng: Dict):
+        """
+        Download one byte range, retrying from where it stopped.
+        
+        Gives up after `range_retries` consecutive attempts that fail or
+        deliver no bytes (e.g. a 206 with an empty body).
+        """
+        failures = 0
+        with open(self.part_path, 'r+b', buffering=0) as f:
+            while rng['next'] <= rng['end']:
+                if self._cancelled():
+                    raise DownloadCancelled(self.url)
+                before = rng['next']
+                try:
+                    response = self.session.get(
+                        self.url,
+                        headers={'Range': f"bytes={rng['next']}-{rng['end']}"},
+                        stream=True,
+                        timeout=(60, 120)
+                    )
+                    with response:
+                        if response.status_code != 206:
+                            response.raise_for_status()
+                            raise RangeNotSupported(self.url)
+                        f.seek(rng['next'])
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            if self._cancelled():
+                                raise DownloadCancelled(self.url)
+                            chunk = chunk[:rng['end'] + 1 - rng['next']]
+                            if not chunk:
+                                continue
+                            self.limiter.consume(len(chunk))
+                            view = memoryview(chunk)
+                            while view:
+                                view = view[f.write(view):]
+                            with self._lock:
+                                rng['next'] += len(chunk)
+                                self._downloaded += len(chunk)
+                            if rng['next'] > rng['end']:
+                                break
+                    if rng['next'] > before:
+                        failures = 0
+                        continue
+                    failures += 1
+                    if failures > self.range_retries:
+                        raise IOError(f"No data for bytes {rng['next']}-{rng['end']} after {failures} attempts")
+                except requests.exceptions.RequestException:
+                    failures += 1
+                    if failures > self.range_retries:
+                        raise
+                    # Backoff, but wake up promptly on cancel
+                    deadline = time.time() + min(30, 2 * failures)
+                    while time.time() < deadline and not self._cancelled():
+                        self._stop.wait(0.25)
+    
+    def discard(self):
+        """Delete the partial file and its manifest."""
+        for path in (self.part_path, self.manifest_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+    
+    def _hashed_prefix_end(self) -> int:
+        """End of the contiguous downloaded prefix."""
+        with self._lock:
+            for rng in self._ranges:
+                if rng['next'] <= rng['end']:
+                    return rng['next']
+        return self._size
+    
+    def _advance_hash(self, hasher, offset: int, reader) -> int:
+        end = self._hashed_prefix_end()
+        if end > offset:
+            reader.seek(offset)
+            while offset < end:
+                block = reader.read(min(self.chunk_size, end - offset))
+                if not block:
+                    break
+                hasher.update(block)
+                offset += len(block)
+        return offset
+    
+    def run(self) -> str:
+        """
+        Download (or resume) the file.
+        
+        Returns:
+            Hex SHA-256 of the completed file
+        
+        Raises:
+            RangeNotSupported, DownloadCancelled, requests.exceptions.RequestException
+        """
+        self._stop.clear()
+        self._size, self._etag = self.probe()
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        ranges = self._load_manifest(self._size, self._etag)
+        if ranges is None:
+            ranges = self._plan_ranges(self._size)
+            with open(self.part_path, 'wb') as f:
+                f.truncate(self._size)  # Sparse preallocation
+        self._ranges = sorted(ranges, key=lambda r: r['start'])
+        self._downloaded = sum(r['next'] - r['start'] for r in self._ranges)
+        self._save_manifest()
+        
+        if self._downloaded and self.show_progress:
+            print(f"📦 Resuming ranged download: {self._downloaded / (1024*1024):.1f}MB already on disk")
+        
+        hasher = hashlib.sha256()
+        hashed = 0
+        reported = self._downloaded
+        last_save = time.time()
+        
+        pbar = None
+        if self.show_progress:
+            pbar = tqdm(
+                total=self._size,
+                initial=self._downloaded,
+                unit='B',
+                unit_scale=True,
+                unit_divisor=1024,
+                desc=f"📥 {self.output_path.name}",
+                bar_format='{desc}: {percentage:3.0f}%|█{bar}█| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]',
+                ncols=100,
+                position=self.progress_position,
+                leave=self.progress_position is None
+            )
+        
+        try:
+            with open(self.part_path, 'rb') as reader, ThreadPoolExecutor(max_workers=self.connections) as pool:
+                pending = {pool.submit(self._fetch_range, r) for r in self._ranges if r['next'] <= r['end']}
+                try:
+                    while pending:
+                        done, pending = wait(pending, timeout=0.25, return_when=FIRST_EXCEPTION)
+                        for future in done:
+                            future.result()
+                        
+                        hashed = self._advance_hash(hasher, hashed, reader)
+                        downloaded = self._downloaded
+                        if pbar and downloaded > reported:
+                            pbar.update(downloaded - reported)
+                        reported = downloaded
+                        if self.progress_callback:
+                            self.progress_callback(downloaded, self._size)
+                        if time.time() - last_save >= self.SAVE_INTERVAL:
+                            self._save_manifest()
+                            last_save = time.time()
+                except BaseException:
+                    # Stop the other workers and keep what they wrote for resume
+                    self._stop.set()
+                    wait(pending)
+                    self._save_manifest()
+                    raise
+                
+                hashed = self._advance_hash(hasher, hashed, reader)
+        finally:
+            if pbar:
+                pbar.close()
+        
+        if hashed != self._size:
+            raise IOError(f"Hashed {hashed} of {self._size} bytes")
+        
+        digest = hasher.hexdigest()
+        self.part_path.replace(self.output_path)
+        self.manifest_path.unlink()
+        self.output_path.with_name(self.output_path.name + '.sha256').write_text(
+            f"{digest}  {self.output_path.name}\n"
+        )
+        return digest
+
+
+def _download_ranged(
+    url: str,
+    output_path: Path,
+    connections: int,
+    progress_callback: Optional[Callable[[int, int], None]],
+    expected_sha256: Optional[str],
+    progress_position: Optional[int]
+) -> Optional[bool]:
+    """Ranged download with unlimited resume/retry; None means fall back to one stream."""
+    downloader = RangedDownloader(
+        url, output_path,
+        connections=connections,
+        progress_callback=progress_callback,
+        progress_position=progress_position
+    )
+    retry_count = 0
+    
+    while True:
+        try:
+            digest = downloader.run()
+        except RangeNotSupported:
+            # Ranges written so far cannot be resumed by a single stream
+            downloader.discard()
+            print("💡 Server does not support ranged downloads, using a single connection")
+            return None
+        except (DownloadCancelled, KeyboardInterrupt):
+            print(f"\n⏸️  Download paused: {output_path.name}")
+            print("   Partial data kept - run the install command again to resume")
+            return False
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Download failed: {e}")
+            retry_count += 1
+            wait_time = min(30, 5 * retry_count)
+            print(f"⏳ Waiting {wait_time}s before resuming...")
+            if _cancel_downloads.wait(wait_time):
+                return False
+            continue
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+            return False
+        
+        if expected_sha256 and digest.lower() != expected_sha256.lower():
+            print(f"❌ SHA-256 mismatch for {output_path.name}")
+            print(f"   Expected: {expected_sha256}")
+            print(f"   Actual:   {digest}")
+            output_path.unlink()
+            output_path.with_name(output_path.name + '.sha256').unlink()
+            return False
+        
+        print(f"✅ Download complete: {output_path.name}")
+        print(f"📊 Size: {output_path.stat().st_size / (1024*1024):.1f}MB (SHA-256 {digest[:12]}…)")
+        return True
+
 
 def download_gguf_model(
     url: str,
     output_path: Path,
     progress_callback: Optional[Callable[[int, int], None]] = None,
     chunk_size: int = 8192,
-    max_retries: int = None
+    max_retries: int = None,
+    connections: int = 4,
+    expected_sha256: Optional[str] = None,
+    progress_position: Optional[int] = None
 ) -> bool:
     """
     Download a GGUF model file from HuggingFace with progress tracking and unlimited auto-retry.
     
+    Uses RangedDownloader over `connections` pooled connections when the server
+    supports byte ranges, otherwise a single resumable stream.
+    
     Args:
         url: HuggingFace download URL
         output_path: Path to save the downloaded file
         progress_callback: Optional callback(downloaded_bytes, total_bytes)
-        chunk_size: Download chunk size in bytes (default 8KB)
+        chunk_size: Download chunk size in bytes for the single-stream path (default 8KB)
         max_retries: Not used (kept for compatibility) - retries are unlimited
+        connections: Parallel range connections (1 = single stream)
+        expected_sha256: Optional digest the ranged download must match
+        progress_position: tqdm row when several downloads run at once
     
     Returns:
         True if successful, False otherwise
@@ -34,6 +450,12 @@ def download_gguf_model(
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
+    if connections > 1:
+        result = _download_ranged(url, output_path, connections, progress_callback,
+                                  expected_sha256, progress_position)
+        if result is not None:
+            return result
+    
     retry_count = 0
     start_time = __import__('time').time()
     
@@ -53,16 +475,16 @@ def download_gguf_model(
                     with open(output_path, 'rb') as f:
                         magic = f.read(4)
                         if magic != b'GGUF':
-                            print(f"⚠️  Partial file corrupted (invalid GGUF header)")
-                            print(f"   Deleting and restarting download...")
+                            print("⚠️  Partial file corrupted (invalid GGUF header)")
+                            print("   Deleting and restarting download...")
                             output_path.unlink()
                             file_size = 0
                         else:
                             if retry_count == 0:
-                                print(f"✅ Partial file validated (GGUF header OK)")
+                                print("✅ Partial file validated (GGUF header OK)")
                 except Exception as e:
                     print(f"⚠️  Error reading partial file: {e}")
-                    print(f"   Deleting and restarting download...")
+                    print("   Deleting and restarting download...")
                     output_path.unlink()
                     file_size = 0
             
@@ -162,7 +584,7 @@ def download_gguf_model(
                 try:
                     output_path.unlink()
                     print(f"🗑️  Deleted partial download: {output_path.name}")
-                    print(f"   Run the install command again to restart")
+                    print("   Run the install command again to restart")
                 except Exception as e:
                     print(f"⚠️  Could not delete partial file: {e}")
                     print(f"📦 Partial file at: {output_path}")
@@ -174,12 +596,13 @@ def download_gguf_model(
             return False
 
 
-def verify_gguf_file(file_path: Path) -> bool:
+def verify_gguf_file(file_path: Path, expected_sha256: Optional[str] = None) -> bool:
     """
     Verify that a GGUF file is valid (basic check).
     
     Args:
         file_path: Path to GGUF file
+        expected_sha256: Optional digest to compare with the one recorded at download
     
     Returns:
         True if file appears valid, False otherwise
@@ -193,17 +616,28 @@ def verify_gguf_file(file_path: Path) -> bool:
         print(f"⚠️  Warning: File size is unusually small ({file_size / (1024*1024):.1f}MB)")
         return False
     
-    # Check GGUF magic header (first 4 bytes should be "GGUF")
+    # Check GGUF magic header (first 4 bytes should be "GGUF") and format version
     try:
         with open(file_path, 'rb') as f:
             magic = f.read(4)
             if magic != b'GGUF':
-                print(f"❌ Invalid GGUF file: missing magic header")
+                print("❌ Invalid GGUF file: missing magic header")
+                return False
+            version = int.from_bytes(f.read(4), 'little')
+            if not 1 <= version <= 3:
+                print(f"❌ Invalid GGUF file: unknown format version {version}")
                 return False
     except Exception as e:
         print(f"❌ Error reading file: {e}")
         return False
     
+    # Ranged downloads record the SHA-256 computed while writing
+    if expected_sha256:
+        recorded = read_recorded_sha256(file_path)
+        if recorded and recorded.lower() != expected_sha256.lower():
+            print(f"❌ SHA-256 mismatch: recorded {recorded[:12]}…, expected {expected_sha256[:12]}…")
+            return False
+    
     return True
 
 
@@ -211,7 +645,10 @@ def download_model_by_name(
     model_name: str,
     output_dir: Optional[Path] = None,
     force: bool = False,
-    force_prompt: bool = False
+    force_prompt: bool = False,
+    interactive: bool = True,
+    connections: int = 4,
+    progress_position: Optional[int] = None
 ) -> bool:
     """
     Download a model by name using the model files mapping.
@@ -221,6 +658,9 @@ def download_model_by_name(
         output_dir: Optional output directory (defaults to .luciferai/models)
         force: Force re-download even if file exists
         force_prompt: Prompt user before overwriting existing files
+        interactive: If False, never prompt - keep valid installs, replace broken ones
+        connections: Parallel range connections for this download
+        progress_position: tqdm row when several downloads run at once
     
     Returns:
         True if successful, False otherwise
@@ -254,7 +694,7 @@ def download_model_by_name(
         expected_size_mb = model_info.get('expected_size_mb', 0)
         
         # Check file integrity
-        is_valid = verify_gguf_file(output_path)
+        is_valid = verify_gguf_file(output_path, model_info.get('sha256'))
         
         # Check if size matches expected (allow 5% tolerance)
         size_ok = True
@@ -262,8 +702,14 @@ def download_model_by_name(
             size_diff_percent = abs(actual_size_mb - expected_size_mb) / expected_size_mb * 100
             size_ok = size_diff_percent < 5
         
+        if not interactive:
+            if is_valid and size_ok:
+                print(f"✅ {canonical_name.upper()} is already installed ({actual_size_mb:.1f}MB)")
+                return True
+            print(f"⚠️  Existing {model_file} failed integrity check - re-downloading")
+            output_path.unlink()
         # If force_prompt is enabled, use the new prompt logic
-        if force_prompt:
+        elif force_prompt:
             if is_valid and size_ok:
                 print(f"✅ {canonical_name.upper()} is already installed")
                 print(f"   Size: {actual_size_mb:.1f}MB (matches expected {expected_size_mb:.0f}MB)")
@@ -282,11 +728,11 @@ def download_model_by_name(
             else:
                 # File is corrupt or incomplete
                 if not size_ok and expected_size_mb > 0:
-                    print(f"⚠️  Existing file size mismatch:")
+                    print("⚠️  Existing file size mismatch:")
                     print(f"   Expected: {expected_size_mb:.1f}MB")
                     print(f"   Actual: {actual_size_mb:.1f}MB")
                 else:
-                    print(f"⚠️  Existing file failed integrity check")
+                    print("⚠️  Existing file failed integrity check")
                 print("🔄 Re-downloading...")
                 print()
                 output_path.unlink()
@@ -296,7 +742,7 @@ def download_model_by_name(
                 print(f"✅ Model already installed: {model_file}")
                 print(f"   Location: {output_path}")
                 print(f"   Size: {actual_size_mb:.1f}MB")
-                print(f"\n⚠️  Model is already installed.")
+                print("\n⚠️  Model is already installed.")
                 
                 # Prompt to overwrite
                 try:
@@ -312,13 +758,13 @@ def download_model_by_name(
             else:
                 # File is corrupt or incomplete
                 if not size_ok and expected_size_mb > 0:
-                    print(f"⚠️  Existing file size mismatch:")
+                    print("⚠️  Existing file size mismatch:")
                     print(f"   Expected: {expected_size_mb:.1f}MB")
                     print(f"   Actual: {actual_size_mb:.1f}MB")
                 else:
-                    print(f"⚠️  Existing file failed integrity check")
+                    print("⚠️  Existing file failed integrity check")
                 
-                print(f"🔄 Re-downloading...")
+                print("🔄 Re-downloading...")
                 output_path.unlink()
     
     # Get download URL
@@ -329,26 +775,99 @@ def download_model_by_name(
     print(f"   Tier: {model_info['tier']} ({model_info['tier_name']})")
     print(f"   Parameters: {model_info['tier_params']}")
     print(f"   File: {model_file}")
-    print(f"   Source: HuggingFace")
+    print("   Source: HuggingFace")
     print()
     
     # Download
-    success = download_gguf_model(url, output_path)
+    success = download_gguf_model(
+        url, output_path,
+        connections=connections,
+        expected_sha256=model_info.get('sha256'),
+        progress_position=progress_position
+    )
     
     if success:
         # Verify downloaded file
-        if verify_gguf_file(output_path):
+        if verify_gguf_file(output_path, model_info.get('sha256')):
             print(f"\n✅ {canonical_name.upper()} installed successfully!")
             print(f"   Location: {output_path}")
             return True
         else:
-            print(f"\n❌ Downloaded file failed verification")
+            print("\n❌ Downloaded file failed verification")
             output_path.unlink()  # Delete corrupt file
             return False
     else:
         return False
 
 
+def download_models_concurrently(
+    model_names: List[str],
+    max_parallel: int = 2,
+    bandwidth_limit: int = 0,
+    output_dir: Optional[Path] = None,
+    connections: int = 4,
+    on_complete: Optional[Callable[[str, bool], None]] = None
+) -> Dict[str, bool]:
+    """
+    Download several models at once under a shared bandwidth cap.
+    
+    Args:
+        model_names: Models to install (already-valid installs are kept)
+        max_parallel: Models downloading at the same time
+        bandwidth_limit: Total bytes/sec across all downloads (0 = unlimited)
+        output_dir: Optional output directory (defaults to .luciferai/models)
+        connections: Range connections per model
+        on_complete: Optional callback(model_name, success), called as each finishes
+    
+    Returns:
+        Dict of model name -> success
+    
+    On Ctrl+C every active download is paused (partial data kept) and
+    KeyboardInterrupt is re-raised.
+    """
+    set_bandwidth_limit(bandwidth_limit)
+    _cancel_downloads.clear()
+    
+    # One progress-bar row per download slot
+    slots: Queue = Queue()
+    for position in range(max(1, max_parallel)):
+        slots.put(position)
+    
+    def install(name: str) -> bool:
+        position = slots.get()
+        try:
+            return download_model_by_name(
+                name, output_dir,
+                interactive=False,
+                connections=connections,
+                progress_position=position
+            )
+        finally:
+            slots.put(position)
+    
+    results: Dict[str, bool] = {}
+    pool = ThreadPoolExecutor(max_workers=max(1, max_parallel))
+    futures = {pool.submit(install, name): name for name in model_names}
+    try:
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = bool(future.result())
+            except Exception as e:
+                print(f"❌ {name}: {e}")
+                results[name] = False
+            if on_complete:
+                on_complete(name, results[name])
+    except KeyboardInterrupt:
+        _cancel_downloads.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    finally:
+        pool.shutdown(wait=True)
+    
+    return results
+
+
 def list_installed_models(models_dir: Optional[Path] = None) -> list:
     """
     List all installed GGUF models.
@@ -366,24 +885,23 @@ def list_installed_models(models_dir: Optional[Path] = None) -> list:
     if not models_dir.exists():
         return []
     
-    from core.model_files_map import MODEL_FILES, get_canonical_name
     from core.model_tiers import get_model_tier
     
+    catalog = get_model_catalog()
+    if models_dir not in catalog.models_dirs:
+        # Catalog a one-off directory on its own rather than widening the shared catalog
+        catalog = ModelCatalog(cache_file=catalog.cache_file, models_dirs=[models_dir])
+        catalog.refresh()
+    
     installed = []
     
-    # Check all .gguf files
-    for gguf_file in models_dir.glob('*.gguf'):
-        # Try to match to a known model
-        model_name = None
-        for name, filename in MODEL_FILES.items():
-            if gguf_file.name == filename:
-                model_name = get_canonical_name(name)
-                break
-        
-        if model_name:
-            size_mb = gguf_file.stat().st_size / (1024 * 1024)
+    # Only files that exactly match a known model's filename
+    for entry in catalog.entries(models_dir):
+        if entry.get('exact'):
+            model_name = entry['model']
+            size_mb = entry['size'] / (1024 * 1024)
             tier = get_model_tier(model_name)
-            installed.append((model_name, gguf_file, size_mb, tier))
+            installed.append((model_name, Path(entry['path']), size_mb, tier))
     
     # Sort by tier, then name
     return sorted(installed, key=lambda x: (x[3], x[0]))
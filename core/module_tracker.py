@@ -8,11 +8,18 @@ Track and display packages from all sources:
 """
 import os
 import sys
-import json
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 
+try:
+    from core.env_probe import (current_packages, env_packages, brew_packages, conda_packages,
+                                get_probe_cache, PROBE_WORKERS)
+except ImportError:
+    from env_probe import (current_packages, env_packages, brew_packages, conda_packages,
+                           get_probe_cache, PROBE_WORKERS)
+
 # Colors
 PURPLE = '\033[35m'
 GREEN = '\033[32m'
@@ -47,53 +54,25 @@ class ModuleTracker:
         """Scan all package sources."""
         print(f"{YELLOW}🔍 Scanning module environments...{RESET}\n")
         
-        self._scan_system_pip()
-        self._scan_brew()
-        self._scan_conda()
-        self._scan_luciferai_global()
-        self._scan_active_luci_env()
+        # Each source is an independent probe (mostly cache hits on repeat runs)
+        scans = [self._scan_system_pip, self._scan_brew, self._scan_conda,
+                 self._scan_luciferai_global, self._scan_active_luci_env]
+        with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(scans))) as pool:
+            for future in [pool.submit(scan) for scan in scans]:
+                future.result()
+        get_probe_cache().save()
     
     def _scan_system_pip(self):
         """Scan system-wide pip packages."""
         try:
-            result = subprocess.run(
-                [sys.executable, "-m", "pip", "list", "--format", "json"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                packages = json.loads(result.stdout)
-                self.system_packages = {
-                    pkg['name']: pkg['version'] for pkg in packages
-                }
+            self.system_packages = dict(current_packages())
         except Exception as e:
             print(f"{DIM}⚠️  Could not scan system pip: {e}{RESET}")
     
     def _scan_brew(self):
-        """Scan Homebrew packages."""
+        """Scan Homebrew packages (read from the Cellar; empty when brew isn't installed)."""
         try:
-            result = subprocess.run(
-                ["brew", "list", "--versions"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                for line in result.stdout.strip().split('\n'):
-                    if line:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            name = parts[0]
-                            version = parts[1]
-                            self.brew_packages.append({
-                                'name': name,
-                                'version': version
-                            })
-        except FileNotFoundError:
-            pass  # Brew not installed
+            self.brew_packages = list(brew_packages())
         except Exception as e:
             print(f"{DIM}⚠️  Could not scan brew: {e}{RESET}")
     
@@ -104,19 +83,7 @@ class ModuleTracker:
             return
         
         try:
-            result = subprocess.run(
-                ["conda", "list", "--json"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                packages = json.loads(result.stdout)
-                self.conda_packages = [
-                    {'name': pkg['name'], 'version': pkg['version']}
-                    for pkg in packages
-                ]
+            self.conda_packages = list(conda_packages(Path(conda_prefix)))
         except Exception as e:
             print(f"{DIM}⚠️  Could not scan conda: {e}{RESET}")
     
@@ -132,18 +99,7 @@ class ModuleTracker:
             return
         
         try:
-            result = subprocess.run(
-                [str(pip_exe), "list", "--format", "json"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                packages = json.loads(result.stdout)
-                self.luciferai_packages = {
-                    pkg['name']: pkg['version'] for pkg in packages
-                }
+            self.luciferai_packages = dict(env_packages(LUCIFERAI_GLOBAL_ENV))
         except Exception as e:
             print(f"{DIM}⚠️  Could not scan LuciferAI global env: {e}{RESET}")
     
@@ -187,18 +143,7 @@ class ModuleTracker:
             return
         
         try:
-            result = subprocess.run(
-                [str(pip_exe), "list", "--format", "json"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                packages = json.loads(result.stdout)
-                self.active_env_packages = {
-                    pkg['name']: pkg['version'] for pkg in packages
-                }
+            self.active_env_packages = dict(env_packages(env_path))
         except Exception as e:
             print(f"{DIM}⚠️  Could not scan active Luci env: {e}{RESET}")
     
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+📈 Performance Metrics - Persistent latency/throughput store across sessions
+Records per-request LLM latency and token rates, route latency and cache
+hits in ~/.luciferai/perf_metrics.db, tagged with the code version and model
+file signature so `perf report` can show trends and flag regressions.
+"""
+import re
+import sqlite3
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+KIND_LLM = 'llm'      # key = model name
+KIND_ROUTE = 'route'  # key = master controller route type
+KIND_CACHE = 'cache'  # key = cache name, hit = 0/1
+
+RETENTION_DAYS = 90
+
+# llama.cpp/llamafile timing lines on stderr, e.g.
+#   llama_print_timings: prompt eval time =   120.00 ms /    20 tokens
+#   llama_print_timings:        eval time =  1480.00 ms /    37 runs
+_PROMPT_EVAL_RE = re.compile(r'prompt eval time\s*=\s*([\d.]+)\s*ms\s*/\s*(\d+)\s+tokens')
+_EVAL_RE = re.compile(r'(?<!prompt )eval time\s*=\s*([\d.]+)\s*ms\s*/\s*(\d+)\s+runs')
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (None for empty input)."""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    rank = max(0, min(len(values) - 1, int(round(pct / 100 * (len(values) - 1)))))
+    return values[rank]
+
+
+def parse_llama_timings(stderr: str) -> Dict:
+    """Token counts and eval times (ms) from llama.cpp timing output; missing values are 0."""
+    stats = {'prompt_tokens': 0, 'generated_tokens': 0, 'prompt_eval_ms': 0.0, 'eval_ms': 0.0}
+    prompt_match = _PROMPT_EVAL_RE.search(stderr or '')
+    if prompt_match:
+        stats['prompt_eval_ms'] = float(prompt_match.group(1))
+        stats['prompt_tokens'] = int(prompt_match.group(2))
+    eval_match = _EVAL_RE.search(stderr or '')
+    if eval_match:
+        stats['eval_ms'] = float(eval_match.group(1))
+        stats['generated_tokens'] = int(eval_match.group(2))
+    return stats
+
+
+def code_version() -> str:
+    """Short git commit of the running code (cached), or 'unknown'."""
+    if not hasattr(code_version, '_value'):
+        value = 'unknown'
+        try:
+            result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                    capture_output=True, text=True, timeout=5)
+            if result.returncode == 0 and result.stdout.strip():
+                value = result.stdout.strip()
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        code_version._value = value
+    return code_version._value
+
+
+def model_signature(model: str) -> str:
+    """Identify the installed model file (size + mtime) so swaps show up as a new version."""
+    try:
+        from core.model_files_map import get_model_file, get_canonical_name
+    except ImportError:
+        from model_files_map import get_model_file, get_canonical_name
+
+    try:
+        model_file = get_model_file(get_canonical_name(model))
+    except Exception:
+        model_file = None
+    if not model_file:
+        return 'unknown'
+
+    for models_dir in (PROJECT_ROOT / 'models', PROJECT_ROOT / '.luciferai' / 'models',
+                       Path.home() / '.luciferai' / 'models'):
+        path = models_dir / model_file
+        if path.exists():
+            st = path.stat()
+            return f"{st.st_size:x}-{int(st.st_mtime):x}"
+    return 'unknown'
+
+
+class PerfMetricsStore:
+    """
+    Append-only sample store with aggregate queries.
+
+    Each sample carries a `version` (code commit + model signature); a
+    regression is a metric that got worse between the two most recent
+    versions of the same model/route.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or (Path.home() / ".luciferai" / "perf_metrics.db"))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._model_versions: Dict[str, str] = {}
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock:
+            self._conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS samples (
+                    id INTEGER PRIMARY KEY,
+                    ts REAL NOT NULL,
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    version TEXT,
+                    tier INTEGER,
+                    latency_ms REAL,
+                    ttft_ms REAL,
+                    prompt_tokens INTEGER,
+                    generated_tokens INTEGER,
+                    tokens_per_sec REAL,
+                    hit INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS idx_samples_key ON samples(kind, key, ts);
+            """)
+            self._conn.execute("DELETE FROM samples WHERE ts < ?", (time.time() - RETENTION_DAYS * 86400,))
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def _version_for(self, model: Optional[str]) -> str:
+        if not model:
+            return code_version()
+        if model not in self._model_versions:
+            self._model_versions[model] = f"{code_version()}:{model_signature(model)}"
+        return self._model_versions[model]
+
+    def _insert(self, **fields):
+        fields.setdefault('ts', time.time())
+        columns = ', '.join(fields)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO samples ({columns}) VALUES ({', '.join('?' * len(fields))})",
+                list(fields.values())
+            )
+            self._conn.commit()
+
+    def record_llm(self, model: str, latency_ms: float, tier: Optional[int] = None,
+                   prompt_tokens: int = 0, generated_tokens: int = 0,
+                   ttft_ms: Optional[float] = None, eval_ms: Optional[float] = None):
+        """
+        Record one LLM request.
+
+        tokens/sec is generation speed: generated tokens over `eval_ms` (the
+        backend's decode time), or over latency minus `ttft_ms`. Without
+        either, prompt eval and model load would be mixed in, so no rate is stored.
+        """
+        if eval_ms:
+            gen_seconds = eval_ms / 1000
+        elif ttft_ms is not None:
+            gen_seconds = (latency_ms - ttft_ms) / 1000
+        else:
+            gen_seconds = 0
+        tokens_per_sec = generated_tokens / gen_seconds if generated_tokens and gen_seconds > 0 else None
+        self._insert(
+            kind=KIND_LLM, key=model, version=self._version_for(model), tier=tier,
+            latency_ms=latency_ms, ttft_ms=ttft_ms, prompt_tokens=prompt_tokens,
+            generated_tokens=generated_tokens, tokens_per_sec=tokens_per_sec
+        )
+
+    def record_route(self, route: str, latency_ms: float):
+        """Record end-to-end latency of one routed request."""
+        self._insert(kind=KIND_ROUTE, key=route, version=code_version(), latency_ms=latency_ms)
+
+    def record_cache(self, hit: bool, cache: str = 'response'):
+        """Record a cache lookup outcome."""
+        self._insert(kind=KIND_CACHE, key=cache, version=code_version(), hit=1 if hit else 0)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _rows(self, kind: str, since: Optional[float] = None) -> List[sqlite3.Row]:
+        sql = "SELECT * FROM samples WHERE kind = ?"
+        params: List = [kind]
+        if since:
+            sql += " AND ts >= ?"
+            params.append(since)
+        sql += " ORDER BY ts"
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _summarize(rows: List[sqlite3.Row]) -> Dict:
+        latencies = [r['latency_ms'] for r in rows]
+        rates = [r['tokens_per_sec'] for r in rows if r['tokens_per_sec']]
+        hits = [r['hit'] for r in rows if r['hit'] is not None]
+        return {
+            'count': len(rows),
+            'p50_ms': percentile(latencies, 50),
+            'p90_ms': percentile(latencies, 90),
+            'p99_ms': percentile(latencies, 99),
+            'tokens_per_sec': sum(rates) / len(rates) if rates else None,
+            'hit_rate': sum(hits) / len(hits) * 100 if hits else None,
+            'last_seen': rows[-1]['ts'] if rows else None,
+        }
+
+    def aggregate(self, kind: str, days: Optional[int] = None) -> Dict[str, Dict]:
+        """Per-key summary (latency percentiles, tokens/sec, hit rate)."""
+        since = time.time() - days * 86400 if days else None
+        groups: Dict[str, List] = {}
+        for row in self._rows(kind, since):
+            groups.setdefault(row['key'], []).append(row)
+        return {key: self._summarize(rows) for key, rows in groups.items()}
+
+    def daily_trend(self, kind: str, key: str, days: int = 7, metric: str = 'latency_ms') -> List[Optional[float]]:
+        """Median of `metric` per day for the last `days` days (oldest first)."""
+        now = time.time()
+        buckets: List[List[float]] = [[] for _ in range(days)]
+        for row in self._rows(kind, now - days * 86400):
+            if row['key'] != key or row[metric] is None:
+                continue
+            index = days - 1 - int((now - row['ts']) // 86400)
+            if 0 <= index < days:
+                buckets[index].append(row[metric])
+        return [percentile(bucket, 50) for bucket in buckets]
+
+    def detect_regressions(self, threshold: float = 0.2, min_samples: int = 5) -> List[Dict]:
+        """
+        Compare the latest version of each model/route against the version before it.
+
+        Flags a p50 latency increase or a tokens/sec drop larger than `threshold`.
+        """
+        regressions = []
+        for kind in (KIND_LLM, KIND_ROUTE):
+            by_key: Dict[str, Dict[str, List]] = {}
+            order: Dict[str, List[str]] = {}
+            for row in self._rows(kind):
+                versions = by_key.setdefault(row['key'], {})
+                if row['version'] not in versions:
+                    order.setdefault(row['key'], []).append(row['version'])
+                versions.setdefault(row['version'], []).append(row)
+
+            for key, versions in by_key.items():
+                seen = order[key]
+                if len(seen) < 2:
+                    continue
+                current_version = seen[-1]
+                previous_version = seen[-2]
+                current = versions[current_version]
+                previous = versions[previous_version]
+                if len(current) < min_samples or len(previous) < min_samples:
+                    continue
+
+                before, after = self._summarize(previous), self._summarize(current)
+                if before['p50_ms'] and after['p50_ms'] and after['p50_ms'] > before['p50_ms'] * (1 + threshold):
+                    regressions.append({
+                        'kind': kind, 'key': key, 'metric': 'p50_ms',
+                        'before': before['p50_ms'], 'after': after['p50_ms'],
+                        'previous_version': previous_version, 'version': current_version
+                    })
+                if before['tokens_per_sec'] and after['tokens_per_sec'] and \
+                        after['tokens_per_sec'] < before['tokens_per_sec'] * (1 - threshold):
+                    regressions.append({
+                        'kind': kind, 'key': key, 'metric': 'tokens_per_sec',
+                        'before': before['tokens_per_sec'], 'after': after['tokens_per_sec'],
+                        'previous_version': previous_version, 'version': current_version
+                    })
+        return regressions
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def sparkline(values: List[Optional[float]]) -> str:
+    """Unicode sparkline; gaps (no data) render as a dot."""
+    bars = "▁▂▃▄▅▆▇█"
+    present = [v for v in values if v is not None]
+    if not present:
+        return "·" * len(values)
+    low, high = min(present), max(present)
+    span = (high - low) or 1
+    return "".join(
+        "·" if v is None else bars[min(len(bars) - 1, int((v - low) / span * (len(bars) - 1)))]
+        for v in values
+    )
+
+
+def get_perf_store() -> PerfMetricsStore:
+    """Get singleton instance of PerfMetricsStore."""
+    if not hasattr(get_perf_store, '_instance'):
+        get_perf_store._instance = PerfMetricsStore()
+    return get_perf_store._instance
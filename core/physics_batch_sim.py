@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+⚔️ Physics Combat Batch Simulator - headless, vectorized PhysicsCombatEngine
+Runs thousands of matchups at once for weapon/rarity balancing. Positions,
+HP, cooldowns, ammo and jump state live in (2, N) NumPy arrays, projectiles
+in one flat pool, and every frame applies the scalar engine's rules in the
+same order with the same float operations - so a battle simulated here ends
+with exactly the winner, time and HP that PhysicsCombatEngine produces for
+the same souls. Loadouts are drawn from a per-battle seed, which makes a
+whole batch reproducible. Without NumPy the scalar engine is run per battle.
+"""
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.soul_system_v2 import Soul
+from core.physics_combat_engine import PhysicsCombatEngine, WEAPON_MECHANICS, WeaponType, best_weapon_for
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+ARENA_WIDTH = 1920  # get_screen_resolution()'s fallback, fixed so results don't depend on the display
+DT = 0.05
+GRAVITY = 500.0
+JUMP_VELOCITY = 250.0
+DEATH_LINE = -50.0
+
+FighterSpec = Tuple[str, str, int]  # (entity_key, rarity, level)
+Matchup = Tuple[FighterSpec, FighterSpec]
+
+
+@dataclass
+class BattleOutcome:
+    """Result of one simulated battle (winner 1, 2 or 0 for a draw)."""
+    winner: int
+    duration: float
+    hp1: float
+    hp2: float
+    entity1: str
+    entity2: str
+    rarity1: str
+    rarity2: str
+    weapon1: str
+    weapon2: str
+
+
+def battle_seeds(seed: int, count: int) -> List[int]:
+    """Per-battle seeds derived from one batch seed."""
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+
+def build_souls(matchup: Matchup, battle_seed: int) -> Tuple[Soul, Soul]:
+    """The two souls of a matchup, with loadouts drawn from `battle_seed`."""
+    rng = random.Random(battle_seed)
+    souls = []
+    for index, (entity_key, rarity, level) in enumerate(matchup, 1):
+        soul = Soul(f"sim_{entity_key}_{index}", entity_key, rarity, 'simulation', '2024-01-01',
+                    f"sim_{battle_seed}_{index}", rng=rng)
+        soul.level = level
+        souls.append(soul)
+    return souls[0], souls[1]
+
+
+def simulate_scalar(matchup: Matchup, battle_seed: int, max_time: float = 60.0) -> BattleOutcome:
+    """One battle on the frame-by-frame engine (reference for the batch simulator)."""
+    soul1, soul2 = build_souls(matchup, battle_seed)
+    engine = PhysicsCombatEngine(soul1, soul2, arena_width=ARENA_WIDTH)
+    winner = engine.simulate_battle(max_time=max_time, show_display=False, save_log=False)
+    return _outcome(winner, engine.time, engine.fighter1.hp, engine.fighter2.hp, soul1, soul2)
+
+
+def _outcome(winner: int, duration: float, hp1: float, hp2: float, soul1: Soul, soul2: Soul) -> BattleOutcome:
+    return BattleOutcome(
+        winner=winner, duration=duration, hp1=hp1, hp2=hp2,
+        entity1=soul1.entity_key, entity2=soul2.entity_key,
+        rarity1=soul1.rarity, rarity2=soul2.rarity,
+        weapon1=best_weapon_for(soul1) or 'none', weapon2=best_weapon_for(soul2) or 'none'
+    )
+
+
+def round_robin(fighters: Sequence[FighterSpec], battles_per_pair: int = 10) -> List[Matchup]:
+    """Every ordered pair of distinct fighters, `battles_per_pair` times each."""
+    return [(a, b) for a in fighters for b in fighters if a != b for _ in range(battles_per_pair)]
+
+
+def win_rate_matrix(outcomes: Sequence[BattleOutcome], by: str = 'entity') -> Dict:
+    """Win rates of row label vs column label, grouped by 'entity', 'rarity' or 'weapon'.
+
+    Both corners count; a draw is half a win for each side.
+    """
+    if by not in ('entity', 'rarity', 'weapon'):
+        raise ValueError(f"Unknown grouping: {by}")
+    games: Dict[str, Dict[str, int]] = {}
+    wins: Dict[str, Dict[str, float]] = {}
+    for outcome in outcomes:
+        a, b = getattr(outcome, f"{by}1"), getattr(outcome, f"{by}2")
+        for label, other, won in ((a, b, 1), (b, a, 2)):
+            games.setdefault(label, {}).setdefault(other, 0)
+            wins.setdefault(label, {}).setdefault(other, 0.0)
+            games[label][other] += 1
+            wins[label][other] += 1.0 if outcome.winner == won else 0.5 if outcome.winner == 0 else 0.0
+    labels = sorted(games)
+    return {
+        'labels': labels,
+        'games': games,
+        'win_rate': {a: {b: round(wins[a][b] / games[a][b], 4) for b in games[a]} for a in labels},
+        'overall': {a: round(sum(wins[a].values()) / sum(games[a].values()), 4) for a in labels},
+    }
+
+
+class BatchCombatSimulator:
+    """Simulates many headless battles in lockstep."""
+
+    def __init__(self, max_time: float = 60.0):
+        self.max_time = max_time
+
+    def run(self, matchups: Sequence[Matchup], seed: int = 0) -> List[BattleOutcome]:
+        """Simulate every matchup; battle i draws its loadouts from battle_seeds(seed, n)[i]."""
+        seeds = battle_seeds(seed, len(matchups))
+        if not NUMPY_AVAILABLE:
+            return [simulate_scalar(m, s, self.max_time) for m, s in zip(matchups, seeds)]
+        souls = [build_souls(m, s) for m, s in zip(matchups, seeds)]
+        return self._run_vectorized(souls)
+
+    # ═══════════════════════════════════════════════════════
+    # Vectorized engine
+    # ═══════════════════════════════════════════════════════
+
+    def _fighter_arrays(self, souls: List[Tuple[Soul, Soul]]) -> Dict[str, "np.ndarray"]:
+        """Constant per-fighter parameters, shape (2, N), computed exactly like the scalar engine."""
+        inf = float('inf')
+        columns = {key: ([], []) for key in (
+            'armed', 'melee', 'boomerang', 'melee_r', 'lo', 'hi', 'back_at', 'approach_at',
+            'move_speed', 'damage', 'attack_speed', 'reload_time', 'ammo_max', 'projectile_speed', 'max_hp')}
+        for pair in souls:
+            for side, soul in enumerate(pair):
+                weapon_key = best_weapon_for(soul)
+                stats = soul.calculate_current_stats()
+                row = {'armed': weapon_key is not None, 'melee': False, 'boomerang': False,
+                       'melee_r': -inf, 'lo': inf, 'hi': -inf, 'back_at': -inf, 'approach_at': inf,
+                       'move_speed': min(40, 20 + stats.get('speed', 0) * 2) * DT,
+                       'damage': 0.0, 'attack_speed': 0.0, 'reload_time': 0.0, 'ammo_max': 0,
+                       'projectile_speed': 0.0, 'max_hp': soul.calculate_max_health()}
+                if weapon_key:
+                    weapon = soul.weapons[weapon_key]
+                    mechanics = WEAPON_MECHANICS[weapon_key]
+                    weapon_type = mechanics['type']
+                    row['damage'] = stats['attack'] + weapon['base_damage']
+                    row['attack_speed'] = weapon['attack_speed']
+                    row['projectile_speed'] = mechanics.get('projectile_speed', 0)
+                    if mechanics.get('ammo') is not None:
+                        row['ammo_max'] = mechanics['ammo']
+                        row['reload_time'] = weapon['attack_speed'] * mechanics.get('reload_multiplier', 3)
+                    if weapon_type == WeaponType.MELEE:
+                        row['melee'] = True
+                        row['melee_r'] = mechanics['range']
+                    elif weapon_type == WeaponType.HYBRID:
+                        row['melee_r'] = mechanics.get('melee_range', 5)
+                        row['lo'], row['hi'] = mechanics['ranged_range']
+                        row['back_at'], row['approach_at'] = row['lo'] - 5, row['hi']
+                    else:
+                        row['boomerang'] = weapon_type == WeaponType.BOOMERANG
+                        row['lo'], row['hi'] = mechanics['range']
+                        row['back_at'], row['approach_at'] = row['lo'], row['hi']
+                for key, value in row.items():
+                    columns[key][side].append(value)
+        return {key: np.array(sides) for key, sides in columns.items()}
+
+    def _run_vectorized(self, souls: List[Tuple[Soul, Soul]]) -> List[BattleOutcome]:
+        n = len(souls)
+        f = self._fighter_arrays(souls)
+        f['armed'] = f['armed'].astype(bool)
+        f['melee'] = f['melee'].astype(bool)
+        f['boomerang'] = f['boomerang'].astype(bool)
+        has_ammo = f['ammo_max'] > 0
+
+        # Mutable fighter state, (2, N)
+        pos = np.empty((2, n))
+        pos[0], pos[1] = ARENA_WIDTH * 0.2, ARENA_WIDTH * 0.8
+        hp = f['max_hp'].astype(float)
+        ammo = f['ammo_max'].copy()
+        can_attack_at = np.zeros((2, n))
+        reloading_until = np.zeros((2, n))
+        in_flight = np.zeros((2, n), dtype=bool)
+        y = np.zeros((2, n))
+        vy = np.zeros((2, n))
+        can_jump_at = np.zeros((2, n))
+
+        # Projectile pool, in creation order (the scalar engine's list order)
+        proj = {'battle': np.zeros(0, dtype=np.intp), 'owner': np.zeros(0, dtype=np.intp),
+                'pos': np.zeros(0), 'target': np.zeros(0), 'speed': np.zeros(0), 'damage': np.zeros(0),
+                'boomerang': np.zeros(0, dtype=bool), 'returning': np.zeros(0, dtype=bool)}
+
+        ids = np.arange(n)  # Original battle index of each column
+        winner = np.zeros(n, dtype=int)
+        duration = np.zeros(n)
+        final_hp = np.zeros((2, n))
+        fall_step = GRAVITY * DT
+        t = 0.0
+
+        while t < self.max_time and len(ids):
+            # Movement: fighter 1 first, fighter 2 reacts to fighter 1's new position
+            for a in (0, 1):
+                p, target = pos[a], pos[1 - a]
+                distance = np.abs(p - target)
+                left = p < target
+                ms = f['move_speed'][a]
+                melee_step = np.where(left, np.minimum(target - f['melee_r'][a], p + ms),
+                                      np.maximum(target + f['melee_r'][a], p - ms))
+                back = np.where(left, p - ms, p + ms)
+                approach = np.where(left, p + ms, p - ms)
+                moved = np.where(f['melee'][a],
+                                 np.where(distance > f['melee_r'][a], melee_step, p),
+                                 np.where(distance < f['back_at'][a], back,
+                                          np.where(distance > f['approach_at'][a], approach, p)))
+                pos[a] = np.where(f['armed'][a], np.clip(moved, 0, ARENA_WIDTH), p)
+
+            # Jump physics, then jumps at fire rate
+            airborne = (y > 0) | (vy != 0)
+            vy = np.where(airborne, vy - fall_step, vy)
+            y = np.where(airborne, y + vy * DT, y)
+            fell = airborne & (y < DEATH_LINE)
+            hp = np.where(fell, 0.0, hp)
+            landed = airborne & ~fell & (y <= 0.0)
+            y = np.where(landed, 0.0, y)
+            vy = np.where(landed, 0.0, vy)
+            jump = (t >= can_jump_at) & (y <= 0.01) & f['armed']
+            vy = np.where(jump, JUMP_VELOCITY, vy)
+            can_jump_at = np.where(jump, t + f['attack_speed'], can_jump_at)
+
+            # Attacks: fighter 1 first so its projectiles precede fighter 2's
+            for a in (0, 1):
+                d = 1 - a
+                distance = np.abs(pos[a] - pos[d])
+                in_reach = (distance <= f['melee_r'][a]) | ((f['lo'][a] <= distance) & (distance <= f['hi'][a]))
+                ready = (f['armed'][a] & (t >= can_attack_at[a]) & (t >= reloading_until[a])
+                         & ~in_flight[a] & in_reach)
+                reload = ready & has_ammo[a] & (ammo[a] <= 0)
+                reloading_until[a] = np.where(reload, t + f['reload_time'][a], reloading_until[a])
+                ammo[a] = np.where(reload, f['ammo_max'][a], ammo[a])
+                fire = ready & ~reload
+
+                melee_hit = fire & (distance <= f['melee_r'][a])
+                hp[d] = np.where(melee_hit, hp[d] - f['damage'][a], hp[d])
+                shoot = np.flatnonzero(fire & ~melee_hit)
+                if len(shoot):
+                    boomerang = f['boomerang'][a][shoot]
+                    new = {'battle': shoot, 'owner': np.full(len(shoot), a, dtype=np.intp),
+                           'pos': pos[a][shoot], 'target': pos[d][shoot],
+                           'speed': f['projectile_speed'][a][shoot], 'damage': f['damage'][a][shoot],
+                           'boomerang': boomerang, 'returning': np.zeros(len(shoot), dtype=bool)}
+                    proj = {key: np.concatenate((proj[key], new[key])) for key in proj}
+                    in_flight[a][shoot[boomerang]] = True
+
+                ammo[a] = np.where(fire & has_ammo[a], ammo[a] - 1, ammo[a])
+                can_attack_at[a] = np.where(fire, t + f['attack_speed'][a], can_attack_at[a])
+
+            # Projectiles
+            if len(proj['pos']):
+                returning = proj['returning']
+                direction = np.where(returning, np.where(proj['pos'] > proj['target'], -1.0, 1.0),
+                                     np.where(proj['target'] > proj['pos'], 1.0, -1.0))
+                proj['pos'] = proj['pos'] + direction * proj['speed'] * DT
+                hit = ~returning & (np.abs(proj['pos'] - proj['target']) < 2)
+                hits = np.flatnonzero(hit)
+                if len(hits):
+                    # ufunc.at applies repeated indices in order: same subtraction order as the engine
+                    np.subtract.at(hp, (1 - proj['owner'][hits], proj['battle'][hits]), proj['damage'][hits])
+                proj['returning'] = returning = returning | (hit & proj['boomerang'])
+                owner_pos = pos[proj['owner'], proj['battle']]
+                caught = returning & proj['boomerang'] & (np.abs(proj['pos'] - owner_pos) < 2)
+                in_flight[proj['owner'][caught], proj['battle'][caught]] = False
+                # A shot that passed its target point swings around it forever without landing
+                overshot = ~returning & ~hit & (np.where(proj['target'] > proj['pos'], 1.0, -1.0) != direction)
+                keep = ~(caught | (hit & ~proj['boomerang']) | overshot)
+                if not keep.all():
+                    proj = {key: value[keep] for key, value in proj.items()}
+
+            # Winner checks
+            dead1, dead2 = hp[0] <= 0, hp[1] <= 0
+            done = dead1 | dead2
+            if done.any():
+                done_ids = ids[done]
+                winner[done_ids] = np.where(dead1[done], 2, 1)
+                duration[done_ids] = t
+                final_hp[:, done_ids] = hp[:, done]
+                alive = ~done
+                remap = np.cumsum(alive) - 1
+                ids = ids[alive]
+                f = {key: value[:, alive] for key, value in f.items()}
+                has_ammo = has_ammo[:, alive]
+                pos, hp, ammo = pos[:, alive], hp[:, alive], ammo[:, alive]
+                can_attack_at, reloading_until = can_attack_at[:, alive], reloading_until[:, alive]
+                in_flight, y, vy, can_jump_at = in_flight[:, alive], y[:, alive], vy[:, alive], can_jump_at[:, alive]
+                live = alive[proj['battle']]
+                proj = {key: value[live] for key, value in proj.items()}
+                proj['battle'] = remap[proj['battle']]
+
+            t += DT
+
+        # Timeouts are decided by remaining HP
+        winner[ids] = np.where(hp[0] > hp[1], 1, np.where(hp[1] > hp[0], 2, 0))
+        duration[ids] = t
+        final_hp[:, ids] = hp
+
+        return [_outcome(int(winner[i]), float(duration[i]), float(final_hp[0, i]), float(final_hp[1, i]), *souls[i])
+                for i in range(n)]
+
+
+def benchmark_batch(battles: int = 2000, seed: int = 0) -> Dict:
+    """Batch vs scalar throughput on a celestial/demonic/angelic round robin."""
+    fighters = [('thor', 'celestial', 50), ('apollo', 'celestial', 50), ('krampus', 'demonic', 50),
+                ('lucifer', 'demonic', 50), ('phoenix', 'angelic', 50), ('fenrir', 'angelic', 50)]
+    pairs = round_robin(fighters, 1)
+    matchups = [pairs[i % len(pairs)] for i in range(battles)]
+
+    start = time.time()
+    outcomes = BatchCombatSimulator().run(matchups, seed=seed)
+    batch_time = time.time() - start
+
+    sample = min(100, battles)
+    seeds = battle_seeds(seed, battles)
+    start = time.time()
+    scalar = [simulate_scalar(matchups[i], seeds[i]) for i in range(sample)]
+    scalar_time = (time.time() - start) * battles / sample
+
+    return {
+        'battles': battles,
+        'numpy': NUMPY_AVAILABLE,
+        'batch_s': round(batch_time, 2),
+        'scalar_s_estimated': round(scalar_time, 2),
+        'speedup': round(scalar_time / batch_time, 1) if batch_time else None,
+        'identical_sample': scalar == outcomes[:sample],
+    }
+
+
+if __name__ == "__main__":
+    result = benchmark_batch(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
+    print("⚔️ Physics Combat Batch Simulator")
+    for key, value in result.items():
+        print(f"   {key}: {value}")
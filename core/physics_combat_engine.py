@@ -307,7 +307,13 @@ def draw_health_bar_right(current_hp: float, max_hp: float, width: int = 22) ->
     return f"HP {hp_text} [{bar}]"
 
 def get_screen_resolution() -> Tuple[int, int]:
-    """Get actual screen resolution (width, height in pixels)."""
+    """Get actual screen resolution (width, height in pixels). Probed once per process."""
+    if hasattr(get_screen_resolution, '_resolution'):
+        return get_screen_resolution._resolution
+    get_screen_resolution._resolution = _probe_screen_resolution()
+    return get_screen_resolution._resolution
+
+def _probe_screen_resolution() -> Tuple[int, int]:
     try:
         # Try to get screen resolution on macOS
         import subprocess
@@ -512,13 +518,38 @@ def draw_arena(fighter1: FighterState, fighter2: FighterState, projectiles: List
 # COMBAT ENGINE
 # ═══════════════════════════════════════════════════════════════════════════
 
+def best_weapon_for(soul: Soul) -> Optional[str]:
+    """Combat weapon with the highest DPS (first one wins ties), or None."""
+    best_weapon = None
+    best_dps = 0
+    
+    for weapon_key, weapon_data in soul.weapons.items():
+        mechanics = WEAPON_MECHANICS.get(weapon_key, {})
+        if mechanics.get('combat', True) == False:
+            continue
+        
+        dps = weapon_data.get('dps', 0)
+        if dps > best_dps:
+            best_dps = dps
+            best_weapon = weapon_key
+    
+    return best_weapon
+
+
 class PhysicsCombatEngine:
     """Complete physics-based combat simulation."""
     
-    def __init__(self, soul1: Soul, soul2: Soul):
-        """Initialize battle between two souls."""
+    def __init__(self, soul1: Soul, soul2: Soul, arena_width: Optional[int] = None):
+        """Initialize battle between two souls.
+
+        Args:
+            arena_width: Fixed coordinate width (headless runs); defaults to the screen width
+        """
         # Get actual screen resolution for coordinate system
-        screen_width, screen_height = get_screen_resolution()
+        if arena_width:
+            screen_width, screen_height = arena_width, 1080
+        else:
+            screen_width, screen_height = get_screen_resolution()
         self.screen_width = screen_width
         self.screen_height = screen_height
         
@@ -570,22 +601,7 @@ class PhysicsCombatEngine:
     
     def select_best_weapon(self, fighter: FighterState) -> None:
         """Select the best weapon for the fighter based on DPS."""
-        if not fighter.soul.weapons:
-            return
-        
-        best_weapon = None
-        best_dps = 0
-        
-        for weapon_key, weapon_data in fighter.soul.weapons.items():
-            mechanics = WEAPON_MECHANICS.get(weapon_key, {})
-            if mechanics.get('combat', True) == False:
-                continue
-            
-            dps = weapon_data.get('dps', 0)
-            if dps > best_dps:
-                best_dps = dps
-                best_weapon = weapon_key
-        
+        best_weapon = best_weapon_for(fighter.soul)
         if best_weapon:
             fighter.current_weapon = best_weapon
     
@@ -859,8 +875,11 @@ class PhysicsCombatEngine:
         
         self.log_action(f"{fighter.soul.entity['emoji']} {fighter.soul.entity['name']} jumps!")
     
-    def simulate_battle(self, max_time: float = 60.0, show_display: bool = True) -> int:
-        """Run the battle simulation. Returns winner (1 or 2, or 0 for draw)."""
+    def simulate_battle(self, max_time: float = 60.0, show_display: bool = True, save_log: bool = True) -> int:
+        """Run the battle simulation. Returns winner (1 or 2, or 0 for draw).
+
+        For many headless battles at once see core.physics_batch_sim.
+        """
         if show_display:
             clear_screen()
         
@@ -892,8 +911,8 @@ class PhysicsCombatEngine:
                 if show_display:
                     draw_arena(self.fighter1, self.fighter2, self.projectiles, self.time, self.last_action, self.screen_width, self.time)
                     print(f"\n🔴 {self.fighter2.soul.entity['name']} WINS!")
-                log_path = self.save_battle_log()
-                if show_display:
+                log_path = self.save_battle_log() if save_log else None
+                if log_path and show_display:
                     print(f"\n📁 Battle log saved: {log_path}")
                 return 2
             elif self.fighter2.hp <= 0:
@@ -901,8 +920,8 @@ class PhysicsCombatEngine:
                 if show_display:
                     draw_arena(self.fighter1, self.fighter2, self.projectiles, self.time, self.last_action, self.screen_width, self.time)
                     print(f"\n🔵 {self.fighter1.soul.entity['name']} WINS!")
-                log_path = self.save_battle_log()
-                if show_display:
+                log_path = self.save_battle_log() if save_log else None
+                if log_path and show_display:
                     print(f"\n📁 Battle log saved: {log_path}")
                 return 1
             
@@ -924,24 +943,24 @@ class PhysicsCombatEngine:
             self.log_action(f"TIME OUT! {self.fighter1.soul.entity['emoji']} {self.fighter1.soul.entity['name']} WINS by HP!")
             if show_display:
                 print(f"\n⏱️  TIME OUT! 🔵 {self.fighter1.soul.entity['name']} WINS by HP!")
-            log_path = self.save_battle_log()
-            if show_display:
+            log_path = self.save_battle_log() if save_log else None
+            if log_path and show_display:
                 print(f"\n📁 Battle log saved: {log_path}")
             return 1
         elif self.fighter2.hp > self.fighter1.hp:
             self.log_action(f"TIME OUT! {self.fighter2.soul.entity['emoji']} {self.fighter2.soul.entity['name']} WINS by HP!")
             if show_display:
                 print(f"\n⏱️  TIME OUT! 🔴 {self.fighter2.soul.entity['name']} WINS by HP!")
-            log_path = self.save_battle_log()
-            if show_display:
+            log_path = self.save_battle_log() if save_log else None
+            if log_path and show_display:
                 print(f"\n📁 Battle log saved: {log_path}")
             return 2
         else:
             self.log_action("TIME OUT! DRAW!")
             if show_display:
                 print(f"\n⏱️  TIME OUT! DRAW!")
-            log_path = self.save_battle_log()
-            if show_display:
+            log_path = self.save_battle_log() if save_log else None
+            if log_path and show_display:
                 print(f"\n📁 Battle log saved: {log_path}")
             return 0
     
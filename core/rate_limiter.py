@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+⏱️ Rate Limiter - shared sliding-window limits
+Keeps per-key deques of epoch timestamps, one deque per window, so a check is
+O(1) amortized: expired hits fall off the left as time moves on. Hits are
+appended to a JSONL log ([key, epoch] per line) in batches rather than
+rewriting a file per check, and the log is compacted once it is mostly
+expired lines.
+"""
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+HOUR = 3600.0
+DAY = 86400.0
+
+FLUSH_BATCH = 32       # Hits buffered before they are appended to the log
+FLUSH_INTERVAL = 5.0   # Seconds a hit may stay buffered before the next hit flushes it
+COMPACT_RATIO = 4      # Rewrite the log when it holds this many lines per live hit
+
+
+class RateLimiter:
+    """
+    Sliding-window hit counter for any number of keys.
+
+    Features:
+    - hit / count / retry_after / acquire per key and window
+    - Windows fixed at construction (e.g. HOUR and DAY), each with its own deque
+    - Optional lazily written JSONL log, replayed on load
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, windows: Sequence[float] = (HOUR,),
+                 clock: Callable[[], float] = time.time):
+        if not windows:
+            raise ValueError("A rate limiter needs at least one window")
+        self.path = Path(path) if path else None
+        self.windows = tuple(sorted(float(w) for w in windows))
+        self.clock = clock
+
+        self._hits: Dict[str, Dict[float, Deque[float]]] = {}
+        self._pending: List[Tuple[str, float]] = []
+        self._last_flush = clock()
+        self._log_lines = 0
+        self._lock = threading.RLock()
+
+        if self.path:
+            self._load()
+            atexit.register(self.flush)
+
+    # ------------------------------------------------------------------
+    # Counting
+    # ------------------------------------------------------------------
+
+    def _window(self, window: Optional[float]) -> float:
+        if window is None:
+            return self.windows[0]
+        window = float(window)
+        if window not in self.windows:
+            raise ValueError(f"Window {window}s is not tracked (windows: {self.windows})")
+        return window
+
+    def _prune(self, key: str, now: float) -> Dict[float, Deque[float]]:
+        """Drop hits that have left each window; returns the key's deques."""
+        windows = self._hits.get(key)
+        if windows is None:
+            windows = self._hits[key] = {w: deque() for w in self.windows}
+        for window, hits in windows.items():
+            cutoff = now - window
+            while hits and hits[0] <= cutoff:
+                hits.popleft()
+        return windows
+
+    def count(self, key: str, window: Optional[float] = None) -> int:
+        """Hits for `key` in the last `window` seconds (default: the shortest window)."""
+        window = self._window(window)
+        with self._lock:
+            return len(self._prune(key, self.clock())[window])
+
+    def last_hit(self, key: str) -> Optional[float]:
+        """Epoch time of the most recent hit still inside the longest window."""
+        with self._lock:
+            hits = self._prune(key, self.clock())[self.windows[-1]]
+            return hits[-1] if hits else None
+
+    def retry_after(self, key: str, limit: int, window: Optional[float] = None) -> float:
+        """Seconds until `key` has fewer than `limit` hits in `window` (0.0 if it already has)."""
+        window = self._window(window)
+        with self._lock:
+            now = self.clock()
+            hits = self._prune(key, now)[window]
+            if len(hits) < limit:
+                return 0.0
+            # Under the limit once the hit `limit` places from the newest expires
+            return max(0.0, hits[len(hits) - limit] + window - now)
+
+    def hit(self, key: str, when: Optional[float] = None):
+        """Record a hit for `key` (now, unless `when` is given)."""
+        with self._lock:
+            now = self.clock()
+            when = now if when is None else when
+            for hits in self._prune(key, now).values():
+                if hits and when < hits[-1]:
+                    bisect.insort(hits, when)  # Back-dated hit; keep the deque ordered
+                else:
+                    hits.append(when)
+            self._pending.append((key, when))
+            if len(self._pending) >= FLUSH_BATCH or now - self._last_flush >= FLUSH_INTERVAL:
+                self.flush()
+
+    def acquire(self, key: str, limit: int, window: Optional[float] = None) -> Tuple[bool, float]:
+        """
+        Record a hit only if `key` is under `limit` in `window`.
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+        with self._lock:
+            wait = self.retry_after(key, limit, window)
+            if wait > 0:
+                return (False, wait)
+            self.hit(key)
+            return (True, 0.0)
+
+    def import_hits(self, key: str, timestamps: Iterable[float]):
+        """Add past hits (e.g. from an older file format); expired ones are ignored."""
+        with self._lock:
+            for when in sorted(timestamps):
+                if when > self.clock() - self.windows[-1]:
+                    self.hit(key, when)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def flush(self):
+        """Write buffered hits, compacting the log when it is mostly expired lines."""
+        with self._lock:
+            self._last_flush = self.clock()
+            if not self.path or not self._pending:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            live = self._live_hits()
+            if self._log_lines + len(self._pending) > COMPACT_RATIO * max(len(live), FLUSH_BATCH):
+                self._write_log(live)
+            else:
+                with open(self.path, 'a') as f:
+                    f.write(''.join(json.dumps([key, when]) + '\n' for key, when in self._pending))
+                self._log_lines += len(self._pending)
+            self._pending.clear()
+
+    def _live_hits(self) -> List[Tuple[str, float]]:
+        now = self.clock()
+        live = []
+        for key in list(self._hits):
+            hits = self._prune(key, now)[self.windows[-1]]
+            if hits:
+                live.extend((key, when) for when in hits)
+            else:
+                del self._hits[key]
+        return live
+
+    def _write_log(self, live: List[Tuple[str, float]]):
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write(''.join(json.dumps([key, when]) + '\n' for key, when in live))
+        os.replace(tmp_path, self.path)
+        self._log_lines = len(live)
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        by_key: Dict[str, List[float]] = {}
+        lines = 0
+        with open(self.path) as f:
+            for line in f:
+                lines += 1
+                try:
+                    key, when = json.loads(line)
+                    by_key.setdefault(str(key), []).append(float(when))
+                except (ValueError, TypeError):
+                    continue  # Torn last line from an interrupted write
+
+        cutoff = self.clock() - self.windows[-1]
+        for key, timestamps in by_key.items():
+            windows = {w: deque() for w in self.windows}
+            for when in sorted(timestamps):
+                if when > cutoff:
+                    for hits in windows.values():
+                        hits.append(when)
+            self._hits[key] = windows
+        self._log_lines = lines
+
+
+def get_rate_limiter(path: Union[str, Path], windows: Sequence[float] = (HOUR,)) -> RateLimiter:
+    """Get the shared RateLimiter for a log file (one instance per path)."""
+    if not hasattr(get_rate_limiter, '_instances'):
+        get_rate_limiter._instances = {}
+    key = str(Path(path).expanduser().resolve())
+    limiter = get_rate_limiter._instances.get(key)
+    if limiter is None:
+        limiter = get_rate_limiter._instances[key] = RateLimiter(path, windows)
+    elif not set(windows) <= set(limiter.windows):
+        raise ValueError(f"{path} is tracked with windows {limiter.windows}, not {tuple(windows)}")
+    return limiter
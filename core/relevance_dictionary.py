@@ -12,6 +12,11 @@ from datetime import datetime
 from collections import defaultdict
 import difflib
 
+try:
+    from core.fixnet_refs import get_ref_store, ref_key
+except ImportError:
+    from fixnet_refs import get_ref_store, ref_key
+
 PURPLE = "\033[35m"
 GREEN = "\033[32m"
 RED = "\033[31m"
@@ -25,8 +30,8 @@ RESET = "\033[0m"
 LUCIFER_HOME = Path.home() / ".luciferai"
 DICT_FILE = LUCIFER_HOME / "data" / "fix_dictionary.json"
 LOCAL_BRANCHES = LUCIFER_HOME / "data" / "user_branches.json"
-# UNIFIED: Single source of truth for remote refs
-FIXNET_REFS = LUCIFER_HOME / "fixnet" / "refs.json"
+# UNIFIED: Single source of truth for remote refs (sharded under fixnet/refs/)
+FIXNET_REFS = LUCIFER_HOME / "fixnet" / "refs"
 CONTEXT_BRANCHES = LUCIFER_HOME / "data" / "context_branches.json"
 SCRIPT_COUNTERS = LUCIFER_HOME / "data" / "script_counters.json"
 # DEPRECATED: Old location - migrated to FIXNET_REFS
@@ -52,6 +57,7 @@ class RelevanceDictionary:
         self.dictionary: Dict[str, List[Dict]] = self._load_dictionary()
         self.branches: Dict[str, List[str]] = self._load_branches()
         self.remote_refs: List[Dict] = self._load_remote_refs()
+        get_ref_store().subscribe(self._on_refs_changed)
         self.context_branches: Dict[str, Dict] = self._load_context_branches()
         self.script_counters: Dict[str, Dict] = self._load_script_counters()
     
@@ -82,15 +88,10 @@ class RelevanceDictionary:
     def _load_remote_refs(self) -> List[Dict]:
         """
         Load remote fix references from FixNet.
-        UNIFIED: Single source of truth at ~/.luciferai/fixnet/refs.json
+        UNIFIED: Single source of truth, sharded under ~/.luciferai/fixnet/refs/
         Migrates from deprecated location if needed.
         """
-        refs = []
-        
-        # Load from UNIFIED location
-        if FIXNET_REFS.exists():
-            with open(FIXNET_REFS) as f:
-                refs = json.load(f)
+        store = get_ref_store()
         
         # MIGRATION: Check deprecated location and merge
         if REMOTE_REFS_DEPRECATED.exists():
@@ -99,23 +100,25 @@ class RelevanceDictionary:
                 
                 if deprecated_refs:
                     # Merge unique refs from deprecated location
-                    ref_hashes = {r.get('fix_hash') for r in refs if r.get('fix_hash')}
-                    migrated_count = 0
-                    
-                    for dep_ref in deprecated_refs:
-                        if dep_ref.get('fix_hash') and dep_ref['fix_hash'] not in ref_hashes:
-                            refs.append(dep_ref)
-                            ref_hashes.add(dep_ref['fix_hash'])
-                            migrated_count += 1
+                    missing = [r for r in deprecated_refs
+                               if r.get('fix_hash') and store.get(ref_key(r)) is None]
                     
-                    # Save merged refs to unified location
-                    if migrated_count > 0:
-                        FIXNET_REFS.parent.mkdir(parents=True, exist_ok=True)
-                        with open(FIXNET_REFS, 'w') as f:
-                            json.dump(refs, f, indent=2)
-                        print(f"{GREEN}🔄 Migrated {migrated_count} refs from deprecated location to {FIXNET_REFS}{RESET}")
-        
-        return refs
+                    # Save merged refs to unified location (only the affected shards)
+                    if missing:
+                        store.upsert(missing)
+                        print(f"{GREEN}🔄 Migrated {len(missing)} refs from deprecated location to {FIXNET_REFS}{RESET}")
+        
+        return store.refs()
+    
+    def _on_refs_changed(self, changes: List[Dict]):
+        """Apply FixNet ref deltas to remote_refs in place (shared with consumers)."""
+        removed_ids = set()
+        for change in changes:
+            # Updated refs are modified in place by the store - nothing to do
+            self.remote_refs.extend(change['added'])
+            removed_ids.update(id(ref) for ref in change['removed'])
+        if removed_ids:
+            self.remote_refs[:] = [r for r in self.remote_refs if id(r) not in removed_ids]
     
     def _load_context_branches(self) -> Dict[str, Dict]:
         """Load context-aware branches (script-specific variations)."""
@@ -879,19 +882,16 @@ class RelevanceDictionary:
         """
         Sync local dictionary with remote FixNet references.
         Updates relevance scores based on collective usage.
-        UNIFIED: Uses single source at ~/.luciferai/fixnet/refs.json
+        UNIFIED: Uses single source, sharded under ~/.luciferai/fixnet/refs/
         """
         print(f"{BLUE}🔄 Syncing with FixNet...{RESET}")
         
-        # Reload remote refs (includes migration from deprecated location)
-        self.remote_refs = self._load_remote_refs()
-        
-        # Save to UNIFIED location
-        FIXNET_REFS.parent.mkdir(parents=True, exist_ok=True)
-        with open(FIXNET_REFS, 'w') as f:
-            json.dump(self.remote_refs, f, indent=2)
+        # Apply only the shards that changed; remote_refs is updated by the
+        # change event so indexes built on it stay in step
+        changes = get_ref_store().sync()
         
-        print(f"{GREEN}✅ Synced {len(self.remote_refs)} remote fixes{RESET}")
+        changed = sum(len(c['added']) + len(c['updated']) + len(c['removed']) for c in changes)
+        print(f"{GREEN}✅ Synced {len(self.remote_refs)} remote fixes ({changed} changed){RESET}")
     
     def _normalize_error(self, error: str) -> str:
         """Normalize error for consistent matching."""
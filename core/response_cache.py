@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+⚡ Response Cache - Reuse LLM answers for repeated questions
+Keyed by (model, temperature bucket, conversation digest, normalized prompt)
+with TTL/LRU eviction, plus a similarity tier that catches paraphrases.
+Stored at ~/.luciferai/cache/responses.json (written in batches)
+"""
+import atexit
+import json
+import math
+import re
+import threading
+import time
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Callable, Sequence, Tuple
+
+
+# Words that make a prompt depend on time, prior turns, or randomness
+TIME_SENSITIVE_WORDS = {
+    'time', 'date', 'today', 'tonight', 'tomorrow', 'yesterday', 'now',
+    'current', 'latest', 'weather', 'news'
+}
+FOLLOW_UP_WORDS = {
+    'it', 'that', 'this', 'those', 'them', 'previous', 'above', 'again', 'last', 'same'
+}
+NON_DETERMINISTIC_WORDS = {
+    'random', 'joke', 'poem', 'story', 'surprise', 'creative', 'another', 'different'
+}
+
+# Routes that never use the cache (non-deterministic or side-effecting)
+ROUTE_OPT_OUT = {'script_creation', 'file_operation', 'fix', 'image', 'mesh', 'daemon'}
+
+# Words ignored when comparing the order of two prompts
+FILLER_WORDS = {
+    'a', 'an', 'the', 'please', 'can', 'could', 'would', 'you', 'me', 'tell', 'just', 'hey', 'hi'
+}
+
+_PUNCT_RE = re.compile(r"[^\w\s+\-*/=.<>%^]")
+_SPACE_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+")
+_TOKEN_RE = re.compile(r"\d+(?:\.\d+)?|\w+|[+\-*/=<>%^]")
+_OPERATORS = set("+-*/=<>%^")
+
+SAVE_BATCH = 16      # Stores buffered before the cache file is rewritten
+SAVE_INTERVAL = 30   # ...or seconds since the last write, whichever comes first
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase, drop punctuation (keeping arithmetic and comparisons), collapse whitespace."""
+    text = _PUNCT_RE.sub(' ', prompt.lower())
+    text = _SPACE_RE.sub(' ', text).strip()
+    return text.rstrip('.').strip()
+
+
+def temperature_bucket(temperature: float) -> str:
+    """Coarse temperature bucket (0.0-0.3 / 0.3-0.7 / 0.7+)."""
+    if temperature < 0.3:
+        return 'low'
+    if temperature < 0.7:
+        return 'mid'
+    return 'high'
+
+
+def ngram_embedding(text: str, dims: int = 256) -> Dict[int, float]:
+    """
+    Cheap, dependency-free sparse embedding: hashed word and character
+    trigram counts, L2-normalized. Good enough for filler and inflection
+    changes; pass a real embedder to ResponseCache for true paraphrases.
+    """
+    vec: Dict[int, float] = {}
+    words = _WORD_RE.findall(text)
+    features = list(words)
+    for word in words:
+        padded = f"#{word}#"
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    for feature in features:
+        bucket = int(hashlib.md5(feature.encode()).hexdigest()[:8], 16) % dims
+        vec[bucket] = vec.get(bucket, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+    return {k: v / norm for k, v in vec.items()}
+
+
+def content_tokens(text: str) -> Tuple[str, ...]:
+    """Ordered words, numbers and operators of a normalized prompt, minus filler words."""
+    return tuple(token for token in _TOKEN_RE.findall(text) if token not in FILLER_WORDS)
+
+
+def operands(tokens: Sequence[str]) -> Tuple[str, ...]:
+    """Numbers and operators of a token sequence, in order."""
+    return tuple(t for t in tokens if t in _OPERATORS or t[0].isdigit())
+
+
+def order_agreement(a: Sequence[str], b: Sequence[str]) -> float:
+    """
+    Share of pairs of tokens found in both sequences that appear in the same
+    order in each (Kendall-style; 1.0 when nothing is reordered).
+    """
+    first_in_b: Dict[str, int] = {}
+    for i, token in enumerate(b):
+        first_in_b.setdefault(token, i)
+    positions = []
+    seen = set()
+    for token in a:
+        if token in first_in_b and token not in seen:
+            seen.add(token)
+            positions.append(first_in_b[token])
+    pairs = len(positions) * (len(positions) - 1) // 2
+    if not pairs:
+        return 1.0
+    concordant = sum(1 for i in range(len(positions)) for j in range(i + 1, len(positions))
+                     if positions[i] < positions[j])
+    return concordant / pairs
+
+
+def history_digest(history: Optional[Sequence[Dict]]) -> str:
+    """Short digest of the conversation a prompt was asked in ('' for none)."""
+    if not history:
+        return ''
+    h = hashlib.sha1()
+    for msg in history:
+        h.update(f"{msg.get('role')}|{msg.get('content')}\n".encode('utf-8', 'replace'))
+    return h.hexdigest()[:16]
+
+
+def cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+class ResponseCache:
+    """
+    Two-tier LLM response cache.
+
+    Entries are only shared between lookups with the same model, temperature
+    bucket and prior conversation (a follow-up never gets another thread's answer).
+
+    Tiers:
+    1. Exact - same normalized prompt
+    2. Similar - cosine similarity of prompt embeddings above
+       `similarity_threshold`, with the shared words in the same order
+       (order_agreement >= `order_threshold`) and identical numbers and
+       operators. Embeddings ignore word order, so "2 divided by 10" never
+       answers "10 divided by 2" and "is a dog bigger than a cat" never
+       answers the reverse. embedder=None turns this tier off.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None, max_entries: int = 500,
+                 ttl_seconds: int = 7 * 24 * 3600, similarity_threshold: float = 0.9,
+                 order_threshold: float = 0.8,
+                 embedder: Optional[Callable[[str], Dict[int, float]]] = ngram_embedding):
+        self.cache_file = cache_file or (Path.home() / ".luciferai" / "cache" / "responses.json")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.order_threshold = order_threshold
+        self.embedder = embedder
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._vectors: Dict[str, Dict[int, float]] = {}
+        self._tokens: Dict[str, Tuple[str, ...]] = {}
+        self._dirty = False
+        self._unsaved = 0
+        self._last_save = time.time()
+
+        # Metrics for this process
+        self.stats = {'exact_hits': 0, 'similar_hits': 0, 'misses': 0, 'bypassed': 0, 'stores': 0}
+
+        self._load()
+        atexit.register(self.save)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+        except:
+            return
+
+        now = time.time()
+        for key, entry in data.get('entries', {}).items():
+            if now - entry.get('created', 0) <= self.ttl_seconds:
+                self._entries[key] = entry
+                if self.embedder:
+                    self._vectors[key] = self.embedder(entry['prompt'])
+                    self._tokens[key] = content_tokens(entry['prompt'])
+
+    def save(self):
+        """Write the cache to disk if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'entries': dict(self._entries)}
+            self._dirty = False
+            self._unsaved = 0
+            self._last_save = time.time()
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f)
+        tmp_file.replace(self.cache_file)
+
+    # ------------------------------------------------------------------
+    # Cache API
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def is_cacheable(prompt: str, route: str = 'general') -> bool:
+        """False for opted-out routes and time-sensitive/follow-up/creative prompts."""
+        if route in ROUTE_OPT_OUT:
+            return False
+        words = set(_WORD_RE.findall(prompt.lower()))
+        if not words:
+            return False
+        return not (words & TIME_SENSITIVE_WORDS or words & FOLLOW_UP_WORDS or words & NON_DETERMINISTIC_WORDS)
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float,
+                 history: Optional[Sequence[Dict]] = None) -> str:
+        return f"{model}|{temperature_bucket(temperature)}|{history_digest(history)}|{normalize_prompt(prompt)}"
+
+    def get(self, model: str, prompt: str, temperature: float = 0.7,
+            route: str = 'general', history: Optional[Sequence[Dict]] = None) -> Optional[Tuple[str, str]]:
+        """
+        Look up a cached response.
+
+        Args:
+            history: Conversation before `prompt` (the model sees it too)
+
+        Returns:
+            (response, tier) where tier is 'exact' or 'similar', or None
+        """
+        if not self.is_cacheable(prompt, route):
+            with self._lock:
+                self.stats['bypassed'] += 1
+            return None
+
+        key = self.make_key(model, prompt, temperature, history)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry['created'] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                entry['hits'] = entry.get('hits', 0) + 1
+                self.stats['exact_hits'] += 1
+                self._dirty = True
+                return entry['response'], 'exact'
+            if entry:
+                self._drop(key)
+
+            if self.embedder:
+                prefix = key.rsplit('|', 1)[0] + '|'
+                normalized = normalize_prompt(prompt)
+                query_vec = self.embedder(normalized)
+                query_tokens = content_tokens(normalized)
+                best_key, best_score = None, 0.0
+                for other_key, vec in self._vectors.items():
+                    if not other_key.startswith(prefix):
+                        continue
+                    score = cosine(query_vec, vec)
+                    if score < self.similarity_threshold or score <= best_score:
+                        continue
+                    other_tokens = self._tokens[other_key]
+                    if operands(other_tokens) != operands(query_tokens):
+                        continue
+                    if order_agreement(query_tokens, other_tokens) < self.order_threshold:
+                        continue
+                    best_key, best_score = other_key, score
+                if best_key:
+                    entry = self._entries[best_key]
+                    if now - entry['created'] <= self.ttl_seconds:
+                        self._entries.move_to_end(best_key)
+                        entry['hits'] = entry.get('hits', 0) + 1
+                        self.stats['similar_hits'] += 1
+                        self._dirty = True
+                        return entry['response'], 'similar'
+                    self._drop(best_key)
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, model: str, prompt: str, response: str, temperature: float = 0.7,
+            route: str = 'general', history: Optional[Sequence[Dict]] = None):
+        """Store a response (ignored for uncacheable prompts or empty responses)."""
+        if not response or not response.strip() or not self.is_cacheable(prompt, route):
+            return
+
+        key = self.make_key(model, prompt, temperature, history)
+        normalized = normalize_prompt(prompt)
+
+        with self._lock:
+            self._entries[key] = {
+                'model': model,
+                'prompt': normalized,
+                'response': response,
+                'created': time.time(),
+                'hits': 0
+            }
+            self._entries.move_to_end(key)
+            if self.embedder:
+                self._vectors[key] = self.embedder(normalized)
+                self._tokens[key] = content_tokens(normalized)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+            self.stats['stores'] += 1
+            self._dirty = True
+            self._unsaved += 1
+            due = self._unsaved >= SAVE_BATCH or time.time() - self._last_save >= SAVE_INTERVAL
+
+        if due:
+            self.save()
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self._vectors.clear()
+            self._tokens.clear()
+            self._dirty = True
+        self.save()
+
+    def _drop(self, key: str):
+        self._entries.pop(key, None)
+        self._vectors.pop(key, None)
+        self._tokens.pop(key, None)
+        self._dirty = True
+
+    def get_stats(self) -> Dict:
+        """Hit-rate metrics for this session plus cache size."""
+        with self._lock:
+            hits = self.stats['exact_hits'] + self.stats['similar_hits']
+            lookups = hits + self.stats['misses']
+            return {
+                **self.stats,
+                'lookups': lookups,
+                'hit_rate': (hits / lookups * 100) if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+
+def get_response_cache() -> ResponseCache:
+    """Get singleton instance of ResponseCache."""
+    if not hasattr(get_response_cache, '_instance'):
+        get_response_cache._instance = ResponseCache()
+    return get_response_cache._instance
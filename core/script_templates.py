@@ -7,6 +7,11 @@ Templates are selected based on keyword relevancy matching.
 from typing import Dict, List, Optional, Tuple
 import re
 
+try:
+    from core.template_index import TemplateIndex, get_template_index
+except ImportError:
+    from template_index import TemplateIndex, get_template_index
+
 
 class ScriptTemplates:
     """
@@ -14,8 +19,12 @@ class ScriptTemplates:
     Used by mistral for template-based script generation.
     """
     
-    def __init__(self):
+    def __init__(self, index: Optional[TemplateIndex] = None):
         self.templates = self._load_templates()
+        # Built-ins are static, so the shared index only needs them once per process
+        self.index = index or get_template_index()
+        if self.index.count('builtin') != len(self.templates):
+            self.index.add_many('builtin', self.templates, replace=True)
     
     def _load_templates(self) -> Dict[str, Dict]:
         """Load all script templates organized by language and purpose."""
@@ -449,29 +458,13 @@ func main() {
             },
         }
     
-    def find_template(self, query: str) -> Optional[Tuple[str, Dict]]:
-        """Find best matching template based on keyword relevancy."""
-        query_lower = query.lower()
-        best_match = None
-        best_score = 0
-        
-        for template_id, template in self.templates.items():
-            score = 0
-            
-            # Check keyword matches
-            for keyword in template['keywords']:
-                if keyword in query_lower:
-                    score += 1
-            
-            # Boost score if language is mentioned
-            if template['language'].lower() in query_lower:
-                score += 2
-            
-            if score > best_score:
-                best_score = score
-                best_match = (template_id, template)
-        
-        return best_match if best_score > 0 else None
+    def find_template(self, query: str, min_relevance: float = 2.0) -> Optional[Tuple[str, Dict]]:
+        """Find best matching template based on keyword relevancy (BM25 over the shared index)."""
+        hits = self.index.search(query, k=1, source='builtin')
+        if not hits or hits[0]['relevance'] < min_relevance:
+            return None
+        template_id = hits[0]['id']
+        return (template_id, self.templates[template_id])
     
     def list_templates(self, language: Optional[str] = None) -> List[Dict]:
         """List all templates, optionally filtered by language."""
@@ -8,6 +8,11 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
+try:
+    from core.memory_index import get_memory_index, summarize_session_data, KIND_LOG
+except ImportError:
+    from memory_index import get_memory_index, summarize_session_data, KIND_LOG
+
 
 class SessionLogger:
     """
@@ -18,6 +23,7 @@ class SessionLogger:
     - Stores in ~/.luciferai/logs/sessions/
     - Auto-cleans sessions older than 6 months
     - Tracks conversation history, commands, and metadata
+    - Indexes messages and per-session summaries in the shared MemoryIndex
     """
     
     def __init__(self, user_id: str):
@@ -102,6 +108,13 @@ class SessionLogger:
         
         self.session_data['messages'].append(message_entry)
         
+        try:
+            get_memory_index().add_entry(
+                KIND_LOG, self.session_id, role, content, message_entry['timestamp']
+            )
+        except Exception:
+            pass  # Index is an accelerator - never block logging
+        
         # Auto-save every 5 messages
         if len(self.session_data['messages']) % 5 == 0:
             self._save_session()
@@ -218,6 +231,15 @@ class SessionLogger:
         """Save current session data to file."""
         with open(self.session_file, 'w') as f:
             json.dump(self.session_data, f, indent=2)
+        
+        try:
+            get_memory_index().update_session(
+                KIND_LOG, self.session_id,
+                summarize_session_data(KIND_LOG, self.session_data),
+                self.session_file
+            )
+        except Exception:
+            pass
     
     def get_session_info(self) -> Dict:
         """Get current session information."""
@@ -246,6 +268,30 @@ class SessionLogger:
         if not sessions_dir.exists():
             return []
         
+        try:
+            index = get_memory_index()
+            index.sync_directory(KIND_LOG, sessions_dir, prefix='session_')
+            rows = index.list_sessions(KIND_LOG, limit=limit)
+        except Exception:
+            return SessionLogger._scan_recent_sessions(sessions_dir, limit)
+        
+        return [
+            {
+                'session_id': row['session_id'],
+                'started_at': row['started_at'],
+                'ended_at': row['ended_at'],
+                'message_count': row['message_count'] or 0,
+                'commands_count': row['commands_count'] or 0,
+                'files_created': row['files_created'] or 0,
+                'files_modified': row['files_modified'] or 0,
+                'events_count': row['events_count'] or 0
+            }
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _scan_recent_sessions(sessions_dir: Path, limit: int) -> List[Dict]:
+        """Fallback for get_recent_sessions when the index is unavailable."""
         sessions = []
         session_files = sorted(sessions_dir.glob("session_*.json"), reverse=True)[:limit]
         
@@ -254,18 +300,9 @@ class SessionLogger:
                 with open(session_file, 'r') as f:
                     session_data = json.load(f)
                     
-                    # Create summary
-                    summary = {
-                        'session_id': session_data.get('session_id'),
-                        'started_at': session_data.get('started_at'),
-                        'ended_at': session_data.get('ended_at'),
-                        'message_count': len(session_data.get('messages', [])),
-                        'commands_count': session_data.get('commands_executed', 0),
-                        'files_created': len(session_data.get('files_created', [])),
-                        'files_modified': len(session_data.get('files_modified', [])),
-                        'events_count': len(session_data.get('events', []))
-                    }
-                    
+                    summary = {'session_id': session_data.get('session_id')}
+                    summary.update(summarize_session_data(KIND_LOG, session_data))
+                    summary.pop('model', None)
                     sessions.append(summary)
             except:
                 continue
@@ -284,6 +321,53 @@ class SessionLogger:
                 'newest_session': None
             }
         
+        try:
+            index = get_memory_index()
+            index.sync_directory(KIND_LOG, sessions_dir, prefix='session_')
+            stats = index.session_stats(KIND_LOG)
+        except Exception:
+            return SessionLogger._scan_session_stats(sessions_dir)
+        
+        return {
+            'total_sessions': stats['total'],
+            'total_messages': stats['messages'],
+            'oldest_session': SessionLogger._session_id_to_iso(stats['oldest']),
+            'newest_session': SessionLogger._session_id_to_iso(stats['newest'])
+        }
+    
+    @staticmethod
+    def search_sessions(query: str, since: Optional[datetime] = None,
+                        until: Optional[datetime] = None, limit: int = 20) -> List[Dict]:
+        """
+        Full-text search across all session logs.
+        
+        Args:
+            query: Words to search for
+            since: Only messages at or after this time
+            until: Only messages at or before this time
+            limit: Maximum number of results
+        
+        Returns:
+            Ranked list of {session_id, role, content, timestamp, score}
+        """
+        sessions_dir = Path.home() / ".luciferai" / "logs" / "sessions"
+        index = get_memory_index()
+        index.sync_directory(KIND_LOG, sessions_dir, prefix='session_')
+        return index.search(query, kinds=[KIND_LOG], since=since, until=until, limit=limit)
+    
+    @staticmethod
+    def _session_id_to_iso(session_id: Optional[str]) -> Optional[str]:
+        """Convert a YYYYMMDD_HHMMSS session ID to an ISO timestamp."""
+        if not session_id:
+            return None
+        try:
+            return datetime.strptime(session_id, "%Y%m%d_%H%M%S").isoformat()
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _scan_session_stats(sessions_dir: Path) -> Dict:
+        """Fallback for get_session_stats when the index is unavailable."""
         session_files = list(sessions_dir.glob("session_*.json"))
         
         if not session_files:
@@ -44,11 +44,11 @@ class SmartTemplateManager:
             (template_id, template_data, source)
             source can be: 'builtin', 'consensus', 'online_enhanced'
         """
-        # Always check built-in templates first
+        # Always check built-in templates first (both lookups use the shared BM25 index)
         builtin_match = self.script_templates.find_template(query)
         
         # Check consensus templates
-        consensus_matches = self.template_consensus.search_templates(query, language)
+        consensus_matches = self.template_consensus.search_templates(query, language, limit=1)
         consensus_best = consensus_matches[0] if consensus_matches else None
         
         # If offline, return best available
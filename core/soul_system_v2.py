@@ -8,6 +8,7 @@ import uuid
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from collections import deque
 import random
 
 # Paths
@@ -360,7 +361,7 @@ class Soul:
     """Represents a combat soul with stats, weapons, and progression."""
     
     def __init__(self, soul_id: str, entity_key: str, rarity: str, obtained_event: str, 
-                 obtained_date: str, verified_hash: str):
+                 obtained_date: str, verified_hash: str, rng: Optional[random.Random] = None):
         self.id = soul_id
         self.entity_key = entity_key
         self.rarity = rarity
@@ -386,8 +387,8 @@ class Soul:
         if rarity in ['uncommon', 'angelic', 'demonic', 'celestial']:
             self.stats['speed'] = 0.0
         
-        # Randomly assign weapons based on rarity
-        self.weapons = self._assign_random_weapons()
+        # Randomly assign weapons based on rarity (seeded rng for reproducible loadouts)
+        self.weapons = self._assign_random_weapons(rng or random)
         
         # Memory & binding
         self.llm_binding = None
@@ -414,26 +415,26 @@ class Soul:
             return CELESTIAL_SOULS[self.entity_key]
         return {}
     
-    def _assign_random_weapons(self) -> Dict:
+    def _assign_random_weapons(self, rng=random) -> Dict:
         """Assign random weapons based on rarity."""
         weapons = {}
         
         if self.rarity == 'angelic':
             # 1 random rare weapon
-            weapon_key = random.choice(list(RARE_WEAPONS.keys()))
+            weapon_key = rng.choice(list(RARE_WEAPONS.keys()))
             weapons[weapon_key] = RARE_WEAPONS[weapon_key].copy()
             
         elif self.rarity == 'demonic':
             # 1 random rare + 1 random legendary
-            rare_key = random.choice(list(RARE_WEAPONS.keys()))
-            legendary_key = random.choice(list(LEGENDARY_WEAPONS.keys()))
+            rare_key = rng.choice(list(RARE_WEAPONS.keys()))
+            legendary_key = rng.choice(list(LEGENDARY_WEAPONS.keys()))
             weapons[rare_key] = RARE_WEAPONS[rare_key].copy()
             weapons[legendary_key] = LEGENDARY_WEAPONS[legendary_key].copy()
             
         elif self.rarity == 'celestial':
             # 2-3 random divine weapons
-            num_weapons = random.choice([2, 3])
-            divine_keys = random.sample(list(DIVINE_WEAPONS.keys()), num_weapons)
+            num_weapons = rng.choice([2, 3])
+            divine_keys = rng.sample(list(DIVINE_WEAPONS.keys()), num_weapons)
             for key in divine_keys:
                 weapons[key] = DIVINE_WEAPONS[key].copy()
         
@@ -776,10 +777,86 @@ def get_weight_class(rarity: str) -> str:
     return weight_classes.get(rarity, 'UNKNOWN')
 
 
-def battle_simulation(soul1: Soul, soul2: Soul) -> Soul:
-    """Simulate a battle between two souls. Returns the winner."""
+MAX_BOUT_ROUNDS = 100000  # Two weaponless level-1 souls deal 0.00 DPS and would trade blows forever
+MAX_BOUT_EVENTS = 400     # Attacks kept for render_bout(): the opening half and the closing half
+
+
+def simulate_bout(soul1: Soul, soul2: Soul, record: bool = True) -> Dict:
+    """Fight a bout without any output or pacing.
+
+    Returns {'winner': 1|2|0, 'rounds', 'hp1', 'hp2', 'events', 'events_skipped'};
+    winner 0 is a draw (both souls still standing after MAX_BOUT_ROUNDS).
+    With `record`, events holds one (round, attacker, damage, apple_used,
+    hp1, hp2) tuple per attack for render_bout(), at most MAX_BOUT_EVENTS:
+    the middle of a longer bout is dropped and counted in events_skipped.
+    Bulk runs pass record=False.
+    """
+
+    max_hp = [soul1.calculate_max_health(), soul2.calculate_max_health()]
+    hp = list(max_hp)
+    dps = [soul1.calculate_dps(), soul2.calculate_dps()]
+    has_apple = [soul1.has_golden_apple(), soul2.has_golden_apple()]
+    used_apple = [False, False]
+    opening = []
+    closing = deque(maxlen=MAX_BOUT_EVENTS - MAX_BOUT_EVENTS // 2)
+    attacks = 0
+    
+    round_num = 0
+    while hp[0] > 0 and hp[1] > 0 and round_num < MAX_BOUT_ROUNDS:
+        round_num += 1
+        for attacker in (0, 1):
+            defender = 1 - attacker
+            hp[defender] -= dps[attacker]
+            
+            # Golden Apple heals once at 20% HP
+            apple = hp[defender] <= max_hp[defender] * 0.2 and has_apple[defender] and not used_apple[defender]
+            if apple:
+                hp[defender] = max_hp[defender]
+                used_apple[defender] = True
+            
+            if record:
+                event = (round_num, attacker + 1, dps[attacker], apple, hp[0], hp[1])
+                (opening if len(opening) < MAX_BOUT_EVENTS // 2 else closing).append(event)
+                attacks += 1
+            if hp[defender] <= 0:
+                break
+    
+    if hp[0] > 0 and hp[1] > 0:
+        winner = 0
+    else:
+        winner = 1 if hp[0] > 0 else 2
+    
+    return {
+        'winner': winner,
+        'rounds': round_num,
+        'hp1': hp[0],
+        'hp2': hp[1],
+        'events': opening + list(closing),
+        'events_skipped': attacks - len(opening) - len(closing)
+    }
+
+
+def draw_bout_health_bar(current_hp: float, max_hp: float, width: int = 40) -> str:
+    """Draw a visual health bar."""
+    percentage = max(0, min(1, current_hp / max_hp))
+    filled = int(width * percentage)
+    empty = width - filled
+    
+    bar = "█" * filled + "░" * empty
+    return f"[{bar}] {int(current_hp)}/{int(max_hp)} HP ({percentage*100:.1f}%)"
+
+
+def render_bout(soul1: Soul, soul2: Soul, bout: Dict, pace: float = 1.0) -> None:
+    """Play back a recorded bout with the tournament presentation.
+
+    pace scales every pause (0 prints the whole bout at once).
+    """
     import time
     
+    def pause(seconds: float):
+        if pace > 0:
+            time.sleep(seconds * pace)
+    
     # Tournament announcement
     print("\n\n")
     print("█" * 80)
@@ -792,9 +869,9 @@ def battle_simulation(soul1: Soul, soul2: Soul) -> Soul:
     
     # Display both loadouts
     display_soul_loadout(soul1, "🔵 FIGHTER 1 - BLUE CORNER")
-    time.sleep(0.5)
+    pause(0.5)
     display_soul_loadout(soul2, "🔴 FIGHTER 2 - RED CORNER")
-    time.sleep(0.5)
+    pause(0.5)
     
     # Face-off
     print("\n" + "=" * 80)
@@ -807,41 +884,15 @@ def battle_simulation(soul1: Soul, soul2: Soul) -> Soul:
     
     # Countdown
     print("📢 FIGHTERS READY...\n")
-    time.sleep(1)
+    pause(1)
     for i in [3, 2, 1]:
         print(f"   {i}...".center(80))
-        time.sleep(1)
+        pause(1)
     print("\n🔔 FIGHT! 🔔\n".center(80))
-    time.sleep(0.3)
-    
-    fighter1_hp = soul1.calculate_max_health()
-    fighter2_hp = soul2.calculate_max_health()
-    
-    fighter1_max_hp = fighter1_hp
-    fighter2_max_hp = fighter2_hp
+    pause(0.3)
     
-    fighter1_dps = soul1.calculate_dps()
-    fighter2_dps = soul2.calculate_dps()
-    
-    fighter1_used_apple = False
-    fighter2_used_apple = False
-    
-    def draw_health_bar(current_hp: float, max_hp: float, width: int = 40) -> str:
-        """Draw a visual health bar."""
-        percentage = max(0, min(1, current_hp / max_hp))
-        filled = int(width * percentage)
-        empty = width - filled
-        
-        # Color based on HP percentage
-        if percentage > 0.6:
-            bar_char = "█"  # Green
-        elif percentage > 0.2:
-            bar_char = "█"  # Yellow
-        else:
-            bar_char = "█"  # Red
-        
-        bar = bar_char * filled + "░" * empty
-        return f"[{bar}] {int(current_hp)}/{int(max_hp)} HP ({percentage*100:.1f}%)"
+    souls = (soul1, soul2)
+    max_hp = (soul1.calculate_max_health(), soul2.calculate_max_health())
     
     print("=" * 80)
     print("LIVE BATTLE")
@@ -850,79 +901,64 @@ def battle_simulation(soul1: Soul, soul2: Soul) -> Soul:
     
     # Initial health bars
     print(f"🔵 {soul1.entity['emoji']} {soul1.entity['name']}")
-    print(f"   {draw_health_bar(fighter1_hp, fighter1_max_hp)}")
+    print(f"   {draw_bout_health_bar(max_hp[0], max_hp[0])}")
     print()
     print(f"🔴 {soul2.entity['emoji']} {soul2.entity['name']}")
-    print(f"   {draw_health_bar(fighter2_hp, fighter2_max_hp)}")
+    print(f"   {draw_bout_health_bar(max_hp[1], max_hp[1])}")
     print()
     print("=" * 80)
-    time.sleep(1)
+    pause(1)
     
-    round_num = 0
-    while fighter1_hp > 0 and fighter2_hp > 0:
-        round_num += 1
-        
-        # Fighter 1 attacks Fighter 2
-        damage1 = fighter1_dps
-        fighter2_hp -= damage1
-        
-        print(f"\n⚔️  Round {round_num}: {soul1.entity['emoji']} {soul1.entity['name']} attacks for {damage1:.2f} damage!")
-        
-        # Check for Golden Apple trigger (Fighter 2)
-        if fighter2_hp <= fighter2_max_hp * 0.2 and soul2.has_golden_apple() and not fighter2_used_apple:
-            fighter2_hp = fighter2_max_hp
-            fighter2_used_apple = True
-            print(f"   ✨ {soul2.entity['name']} uses 🍎 Golden Notch Apple! Fully healed!")
+    skipped = bout.get('events_skipped', 0)
+    for i, (round_num, attacker, damage, apple, hp1, hp2) in enumerate(bout['events']):
+        if skipped and i == MAX_BOUT_EVENTS // 2:
+            print("\n" + "-" * 80)
+            print(f"⏩ {skipped:,} more attacks...".center(80))
+            print("-" * 80)
+        soul, defender = souls[attacker - 1], souls[2 - attacker]
+        print(f"\n⚔️  Round {round_num}: {soul.entity['emoji']} {soul.entity['name']} attacks for {damage:.2f} damage!")
+        if apple:
+            print(f"   ✨ {defender.entity['name']} uses 🍎 Golden Notch Apple! Fully healed!")
         
         # Show health bars
         print(f"\n🔵 {soul1.entity['emoji']} {soul1.entity['name']}")
-        print(f"   {draw_health_bar(fighter1_hp, fighter1_max_hp)}")
+        print(f"   {draw_bout_health_bar(max(0, hp1), max_hp[0])}")
         print(f"🔴 {soul2.entity['emoji']} {soul2.entity['name']}")
-        print(f"   {draw_health_bar(max(0, fighter2_hp), fighter2_max_hp)}")
+        print(f"   {draw_bout_health_bar(max(0, hp2), max_hp[1])}")
         
-        if fighter2_hp <= 0:
+        if attacker == 1 and hp2 <= 0:
             break
-        
-        time.sleep(0.3)
-        
-        # Fighter 2 attacks Fighter 1
-        damage2 = fighter2_dps
-        fighter1_hp -= damage2
-        
-        print(f"\n⚔️  Round {round_num}: {soul2.entity['emoji']} {soul2.entity['name']} attacks for {damage2:.2f} damage!")
-        
-        # Check for Golden Apple trigger (Fighter 1)
-        if fighter1_hp <= fighter1_max_hp * 0.2 and soul1.has_golden_apple() and not fighter1_used_apple:
-            fighter1_hp = fighter1_max_hp
-            fighter1_used_apple = True
-            print(f"   ✨ {soul1.entity['name']} uses 🍎 Golden Notch Apple! Fully healed!")
-        
-        # Show health bars
-        print(f"\n🔵 {soul1.entity['emoji']} {soul1.entity['name']}")
-        print(f"   {draw_health_bar(max(0, fighter1_hp), fighter1_max_hp)}")
-        print(f"🔴 {soul2.entity['emoji']} {soul2.entity['name']}")
-        print(f"   {draw_health_bar(max(0, fighter2_hp), fighter2_max_hp)}")
-        
-        time.sleep(0.3)
+        pause(0.3)
         
         # Pause every 10 rounds to prevent spam
-        if round_num % 10 == 0:
+        if attacker == 2 and round_num % 10 == 0:
             print("\n" + "-" * 80)
-            time.sleep(0.5)
+            pause(0.5)
     
     print("\n" + "=" * 80)
-    if fighter1_hp > 0:
-        print(f"🏆 WINNER: {soul1.entity['emoji']} {soul1.entity['name']} with {int(fighter1_hp)} HP remaining!")
-        return soul1
+    if bout['winner'] == 0:
+        print(f"🤝 DRAW after {bout['rounds']:,} rounds - both fighters still standing!")
+    elif bout['winner'] == 1:
+        print(f"🏆 WINNER: {soul1.entity['emoji']} {soul1.entity['name']} with {int(bout['hp1'])} HP remaining!")
     else:
-        print(f"🏆 WINNER: {soul2.entity['emoji']} {soul2.entity['name']} with {int(fighter2_hp)} HP remaining!")
-        return soul2
+        print(f"🏆 WINNER: {soul2.entity['emoji']} {soul2.entity['name']} with {int(bout['hp2'])} HP remaining!")
+
 
+def battle_simulation(soul1: Soul, soul2: Soul, pace: float = 1.0) -> Soul:
+    """Simulate a battle between two souls and show it. Returns the winner (soul1 on a draw)."""
+    bout = simulate_bout(soul1, soul2)
+    render_bout(soul1, soul2, bout, pace)
+    return soul2 if bout['winner'] == 2 else soul1
 
-def test_battles():
-    """Test battles between different rarity tiers."""
+
+def test_battles(pace: float = 1.0):
+    """Test battles between different rarity tiers (pace scales the pauses, 0 = none)."""
     import time
     
+    def pause(seconds: float):
+        if pace > 0:
+            time.sleep(seconds * pace)
+    
     print("\n\n")
     print("⭐" * 40)
     print("⭐" * 40)
@@ -930,7 +966,7 @@ def test_battles():
     print("⭐" * 40)
     print("⭐" * 40)
     print()
-    time.sleep(1)
+    pause(1)
     
     # Create max-level souls for each tier
     common = Soul(str(uuid.uuid4()), 'creative', 'common', 'Test', '2024-01-01', 'hash')
@@ -952,28 +988,28 @@ def test_battles():
     print("\n🏟️  BOUT 1 OF 5")
     common2 = Soul(str(uuid.uuid4()), 'dark', 'common', 'Test', '2024-01-01', 'hash')
     common2.level = 50
-    winner1 = battle_simulation(common, common2)
-    time.sleep(2)
+    winner1 = battle_simulation(common, common2, pace)
+    pause(2)
     
     # Battle 2: LIGHTWEIGHT - Uncommon
     print("\n🏟️  BOUT 2 OF 5")
-    winner2 = battle_simulation(uncommon, winner1)
-    time.sleep(2)
+    winner2 = battle_simulation(uncommon, winner1, pace)
+    pause(2)
     
     # Battle 3: MIDDLEWEIGHT - Angelic
     print("\n🏟️  BOUT 3 OF 5")
-    winner3 = battle_simulation(angelic, winner2)
-    time.sleep(2)
+    winner3 = battle_simulation(angelic, winner2, pace)
+    pause(2)
     
     # Battle 4: HEAVYWEIGHT - Demonic
     print("\n🏟️  BOUT 4 OF 5")
-    winner4 = battle_simulation(demonic, winner3)
-    time.sleep(2)
+    winner4 = battle_simulation(demonic, winner3, pace)
+    pause(2)
     
     # Battle 5: CHAMPIONSHIP - SUPER HEAVYWEIGHT - Celestial
     print("\n🏟️  CHAMPIONSHIP BOUT - BOUT 5 OF 5")
-    champion = battle_simulation(celestial, winner4)
-    time.sleep(1)
+    champion = battle_simulation(celestial, winner4, pace)
+    pause(1)
     
     # Grand finale
     print("\n\n")
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+🏟️ Soul Tournament Engine - bulk brackets and round-robins
+Bouts are simulated without output or pauses (soul_system_v2.simulate_bout,
+or the headless PhysicsCombatEngine) on a process pool, so a tournament runs
+at bouts/sec instead of minutes per bout. Every bout keeps both souls as
+dicts, which is all replay() needs to show it again through the regular
+battle presentation.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.soul_system_v2 import Soul, simulate_bout, render_bout
+
+MODES = ('classic', 'physics')
+PHYSICS_ARENA_WIDTH = 1920  # Fixed so a replay matches the bulk result on any display
+MIN_PARALLEL_BOUTS = 16     # Fewer bouts than this don't pay for starting worker processes
+
+
+def _run_bout(job: Tuple[str, Dict, Dict]) -> Dict:
+    """Worker: fight one bout from serialized souls, return its result."""
+    mode, soul1_data, soul2_data = job
+    soul1, soul2 = Soul.from_dict(soul1_data), Soul.from_dict(soul2_data)
+    if mode == 'physics':
+        from core.physics_combat_engine import PhysicsCombatEngine
+        engine = PhysicsCombatEngine(soul1, soul2, arena_width=PHYSICS_ARENA_WIDTH)
+        winner = engine.simulate_battle(show_display=False, save_log=False)
+        return {'winner': winner, 'rounds': None, 'duration': round(engine.time, 2),
+                'hp1': engine.fighter1.hp, 'hp2': engine.fighter2.hp}
+    bout = simulate_bout(soul1, soul2, record=False)
+    return {'winner': bout['winner'], 'rounds': bout['rounds'], 'duration': None,
+            'hp1': bout['hp1'], 'hp2': bout['hp2']}
+
+
+class TournamentEngine:
+    """Runs soul tournaments across a process pool."""
+
+    def __init__(self, mode: str = 'classic', workers: Optional[int] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown bout mode: {mode}")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._bout_count = 0
+        self.stats = {'bouts': 0, 'seconds': 0.0, 'bouts_per_sec': 0.0, 'workers': self.workers}
+
+    # ═══════════════════════════════════════════════════════
+    # Formats
+    # ═══════════════════════════════════════════════════════
+
+    def round_robin(self, souls: Sequence[Soul], bouts_per_pair: int = 1) -> Dict:
+        """Every soul fights every other soul, swapping corners on each repeat."""
+        pairs = []
+        for i in range(len(souls)):
+            for j in range(i + 1, len(souls)):
+                for repeat in range(bouts_per_pair):
+                    pairs.append((souls[i], souls[j]) if repeat % 2 == 0 else (souls[j], souls[i]))
+
+        with self:
+            start = time.time()
+            bouts = self._fight(pairs)
+            self._record(len(bouts), time.time() - start)
+
+        return {
+            'format': 'round_robin',
+            'mode': self.mode,
+            'bouts': bouts,
+            'standings': self.standings(bouts),
+            'stats': dict(self.stats)
+        }
+
+    def bracket(self, souls: Sequence[Soul]) -> Dict:
+        """Single elimination in seed order; top seeds get byes up to the next power of two."""
+        if not souls:
+            raise ValueError("A bracket needs at least one soul")
+        size = 1
+        while size < len(souls):
+            size *= 2
+        # Standard seeding: 1 v N, 2 v N-1, ... with None for a bye
+        entrants: List[Optional[Soul]] = list(souls) + [None] * (size - len(souls))
+        field = [entrants[k] for k in _seed_order(size)]
+
+        rounds = []
+        with self:
+            start = time.time()
+            total = 0
+            while len(field) > 1:
+                pairs = [(field[i], field[i + 1]) for i in range(0, len(field), 2)]
+                fights = [pair for pair in pairs if pair[0] and pair[1]]
+                bouts = iter(self._fight(fights, round_num=len(rounds) + 1))
+                results, advancing = [], []
+                for soul1, soul2 in pairs:
+                    if soul1 and soul2:
+                        bout = next(bouts)
+                        results.append(bout)
+                        # A drawn bout goes to the higher seed
+                        advancing.append(soul2 if bout['winner'] == 2 else soul1)
+                    else:
+                        advancing.append(soul1 or soul2)
+                total += len(results)
+                rounds.append(results)
+                field = advancing
+            self._record(total, time.time() - start)
+
+        return {
+            'format': 'bracket',
+            'mode': self.mode,
+            'rounds': rounds,
+            'bouts': [bout for results in rounds for bout in results],
+            'champion': field[0].to_dict() if field[0] else None,
+            'stats': dict(self.stats)
+        }
+
+    # ═══════════════════════════════════════════════════════
+    # Results
+    # ═══════════════════════════════════════════════════════
+
+    @staticmethod
+    def standings(bouts: Sequence[Dict]) -> List[Dict]:
+        """Win/loss/draw table, best win rate first."""
+        table: Dict[str, Dict] = {}
+        for bout in bouts:
+            for corner, soul in ((1, bout['soul1']), (2, bout['soul2'])):
+                row = table.setdefault(soul['id'], {
+                    'id': soul['id'], 'name': soul['entity']['name'], 'rarity': soul['rarity'],
+                    'level': soul['level'], 'wins': 0, 'losses': 0, 'draws': 0
+                })
+                if bout['winner'] == 0:
+                    row['draws'] += 1
+                elif bout['winner'] == corner:
+                    row['wins'] += 1
+                else:
+                    row['losses'] += 1
+        for row in table.values():
+            played = row['wins'] + row['losses'] + row['draws']
+            row['win_rate'] = round((row['wins'] + 0.5 * row['draws']) / played, 4) if played else 0.0
+        return sorted(table.values(), key=lambda r: (-r['win_rate'], -r['wins'], r['name']))
+
+    def replay(self, bout: Dict, pace: float = 1.0) -> int:
+        """Show a finished bout again through the regular battle display. Returns its winner."""
+        soul1, soul2 = Soul.from_dict(bout['soul1']), Soul.from_dict(bout['soul2'])
+        if bout.get('mode', self.mode) == 'physics':
+            from core.physics_combat_engine import PhysicsCombatEngine
+            engine = PhysicsCombatEngine(soul1, soul2, arena_width=PHYSICS_ARENA_WIDTH)
+            return engine.simulate_battle(show_display=pace > 0, save_log=False)
+        bout = simulate_bout(soul1, soul2)
+        render_bout(soul1, soul2, bout, pace)
+        return bout['winner']
+
+    # ═══════════════════════════════════════════════════════
+    # Execution
+    # ═══════════════════════════════════════════════════════
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _fight(self, pairs: Sequence[Tuple[Soul, Soul]], round_num: Optional[int] = None) -> List[Dict]:
+        """Simulate bouts (in parallel when worthwhile), results in input order."""
+        jobs = [(self.mode, soul1.to_dict(), soul2.to_dict()) for soul1, soul2 in pairs]
+        if self.workers > 1 and len(jobs) >= MIN_PARALLEL_BOUTS:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            chunksize = max(1, len(jobs) // (self.workers * 4))
+            results = list(self._pool.map(_run_bout, jobs, chunksize=chunksize))
+        else:
+            results = [_run_bout(job) for job in jobs]
+
+        bouts = []
+        for (mode, soul1_data, soul2_data), result in zip(jobs, results):
+            self._bout_count += 1
+            bout = {'id': self._bout_count, 'mode': mode, 'round': round_num,
+                    'soul1': soul1_data, 'soul2': soul2_data}
+            bout.update(result)
+            bouts.append(bout)
+        return bouts
+
+    def _record(self, bouts: int, seconds: float):
+        self.stats['bouts'] += bouts
+        self.stats['seconds'] = round(self.stats['seconds'] + seconds, 3)
+        self.stats['bouts_per_sec'] = round(self.stats['bouts'] / self.stats['seconds'], 1) if self.stats['seconds'] else 0.0
+
+
+def _seed_order(size: int) -> List[int]:
+    """Bracket slot order for seeds 0..size-1 so seeds 0 and 1 can only meet in the final."""
+    order = [0]
+    while len(order) < size:
+        span = len(order) * 2
+        order = [k for seed in order for k in (seed, span - 1 - seed)]
+    return order
+
+
+def print_standings(result: Dict):
+    """Print a tournament's standings and throughput."""
+    print(f"\n🏟️  {result['format'].replace('_', ' ').title()} ({result['mode']})")
+    print("─" * 64)
+    for place, row in enumerate(result.get('standings') or TournamentEngine.standings(result['bouts']), 1):
+        print(f"{place:3d}. {row['name']:14s} {row['rarity']:10s} L{row['level']:<5d} "
+              f"{row['wins']:4d}W {row['losses']:4d}L {row['draws']:3d}D  {row['win_rate']*100:5.1f}%")
+    if result.get('champion'):
+        champion = result['champion']
+        print(f"\n🏆 Champion: {champion['entity']['emoji']} {champion['entity']['name']}")
+    stats = result['stats']
+    print(f"\n⚡ {stats['bouts']} bouts in {stats['seconds']:.2f}s = {stats['bouts_per_sec']} bouts/sec "
+          f"({stats['workers']} workers)")
@@ -11,6 +11,11 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
+try:
+    from core.template_index import TemplateIndex, get_template_index
+except ImportError:
+    from template_index import TemplateIndex, get_template_index
+
 
 class TemplateConsensus:
     """
@@ -18,7 +23,7 @@ class TemplateConsensus:
     Similar to fix consensus but for code templates.
     """
     
-    def __init__(self, user_id: str):
+    def __init__(self, user_id: str, index: Optional[TemplateIndex] = None):
         self.user_id = user_id
         self.consensus_home = Path.home() / ".luciferai" / "consensus"
         self.templates_dir = self.consensus_home / "templates"
@@ -33,6 +38,14 @@ class TemplateConsensus:
         self.local_templates = self._load_local_templates()
         self.remote_templates = self._load_remote_templates()
         self.upload_queue = self._load_upload_queue()
+        
+        # Search index (shared with ScriptTemplates); local copies shadow remote ones
+        self.index = index or get_template_index()
+        self._reindex()
+    
+    def _reindex(self):
+        """Rebuild this collection's entries in the search index."""
+        self.index.add_many('consensus', {**self.remote_templates, **self.local_templates}, replace=True)
     
     def _load_local_templates(self) -> Dict:
         """Load locally created/saved templates."""
@@ -173,6 +186,7 @@ class TemplateConsensus:
         
         if orphaned or fixed_hashes > 0:
             self._save_local_templates()
+            self._reindex()
             
             # Print detailed cleanup report
             print(f"\033[33m🧹 Template Consensus Cleanup Report:\033[0m")
@@ -243,6 +257,7 @@ class TemplateConsensus:
         template['version'] = template.get('version', 1) + 1
         
         self._save_local_templates()
+        self.index.add('consensus', template_hash, template)
         return True
     
     def add_template(self, name: str, language: str, keywords: List[str], 
@@ -308,6 +323,7 @@ class TemplateConsensus:
         # Save to local
         self.local_templates[template_hash] = template_data
         self._save_local_templates()
+        self.index.add('consensus', template_hash, template_data)
         
         # Queue for upload
         if template_hash not in [t['hash'] for t in self.upload_queue]:
@@ -319,53 +335,29 @@ class TemplateConsensus:
         
         return template_hash
     
-    def search_templates(self, query: str, language: Optional[str] = None) -> List[Dict]:
+    def search_templates(self, query: str, language: Optional[str] = None,
+                         limit: int = 20) -> List[Dict]:
         """
         Search for templates in local and remote collections.
         
         Args:
             query: Search keywords
             language: Optional language filter
+            limit: Maximum number of matches
         
         Returns:
-            List of matching templates sorted by relevance
+            List of matching templates sorted by relevance. `relevance_score`
+            is 0-10 (10 = best possible match for every query term);
+            `bm25_score` is the raw index score.
         """
-        query_lower = query.lower()
         matches = []
-        
-        # Combine local and remote
-        all_templates = {**self.remote_templates, **self.local_templates}
-        
-        for template_hash, template in all_templates.items():
-            # Filter by language if specified
-            if language and template['language'].lower() != language.lower():
-                continue
-            
-            score = 0
-            
-            # Check name match
-            if query_lower in template['name'].lower():
-                score += 3
-            
-            # Check keyword matches
-            for keyword in template.get('keywords', []):
-                if keyword.lower() in query_lower:
-                    score += 2
-            
-            # Check language match
-            if template['language'].lower() in query_lower:
-                score += 1
-            
-            # Check description match
-            if query_lower in template.get('description', '').lower():
-                score += 1
-            
-            if score > 0:
-                matches.append({
-                    **template,
-                    'relevance_score': score,
-                    'source': 'local' if template_hash in self.local_templates else 'remote'
-                })
+        for hit in self.index.search(query, k=limit, language=language, source='consensus'):
+            matches.append({
+                **hit['template'],
+                'relevance_score': round(hit['relevance'], 2),
+                'bm25_score': hit['score'],
+                'source': 'local' if hit['id'] in self.local_templates else 'remote'
+            })
         
         # Sort by relevance score (highest first) then by rating
         matches.sort(key=lambda x: (x['relevance_score'], x.get('rating', 0)), reverse=True)
@@ -439,12 +431,17 @@ class TemplateConsensus:
             remote_templates = uploader.fetch_templates()
             
             if remote_templates:
+                downloaded = {}
                 for template_hash, template_data in remote_templates.items():
                     if template_hash not in self.remote_templates:
                         self.remote_templates[template_hash] = template_data
                         stats['downloaded'] += 1
+                        if template_hash not in self.local_templates:
+                            downloaded[template_hash] = template_data
                 
                 self._save_remote_templates()
+                if downloaded:
+                    self.index.add_many('consensus', downloaded)
             
             # Upload queued templates
             if self.upload_queue:
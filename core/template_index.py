@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+🔎 Template Index - BM25 search shared by all template sources
+One inverted index over built-in (ScriptTemplates) and consensus
+(TemplateConsensus) templates. Fields are weighted BM25 (name > keywords >
+description > code identifiers), languages and sources are facets, and
+per-term impact lists are cached so a query only touches the postings of
+its own terms.
+"""
+import heapq
+import math
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+K1 = 1.2
+B = 0.75
+FIELD_WEIGHTS = {'name': 3.0, 'keywords': 2.0, 'description': 1.0, 'code': 0.3}
+LANGUAGE_BOOST = 1.25     # Query mentions the template's language
+MAX_POSTINGS_PER_TERM = 2000  # Impact-ordered; lower-impact tail is skipped for very common terms
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'for', 'from', 'i', 'in',
+    'into', 'is', 'it', 'me', 'my', 'need', 'of', 'on', 'or', 'please', 'some', 'that', 'the',
+    'this', 'to', 'want', 'we', 'with', 'you', 'make', 'create', 'build', 'write', 'new',
+}
+# Identifiers that appear in nearly every template of a language carry no signal
+CODE_STOPWORDS = STOPWORDS | {
+    'def', 'self', 'return', 'import', 'if', 'else', 'elif', 'for', 'while', 'none', 'true',
+    'false', 'not', 'try', 'except', 'class', 'function', 'const', 'let', 'var', 'func', 'fi',
+    'then', 'echo', 'main', 'name', 'print', 'string', 'str', 'int', 'err', 'nil', 'package',
+    'usr', 'bin', 'env', 'python', 'python3', 'bash', 'sh',
+}
+
+_TOKEN = re.compile(r"[A-Za-z0-9]+")
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_SUFFIXES = ("ing", "ers", "er", "es", "ed", "s")
+_SIBILANTS = ("s", "x", "z", "ch", "sh")
+
+
+def _stem(word: str) -> str:
+    """Tiny suffix stripper so 'scrape', 'scraper', 'scraping' and 'scrapes' share a term."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith("ss"):
+                return word
+            if suffix == "es" and not word[:-2].endswith(_SIBILANTS):
+                continue  # 'files' -> 'file', but 'boxes' -> 'box'
+            word = word[:-len(suffix)]
+            break
+    if word.endswith("e") and len(word) > 4:
+        return word[:-1]  # 'parse'/'parser', 'scrape'/'scraper'
+    return word
+
+
+def tokenize(text: str, stopwords: Set[str] = STOPWORDS) -> List[str]:
+    """Lowercased, stemmed terms; camelCase/snake_case identifiers are split (and kept joined)."""
+    terms = []
+    for raw in _TOKEN.findall(text or ""):
+        parts = _CAMEL.findall(raw)
+        words = [p.lower() for p in parts]
+        if len(words) > 1:
+            words.append(raw.lower())
+        for word in words:
+            if word not in stopwords and (len(word) > 1 or word.isdigit()):
+                terms.append(_stem(word))
+    return terms
+
+
+class TemplateIndex:
+    """
+    BM25F-style index over templates from several sources.
+
+    Documents are keyed by (source, template_id). `search` returns the top-k
+    hits with their raw BM25 score and a 0-10 relevance normalised against
+    the best score each query term can contribute. Scores are scaled by the
+    share of query terms the template matches (Lucene's coordination factor),
+    so partial matches rank and score below full ones. Terms no
+    template matches count at the impact of a rare name match, so a template
+    that covers only part of the query stays well below 10.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._docs: Dict[Tuple[str, str], Dict] = {}
+        self._doc_terms: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._lengths: Dict[Tuple[str, str], float] = {}
+        self._postings: Dict[str, Dict[Tuple[str, str], float]] = {}
+        self._languages: Dict[str, Set[Tuple[str, str]]] = {}
+        self._sources: Dict[str, Set[Tuple[str, str]]] = {}
+        self._total_length = 0.0
+        self._generation = 0
+        self._impacts: Dict[str, Tuple[int, List[Tuple[float, Tuple[str, str]]]]] = {}
+
+    # ---------- updates ----------
+
+    def add(self, source: str, template_id: str, template: Dict):
+        """Index (or re-index) one template."""
+        with self._lock:
+            self._add(source, template_id, template)
+            self._generation += 1
+
+    def add_many(self, source: str, templates: Dict[str, Dict], replace: bool = False):
+        """Index several templates; with replace=True the source's other templates are dropped."""
+        with self._lock:
+            if replace:
+                for key in list(self._sources.get(source, ())):
+                    if key[1] not in templates:
+                        self._remove(key)
+            for template_id, template in templates.items():
+                self._add(source, template_id, template)
+            self._generation += 1
+
+    def remove(self, source: str, template_id: str):
+        with self._lock:
+            if (source, template_id) in self._docs:
+                self._remove((source, template_id))
+                self._generation += 1
+
+    def _add(self, source: str, template_id: str, template: Dict):
+        key = (source, template_id)
+        if key in self._docs:
+            self._remove(key)
+        fields = {
+            'name': tokenize(template.get('name', '')),
+            'keywords': tokenize(" ".join(template.get('keywords', []))),
+            'description': tokenize(template.get('description', '')),
+            'code': tokenize(template.get('template', ''), CODE_STOPWORDS),
+        }
+        weights: Dict[str, float] = {}
+        length = 0.0
+        for field, terms in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            length += weight * len(terms)
+            for term in terms:
+                weights[term] = weights.get(term, 0.0) + weight
+        for term, tf in weights.items():
+            self._postings.setdefault(term, {})[key] = tf
+
+        language = (template.get('language') or '').lower()
+        self._docs[key] = template
+        self._doc_terms[key] = weights
+        self._lengths[key] = length
+        self._total_length += length
+        self._languages.setdefault(language, set()).add(key)
+        self._sources.setdefault(source, set()).add(key)
+
+    def _remove(self, key: Tuple[str, str]):
+        for term in self._doc_terms.pop(key):
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+        template = self._docs.pop(key)
+        self._total_length -= self._lengths.pop(key)
+        language = (template.get('language') or '').lower()
+        self._languages[language].discard(key)
+        self._sources[key[0]].discard(key)
+
+    # ---------- queries ----------
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, key) -> bool:
+        return key in self._docs
+
+    def get(self, source: str, template_id: str) -> Optional[Dict]:
+        return self._docs.get((source, template_id))
+
+    def count(self, source: Optional[str] = None) -> int:
+        """Number of indexed templates (from one source, or all)."""
+        with self._lock:
+            return len(self._sources.get(source, ())) if source else len(self._docs)
+
+    def languages(self) -> Dict[str, int]:
+        """Language facet counts."""
+        with self._lock:
+            return {lang: len(keys) for lang, keys in self._languages.items() if keys}
+
+    def _term_impacts(self, term: str) -> List[Tuple[float, Tuple[str, str]]]:
+        """BM25 contribution of `term` per document, highest first (cached until the index changes)."""
+        cached = self._impacts.get(term)
+        if cached and cached[0] == self._generation:
+            return cached[1]
+        postings = self._postings.get(term)
+        if not postings:
+            return []
+        n = len(self._docs)
+        avg_length = self._total_length / n if n else 1.0
+        df = len(postings)
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        lengths = self._lengths
+        impacts = sorted(
+            ((idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths[key] / avg_length)), key)
+             for key, tf in postings.items()),
+            reverse=True
+        )
+        self._impacts[term] = (self._generation, impacts)
+        return impacts
+
+    def _unmatched_impact(self) -> float:
+        """What a term no template contains would score in a short template's name, had one matched it."""
+        n = len(self._docs)
+        idf = math.log(1 + (n + 0.5) / 0.5)
+        tf = FIELD_WEIGHTS['name']
+        return idf * tf * (K1 + 1) / (tf + K1 * (1 - B))
+
+    def search(self, query: str, k: int = 10, language: Optional[str] = None,
+               source: Optional[str] = None) -> List[Dict]:
+        """
+        Top-k templates for `query`.
+
+        Args:
+            language: Only templates in this language (facet filter)
+            source: Only templates from this source ('builtin', 'consensus', ...)
+
+        Returns:
+            [{'source', 'id', 'score', 'relevance', 'template'}] best first
+        """
+        with self._lock:
+            terms = list(dict.fromkeys(tokenize(query)))
+            allowed = None
+            if language:
+                allowed = self._languages.get(language.lower(), set())
+            if source:
+                by_source = self._sources.get(source, set())
+                allowed = by_source if allowed is None else allowed & by_source
+            mentioned = {w.lower() for w in _TOKEN.findall(query or "")} & {
+                lang for lang, keys in self._languages.items() if lang and keys}
+
+            scores: Dict[Tuple[str, str], float] = {}
+            matched: Dict[Tuple[str, str], int] = {}
+            best_possible = 0.0
+            for term in terms:
+                facet = term in mentioned  # Language names count through the boost instead
+                impacts = self._term_impacts(term)
+                taken = 0
+                for impact, key in impacts:
+                    if allowed is not None and key not in allowed:
+                        continue
+                    if not taken:
+                        best_possible += impact
+                    scores[key] = scores.get(key, 0.0) + impact
+                    if not facet:
+                        matched[key] = matched.get(key, 0) + 1
+                    taken += 1
+                    if taken >= MAX_POSTINGS_PER_TERM:
+                        break
+                if not taken and not facet:
+                    # Unmatched terms still count toward the best possible score
+                    best_possible += self._unmatched_impact()
+
+            if mentioned and not language:
+                boosted = set().union(*(self._languages[lang] for lang in mentioned))
+                for key in scores.keys() & boosted:
+                    scores[key] *= LANGUAGE_BOOST
+                best_possible *= LANGUAGE_BOOST
+
+            query_terms = sum(1 for term in terms if term not in mentioned)
+            if query_terms:
+                scores = {key: score * matched[key] / query_terms
+                          for key, score in scores.items() if key in matched}
+
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [{
+                'source': key[0],
+                'id': key[1],
+                'score': score,
+                'relevance': min(10.0, 10.0 * score / best_possible) if best_possible else 0.0,
+                'template': self._docs[key]
+            } for key, score in top]
+
+
+def get_template_index() -> TemplateIndex:
+    """Process-wide template index shared by ScriptTemplates, TemplateConsensus and SmartTemplateManager."""
+    if not hasattr(get_template_index, '_instance'):
+        get_template_index._instance = TemplateIndex()
+    return get_template_index._instance
+
+
+def benchmark_search(count: int = 10000, queries: int = 1000) -> Dict[str, float]:
+    """Build an index of `count` synthetic templates and time queries against it."""
+    import random
+
+    rng = random.Random(7)
+    languages = ["Python", "JavaScript", "Bash", "Go", "Rust"]
+    vocab = ["api", "rest", "flask", "scraper", "backup", "monitor", "deploy", "cli", "parser",
+             "csv", "json", "database", "sqlite", "cache", "queue", "worker", "upload", "image",
+             "resize", "email", "notify", "cron", "log", "rotate", "auth", "token", "server",
+             "client", "socket", "stream", "async", "retry", "config", "yaml", "test", "mock"]
+    vocab += [f"topic{i}" for i in range(2000)]
+    index = TemplateIndex()
+    start = time.perf_counter()
+    index.add_many("consensus", {
+        f"t{i}": {
+            'name': " ".join(rng.sample(vocab, 3)).title(),
+            'language': rng.choice(languages),
+            'keywords': rng.sample(vocab, 5),
+            'description': " ".join(rng.sample(vocab, 8)),
+            'template': "\n".join(f"def {rng.choice(vocab)}_{rng.choice(vocab)}(data):\n    return data"
+                                  for _ in range(5))
+        } for i in range(count)
+    })
+    build = time.perf_counter() - start
+
+    query_texts = [" ".join(rng.sample(vocab[:36], rng.randint(2, 4))) for _ in range(queries)]
+    for text in query_texts[:50]:
+        index.search(text)  # Warm the impact cache, as a long-running REPL would be
+    start = time.perf_counter()
+    for text in query_texts:
+        index.search(text, k=10)
+    per_query = (time.perf_counter() - start) / queries
+
+    # First query after an update rebuilds the impact lists of its terms
+    index.add("consensus", "fresh", {'name': "Fresh Api Template", 'language': "Python",
+                                     'keywords': ["api", "fresh"], 'template': "pass"})
+    start = time.perf_counter()
+    index.search(query_texts[0], k=10)
+    cold = time.perf_counter() - start
+    return {'templates': count, 'build_s': build, 'query_ms': per_query * 1000, 'cold_query_ms': cold * 1000}
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        result = benchmark_search(count)
+        print(f"{result['templates']} templates: built in {result['build_s']:.2f}s, "
+              f"{result['query_ms']:.3f} ms/query ({result['cold_query_ms']:.3f} ms right after an update)")
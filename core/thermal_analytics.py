@@ -1,18 +1,153 @@
 #!/usr/bin/env python3
 """
 🌡️ LuciferAI Thermal Analytics - Heat Dispersion Tracking & Analysis
-Monitors thermal performance and calculates cooling efficiency metrics
+Monitors thermal performance and calculates cooling efficiency metrics.
+A background sampler writes readings into a fixed-size ring buffer
+(float32 column per sensor); rolling mean/max/stddev are updated on every
+write, so a long-running session uses constant memory and stats are O(1).
 """
 import os
-import json
+import math
+import atexit
+import threading
 import subprocess
+from array import array
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
 from collections import deque
 
 from lucifer_colors import c, Colors, Emojis
 
+# SMC keys averaged into each sensor group
+SMC_SENSORS = {
+    "CPU": ["TC0P", "TC1P"],
+    "GPU": ["TG0P", "TG1P"],
+    "MEM": ["TM0P"],
+    "HEAT": ["TH0P"],
+    "SSD": ["Ts0P"],
+    "BAT": ["TB0T", "TB1T"]
+}
+
+# Ring buffer columns: sensors, fan RPM, average temp, heat dispersion % vs baseline
+THERMAL_COLUMNS = tuple(SMC_SENSORS) + ("FAN", "AVG", "DISPERSION")
+
+DEFAULT_SAMPLE_INTERVAL = 5.0   # Seconds between background readings
+DEFAULT_CAPACITY = 720          # Readings kept in memory (1h at the default rate)
+MAX_SAVED_READINGS = 1000       # Rows kept in the on-disk CSV log
+
+
+class ThermalRingBuffer:
+    """
+    Preallocated time series with one float32 column per series.
+    Once full, each append overwrites the oldest reading. Per-column sum,
+    sum of squares and a monotonic max queue are updated on every append,
+    so mean/max/std over the buffered window are O(1) reads.
+    Missing values are stored as NaN and left out of the stats.
+    """
+    
+    def __init__(self, columns: Sequence[str], capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.columns = tuple(columns)
+        self.capacity = capacity
+        self.timestamps = array('d', [0.0]) * capacity
+        self.data = {name: array('f', [math.nan]) * capacity for name in self.columns}
+        self.context_codes = array('B', [0]) * capacity
+        self.context_names: List[str] = []
+        self.head = 0      # Next slot to write
+        self.count = 0     # Readings currently held
+        self.written = 0   # Readings ever appended (sequence number of the next one)
+        
+        self._sum = {name: 0.0 for name in self.columns}
+        self._sumsq = {name: 0.0 for name in self.columns}
+        self._n = {name: 0 for name in self.columns}
+        self._max = {name: deque() for name in self.columns}  # (seq, value), values decreasing
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def _context_code(self, context: str) -> int:
+        if context in self.context_names:
+            return self.context_names.index(context)
+        if len(self.context_names) < 255:
+            self.context_names.append(context)
+            return len(self.context_names) - 1
+        return 255  # Reported as "other"
+    
+    def append(self, timestamp: float, values: Dict[str, float], context: str = "") -> int:
+        """Store one reading; returns its sequence number."""
+        slot, seq = self.head, self.written
+        full = self.count == self.capacity
+        
+        for name in self.columns:
+            column = self.data[name]
+            if full:
+                old = column[slot]
+                if old == old:  # not NaN
+                    self._sum[name] -= old
+                    self._sumsq[name] -= old * old
+                    self._n[name] -= 1
+            
+            value = values.get(name)
+            column[slot] = math.nan if value is None else value
+            stored = column[slot]  # float32-rounded, exactly what eviction will subtract
+            if stored == stored:
+                self._sum[name] += stored
+                self._sumsq[name] += stored * stored
+                self._n[name] += 1
+                queue = self._max[name]
+                while queue and queue[-1][1] <= stored:
+                    queue.pop()
+                queue.append((seq, stored))
+            
+            queue = self._max[name]
+            while queue and queue[0][0] <= seq - self.capacity:
+                queue.popleft()
+        
+        self.timestamps[slot] = timestamp
+        self.context_codes[slot] = self._context_code(context)
+        self.head = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.written += 1
+        
+        # Re-sum once per lap so add/subtract rounding can't accumulate
+        if self.written % self.capacity == 0:
+            for name in self.columns:
+                valid = [v for v in self.data[name] if v == v]
+                self._sum[name] = sum(valid)
+                self._sumsq[name] = sum(v * v for v in valid)
+        return seq
+    
+    def mean(self, name: str) -> Optional[float]:
+        n = self._n[name]
+        return self._sum[name] / n if n else None
+    
+    def max(self, name: str) -> Optional[float]:
+        queue = self._max[name]
+        return queue[0][1] if queue else None
+    
+    def std(self, name: str) -> Optional[float]:
+        n = self._n[name]
+        if not n:
+            return None
+        mean = self._sum[name] / n
+        return math.sqrt(max(0.0, self._sumsq[name] / n - mean * mean))
+    
+    def stats(self) -> Dict[str, Dict]:
+        """{column: {'mean', 'max', 'std', 'count'}} over the buffered window."""
+        return {name: {'mean': self.mean(name), 'max': self.max(name), 'std': self.std(name), 'count': self._n[name]}
+                for name in self.columns}
+    
+    def rows(self, since: int = 0) -> Iterator[Tuple[int, float, str, List[float]]]:
+        """Buffered readings with sequence >= since, oldest first: (seq, timestamp, context, values)."""
+        first = max(since, self.written - self.count)
+        for seq in range(first, self.written):
+            slot = seq % self.capacity
+            code = self.context_codes[slot]
+            context = self.context_names[code] if code < len(self.context_names) else "other"
+            yield seq, self.timestamps[slot], context, [self.data[name][slot] for name in self.columns]
+
 
 class ThermalAnalytics:
     """
@@ -20,7 +155,8 @@ class ThermalAnalytics:
     Only tracks when user ID is linked and validated.
     """
     
-    def __init__(self, user_id: str, validated: bool = False):
+    def __init__(self, user_id: str, validated: bool = False,
+                 sample_interval: float = DEFAULT_SAMPLE_INTERVAL, capacity: int = DEFAULT_CAPACITY):
         self.user_id = user_id
         self.validated = validated
         
@@ -28,12 +164,23 @@ class ThermalAnalytics:
         self.thermal_data_dir = self.lucifer_home / "thermal"
         self.thermal_data_dir.mkdir(parents=True, exist_ok=True)
         
-        self.thermal_log = self.thermal_data_dir / f"{user_id}_thermal.json"
-        self.session_data = []
+        self.thermal_log = self.thermal_data_dir / f"{user_id}_thermal.csv"
         self.baseline_temps = None
         
-        # Thermal history (last 100 readings)
-        self.temp_history = deque(maxlen=100)
+        # Thermal history: fixed-size ring buffer plus running session totals
+        self.readings = ThermalRingBuffer(THERMAL_COLUMNS, capacity)
+        self.latest_reading: Optional[Dict] = None
+        self._session = {
+            'count': 0, 'temp_sum': 0.0, 'temp_min': math.inf, 'temp_max': -math.inf,
+            'disp_count': 0, 'disp_sum': 0.0, 'disp_best': -math.inf, 'disp_worst': math.inf
+        }
+        self._saved_seq = 0
+        self._lock = threading.Lock()
+        
+        # Background sampler
+        self.sample_interval = sample_interval
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
         
         # SMC path
         self.smc_path = self._find_smc()
@@ -61,17 +208,8 @@ class ThermalAnalytics:
             return None
         
         try:
-            sensors = {
-                "CPU": ["TC0P", "TC1P"],
-                "GPU": ["TG0P", "TG1P"],
-                "MEM": ["TM0P"],
-                "HEAT": ["TH0P"],
-                "SSD": ["Ts0P"],
-                "BAT": ["TB0T", "TB1T"]
-            }
-            
             readings = {}
-            for name, keys in sensors.items():
+            for name, keys in SMC_SENSORS.items():
                 vals = []
                 for key in keys:
                     try:
@@ -156,8 +294,69 @@ class ThermalAnalytics:
             dispersion = self._calculate_dispersion(temps)
             reading["dispersion_metrics"] = dispersion
         
-        self.session_data.append(reading)
-        self.temp_history.append(reading)
+        self._store_reading(reading)
+    
+    def _store_reading(self, reading: Dict):
+        """Write a reading into the ring buffer and the running session totals."""
+        values = dict(reading["temperatures"])
+        values["FAN"] = reading.get("fan_speed")
+        values["AVG"] = reading["average_temp"]
+        dispersion = reading.get("dispersion_metrics", {}).get("dispersion_percentage")
+        values["DISPERSION"] = dispersion
+        
+        with self._lock:
+            self.readings.append(datetime.fromisoformat(reading["timestamp"]).timestamp(), values, reading["context"])
+            self.latest_reading = reading
+            
+            session = self._session
+            session['count'] += 1
+            session['temp_sum'] += reading["average_temp"]
+            session['temp_min'] = min(session['temp_min'], reading["average_temp"])
+            session['temp_max'] = max(session['temp_max'], reading["average_temp"])
+            if dispersion is not None:
+                session['disp_count'] += 1
+                session['disp_sum'] += dispersion
+                session['disp_best'] = max(session['disp_best'], dispersion)
+                session['disp_worst'] = min(session['disp_worst'], dispersion)
+    
+    # ═══════════════════════════════════════════════════════
+    # Background sampling
+    # ═══════════════════════════════════════════════════════
+    
+    def start_sampler(self, interval: Optional[float] = None) -> bool:
+        """Record a reading every `interval` seconds on a daemon thread until stop_sampler()."""
+        if not self.is_tracking_enabled():
+            return False
+        if interval:
+            self.sample_interval = interval
+        if self._sampler and self._sampler.is_alive():
+            return True
+        
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="thermal-sampler", daemon=True)
+        self._sampler.start()
+        atexit.register(self.stop_sampler)
+        return True
+    
+    def stop_sampler(self, save: bool = True):
+        """Stop the background sampler (saving what it collected)."""
+        self._stop_sampling.set()
+        atexit.unregister(self.stop_sampler)
+        if self._sampler and self._sampler is not threading.current_thread():
+            self._sampler.join(timeout=self.sample_interval + 5)
+        self._sampler = None
+        if save:
+            self.save_session(quiet=True)
+    
+    def is_sampling(self) -> bool:
+        return bool(self._sampler and self._sampler.is_alive())
+    
+    def _sample_loop(self):
+        while not self._stop_sampling.wait(self.sample_interval):
+            try:
+                self.record_reading("background")
+            except Exception:
+                pass  # A failed SMC read must not kill the sampler
     
     def _calculate_dispersion(self, current_temps: Dict[str, float]) -> Dict:
         """Calculate heat dispersion metrics."""
@@ -202,11 +401,10 @@ class ThermalAnalytics:
     
     def get_dispersion_stats(self) -> Optional[Dict]:
         """Get current heat dispersion statistics."""
-        if not self.baseline_temps or not self.session_data:
+        latest = self.latest_reading
+        if not self.baseline_temps or not latest:
             return None
         
-        latest = self.session_data[-1]
-        
         if "dispersion_metrics" not in latest:
             return None
         
@@ -266,59 +464,73 @@ class ThermalAnalytics:
                 print(c(f"  Efficiency: {stats['efficiency']}", eff_color))
                 print(c(f"  Hottest:    {stats['hottest_sensor']}", "yellow"))
     
-    def save_session(self):
-        """Save session data to disk."""
-        if not self.session_data:
+    def save_session(self, quiet: bool = False):
+        """Append readings not yet saved to the CSV log (last MAX_SAVED_READINGS kept)."""
+        with self._lock:
+            rows = list(self.readings.rows(since=self._saved_seq))
+            self._saved_seq = self.readings.written
+        if not rows:
             return
         
-        # Load existing data
-        existing = []
-        if self.thermal_log.exists():
-            try:
-                with open(self.thermal_log, 'r') as f:
-                    existing = json.load(f)
-            except:
-                existing = []
-        
-        # Append new data
-        existing.extend(self.session_data)
-        
-        # Keep last 1000 readings
-        if len(existing) > 1000:
-            existing = existing[-1000:]
+        new_file = not self.thermal_log.exists()
+        with open(self.thermal_log, 'a') as f:
+            if new_file:
+                f.write(",".join(("timestamp", "context") + THERMAL_COLUMNS) + "\n")
+            for _, timestamp, context, values in rows:
+                fields = [datetime.fromtimestamp(timestamp).isoformat(timespec='seconds'), context.replace(",", " ")]
+                fields += ["" if v != v else f"{v:.2f}" for v in values]
+                f.write(",".join(fields) + "\n")
         
-        # Save
-        with open(self.thermal_log, 'w') as f:
-            json.dump(existing, f, indent=2)
+        self._trim_log()
         
-        print(c(f"{Emojis.CHECKMARK} Thermal session saved ({len(self.session_data)} readings)", "green"))
+        if not quiet:
+            print(c(f"{Emojis.CHECKMARK} Thermal session saved ({len(rows)} readings)", "green"))
+    
+    def _trim_log(self):
+        # Rows are ~60 bytes; only read the file back once it is well past the limit
+        if self.thermal_log.stat().st_size < MAX_SAVED_READINGS * 120:
+            return
+        with open(self.thermal_log, 'r') as f:
+            lines = f.readlines()
+        if len(lines) - 1 > MAX_SAVED_READINGS:
+            tmp_file = self.thermal_log.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                f.writelines([lines[0]] + lines[-MAX_SAVED_READINGS:])
+            tmp_file.replace(self.thermal_log)
     
     def get_session_summary(self) -> Optional[Dict]:
-        """Get summary of current session."""
-        if not self.session_data:
+        """Get summary of current session (running totals, O(1))."""
+        with self._lock:
+            session = dict(self._session)
+            window = self.readings.stats()["AVG"]
+            window_size = len(self.readings)
+        if not session['count']:
             return None
         
-        temps_over_time = [r["average_temp"] for r in self.session_data]
-        
         summary = {
-            "readings_count": len(self.session_data),
-            "avg_temp": sum(temps_over_time) / len(temps_over_time),
-            "min_temp": min(temps_over_time),
-            "max_temp": max(temps_over_time),
-            "temp_variance": max(temps_over_time) - min(temps_over_time)
+            "readings_count": session['count'],
+            "avg_temp": session['temp_sum'] / session['count'],
+            "min_temp": session['temp_min'],
+            "max_temp": session['temp_max'],
+            "temp_variance": session['temp_max'] - session['temp_min'],
+            "window_readings": window_size,
+            "window_avg_temp": window['mean'],
+            "window_max_temp": window['max'],
+            "window_temp_std": window['std']
         }
         
-        # Calculate average dispersion if available
-        dispersions = [r.get("dispersion_metrics", {}).get("dispersion_percentage", 0) 
-                      for r in self.session_data 
-                      if "dispersion_metrics" in r]
-        
-        if dispersions:
-            summary["avg_dispersion_pct"] = sum(dispersions) / len(dispersions)
-            summary["best_dispersion_pct"] = max(dispersions)
-            summary["worst_dispersion_pct"] = min(dispersions)
+        # Average dispersion if available
+        if session['disp_count']:
+            summary["avg_dispersion_pct"] = session['disp_sum'] / session['disp_count']
+            summary["best_dispersion_pct"] = session['disp_best']
+            summary["worst_dispersion_pct"] = session['disp_worst']
         
         return summary
+    
+    def get_rolling_stats(self) -> Dict[str, Dict]:
+        """Mean/max/stddev per sensor over the buffered window."""
+        with self._lock:
+            return self.readings.stats()
 
 
 def print_thermal_banner(validated: bool, user_id: str):
@@ -2,10 +2,18 @@
 """
 🌳 Tree Visualizer - Visual Directory Structure Display
 Generates clean, annotated tree structures for directory listings
+
+Directories are read with os.scandir (DirEntry caches is_dir()/is_file()), and
+listings are kept for a few seconds so the previews shown before and after a
+move/create don't re-read the disk. ExecutionTracker file events invalidate
+the affected listings.
 """
+import heapq
 import os
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Iterator, Optional, Set, Tuple
 
 # Tree drawing characters
 BRANCH = "├── "
@@ -21,6 +29,94 @@ BLUE = '\033[34m'
 DIM = '\033[2m'
 RESET = '\033[0m'
 
+LISTING_TTL = 5.0               # Seconds a cached directory listing is trusted
+MAX_CACHED_ENTRIES = 5000       # Bigger directories are streamed, never cached
+MAX_CACHED_DIRECTORIES = 256
+
+
+class DirectoryListingCache:
+    """
+    Short-lived cache of os.scandir() listings, keyed by absolute path.
+    
+    Entries expire after `ttl` seconds or when invalidate() is called for
+    a path inside the directory.
+    """
+    
+    def __init__(self, ttl: float = LISTING_TTL, max_entries: int = MAX_CACHED_ENTRIES,
+                 max_directories: int = MAX_CACHED_DIRECTORIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_directories = max_directories
+        self._listings: Dict[str, Tuple[float, List[os.DirEntry]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def scan(self, directory) -> Iterator[os.DirEntry]:
+        """
+        Yield a directory's entries in os.scandir order.
+        
+        A fresh cached listing is replayed; otherwise the directory is read
+        lazily and, if it is small enough, cached once fully read.
+        """
+        key = os.path.abspath(directory)
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                self.hits += 1
+                listing = cached[1]
+            else:
+                self.misses += 1
+                listing = None
+        
+        if listing is not None:
+            yield from listing
+            return
+        
+        started = time.monotonic()
+        collected: Optional[List[os.DirEntry]] = []
+        with os.scandir(key) as it:
+            for entry in it:
+                if collected is not None:
+                    collected.append(entry)
+                    if len(collected) > self.max_entries:
+                        collected = None
+                yield entry
+        
+        if collected is not None:
+            with self._lock:
+                if len(self._listings) >= self.max_directories:
+                    self._listings.pop(next(iter(self._listings)))  # Oldest first
+                self._listings[key] = (started, collected)
+    
+    def invalidate(self, path):
+        """
+        Forget listings a change at `path` makes stale: itself, anything below it,
+        and its ancestors (a mkdir -p or move can add entries to any of them).
+        """
+        key = os.path.abspath(path)
+        below = key.rstrip(os.sep) + os.sep
+        with self._lock:
+            for cached in list(self._listings):
+                if cached == key or cached.startswith(below) or below.startswith(cached.rstrip(os.sep) + os.sep):
+                    del self._listings[cached]
+    
+    def clear(self):
+        with self._lock:
+            self._listings.clear()
+
+
+def get_listing_cache() -> DirectoryListingCache:
+    """Get singleton instance of DirectoryListingCache."""
+    if not hasattr(get_listing_cache, '_instance'):
+        get_listing_cache._instance = DirectoryListingCache()
+    return get_listing_cache._instance
+
+
+def _display_key(entry: os.DirEntry):
+    """Directories first, then files, case-insensitive by name."""
+    return (not entry.is_dir(), entry.name.lower())
+
 
 class TreeVisualizer:
     """Generates visual tree structures for directories."""
@@ -56,22 +152,31 @@ class TreeVisualizer:
         Returns:
             Formatted tree string
         """
+        return "\n".join(self.iter_tree(root_path, max_items))
+    
+    def print_tree(self, root_path: str, max_items: int = 50):
+        """Print the tree line by line as directories are read."""
+        for line in self.iter_tree(root_path, max_items):
+            print(line, flush=True)
+    
+    def iter_tree(self, root_path: str, max_items: int = 50) -> Iterator[str]:
+        """Yield the lines of generate_tree() as they are produced."""
         root = Path(root_path).resolve()
         
         if not root.exists():
-            return f"{root.name}/ (does not exist)"
+            yield f"{root.name}/ (does not exist)"
+            return
         
         if not root.is_dir():
-            return f"{root.name} (not a directory)"
+            yield f"{root.name} (not a directory)"
+            return
         
-        lines = [f"{CYAN}{root.name}/{RESET}"]
+        yield f"{CYAN}{root.name}/{RESET}"
         
         try:
-            self._build_tree(root, "", lines, 0, max_items)
+            yield from self._iter_tree(str(root), "", 0, max_items, {'count': 0})
         except Exception as e:
-            lines.append(f"{YELLOW}(Error reading directory: {e}){RESET}")
-        
-        return "\n".join(lines)
+            yield f"{YELLOW}(Error reading directory: {e}){RESET}"
     
     def _build_tree(self, directory: Path, prefix: str, lines: List[str], 
                     depth: int, max_items: int, shown_count: Dict = None):
@@ -88,33 +193,48 @@ class TreeVisualizer:
         """
         if shown_count is None:
             shown_count = {'count': 0}
+        lines.extend(self._iter_tree(str(directory), prefix, depth, max_items, shown_count))
+    
+    def _top_entries(self, directory: str, limit: int) -> Tuple[List[os.DirEntry], int]:
+        """
+        First `limit` visible entries of a directory in display order, plus how many
+        there are in total. Only `limit` entries are ever held and ordered, so a
+        huge directory costs one pass rather than a full sort.
+        """
+        total = 0
+        
+        def visible():
+            nonlocal total
+            for entry in get_listing_cache().scan(directory):
+                if not self.show_hidden and entry.name.startswith('.'):
+                    continue
+                if entry.is_dir() or entry.is_file():
+                    total += 1
+                    yield entry
         
+        top = heapq.nsmallest(limit, visible(), key=_display_key)
+        return top, total
+    
+    def _iter_tree(self, directory: str, prefix: str, depth: int, max_items: int,
+                   shown_count: Dict) -> Iterator[str]:
+        """Yield the lines under `directory`, sharing the item budget through shown_count."""
         if depth >= self.max_depth:
             return
         
         if shown_count['count'] >= max_items:
-            lines.append(f"{prefix}{ELBOW}{DIM}(... truncated ...){RESET}")
+            yield f"{prefix}{ELBOW}{DIM}(... truncated ...){RESET}"
             return
         
         try:
-            # Get directory contents
-            contents = sorted(directory.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower()))
-            
-            # Filter hidden files if needed
-            if not self.show_hidden:
-                contents = [p for p in contents if not p.name.startswith('.')]
-            
-            # Separate directories and files
-            dirs = [p for p in contents if p.is_dir()]
-            files = [p for p in contents if p.is_file()]
-            all_items = dirs + files
+            # Every item shown uses up budget, so nothing past the remaining budget can appear
+            all_items, total = self._top_entries(directory, max_items - shown_count['count'])
             
             for i, item in enumerate(all_items):
                 if shown_count['count'] >= max_items:
-                    lines.append(f"{prefix}{ELBOW}{DIM}(... {len(all_items) - i} more items ...){RESET}")
+                    yield f"{prefix}{ELBOW}{DIM}(... {total - i} more items ...){RESET}"
                     break
                 
-                is_last = (i == len(all_items) - 1)
+                is_last = (i == total - 1)
                 connector = ELBOW if is_last else BRANCH
                 
                 # Get annotation if exists
@@ -122,28 +242,34 @@ class TreeVisualizer:
                 annotation_str = f"  {DIM}# {annotation}{RESET}" if annotation else ""
                 
                 # Format item name with color
-                if item.is_dir():
+                is_dir = item.is_dir()
+                suffix = os.path.splitext(item.name)[1]
+                if is_dir:
                     item_str = f"{CYAN}{item.name}/{RESET}"
-                elif item.suffix in ['.py', '.sh', '.js', '.ts']:
+                elif suffix in ['.py', '.sh', '.js', '.ts']:
                     item_str = f"{GREEN}{item.name}{RESET}"
-                elif item.suffix in ['.md', '.txt', '.json', '.yaml', '.yml']:
+                elif suffix in ['.md', '.txt', '.json', '.yaml', '.yml']:
                     item_str = f"{BLUE}{item.name}{RESET}"
                 else:
                     item_str = item.name
                 
-                lines.append(f"{prefix}{connector}{item_str}{annotation_str}")
+                yield f"{prefix}{connector}{item_str}{annotation_str}"
                 shown_count['count'] += 1
                 
                 # Recurse into directories
-                if item.is_dir() and depth + 1 < self.max_depth:
+                if is_dir and depth + 1 < self.max_depth:
                     extension = BLANK if is_last else PIPE
-                    self._build_tree(item, prefix + extension, lines, depth + 1, 
-                                   max_items, shown_count)
+                    yield from self._iter_tree(item.path, prefix + extension, depth + 1,
+                                               max_items, shown_count)
+            else:
+                if total > len(all_items):
+                    # Budget ran out exactly on this directory's last shown item
+                    yield f"{prefix}{ELBOW}{DIM}(... {total - len(all_items)} more items ...){RESET}"
         
         except PermissionError:
-            lines.append(f"{prefix}{ELBOW}{YELLOW}(Permission denied){RESET}")
+            yield f"{prefix}{ELBOW}{YELLOW}(Permission denied){RESET}"
         except Exception as e:
-            lines.append(f"{prefix}{ELBOW}{YELLOW}(Error: {e}){RESET}")
+            yield f"{prefix}{ELBOW}{YELLOW}(Error: {e}){RESET}"
 
 
 def format_ls_as_tree(path: str, annotations: Optional[Dict[str, str]] = None,
@@ -10,8 +10,10 @@ Scales intelligently based on model tier:
 from typing import List, Dict, Optional, Callable
 from dataclasses import dataclass
 from enum import Enum
+import os
 import re
 from core.lucifer_colors import print_step
+from core.tree_visualizer import get_listing_cache
 
 
 class TaskComplexity(Enum):
@@ -69,6 +71,9 @@ class UniversalTaskSystem:
     def _display_tree(self, path, prefix="", is_last=True, max_depth=3, current_depth=0, created_items=None):
         """Display directory tree structure with visual branches.
         
+        Directories are read through the shared scandir listing cache, so the
+        tree shown right after an operation doesn't re-stat every entry.
+        
         Args:
             path: Path to display
             prefix: Current line prefix for tree branches
@@ -86,46 +91,39 @@ class UniversalTaskSystem:
         if not path.exists():
             return
         
-        # Determine branch characters
-        branch = "└── " if is_last else "├── "
-        
-        # Display current item
-        display_name = path.name + ("/" if path.is_dir() else "")
-        
-        # Highlight if newly created
-        if str(path) in created_items:
-            display_name += "  ← Created"
-        
-        if current_depth == 0:
-            print(f"{display_name}")
-        else:
-            print(f"{prefix}{branch}{display_name}")
+        listings = get_listing_cache()
         
-        # Recurse into directories
-        if path.is_dir() and current_depth < max_depth:
+        def show(item_path, name, is_dir, prefix, is_last, depth):
+            # Determine branch characters
+            branch = "└── " if is_last else "├── "
+            
+            # Display current item, highlighted if newly created
+            display_name = name + ("/" if is_dir else "")
+            if item_path in created_items:
+                display_name += "  ← Created"
+            
+            if depth == 0:
+                print(f"{display_name}")
+            else:
+                print(f"{prefix}{branch}{display_name}")
+            
+            # Recurse into directories
+            if not is_dir or depth >= max_depth:
+                return
+            
             # Get children, sorted (directories first, then files)
             try:
-                children = sorted(path.iterdir(), key=lambda p: (not p.is_dir(), p.name))
+                children = sorted(listings.scan(item_path), key=lambda e: (not e.is_dir(), e.name))
             except PermissionError:
                 return
             
+            child_prefix = "" if depth == 0 else prefix + ("    " if is_last else "│   ")
             for i, child in enumerate(children):
-                is_last_child = (i == len(children) - 1)
-                
-                # Determine new prefix
-                if current_depth == 0:
-                    new_prefix = ""
-                else:
-                    new_prefix = prefix + ("    " if is_last else "│   ")
-                
-                self._display_tree(
-                    child,
-                    new_prefix,
-                    is_last_child,
-                    max_depth,
-                    current_depth + 1,
-                    created_items
-                )
+                if child.is_symlink() and not os.path.exists(child.path):
+                    continue  # Dangling link
+                show(child.path, child.name, child.is_dir(), child_prefix, i == len(children) - 1, depth + 1)
+        
+        show(str(path), path.name, path.is_dir(), prefix, is_last, current_depth)
     
     def parse_command(self, command: str) -> Optional[Task]:
         """
@@ -292,7 +290,9 @@ class UniversalTaskSystem:
                     return "CANCELLED"
             
             # Create folder
-            folder_path.mkdir(parents=True, exist_ok=True)
+            if not folder_path.exists():
+                folder_path.mkdir(parents=True, exist_ok=True)
+                get_listing_cache().invalidate(str(folder_path))
             print(f"✅ Created folder: {folder_path}")
             
             # Determine file content based on tier
@@ -305,6 +305,7 @@ class UniversalTaskSystem:
             
             # Create file
             file_path.write_text(content)
+            get_listing_cache().invalidate(str(file_path))
             print(f"✅ Created file: {file_path}")
             
             # Make executable if script
@@ -371,7 +372,9 @@ class UniversalTaskSystem:
             created_items = set()
             
             # Create main folder
-            folder_path.mkdir(parents=True, exist_ok=True)
+            if not folder_path.exists():
+                folder_path.mkdir(parents=True, exist_ok=True)
+                get_listing_cache().invalidate(str(folder_path))
             print(f"✅ Created folder: {folder_path}")
             created_items.add(str(folder_path))
             
@@ -387,6 +390,7 @@ class UniversalTaskSystem:
                     if subfolder:  # Skip empty strings
                         subfolder_path = folder_path / subfolder
                         subfolder_path.mkdir(parents=True, exist_ok=True)
+                        get_listing_cache().invalidate(str(subfolder_path))
                         print(f"  ✅ Created subfolder: {subfolder}")
                         created_items.add(str(subfolder_path))
             
@@ -437,11 +441,14 @@ class UniversalTaskSystem:
             
             # Write or append content
             mode = 'w'  # Default to overwrite
-            if file_path.exists():
+            existed = file_path.exists()
+            if existed:
                 print(f"⚠️  File exists: {file_path.name}")
                 print(f"✏️  Writing: {content[:50]}..." if len(content) > 50 else f"✏️  Writing: {content}")
             
             file_path.write_text(content)
+            if not existed:
+                get_listing_cache().invalidate(str(file_path))  # Overwrites don't change listings
             print(f"✅ Wrote to file: {file_path}")
             
             return str(file_path)
@@ -532,6 +539,7 @@ class UniversalTaskSystem:
                 content = ""
             
             file_path.write_text(content)
+            get_listing_cache().invalidate(str(file_path))
             if content:
                 print(f"✅ Created file with template: {file_path}")
             else:
@@ -601,6 +609,7 @@ class UniversalTaskSystem:
             # Create empty file - content will be generated by LLM in multi-step flow
             file_path.parent.mkdir(parents=True, exist_ok=True)
             file_path.write_text('# Placeholder - will be generated by LLM\n')
+            get_listing_cache().invalidate(str(file_path))
             return str(file_path)
         
         return Task(
@@ -891,6 +900,8 @@ class UniversalTaskSystem:
             
             try:
                 shutil.move(str(source_file), str(dest_file))
+                get_listing_cache().invalidate(str(source_file))
+                get_listing_cache().invalidate(str(dest_file))
                 print(f"✅ Moved: {source_file.name} → {dest_dir.relative_to(Path.home()) if dest_dir.is_relative_to(Path.home()) else dest_dir}")
                 self.last_found_file = str(dest_file)
                 return str(dest_file)
@@ -1004,6 +1015,8 @@ class UniversalTaskSystem:
             # Move the file
             try:
                 shutil.move(str(source_file), str(dest_file))
+                get_listing_cache().invalidate(str(source_file))
+                get_listing_cache().invalidate(str(dest_file))
                 print(f"✅ Moved: {filename}")
                 print(f"   From: {source_file}")
                 print(f"   To:   {dest_file}")
@@ -1173,6 +1186,8 @@ class UniversalTaskSystem:
             
             try:
                 shutil.move(str(source_file), str(dest_file))
+                get_listing_cache().invalidate(str(source_file))
+                get_listing_cache().invalidate(str(dest_file))
                 print(f"✅ Moved: {source_file.name} → {dest_dir.relative_to(Path.home()) if dest_dir.is_relative_to(Path.home()) else dest_dir}")
                 steps.append("File moved")
                 return str(dest_file)
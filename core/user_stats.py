@@ -3,6 +3,8 @@
 📊 User Stats & Contribution Tracking
 Tracks user contributions to consensus for proper attribution and leaderboards.
 """
+import bisect
+import heapq
 import json
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -428,15 +430,65 @@ SECRET_BADGE_DEFINITIONS = [
     }
 ]
 
+BADGES_BY_ID = {badge['id']: badge for badge in BADGE_DEFINITIONS}
+
+# Ascending thresholds per badge, so a progress level is one bisect
+BADGE_THRESHOLDS = {
+    badge['id']: [level['threshold'] for level in badge.get('levels', [])]
+    for badge in BADGE_DEFINITIONS
+}
+
+
+def _total_contributions(profile: Dict) -> int:
+    return profile['total_templates'] + profile['total_fixes']
+
+
+def _flag(name: str):
+    return lambda profile: 1 if profile.get(name, False) else 0
+
+
+# Profile value that drives each badge's progress level
+BADGE_METRICS = {
+    'first_contribution': _total_contributions,
+    'active_contributor': _total_contributions,
+    'veteran_contributor': _total_contributions,
+    'elite_contributor': _total_contributions,
+    'template_master': lambda profile: profile['total_templates'],
+    'fix_specialist': lambda profile: profile['total_fixes'],
+    'community_favorite': lambda profile: profile.get('total_downloads', 0),
+    'quality_contributor': lambda profile: profile.get('avg_rating', 0),
+    'first_fix_to_fixnet': _flag('first_fix_uploaded_to_fixnet'),
+    'first_template_to_fixnet': _flag('first_template_uploaded_to_fixnet'),
+    'learning_experience': _flag('first_fix_failed_by_user'),
+    'problem_solver': _flag('first_fix_succeeded_for_user'),
+    'template_pioneer': _flag('first_template_used_successfully'),
+}
+
+# Badges whose progress can move when a template or fix is added
+CONTRIBUTION_BADGES = (
+    'first_contribution', 'active_contributor', 'veteran_contributor',
+    'elite_contributor', 'template_master', 'fix_specialist',
+)
+
+# Stale leaderboard heap entries allowed per user before the heap is rebuilt
+HEAP_COMPACT_FACTOR = 4
+
 
 class UserStatsTracker:
     """
     Track user contributions to FixNet consensus.
     Provides stats, history, and leaderboard functionality.
+    
+    Scores live in a max-heap (with lazily skipped stale entries) indexed by
+    user, and badge progress levels are cached per user; both are updated
+    as contributions come in, so leaderboards and badge screens don't
+    rescan every profile.
     """
     
     def __init__(self):
         self.stats = self._load_stats()
+        self._indexed_stats = None  # The stats dict the indexes below describe
+        self._sync_indexes()
     
     def _load_stats(self) -> Dict:
         """Load user statistics."""
@@ -450,6 +502,32 @@ class UserStatsTracker:
         with open(USER_STATS_FILE, 'w') as f:
             json.dump(self.stats, f, indent=2)
     
+    def _sync_indexes(self):
+        """Rebuild the score index and badge caches if self.stats was replaced."""
+        if self._indexed_stats is self.stats:
+            return
+        self._indexed_stats = self.stats
+        self._scores: Dict[str, int] = {}
+        self._order: Dict[str, int] = {}  # First-seen order, breaks score ties like a stable sort
+        self._score_heap: List[tuple] = []
+        self._badge_progress: Dict[str, Dict] = {}
+        for user_id in self.stats:
+            self._index_score(user_id)
+    
+    def _index_score(self, user_id: str):
+        """Push a user's current score onto the leaderboard heap if it changed."""
+        score = self.calculate_user_score(user_id)
+        order = self._order.setdefault(user_id, len(self._order))
+        if self._scores.get(user_id) == score:
+            return
+        self._scores[user_id] = score
+        heapq.heappush(self._score_heap, (-score, order, user_id))
+        
+        # Old entries are skipped when popped; drop them once they pile up
+        if len(self._score_heap) > HEAP_COMPACT_FACTOR * len(self._scores) + 64:
+            self._score_heap = [(-s, self._order[u], u) for u, s in self._scores.items()]
+            heapq.heapify(self._score_heap)
+    
     def get_user_profile(self, user_id: str) -> Dict:
         """
         Get complete profile for a user.
@@ -472,7 +550,7 @@ class UserStatsTracker:
         return self.stats[user_id]
     
     def update_user_stats(self, user_id: str, contribution_type: str, 
-                         item_hash: str, item_name: str):
+                         item_hash: str, item_name: str, save: bool = True):
         """
         Update user stats when they contribute a template or fix.
         
@@ -481,7 +559,9 @@ class UserStatsTracker:
             contribution_type: 'template' or 'fix'
             item_hash: Hash of the contributed item
             item_name: Name/description of the item
+            save: Write the stats file now (batch callers save once at the end)
         """
+        self._sync_indexes()
         if user_id not in self.stats:
             self.stats[user_id] = {
                 'user_id': user_id,
@@ -518,59 +598,54 @@ class UserStatsTracker:
         profile['last_contribution'] = datetime.now().isoformat()
         
         # Award badges
-        self._award_badges(user_id)
+        awarded = self._award_badges(user_id)
         
-        self._save_stats()
+        self._index_score(user_id)
+        self._update_badge_progress(user_id, CONTRIBUTION_BADGES + tuple(awarded))
+        
+        if save:
+            self._save_stats()
     
-    def _award_badges(self, user_id: str):
+    def _award_badges(self, user_id: str) -> List[str]:
         """
         Award badges based on contribution milestones.
         13 total badges (Badges 1-13) covering various achievements.
         Badge 0 (Founder/Member) is handled separately and not counted here.
         Uses badge IDs instead of full emoji+name strings.
+        
+        Returns:
+            IDs of the badges newly awarded (appended to the profile in order)
         """
         profile = self.stats[user_id]
-        badges = set(profile.get('badges', []))
+        badges = profile.setdefault('badges', [])
         
         total = profile['total_templates'] + profile['total_fixes']
         
-        # 1. Contribution level badges
-        if total >= 1:
-            badges.add('first_contribution')
-        if total >= 10:
-            badges.add('active_contributor')
-        if total >= 50:
-            badges.add('veteran_contributor')
-        if total >= 100:
-            badges.add('elite_contributor')
-        
-        # 6-7. Specialist badges
-        if profile['total_templates'] >= 20:
-            badges.add('template_master')
-        if profile['total_fixes'] >= 20:
-            badges.add('fix_specialist')
-        
-        # 8-9. Community badges
-        if profile.get('total_downloads', 0) >= 100:
-            badges.add('community_favorite')
-        if profile.get('avg_rating', 0) >= 4.5:
-            badges.add('quality_contributor')
-        
-        # 6-7. First FixNet upload badges
-        if profile.get('first_fix_uploaded_to_fixnet', False):
-            badges.add('first_fix_to_fixnet')
-        if profile.get('first_template_uploaded_to_fixnet', False):
-            badges.add('first_template_to_fixnet')
-        
-        # 8-10. Community validation badges
-        if profile.get('first_fix_failed_by_user', False):
-            badges.add('learning_experience')
-        if profile.get('first_fix_succeeded_for_user', False):
-            badges.add('problem_solver')
-        if profile.get('first_template_used_successfully', False):
-            badges.add('template_pioneer')
-        
-        profile['badges'] = list(badges)
+        milestones = (
+            # 1. Contribution level badges
+            ('first_contribution', total >= 1),
+            ('active_contributor', total >= 10),
+            ('veteran_contributor', total >= 50),
+            ('elite_contributor', total >= 100),
+            # 6-7. Specialist badges
+            ('template_master', profile['total_templates'] >= 20),
+            ('fix_specialist', profile['total_fixes'] >= 20),
+            # 8-9. Community badges
+            ('community_favorite', profile.get('total_downloads', 0) >= 100),
+            ('quality_contributor', profile.get('avg_rating', 0) >= 4.5),
+            # 6-7. First FixNet upload badges
+            ('first_fix_to_fixnet', profile.get('first_fix_uploaded_to_fixnet', False)),
+            ('first_template_to_fixnet', profile.get('first_template_uploaded_to_fixnet', False)),
+            # 8-10. Community validation badges
+            ('learning_experience', profile.get('first_fix_failed_by_user', False)),
+            ('problem_solver', profile.get('first_fix_succeeded_for_user', False)),
+            ('template_pioneer', profile.get('first_template_used_successfully', False)),
+        )
+        
+        earned = set(badges)
+        awarded = [badge_id for badge_id, reached in milestones if reached and badge_id not in earned]
+        badges.extend(awarded)
+        return awarded
     
     def get_badge_display(self, badge_id: str) -> dict:
         """
@@ -582,10 +657,7 @@ class UserStatsTracker:
         Returns:
             Dict with emoji, name, and other metadata
         """
-        for badge_def in BADGE_DEFINITIONS:
-            if badge_def['id'] == badge_id:
-                return badge_def
-        return None
+        return BADGES_BY_ID.get(badge_id)
     
     def _calculate_badge_progress(self, user_id: str, badge_def: dict) -> int:
         """
@@ -598,54 +670,62 @@ class UserStatsTracker:
         Returns:
             Progress level: 0 (locked), 1 (I), 2 (II), 3 (III), 4 (unlocked)
         """
-        profile = self.get_user_profile(user_id)
+        return self._badge_level(self.get_user_profile(user_id), badge_def)
+    
+    @staticmethod
+    def _badge_level(profile: Dict, badge_def: dict) -> int:
         badge_id = badge_def['id']
         
         # Check if fully unlocked
         if badge_id in profile.get('badges', []):
             return 4
         
-        # Calculate progress based on badge type
-        total = profile['total_templates'] + profile['total_fixes']
-        
-        # Get current value for this badge type
-        if badge_id == 'first_contribution':
-            current_value = total
-        elif badge_id in ['active_contributor', 'veteran_contributor', 'elite_contributor']:
-            current_value = total
-        elif badge_id == 'template_master':
-            current_value = profile['total_templates']
-        elif badge_id == 'fix_specialist':
-            current_value = profile['total_fixes']
-        elif badge_id == 'community_favorite':
-            current_value = profile.get('total_downloads', 0)
-        elif badge_id == 'quality_contributor':
-            current_value = profile.get('avg_rating', 0)
-        elif badge_id == 'first_fix_to_fixnet':
-            current_value = 1 if profile.get('first_fix_uploaded_to_fixnet', False) else 0
-        elif badge_id == 'first_template_to_fixnet':
-            current_value = 1 if profile.get('first_template_uploaded_to_fixnet', False) else 0
-        elif badge_id == 'learning_experience':
-            current_value = 1 if profile.get('first_fix_failed_by_user', False) else 0
-        elif badge_id == 'problem_solver':
-            current_value = 1 if profile.get('first_fix_succeeded_for_user', False) else 0
-        elif badge_id == 'template_pioneer':
-            current_value = 1 if profile.get('first_template_used_successfully', False) else 0
-        else:
-            current_value = 0
+        metric = BADGE_METRICS.get(badge_id)
+        current_value = metric(profile) if metric else 0
         
-        # Determine level based on thresholds
-        levels = badge_def.get('levels', [])
-        if not levels:
-            return 0
-        
-        # Count how many levels achieved (but not fully unlocked yet)
-        level = 0
-        for i, level_def in enumerate(levels):
-            if current_value >= level_def['threshold']:
-                level = min(i + 1, 3)  # Max level 3 before full unlock
+        # Count how many levels achieved (max level 3 before full unlock)
+        thresholds = BADGE_THRESHOLDS.get(badge_id)
+        if thresholds is None:
+            thresholds = [level_def['threshold'] for level_def in badge_def.get('levels', [])]
+        return min(bisect.bisect_right(thresholds, current_value), 3)
+    
+    def _get_badge_progress(self, user_id: str) -> Dict:
+        """
+        Cached progress for Badges 1-13: level per badge plus running totals.
         
-        return level
+        Returns:
+            Dict with 'levels' ({badge_id: 0-4}), 'total_levels' and 'unlocked_count'
+        """
+        self._sync_indexes()
+        progress = self._badge_progress.get(user_id)
+        if progress is None:
+            profile = self.get_user_profile(user_id)
+            levels = {badge_def['id']: self._badge_level(profile, badge_def) for badge_def in BADGE_DEFINITIONS}
+            progress = {
+                'levels': levels,
+                'total_levels': sum(levels.values()),
+                'unlocked_count': sum(1 for level in levels.values() if level == 4)
+            }
+            if user_id in self.stats:
+                self._badge_progress[user_id] = progress
+        return progress
+    
+    def _update_badge_progress(self, user_id: str, badge_ids):
+        """Recompute only the given badges' levels and adjust the running totals."""
+        progress = self._badge_progress.get(user_id)
+        if progress is None:
+            return  # Built on first read
+        profile = self.stats[user_id]
+        for badge_id in badge_ids:
+            badge_def = BADGES_BY_ID.get(badge_id)
+            if badge_def is None:
+                continue
+            old = progress['levels'][badge_id]
+            level = self._badge_level(profile, badge_def)
+            if level != old:
+                progress['levels'][badge_id] = level
+                progress['total_levels'] += level - old
+                progress['unlocked_count'] += (level == 4) - (old == 4)
     
     def _get_roman_numeral_display(self, level: int, badge_emoji: str) -> str:
         """
@@ -744,13 +824,12 @@ class UserStatsTracker:
         Returns:
             List of badge dicts with 'unlocked' status and progress levels
         """
-        profile = self.get_user_profile(user_id)
-        unlocked_badges = set(profile.get('badges', []))
+        progress_levels = self._get_badge_progress(user_id)['levels']
         
         badges_status = []
         for badge_def in BADGE_DEFINITIONS:
-            is_unlocked = badge_def['id'] in unlocked_badges
-            progress_level = self._calculate_badge_progress(user_id, badge_def)
+            progress_level = progress_levels[badge_def['id']]
+            is_unlocked = progress_level == 4
             
             # Determine display
             if is_unlocked or progress_level == 4:
@@ -794,20 +873,14 @@ class UserStatsTracker:
         Returns:
             Dict with progress percentage, unlocked count, and rewards info
         """
-        badges_status = self.get_all_badges_status(user_id)
+        progress = self._get_badge_progress(user_id)
         
         # Total possible progress: 13 badges * 4 levels each = 52 total levels
         # (Level 4 = unlocked, so we count levels 0-4)
         # NOTE: Badge 0 (Founder/Member) is NOT counted
-        total_levels = 0
+        total_levels = progress['total_levels']
         max_levels = len(BADGE_DEFINITIONS) * 4  # 13 badges * 4 levels = 52
-        
-        unlocked_count = 0
-        for badge in badges_status:
-            level = badge['progress_level']
-            total_levels += level
-            if badge['unlocked']:
-                unlocked_count += 1
+        unlocked_count = progress['unlocked_count']
         
         # Calculate percentage (0-100)
         percentage = int((total_levels / max_levels) * 100) if max_levels > 0 else 0
@@ -875,24 +948,28 @@ class UserStatsTracker:
         Returns:
             List of user profiles sorted by score
         """
-        leaderboard = []
-        
-        for user_id, profile in self.stats.items():
-            score = self.calculate_user_score(user_id)
-            leaderboard.append({
-                **profile,
-                'score': score
-            })
-        
-        # Sort by score (descending)
-        leaderboard.sort(key=lambda x: x['score'], reverse=True)
+        self._sync_indexes()
+        
+        # Pop the best current entries (discarding stale ones), then put them back
+        top = []
+        seen = set()
+        while self._score_heap and len(top) < top_n:
+            entry = heapq.heappop(self._score_heap)
+            neg_score, _, user_id = entry
+            if user_id in seen or self._scores.get(user_id) != -neg_score:
+                continue
+            seen.add(user_id)
+            top.append(entry)
+        for entry in top:
+            heapq.heappush(self._score_heap, entry)
         
-        return leaderboard[:top_n]
+        return [{**self.stats[user_id], 'score': -neg_score} for neg_score, _, user_id in top]
     
     def rebuild_stats_from_consensus(self):
         """
         Rebuild user stats from existing consensus data.
         Useful for initial migration or data recovery.
+        Replays every contribution in memory and writes the stats file once.
         """
         # Clear existing stats
         self.stats = {}
@@ -909,7 +986,8 @@ class UserStatsTracker:
                         user_id=user_id,
                         contribution_type='template',
                         item_hash=template_hash,
-                        item_name=template.get('name', 'Unknown')
+                        item_name=template.get('name', 'Unknown'),
+                        save=False
                     )
         
         # Scan fixes
@@ -925,9 +1003,11 @@ class UserStatsTracker:
                             user_id=user_id,
                             contribution_type='fix',
                             item_hash=fix.get('fix_hash', 'unknown'),
-                            item_name=f"{fix.get('error_type', 'Unknown')} - {fix.get('script_name', 'Unknown')}"
+                            item_name=f"{fix.get('error_type', 'Unknown')} - {fix.get('script_name', 'Unknown')}",
+                            save=False
                         )
         
+        self._save_stats()
         print(f"✅ Rebuilt stats for {len(self.stats)} user(s)")
     
     def get_user_history(self, user_id: str, limit: int = 20) -> List[Dict]:
@@ -4,11 +4,29 @@ Generates 3D meshes and textures from text prompts
 Follows MeshyAI-style two-stage approach: preview (geometry) + refine (texture)
 """
 import os
+import re
+import sys
 import math
+import time
 import random
+import struct
 from typing import Optional, Tuple, Dict, List
 from pathlib import Path
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+OBJ_WRITE_CHUNK = 100_000  # Lines formatted per write
+WELD_DECIMALS = 6          # Vertices equal to this many decimals are merged
+EXPORT_FORMATS = ('obj', 'stl', 'ply')
+
+_OBJ_VERTEX = re.compile(r'^v[ \t]+([^\n]*)', re.M)
+_OBJ_FACE = re.compile(r'^f[ \t]+([^\n]*)', re.M)
+_OBJ_REF_SUFFIX = re.compile(r'/[^ \t]*')  # "/vt/vn" after a face's vertex index
+
 class MeshGenerator:
     """Integration with 3D mesh generation"""
     
@@ -32,6 +50,9 @@ class MeshGenerator:
             'torus': 'torus',
             'ring': 'torus',
         }
+        
+        # Last mesh written as (path, vertices, faces), so refine skips re-parsing it
+        self._last_mesh = None
     
     def _check_availability(self) -> bool:
         """Check if mesh generation is configured and accessible"""
@@ -52,21 +73,30 @@ class MeshGenerator:
                 prompt = query.split(None, 1)[1] if len(query.split()) > 1 else "cube"
             else:
                 prompt = query
+            prompt, formats, detail = self._parse_options(prompt)
             
             # Two-stage generation: preview + refine
             preview_path, preview_msg = self._generate_preview(prompt)
             if not preview_path:
                 return False, preview_msg
             
-            refined_path, refine_msg = self._generate_refined(prompt, preview_path)
+            refined_path, refine_msg = self._generate_refined(prompt, preview_path, detail)
             if not refined_path:
                 return False, refine_msg
             
+            # Binary copies of the refined mesh
+            _, vertices, faces = self._last_mesh
+            exports = ""
+            for fmt in formats:
+                export_path = str(Path(refined_path).with_suffix(f".{fmt}"))
+                self.export_mesh(export_path, vertices, faces)
+                exports += f"{fmt.upper()} export: {export_path}\n"
+            
             result = f"""✅ 3D Mesh Generated!
 
 Preview mesh: {preview_path}
 Refined mesh: {refined_path}
-
+{exports}
 Prompt: "{prompt}"
 
 Files saved to: {self.output_dir}
@@ -81,6 +111,28 @@ The meshes are in OBJ format and can be opened with:
         except Exception as e:
             return False, f"Mesh generation failed: {e}"
     
+    def _parse_options(self, prompt: str) -> Tuple[str, List[str], int]:
+        """
+        Strip generation flags from a prompt
+        --stl / --ply: also export the refined mesh in that binary format
+        --detail N: subdivide the refined mesh N times (each level quadruples faces)
+        Returns: (prompt, formats, detail)
+        """
+        words, formats, detail = [], [], 0
+        tokens = prompt.split()
+        i = 0
+        while i < len(tokens):
+            token = tokens[i].lower()
+            if token.startswith('--') and token[2:] in EXPORT_FORMATS[1:]:
+                formats.append(token[2:])
+            elif token == '--detail' and i + 1 < len(tokens) and tokens[i + 1].isdigit():
+                detail = min(int(tokens[i + 1]), 4)
+                i += 1
+            else:
+                words.append(tokens[i])
+            i += 1
+        return ' '.join(words) or 'cube', formats, detail
+    
     def _generate_preview(self, prompt: str) -> Tuple[Optional[str], str]:
         """
         Stage 1: Generate base mesh with no texture (preview)
@@ -90,21 +142,23 @@ The meshes are in OBJ format and can be opened with:
             # Detect shape type from prompt
             shape_type = self._detect_shape_type(prompt)
             
-            # Generate base mesh geometry
+            # Generate base mesh geometry, merging coincident vertices (e.g. sphere poles)
             vertices, faces = self._create_base_geometry(shape_type, prompt)
+            vertices, faces = self._weld_vertices(vertices, faces)
             
             # Save as OBJ file
             filename = self._sanitize_filename(prompt) + "_preview.obj"
             filepath = self.output_dir / filename
             
             self._save_obj_file(str(filepath), vertices, faces)
+            self._last_mesh = (str(filepath), vertices, faces)
             
             return str(filepath), f"Preview mesh generated: {shape_type}"
             
         except Exception as e:
             return None, f"Preview generation failed: {e}"
     
-    def _generate_refined(self, prompt: str, preview_path: str) -> Tuple[Optional[str], str]:
+    def _generate_refined(self, prompt: str, preview_path: str, detail: int = 0) -> Tuple[Optional[str], str]:
         """
         Stage 2: Apply texture to preview mesh (refine)
         This demonstrates the texturing phase
@@ -113,8 +167,16 @@ The meshes are in OBJ format and can be opened with:
             # In a real implementation, this would use diffusion models to generate textures
             # For now, we'll add material properties based on prompt keywords
             
-            # Read preview mesh
-            vertices, faces = self._read_obj_file(preview_path)
+            # Preview mesh (still in memory when it was just generated)
+            if self._last_mesh and self._last_mesh[0] == preview_path:
+                _, vertices, faces = self._last_mesh
+            else:
+                vertices, faces = self._read_obj_file(preview_path)
+            
+            if detail:
+                # Spheres stay round: new vertices are pushed back onto the unit sphere
+                radius = 1.0 if self._detect_shape_type(prompt) == 'sphere' else None
+                vertices, faces = self._subdivide_mesh(vertices, faces, detail, radius)
             
             # Generate texture/material based on prompt
             material = self._generate_material(prompt)
@@ -125,6 +187,7 @@ The meshes are in OBJ format and can be opened with:
             
             # Save with material file
             self._save_obj_with_material(str(filepath), vertices, faces, material, prompt)
+            self._last_mesh = (str(filepath), vertices, faces)
             
             return str(filepath), "Refined mesh with texture generated"
             
@@ -183,7 +246,31 @@ The meshes are in OBJ format and can be opened with:
         return vertices, faces
     
     def _create_sphere(self, resolution: int = 20) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
-        """Create a sphere mesh using UV sphere algorithm"""
+        """Create a sphere mesh using UV sphere algorithm (4*r*(r-1) triangles)"""
+        if NUMPY_AVAILABLE:
+            ring = resolution * 2
+            theta = np.arange(resolution + 1) / resolution * math.pi
+            phi = np.arange(ring) / ring * 2 * math.pi
+            sin_t = np.sin(theta)[:, None]
+            vertices = np.stack([
+                sin_t * np.cos(phi),
+                np.broadcast_to(np.cos(theta)[:, None], (resolution + 1, ring)),
+                sin_t * np.sin(phi)
+            ], axis=-1).reshape(-1, 3)
+            
+            # Quad (i, j) -> two triangles; at the poles one of them collapses and is skipped
+            i = np.arange(resolution)[:, None]
+            j = np.arange(ring)[None, :]
+            j_next = (j + 1) % ring
+            v1 = i * ring + j + 1
+            v2 = v1 + ring
+            v3 = (i + 1) * ring + j_next + 1
+            v4 = i * ring + j_next + 1
+            triangles = np.stack([np.stack([v1, v2, v3], -1), np.stack([v1, v3, v4], -1)], axis=2)
+            keep = np.stack([i[:, 0] < resolution - 1, i[:, 0] > 0], -1)[:, None, :]
+            faces = triangles[np.broadcast_to(keep, triangles.shape[:3])]
+            return vertices, faces
+        
         vertices = []
         faces = []
         
@@ -205,21 +292,34 @@ The meshes are in OBJ format and can be opened with:
                 v3 = v2 + 1 if (j + 1) < resolution * 2 else v2 + 1 - resolution * 2
                 v4 = v1 + 1 if (j + 1) < resolution * 2 else v1 + 1 - resolution * 2
                 
-                if i > 0:
-                    faces.append((v1 + 1, v2 + 1, v3 + 1))
                 if i < resolution - 1:
+                    faces.append((v1 + 1, v2 + 1, v3 + 1))
+                if i > 0:
                     faces.append((v1 + 1, v3 + 1, v4 + 1))
         
         return vertices, faces
     
-    def _create_cylinder(self) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
+    def _create_cylinder(self, segments: int = 20) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
         """Create a cylinder mesh"""
         vertices = []
         faces = []
-        segments = 20
         height = 2.0
         radius = 1.0
         
+        if NUMPY_AVAILABLE:
+            angle = np.arange(segments) / segments * 2 * math.pi
+            ring = np.stack([radius * np.cos(angle), np.zeros(segments), radius * np.sin(angle)], axis=-1)
+            vertices = np.concatenate([ring, ring])
+            vertices[:segments, 1] = -height/2
+            vertices[segments:, 1] = height/2
+            
+            v1 = np.arange(segments) + 1
+            v2 = (v1 % segments) + 1
+            v3 = v2 + segments
+            v4 = v1 + segments
+            faces = np.stack([np.stack([v1, v2, v3], -1), np.stack([v1, v3, v4], -1)], axis=1).reshape(-1, 3)
+            return vertices, faces
+        
         # Bottom circle
         for i in range(segments):
             angle = (i / segments) * 2 * math.pi
@@ -246,11 +346,18 @@ The meshes are in OBJ format and can be opened with:
         
         return vertices, faces
     
-    def _create_cone(self) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
+    def _create_cone(self, segments: int = 20) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
         """Create a cone mesh"""
+        if NUMPY_AVAILABLE:
+            angle = np.arange(segments) / segments * 2 * math.pi
+            base = np.stack([np.cos(angle), np.full(segments, -1.0), np.sin(angle)], axis=-1)
+            vertices = np.concatenate([[(0.0, 1.0, 0.0)], base])  # Apex first
+            ring = np.arange(segments)
+            faces = np.stack([np.ones(segments, dtype=np.int64), ring + 2, (ring + 1) % segments + 2], axis=-1)
+            return vertices, faces
+        
         vertices = [(0, 1, 0)]  # Apex
         faces = []
-        segments = 20
         
         # Base circle
         for i in range(segments):
@@ -287,14 +394,33 @@ The meshes are in OBJ format and can be opened with:
         
         return vertices, faces
     
-    def _create_torus(self) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
+    def _create_torus(self, major_segments: int = 30, minor_segments: int = 15) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
         """Create a torus mesh"""
         vertices = []
         faces = []
         major_radius = 1.0
         minor_radius = 0.3
-        major_segments = 30
-        minor_segments = 15
+        
+        if NUMPY_AVAILABLE:
+            theta = (np.arange(major_segments) / major_segments * 2 * math.pi)[:, None]
+            phi = (np.arange(minor_segments) / minor_segments * 2 * math.pi)[None, :]
+            tube = major_radius + minor_radius * np.cos(phi)
+            vertices = np.stack([
+                tube * np.cos(theta),
+                np.broadcast_to(minor_radius * np.sin(phi), (major_segments, minor_segments)),
+                tube * np.sin(theta)
+            ], axis=-1).reshape(-1, 3)
+            
+            i = np.arange(major_segments)[:, None]
+            j = np.arange(minor_segments)[None, :]
+            i_next = (i + 1) % major_segments
+            j_next = (j + 1) % minor_segments
+            v1 = i * minor_segments + j + 1
+            v2 = i * minor_segments + j_next + 1
+            v3 = i_next * minor_segments + j + 1
+            v4 = i_next * minor_segments + j_next + 1
+            faces = np.stack([np.stack([v1, v2, v4], -1), np.stack([v1, v4, v3], -1)], axis=2).reshape(-1, 3)
+            return vertices, faces
         
         for i in range(major_segments):
             theta = (i / major_segments) * 2 * math.pi
@@ -452,6 +578,105 @@ The meshes are in OBJ format and can be opened with:
             # Default gray material
             return {'Ka': (0.5, 0.5, 0.5), 'Kd': (0.5, 0.5, 0.5), 'Ks': (0.7, 0.7, 0.7), 'Ns': 50}
     
+    def _weld_vertices(self, vertices, faces, decimals: int = WELD_DECIMALS):
+        """
+        Merge vertices that are equal to `decimals` places, keyed on their quantized
+        coordinates, and drop faces that collapse. Vertex order is first-seen order.
+        """
+        scale = 10 ** decimals
+        if NUMPY_AVAILABLE:
+            vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+            faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3) - 1
+            # Each quantized (x, y, z) packed into one 24-byte key
+            keys = np.ascontiguousarray(np.round(vertices * scale).astype(np.int64))
+            keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * 3))).ravel()
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            order = np.argsort(first)
+            rank = np.empty(len(first), dtype=np.int64)
+            rank[order] = np.arange(len(first))
+            faces = rank[inverse.ravel()][faces]
+            keep = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])
+            return vertices[first[order]], faces[keep] + 1
+        
+        index, welded, remap = {}, [], []
+        for v in vertices:
+            key = (round(v[0] * scale), round(v[1] * scale), round(v[2] * scale))
+            if key not in index:
+                index[key] = len(welded) + 1
+                welded.append(tuple(v))
+            remap.append(index[key])
+        welded_faces = []
+        for face in faces:
+            a, b, c = remap[face[0] - 1], remap[face[1] - 1], remap[face[2] - 1]
+            if a != b and b != c and a != c:
+                welded_faces.append((a, b, c))
+        return welded, welded_faces
+    
+    def _subdivide_mesh(self, vertices, faces, levels: int = 1, radius: Optional[float] = None):
+        """
+        Split every triangle into four through its edge midpoints, `levels` times.
+        Shared edges get one midpoint (edges hashed as sorted index pairs), so the
+        result stays watertight. With `radius`, midpoints are projected onto a sphere.
+        """
+        for _ in range(levels):
+            if NUMPY_AVAILABLE:
+                vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+                faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3) - 1
+                count, num_faces = len(vertices), len(faces)
+                
+                edges = np.sort(np.concatenate([faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]]), axis=1)
+                keys, inverse = np.unique(edges[:, 0] * count + edges[:, 1], return_inverse=True)
+                midpoints = (vertices[keys // count] + vertices[keys % count]) / 2
+                if radius is not None:
+                    midpoints *= radius / np.linalg.norm(midpoints, axis=1, keepdims=True)
+                
+                mid = inverse.ravel().reshape(3, num_faces) + count
+                ab, bc, ca = mid
+                a, b, c = faces.T
+                faces = np.stack([
+                    np.stack([a, ab, ca], -1), np.stack([b, bc, ab], -1),
+                    np.stack([c, ca, bc], -1), np.stack([ab, bc, ca], -1)
+                ], axis=1).reshape(-1, 3) + 1
+                vertices = np.concatenate([vertices, midpoints])
+                continue
+            
+            vertices = [tuple(v) for v in vertices]
+            midpoint_index = {}
+            
+            def midpoint(i: int, j: int) -> int:
+                key = (i, j) if i < j else (j, i)
+                if key not in midpoint_index:
+                    p, q = vertices[i - 1], vertices[j - 1]
+                    m = tuple((p[k] + q[k]) / 2 for k in range(3))
+                    if radius is not None:
+                        norm = math.sqrt(sum(x * x for x in m))
+                        m = tuple(x * radius / norm for x in m)
+                    vertices.append(m)
+                    midpoint_index[key] = len(vertices)
+                return midpoint_index[key]
+            
+            refined = []
+            for a, b, c in faces:
+                ab, bc, ca = midpoint(a, b), midpoint(b, c), midpoint(c, a)
+                refined.extend([(a, ab, ca), (b, bc, ab), (c, ca, bc), (ab, bc, ca)])
+            faces = refined
+        
+        return vertices, faces
+    
+    def _write_obj_vertices(self, f, vertices):
+        """Write 'v' lines, formatting a chunk of lines per write"""
+        for start in range(0, len(vertices), OBJ_WRITE_CHUNK):
+            chunk = vertices[start:start + OBJ_WRITE_CHUNK]
+            flat = chunk.ravel().tolist() if NUMPY_AVAILABLE and isinstance(chunk, np.ndarray) else [x for v in chunk for x in v]
+            f.write("v %.6f %.6f %.6f\n" * len(chunk) % tuple(flat))
+    
+    def _write_obj_faces(self, f, faces):
+        """Write 'f' lines (1-indexed), formatting a chunk of lines per write"""
+        for start in range(0, len(faces), OBJ_WRITE_CHUNK):
+            chunk = faces[start:start + OBJ_WRITE_CHUNK]
+            flat = chunk.ravel().tolist() if NUMPY_AVAILABLE and isinstance(chunk, np.ndarray) else [i for face in chunk for i in face]
+            f.write("f %d %d %d\n" * len(chunk) % tuple(flat))
+    
     def _save_obj_file(self, filepath: str, vertices: List[Tuple[float, float, float]], faces: List[Tuple[int, int, int]]):
         """Save mesh as OBJ file"""
         with open(filepath, 'w') as f:
@@ -460,14 +685,12 @@ The meshes are in OBJ format and can be opened with:
             f.write(f"# Faces: {len(faces)}\n\n")
             
             # Write vertices
-            for v in vertices:
-                f.write(f"v {v[0]:.6f} {v[1]:.6f} {v[2]:.6f}\n")
+            self._write_obj_vertices(f, vertices)
             
             f.write("\n")
             
             # Write faces
-            for face in faces:
-                f.write(f"f {face[0]} {face[1]} {face[2]}\n")
+            self._write_obj_faces(f, faces)
     
     def _save_obj_with_material(self, filepath: str, vertices: List[Tuple[float, float, float]], 
                                  faces: List[Tuple[int, int, int]], material: Dict, prompt: str):
@@ -483,15 +706,13 @@ The meshes are in OBJ format and can be opened with:
             f.write(f"mtllib {mtl_filename}\n\n")
             
             # Write vertices
-            for v in vertices:
-                f.write(f"v {v[0]:.6f} {v[1]:.6f} {v[2]:.6f}\n")
+            self._write_obj_vertices(f, vertices)
             
             f.write("\n")
             f.write(f"usemtl material_0\n")
             
             # Write faces
-            for face in faces:
-                f.write(f"f {face[0]} {face[1]} {face[2]}\n")
+            self._write_obj_faces(f, faces)
         
         # Save MTL file
         mtl_path = Path(filepath).parent / mtl_filename
@@ -504,22 +725,95 @@ The meshes are in OBJ format and can be opened with:
             f.write(f"Ks {material['Ks'][0]} {material['Ks'][1]} {material['Ks'][2]}\n")
             f.write(f"Ns {material['Ns']}\n")
     
+    def _save_stl_file(self, filepath: str, vertices, faces):
+        """Save mesh as binary STL (little-endian float32 normal + 3 corners per triangle)"""
+        header = b"Generated by LuciferAI Mesh Generator".ljust(80, b" ")
+        with open(filepath, 'wb') as f:
+            f.write(header)
+            f.write(struct.pack('<I', len(faces)))
+            if NUMPY_AVAILABLE:
+                corners = np.asarray(vertices, dtype=np.float64)[np.asarray(faces, dtype=np.int64) - 1]
+                normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+                lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+                normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+                
+                records = np.zeros(len(faces), dtype=np.dtype([
+                    ('normal', '<f4', 3), ('corners', '<f4', (3, 3)), ('attribute', '<u2')
+                ]))
+                records['normal'] = normals
+                records['corners'] = corners
+                f.write(records.tobytes())
+                return
+            
+            for face in faces:
+                p, q, r = (vertices[i - 1] for i in face)
+                u = [q[k] - p[k] for k in range(3)]
+                w = [r[k] - p[k] for k in range(3)]
+                n = (u[1] * w[2] - u[2] * w[1], u[2] * w[0] - u[0] * w[2], u[0] * w[1] - u[1] * w[0])
+                length = math.sqrt(sum(x * x for x in n))
+                n = tuple(x / length for x in n) if length else (0.0, 0.0, 0.0)
+                f.write(struct.pack('<12fH', *n, *p, *q, *r, 0))
+    
+    def _save_ply_file(self, filepath: str, vertices, faces):
+        """Save mesh as binary little-endian PLY (float32 vertices, 0-indexed int32 faces)"""
+        header = (
+            "ply\n"
+            "format binary_little_endian 1.0\n"
+            "comment Generated by LuciferAI Mesh Generator\n"
+            f"element vertex {len(vertices)}\n"
+            "property float x\n"
+            "property float y\n"
+            "property float z\n"
+            f"element face {len(faces)}\n"
+            "property list uchar int vertex_indices\n"
+            "end_header\n"
+        )
+        with open(filepath, 'wb') as f:
+            f.write(header.encode('ascii'))
+            if NUMPY_AVAILABLE:
+                f.write(np.asarray(vertices, dtype='<f4').reshape(-1, 3).tobytes())
+                records = np.empty(len(faces), dtype=np.dtype([('count', 'u1'), ('indices', '<i4', 3)]))
+                records['count'] = 3
+                records['indices'] = np.asarray(faces, dtype=np.int64).reshape(-1, 3) - 1
+                f.write(records.tobytes())
+                return
+            
+            for v in vertices:
+                f.write(struct.pack('<3f', *v))
+            for a, b, c in faces:
+                f.write(struct.pack('<B3i', 3, a - 1, b - 1, c - 1))
+    
+    def export_mesh(self, filepath: str, vertices, faces):
+        """Save a mesh in the format named by the file extension (.obj, .stl or .ply)"""
+        fmt = Path(filepath).suffix.lower().lstrip('.')
+        if fmt == 'obj':
+            self._save_obj_file(filepath, vertices, faces)
+        elif fmt == 'stl':
+            self._save_stl_file(filepath, vertices, faces)
+        elif fmt == 'ply':
+            self._save_ply_file(filepath, vertices, faces)
+        else:
+            raise ValueError(f"Unsupported mesh format: {fmt or filepath}")
+    
     def _read_obj_file(self, filepath: str) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
         """Read mesh from OBJ file"""
-        vertices = []
-        faces = []
-        
         with open(filepath, 'r') as f:
-            for line in f:
-                if line.startswith('v '):
-                    parts = line.split()
-                    vertices.append((float(parts[1]), float(parts[2]), float(parts[3])))
-                elif line.startswith('f '):
-                    parts = line.split()
-                    # Handle face indices (1-indexed)
-                    face = tuple(int(p.split('/')[0]) for p in parts[1:4])
-                    faces.append(face)
-        
+            text = f.read()
+        
+        # Face indices are 1-indexed; v/vt/vn references keep only the vertex
+        vertex_rows = _OBJ_VERTEX.findall(text)
+        face_rows = _OBJ_FACE.findall(text)
+        if any('/' in row for row in face_rows):
+            face_rows = [_OBJ_REF_SUFFIX.sub('', row) for row in face_rows]
+        
+        if NUMPY_AVAILABLE:
+            # Only the first three columns: extra polygon corners are dropped
+            vertices = np.loadtxt(vertex_rows, dtype=np.float64, usecols=(0, 1, 2), ndmin=2) if vertex_rows else np.empty((0, 3))
+            faces = np.loadtxt(face_rows, dtype=np.int64, usecols=(0, 1, 2), ndmin=2) if face_rows else np.empty((0, 3), dtype=np.int64)
+            return vertices, faces
+        
+        vertices = [tuple(float(x) for x in row.split()[:3]) for row in vertex_rows]
+        faces = [tuple(int(i) for i in row.split()[:3]) for row in face_rows]
         return vertices, faces
     
     def _sanitize_filename(self, text: str) -> str:
@@ -529,3 +823,62 @@ The meshes are in OBJ format and can be opened with:
         # Replace spaces with underscores and limit length
         safe = safe.replace(' ', '_')[:50]
         return safe.lower()
+
+
+
+def benchmark_meshes(triangles: int = 1_000_000, output_dir: Optional[str] = None) -> Dict:
+    """Time generation, refinement and export of a ~`triangles` sphere"""
+    global NUMPY_AVAILABLE
+    import tempfile
+    
+    generator = MeshGenerator.__new__(MeshGenerator)  # Skip creating ~/.luciferai/generated_meshes
+    generator._last_mesh = None
+    resolution = max(2, int(round((1 + math.sqrt(1 + triangles)) / 2)))  # 4r(r-1) triangles
+    result = {'numpy': NUMPY_AVAILABLE, 'resolution': resolution}
+    
+    start = time.time()
+    vertices, faces = generator._create_sphere(resolution)
+    result['generate_s'] = round(time.time() - start, 3)
+    
+    if NUMPY_AVAILABLE:
+        # The same sphere through the pure-Python loops
+        NUMPY_AVAILABLE = False
+        start = time.time()
+        try:
+            generator._create_sphere(resolution)
+        finally:
+            NUMPY_AVAILABLE = True
+        result['python_generate_s'] = round(time.time() - start, 3)
+    
+    start = time.time()
+    vertices, faces = generator._weld_vertices(vertices, faces)
+    result['weld_s'] = round(time.time() - start, 3)
+    result['vertices'], result['triangles'] = len(vertices), len(faces)
+    
+    # Same triangle count by refining a quarter-size sphere once
+    start = time.time()
+    coarse = generator._weld_vertices(*generator._create_sphere(max(2, resolution // 2)))
+    refined_vertices, refined_faces = generator._subdivide_mesh(*coarse, levels=1, radius=1.0)
+    result['subdivide_s'] = round(time.time() - start, 3)
+    result['subdivided_triangles'] = len(refined_faces)
+    
+    with tempfile.TemporaryDirectory(dir=output_dir) as tmp:
+        for fmt in EXPORT_FORMATS:
+            path = os.path.join(tmp, f"sphere.{fmt}")
+            start = time.time()
+            generator.export_mesh(path, vertices, faces)
+            result[f'write_{fmt}_s'] = round(time.time() - start, 3)
+            result[f'{fmt}_mb'] = round(os.path.getsize(path) / (1024 * 1024), 1)
+        
+        start = time.time()
+        generator._read_obj_file(os.path.join(tmp, "sphere.obj"))
+        result['read_obj_s'] = round(time.time() - start, 3)
+    
+    return result
+
+
+if __name__ == "__main__":
+    result = benchmark_meshes(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
+    print("🧊 Mesh Generator Benchmark")
+    for key, value in result.items():
+        print(f"  {key:22s} {value}")
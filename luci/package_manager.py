@@ -9,8 +9,12 @@ import time
 import subprocess
 import platform
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+import urllib.error
+import urllib.parse
 import urllib.request
 import json
 
@@ -28,6 +32,34 @@ RESET = "\033[0m"
 LUCIFER_HOME = Path.home() / ".luciferai"
 LUCIFER_BIN = LUCIFER_HOME / "bin"
 LUCIFER_PACKAGES = LUCIFER_HOME / "packages"
+PROBE_CACHE_FILE = LUCIFER_HOME / "probe_cache.json"
+
+PROBE_TIMEOUT = 8.0                 # Seconds for all sources to answer
+PROBE_TTL_FOUND = 7 * 24 * 3600     # Package listings rarely disappear
+PROBE_TTL_MISSING = 24 * 3600
+# Package types that only download files; these run in parallel with buffered output
+DOWNLOAD_TYPES = ('binary-download', 'ai-model', 'image-model')
+
+
+class _ThreadOutput:
+    """sys.stdout stand-in that buffers writes from registered worker threads."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffers: Dict[int, List[str]] = {}
+    
+    def write(self, text):
+        buffer = self.buffers.get(threading.get_ident())
+        if buffer is None:
+            return self.stream.write(text)
+        buffer.append(text)
+        return len(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
 
 
 class PackageManager:
@@ -54,6 +86,11 @@ class PackageManager:
         
         # Package database
         self.package_db = self._load_package_db()
+        
+        # Source probe results: "source:package" -> {'found', 'checked'}
+        self._probe_lock = threading.Lock()
+        self._probe_cache = self._load_probe_cache()
+        self._local = threading.local()  # .unattended inside parallel plan workers
     
     def _detect_os(self) -> str:
         """Detect operating system."""
@@ -515,7 +552,7 @@ class PackageManager:
         if 'requires' in package_info:
             print(f"{GOLD}🔍 Checking dependencies...{RESET}")
             for dep in package_info['requires']:
-                if not self.package_sources.get(dep):
+                if not self._dependency_available(dep):
                     print(f"  {RED}✗{RESET} {dep} not found")
                     print()
                     print(f"{GOLD}💡 Installing dependency: {dep}{RESET}")
@@ -594,6 +631,10 @@ class PackageManager:
     
     def _offer_model_download(self, llamafile_path: Path) -> bool:
         """Offer to download a starter AI model for llamafile."""
+        if getattr(self._local, 'unattended', False):
+            print(f"{DIM}Download a model later with: luci! install tinyllama{RESET}")
+            return True
+        
         print(f"{CYAN}🤖 llamafile needs a language model to run{RESET}")
         print()
         print(f"{CYAN}Recommended starter model:{RESET}")
@@ -744,9 +785,7 @@ class PackageManager:
         ]
         
         for i, step in enumerate(steps, 1):
-            print(f"{DIM}  [{i}/{len(steps)}]{RESET} {step}...", end=" ", flush=True)
-            time.sleep(0.4)
-            print(f"{GREEN}✓{RESET}")
+            print(f"{DIM}  [{i}/{len(steps)}]{RESET} {step}... {GREEN}✓{RESET}")
         
         print()
         
@@ -803,9 +842,7 @@ class PackageManager:
         ]
         
         for i, step in enumerate(steps, 1):
-            print(f"{DIM}  [{i}/{len(steps)}]{RESET} {step}...", end=" ", flush=True)
-            time.sleep(0.5)
-            print(f"{GREEN}✓{RESET}")
+            print(f"{DIM}  [{i}/{len(steps)}]{RESET} {step}... {GREEN}✓{RESET}")
         
         print()
         
@@ -917,7 +954,6 @@ class PackageManager:
         
         print(f"{GOLD}🔍 Searching for {package_info['name']} across package managers...{RESET}")
         print()
-        time.sleep(0.3)
         
         # Define fallback sources in priority order
         fallback_sources = []
@@ -1569,29 +1605,28 @@ class PackageManager:
         """Install generic package with fallback chain with confirmation."""
         print(f"{GOLD}🔍 Searching for {package_name} across package managers...{RESET}")
         print()
-        time.sleep(0.3)
         
         # Try each source in priority order
         # brew and conda first since they can install anything
         priority_order = ['brew', 'conda', 'pip', 'apt', 'yum', 'npm']
+        candidates = [source for source in priority_order if self.package_sources.get(source)]
         available_sources = []
         
-        # Check which sources are available
-        for source in priority_order:
-            if self.package_sources.get(source):
-                print(f"{CYAN}  • {source}:{RESET} ", end="", flush=True)
-                time.sleep(0.2)
-                
-                # For brew/conda, they're always available for any package
-                if source in ['brew', 'conda']:
-                    print(f"{GREEN}✓ Available{RESET}")
-                    available_sources.append(source)
-                # For others, check if package exists first
-                elif self._check_package_exists(package_name, source):
-                    print(f"{GREEN}✓ Found{RESET}")
-                    available_sources.append(source)
-                else:
-                    print(f"{DIM}✗ Not available{RESET}")
+        # All sources are asked at once; slow ones are reported as not answering
+        found = self.probe_sources(package_name, candidates)
+        for source in candidates:
+            print(f"{CYAN}  • {source}:{RESET} ", end="")
+            if found.get(source):
+                print(f"{GREEN}✓ Found{RESET}")
+                available_sources.append(source)
+            elif found.get(source) is None and source in ['brew', 'conda']:
+                # No answer in time; brew/conda can still try any package
+                print(f"{GREEN}✓ Available{RESET}")
+                available_sources.append(source)
+            elif found.get(source) is None:
+                print(f"{DIM}? No answer{RESET}")
+            else:
+                print(f"{DIM}✗ Not available{RESET}")
         
         print()
         
@@ -1749,12 +1784,245 @@ class PackageManager:
         package_info = {'name': package_name}
         return self._offer_github_install(package_info)
     
-    def _check_package_exists(self, package_name: str, source: str) -> bool:
-        """Check if package exists in source (simplified simulation)."""
-        # In real implementation, would query package repositories
-        # For now, simulate with random success for known patterns
-        common_packages = ['requests', 'numpy', 'pandas', 'flask', 'django']
-        return package_name.lower() in common_packages
+    def _check_package_exists(self, package_name: str, source: str) -> Optional[bool]:
+        """
+        Ask a source whether it has a package.
+        
+        Returns:
+            True/False, or None if the source didn't answer (offline, timeout, unknown source)
+        """
+        try:
+            if source == 'pip':
+                return self._url_exists(f"https://pypi.org/pypi/{urllib.parse.quote(package_name)}/json")
+            if source == 'npm':
+                return self._url_exists(f"https://registry.npmjs.org/{urllib.parse.quote(package_name, safe='@')}")
+            
+            commands = {
+                'brew': ['brew', 'info', '--json=v2', package_name],
+                'conda': ['conda', 'search', '--json', package_name],
+                'apt': ['apt-cache', 'show', package_name],
+                'yum': ['yum', 'info', '-q', package_name],
+            }
+            if source not in commands:
+                return None
+            result = subprocess.run(commands[source], capture_output=True, timeout=PROBE_TIMEOUT)
+            return result.returncode == 0
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+    
+    def _url_exists(self, url: str) -> Optional[bool]:
+        request = urllib.request.Request(url, method='HEAD')
+        try:
+            with urllib.request.urlopen(request, timeout=PROBE_TIMEOUT) as response:
+                return response.status == 200
+        except urllib.error.HTTPError as e:
+            return False if e.code == 404 else None
+        except (urllib.error.URLError, OSError):
+            return None
+    
+    def _load_probe_cache(self) -> Dict:
+        try:
+            with open(PROBE_CACHE_FILE, 'r') as f:
+                return json.load(f)
+        except:
+            return {}
+    
+    def _save_probe_cache(self):
+        try:
+            tmp_file = PROBE_CACHE_FILE.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(self._probe_cache, f)
+            tmp_file.replace(PROBE_CACHE_FILE)
+        except OSError:
+            pass
+    
+    def probe_sources(self, package_name: str, sources: List[str], timeout: float = PROBE_TIMEOUT) -> Dict[str, Optional[bool]]:
+        """
+        Check every source for a package concurrently.
+        
+        Definite answers are cached in ~/.luciferai/probe_cache.json (hits for a
+        week, misses for a day). Sources that haven't answered after `timeout`
+        seconds are reported as None.
+        """
+        results: Dict[str, Optional[bool]] = {}
+        now = time.time()
+        to_probe = []
+        with self._probe_lock:
+            for source in sources:
+                entry = self._probe_cache.get(f"{source}:{package_name.lower()}")
+                ttl = PROBE_TTL_FOUND if entry and entry['found'] else PROBE_TTL_MISSING
+                if entry and now - entry['checked'] < ttl:
+                    results[source] = entry['found']
+                else:
+                    to_probe.append(source)
+        
+        if to_probe:
+            pool = ThreadPoolExecutor(max_workers=len(to_probe))
+            futures = {pool.submit(self._check_package_exists, package_name, source): source
+                       for source in to_probe}
+            done, _ = wait(futures, timeout=timeout)
+            pool.shutdown(wait=False)
+            
+            with self._probe_lock:
+                for future, source in futures.items():
+                    found = future.result() if future in done else None
+                    results[source] = found
+                    if found is not None:
+                        self._probe_cache[f"{source}:{package_name.lower()}"] = {'found': found, 'checked': now}
+                self._save_probe_cache()
+        
+        return results
+    
+    # ═══════════════════════════════════════════════════════════
+    # Multi-package installs
+    # ═══════════════════════════════════════════════════════════
+    
+    def _dependency_available(self, dep: str) -> bool:
+        """A `requires` entry is met: the tool is on PATH or its binary is already downloaded."""
+        if self.package_sources.get(dep):
+            return True
+        info = self.package_db.get(dep, {})
+        if info.get('type') == 'binary-download':
+            source_info = info.get('sources', {}).get(self.os_type, {})
+            install_path = source_info.get('install_path', '')
+            install_path = install_path.replace('PROJECT', str(Path(__file__).parent.parent)).replace('~', str(Path.home()))
+            return bool(install_path) and Path(install_path).exists()
+        return False
+    
+    def plan_install(self, package_names: List[str]) -> Dict[str, List[str]]:
+        """
+        Dependency DAG for installing several packages.
+        
+        Returns:
+            {package: [packages it waits for]} in dependency order; requirements
+            that are already met are left out.
+        """
+        plan: Dict[str, List[str]] = {}
+        visiting = set()
+        
+        def visit(name: str):
+            if name in plan or name in visiting:
+                return  # Done, or a cycle (the dependency is installed inline by install())
+            visiting.add(name)
+            deps = [dep.lower() for dep in self.package_db.get(name, {}).get('requires', [])
+                    if not self._dependency_available(dep)]
+            for dep in deps:
+                visit(dep)
+            visiting.discard(name)
+            plan[name] = [dep for dep in deps if dep in plan]
+        
+        for name in package_names:
+            visit(name.lower())
+        return plan
+    
+    def _install_lane(self, package_name: str) -> str:
+        """'download' packages run side by side; 'system' ones one at a time with the terminal."""
+        package_type = self.package_db.get(package_name, {}).get('type')
+        return 'download' if package_type in DOWNLOAD_TYPES else 'system'
+    
+    def _run_plan_step(self, package_name: str, output: _ThreadOutput, unattended: bool) -> Tuple[bool, str]:
+        """Install one plan node. Returns (success, its buffered output)."""
+        self._local.unattended = unattended
+        if unattended:
+            output.buffers[threading.get_ident()] = []
+        try:
+            success = self.install(package_name, verbose=False)
+        except Exception as e:
+            print(f"{RED}❌ {e}{RESET}")
+            success = False
+        finally:
+            self._local.unattended = False
+            log = "".join(output.buffers.pop(threading.get_ident(), []))
+        if success and package_name in self.package_sources:
+            self.package_sources[package_name] = True
+        return success, log
+    
+    def install_many(self, package_names: List[str], max_parallel: int = 3) -> Dict[str, bool]:
+        """
+        Install several packages, dependencies first.
+        
+        Independent downloads (binaries, AI/image models) run up to `max_parallel`
+        at a time with their output collected; system installs (brew, conda, pip,
+        apt...) run one at a time in the foreground since their tools lock and
+        may prompt. A package whose dependency failed is skipped.
+        
+        Returns:
+            {package: success}
+        """
+        plan = self.plan_install(package_names)
+        total = len(plan)
+        
+        print()
+        self._print_header("📦 Luci! Install Plan")
+        print()
+        for i, (name, deps) in enumerate(plan.items(), 1):
+            after = f" {DIM}after {', '.join(deps)}{RESET}" if deps else ""
+            print(f"  {DIM}{i}.{RESET} {CYAN}{name}{RESET} {DIM}({self._install_lane(name)}){RESET}{after}")
+        print()
+        
+        results: Dict[str, bool] = {}
+        pending = dict(plan)
+        running = {}  # future -> (name, started)
+        output = _ThreadOutput(sys.stdout)
+        
+        def status(icon: str, name: str, note: str = ""):
+            done = len(results)
+            output.stream.write(f"{PURPLE}[{done}/{total}]{RESET} {icon} {BOLD}{name}{RESET} {DIM}{note}{RESET}\n")
+            output.stream.flush()
+        
+        sys.stdout = output
+        pool = ThreadPoolExecutor(max_workers=max_parallel + 1)
+        try:
+            while pending or running:
+                for name, deps in list(pending.items()):
+                    failed = [dep for dep in deps if results.get(dep) is False]
+                    if failed:
+                        del pending[name]
+                        results[name] = False
+                        status(f"{GOLD}⏭️{RESET}", name, f"skipped, needs {', '.join(failed)}")
+                
+                lanes = [self._install_lane(n) for n, _ in running.values()]
+                for name, deps in list(pending.items()):
+                    if not all(results.get(dep) for dep in deps):
+                        continue
+                    lane = self._install_lane(name)
+                    if lane == 'system' and 'system' in lanes:
+                        continue
+                    if lane == 'download' and lanes.count('download') >= max_parallel:
+                        continue
+                    del pending[name]
+                    lanes.append(lane)
+                    future = pool.submit(self._run_plan_step, name, output, lane == 'download')
+                    running[future] = (name, time.time())
+                    status(f"{CYAN}⬇️{RESET}" if lane == 'download' else f"{CYAN}⚙️{RESET}", name, "started")
+                
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, started = running.pop(future)
+                    success, log = future.result()
+                    results[name] = success
+                    elapsed = f"{time.time() - started:.1f}s"
+                    if success:
+                        status(f"{GREEN}✅{RESET}", name, elapsed)
+                    else:
+                        status(f"{RED}❌{RESET}", name, f"failed after {elapsed}")
+                        # Collected output is only worth showing for failures
+                        for line in [l for l in log.splitlines() if l.strip()][-6:]:
+                            output.stream.write(f"      {DIM}{line}{RESET}\n")
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            sys.stdout = output.stream
+        
+        installed = [n for n, ok in results.items() if ok]
+        failed = [n for n, ok in results.items() if not ok]
+        print()
+        print(f"{GREEN}✅ Installed: {len(installed)}/{total}{RESET}")
+        if failed:
+            print(f"{GOLD}⚠️  Failed/skipped: {', '.join(failed)}{RESET}")
+        print()
+        return results
     
     def _install_via_source(self, package_name: str, source: str, verbose: bool) -> bool:
         """Install package via specific source with REAL execution and monitoring."""
@@ -2007,16 +2275,7 @@ class PackageManager:
     def _show_download_progress(self, size_str: str):
         """Show visual download progress bar."""
         total_blocks = 40
-        
-        for i in range(total_blocks + 1):
-            percent = (i / total_blocks) * 100
-            filled = "█" * i
-            empty = "░" * (total_blocks - i)
-            
-            print(f"\r  [{filled}{empty}] {percent:.0f}% {DIM}({size_str}){RESET}", end="", flush=True)
-            time.sleep(0.03)
-        
-        print()
+        print(f"  [{'█' * total_blocks}] 100% {DIM}({size_str}){RESET}")
     
     def _show_install_progress(self, package_name: str):
         """Show file-by-file install progress."""
@@ -2030,13 +2289,7 @@ class PackageManager:
         ]
         
         for i, file in enumerate(files, 1):
-            print(f"{DIM}  [{i}/{len(files)}]{RESET} {file}...", end=" ", flush=True)
-            
-            # Mini progress bar for this file
-            for j in range(10):
-                time.sleep(0.02)
-            
-            print(f"{GREEN}✓{RESET}")
+            print(f"{DIM}  [{i}/{len(files)}]{RESET} {file}... {GREEN}✓{RESET}")
     
     def list_packages(self) -> None:
         """List all available packages in Luci! package manager."""
@@ -2133,9 +2386,7 @@ class PackageManager:
         ]
         
         for i, step in enumerate(steps, 1):
-            print(f"{DIM}  [{i}/{len(steps)}]{RESET} {step}...", end=" ", flush=True)
-            time.sleep(0.3)
-            print(f"{GREEN}✓{RESET}")
+            print(f"{DIM}  [{i}/{len(steps)}]{RESET} {step}... {GREEN}✓{RESET}")
         
         print()
         print(f"{GREEN}✅ {package_name} uninstalled successfully{RESET}")
@@ -2150,7 +2401,6 @@ class PackageManager:
         print()
         
         print(f"{CYAN}Checking for updates...{RESET}")
-        time.sleep(0.5)
         print()
         
         # Simulate checking installed packages
@@ -2219,7 +2469,7 @@ def main():
         print(f"{PURPLE}╚════════════════════════════════════════╝{RESET}")
         print()
         print(f"{GOLD}Usage:{RESET}")
-        print(f"  luci! install <package>")
+        print(f"  luci! install <package> [<package> ...]")
         print(f"  luci! uninstall <package>")
         print(f"  luci! list")
         print(f"  luci! update")
@@ -2236,7 +2486,12 @@ def main():
     # Parse command
     command = sys.argv[1].lower()
     
-    if command == 'install' and len(sys.argv) >= 3:
+    if command == 'install' and len(sys.argv) > 3:
+        pm = PackageManager()
+        results = pm.install_many(sys.argv[2:])
+        sys.exit(0 if all(results.values()) else 1)
+    
+    elif command == 'install' and len(sys.argv) >= 3:
         package_name = sys.argv[2]
         pm = PackageManager()
         success = pm.install(package_name)
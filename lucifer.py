@@ -187,31 +187,63 @@ def download_with_progress(url: str, dest: Path, description: str) -> bool:
 
 
 def assemble_llamafile_from_parts() -> bool:
-    """Assemble llamafile from split parts if needed."""
+    """
+    Assemble llamafile from split parts if needed.
+    
+    Parts are concatenated in the kernel (copy_file_range/sendfile) and a
+    hash manifest (bin/llamafile.manifest.json) is written next to the
+    result. Later startups trust the integrity cache's (size, mtime, hash)
+    record instead of re-verifying the binary.
+    """
+    import json
+    from integrity_cache import get_integrity_cache, concat_files, file_sha256, parts_match_manifest
+    
     project_bin = Path(__file__).parent / "bin"
     llamafile_path = project_bin / "llamafile"
-    part_aa = project_bin / "llamafile.part.aa"
+    manifest_path = project_bin / "llamafile.manifest.json"
+    parts = sorted(project_bin.glob("llamafile.part.*"))
+    integrity = get_integrity_cache()
     
-    # If llamafile exists, we're good
     if llamafile_path.exists():
-        return True
+        # Verified on an earlier startup and unchanged since
+        if integrity.lookup(llamafile_path):
+            return True
+        
+        manifest = None
+        if manifest_path.exists():
+            try:
+                manifest = json.loads(manifest_path.read_text())
+            except (OSError, ValueError):
+                manifest = None
+        
+        # Installed some other way - nothing to check against
+        if not parts or manifest is None:
+            integrity.record(llamafile_path, sha256=file_sha256(llamafile_path))
+            return True
+        
+        if parts_match_manifest(parts, manifest) and file_sha256(llamafile_path) == manifest.get('sha256'):
+            integrity.record(llamafile_path, sha256=manifest['sha256'])
+            return True
+        
+        print(f"{GOLD}⚠️  llamafile does not match its parts - reassembling{RESET}")
     
     # Check if parts exist
-    if not part_aa.exists():
+    if not parts:
         return False
     
     print(f"{BLUE}🔧 Assembling llamafile from parts...{RESET}")
+    tmp_path = llamafile_path.with_name(llamafile_path.name + ".tmp")
     try:
-        import glob
-        parts = sorted(glob.glob(str(project_bin / "llamafile.part.*")))
-        with open(llamafile_path, 'wb') as outfile:
-            for part in parts:
-                with open(part, 'rb') as infile:
-                    outfile.write(infile.read())
-        os.chmod(llamafile_path, 0o755)
-        print(f"{GREEN}✅ llamafile assembled{RESET}")
+        manifest = concat_files(parts, tmp_path)
+        os.chmod(tmp_path, 0o755)
+        tmp_path.replace(llamafile_path)  # Never leave a half-written binary behind
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+        integrity.record(llamafile_path, sha256=manifest['sha256'])
+        print(f"{GREEN}✅ llamafile assembled{RESET} {DIM}(sha256 {manifest['sha256'][:12]}…){RESET}")
         return True
     except Exception as e:
+        if tmp_path.exists():
+            tmp_path.unlink()
         print(f"{RED}❌ Failed to assemble llamafile: {e}{RESET}")
         return False
 
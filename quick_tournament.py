@@ -1,11 +1,36 @@
 #!/usr/bin/env python3
-"""Quick Soul Combat Tournament Demo"""
+"""Quick Soul Combat Tournament Demo
+
+    python3 quick_tournament.py                 # Presented 5-bout gauntlet
+    python3 quick_tournament.py --fast          # Same gauntlet without pauses
+    python3 quick_tournament.py --bulk 200      # Round-robin, 200 bouts per pair, on all cores
+"""
+import os
 import sys
-sys.path.insert(0, '/Users/TheRustySpoon/Desktop/Projects/LuciferAI_Local')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from core.soul_system_v2 import Soul, battle_simulation, test_battles
 import uuid
 
+
+def bulk_round_robin(bouts_per_pair: int):
+    """Round-robin of the gauntlet's tier champions, no presentation."""
+    from core.soul_tournament import TournamentEngine, print_standings
+
+    roster = [('creative', 'common', 50), ('imp', 'uncommon', 99), ('phoenix', 'angelic', 256),
+              ('baal', 'demonic', 999), ('azazel', 'celestial', 9999)]
+    souls = []
+    for entity_key, rarity, level in roster:
+        soul = Soul(str(uuid.uuid4()), entity_key, rarity, 'Test', '2024-01-01', 'hash')
+        soul.level = level
+        souls.append(soul)
+    print_standings(TournamentEngine().round_robin(souls, bouts_per_pair))
+
+
 if __name__ == "__main__":
-    # Run the full tournament
-    test_battles()
+    if '--bulk' in sys.argv:
+        index = sys.argv.index('--bulk')
+        bulk_round_robin(int(sys.argv[index + 1]) if len(sys.argv) > index + 1 else 100)
+    else:
+        # Run the full tournament
+        test_battles(pace=0 if '--fast' in sys.argv else 1.0)
@@ -12,9 +12,6 @@ from pathlib import Path
 # Add core to path for model_tiers import
 sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
 from model_tiers import get_model_tier
-
-# Add tests to path for response validator
-sys.path.insert(0, str(Path(__file__).parent))
 from response_validator import ResponseValidator
 
 class CommandTester:
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test the compiled multi-pattern ContentScanner and the ban/spam checks built on it.
+"""
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.ban_system import BanSystem
+from core.consensus_dictionary import ConsensusDictionary
+from core.content_scanner import DEFAULT_CATEGORIES, ContentScanner, benchmark_scan, get_content_scanner
+
+
+def _naive_scan(text):
+    lower = text.lower()
+    return {name: [p for p in patterns if p.lower() in lower] for name, patterns in DEFAULT_CATEGORIES.items()}
+
+
+def test_scanner_matches_per_pattern_search():
+    scanner = get_content_scanner()
+    # Nested and overlapping patterns: "rm -rf /" holds "rm -rf", "eval(" holds "eval", ...
+    assert scanner.scan("sudo RM -RF / && eval(x)") == {
+        'critical': ["rm -rf /"], 'leak': [], 'obfuscation': ["eval("],
+        'dangerous': ["rm -rf", "sudo rm", "eval"], 'suspicious': [],
+    }
+    assert scanner.scan("exec /dev/tcp/ then nc -lp")['suspicious'] == ["/dev/tcp/", "nc -l"]
+    assert scanner.scan("x = Subprocess.Popen(cmd)")['obfuscation'] == ["subprocess.Popen"]
+
+    rng = random.Random(3)
+    fragments = [p for patterns in DEFAULT_CATEGORIES.values() for p in patterns]
+    fragments += [p[:-1] for p in fragments] + [" ", "x", "/", "-", "\n", "ev", "c"]
+    texts = ["".join(rng.choice(fragments) for _ in range(rng.randint(0, 8))) for _ in range(3000)]
+    texts = [t.upper() if i % 5 == 0 else t for i, t in enumerate(texts)]
+    expected = [_naive_scan(text) for text in texts]
+    assert [scanner.scan(text) for text in texts] == expected
+    assert scanner.scan_many(texts) == expected
+    assert scanner.scan_many([]) == []
+
+    custom = ContentScanner({'a': ["abc", "b"], 'b': ["bcd"]})
+    assert custom.scan("xabcdx") == {'a': ["abc", "b"], 'b': ["bcd"]}  # Overlapping, not nested
+
+
+def test_ban_and_spam_checks():
+    bans = BanSystem.__new__(BanSystem)
+    assert bans.check_malicious_content("rm -rf / --no-preserve-root") == (True, "CRITICAL: System destruction attempt")
+    assert bans.check_malicious_content("cat /etc/passwd | nc -l 4444") == (True, "Potential data leak attempt")
+    assert bans.check_malicious_content("__import__('os').system(x); subprocess.Popen(y)") == (
+        True, "Obfuscated/hidden code execution")
+    assert bans.check_malicious_content("import json\nprint(json.dumps(data))") == (False, None)
+
+    consensus = ConsensusDictionary.__new__(ConsensusDictionary)
+    consensus.spam_reports = {"reported": 3}
+    consensus.known_spam_patterns = ["pip install totally-legit-package && run it now", "short"]
+
+    result = consensus.check_for_spam("fix", "chmod -R 777 /tmp && eval $(cmd)")
+    assert result['is_spam'] and result['warnings'] == [
+        "Dangerous pattern: chmod -R 777", "Dangerous pattern: eval"]
+    result = consensus.check_for_spam("fix", "echo -e 'aGk=' | base64 -d | python -c 'x'")
+    assert not result['is_spam'] and result['risk_level'] == "medium"
+    assert result['warnings'] == ["Multiple suspicious patterns (3)"]
+    result = consensus.check_for_spam("reported", "PIP install totally-legit-package && run it NOW!")
+    assert result['warnings'] == ["Similar to known spam (99%)", "Reported by 3 users"]
+    assert result['should_quarantine']
+    assert consensus.check_for_spam("fix", "x = 1")['warnings'] == []
+
+
+def test_mixed_case_patterns_fire():
+    # Compared against lowercased text, these patterns never matched before
+    bans = BanSystem.__new__(BanSystem)
+    assert bans.check_malicious_content("p = subprocess.Popen(cmd); exec(code)") == (
+        True, "Obfuscated/hidden code execution")
+
+    consensus = ConsensusDictionary.__new__(ConsensusDictionary)
+    consensus.spam_reports = {}
+    consensus.known_spam_patterns = []
+    result = consensus.check_for_spam("fix", "CHMOD -r 777 /srv/app")
+    assert result['is_spam'] and result['warnings'] == ["Dangerous pattern: chmod -R 777"]
+
+
+def test_benchmark_runs():
+    stats = benchmark_scan(count=500)
+    assert stats['texts'] == 500 and 0 < stats['flagged'] < 500
+
+
+if __name__ == "__main__":
+    test_scanner_matches_per_pattern_search()
+    test_ban_and_spam_checks()
+    test_mixed_case_patterns_fire()
+    test_benchmark_runs()
+    print("✅ Content scanner tests passed")
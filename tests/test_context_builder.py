@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test token-budget context packing and rolling summaries.
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.context_builder import ContextBuilder, TokenCounter, SummaryCache
+from core.memory_system import MemorySystem
+
+
+def _conversation(n, size=40):
+    messages = []
+    for i in range(n):
+        messages.append({'role': 'user', 'content': f"question {i} " + "x" * size})
+        messages.append({'role': 'assistant', 'content': f"answer {i} " + "y" * size})
+    return messages
+
+
+def test_fits_budget():
+    counter = TokenCounter()
+    builder = ContextBuilder(counter)
+    messages = _conversation(50)
+
+    context = builder.build(messages, budget=200)
+    assert counter.count(context) <= 200
+    # Newest turn is always kept
+    assert "answer 49" in context
+    assert "question 0 " not in context
+
+
+def test_truncates_oversized_turn():
+    builder = ContextBuilder(TokenCounter())
+    messages = [{'role': 'user', 'content': "z" * 4000}]
+    summary, turns = builder.select(messages, budget=50)
+    assert summary is None and len(turns) == 1
+    assert builder.counter.count("User: " + turns[0]['content']) <= 50
+
+
+def test_relevant_older_turn():
+    builder = ContextBuilder(TokenCounter())
+    messages = [{'role': 'user', 'content': "my dog is called biscuit"}] + _conversation(20)
+    _, turns = builder.select(messages, budget=150, query="what is my dog called?")
+    assert turns[0]['content'] == "my dog is called biscuit"
+
+
+def test_rolling_summary():
+    with tempfile.TemporaryDirectory() as tmp:
+        summaries = SummaryCache(Path(tmp) / "summaries.json")
+        builder = ContextBuilder(TokenCounter(), summaries)
+        messages = _conversation(30)
+
+        summary, _ = builder.select(messages, budget=200)
+        assert summary is None
+        assert summaries.pending_count() == 1
+
+        assert summaries.summarize_pending(lambda prompt: "User asked many numbered questions.") == 1
+        summary, turns = builder.select(messages, budget=200)
+        assert summary == "User asked many numbered questions."
+
+        # Persisted across instances
+        reloaded = ContextBuilder(TokenCounter(), SummaryCache(Path(tmp) / "summaries.json"))
+        assert reloaded.select(messages, budget=200)[0] == summary
+
+
+def test_summary_survives_sliding_window():
+    with tempfile.TemporaryDirectory() as tmp:
+        summaries = SummaryCache(Path(tmp) / "summaries.json")
+        memory = MemorySystem.__new__(MemorySystem)
+        memory.session_memory = _conversation(20)
+        memory.permanent_memory = {}
+        memory.context_builder = ContextBuilder(TokenCounter(), summaries)
+
+        memory.inject_context_for_model("next", max_context_entries=10, token_budget=60)
+        assert summaries.summarize_pending(lambda prompt: "Numbered questions so far.") == 1
+
+        # A new exchange slides the window by two turns; the summary queued
+        # for the old window is still found (and the next one is queued)
+        memory.session_memory.extend(_conversation(1))
+        prompt = memory.inject_context_for_model("next", max_context_entries=10, token_budget=60)
+        assert "[summary]: Numbered questions so far." in prompt
+        assert summaries.pending_count() == 1
+
+
+if __name__ == "__main__":
+    test_fits_budget()
+    test_truncates_oversized_turn()
+    test_relevant_older_turn()
+    test_rolling_summary()
+    test_summary_survives_sliding_window()
+    print("✅ ContextBuilder tests passed")
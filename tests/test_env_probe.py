@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the cached in-process environment probes used by EnvironmentScanner and ModuleTracker.
+"""
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import env_probe, environment_scanner, module_tracker
+from core.env_probe import ProbeCache, env_packages, python_version, brew_packages
+
+
+def _fake_venv(root: Path, packages: dict) -> Path:
+    (root / "bin").mkdir(parents=True)
+    (root / "bin" / "python").write_text("")
+    (root / "pyvenv.cfg").write_text("home = /usr/bin\nversion = 3.11.7\n")
+    site = root / "lib" / "python3.11" / "site-packages"
+    site.mkdir(parents=True)
+    for name, version in packages.items():
+        _add_dist(site, name, version)
+    return root
+
+
+def _add_dist(site: Path, name: str, version: str):
+    dist_info = site / f"{name.replace('-', '_')}-{version}.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n")
+
+
+def _with_cache(tmp: Path):
+    env_probe.get_probe_cache._instance = ProbeCache(tmp / "cache.json")
+
+
+def test_packages_and_version_cached_by_mtime():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _with_cache(tmp)
+        env = _fake_venv(tmp / "env", {"requests": "2.31.0", "six": "1.16.0"})
+        site = env / "lib" / "python3.11" / "site-packages"
+
+        assert env_packages(env) == {"requests": "2.31.0", "six": "1.16.0"}
+        assert python_version(env) == "3.11.7"
+
+        # Editing metadata in place doesn't touch site-packages' mtime: served from cache
+        (site / "six-1.16.0.dist-info" / "METADATA").write_text("Name: six\nVersion: 9.9\n")
+        assert env_packages(env)["six"] == "1.16.0"
+
+        _add_dist(site, "idna", "3.4")
+        os.utime(site, ns=(0, site.stat().st_mtime_ns + 10**9))
+        assert env_packages(env) == {"requests": "2.31.0", "six": "9.9", "idna": "3.4"}
+
+        # The cache survives a restart
+        env_probe.get_probe_cache().save()
+        _with_cache(tmp)
+        (site / "idna-3.4.dist-info" / "METADATA").write_text("Name: idna\nVersion: 0\n")
+        assert env_packages(env)["idna"] == "3.4"
+
+
+def test_brew_cellar():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _with_cache(tmp)
+        cellar = tmp / "Cellar"
+        for formula, version in [("git", "2.40.0"), ("git", "2.42.0"), ("wget", "1.21")]:
+            (cellar / formula / version).mkdir(parents=True)
+        saved = env_probe.HOMEBREW_CELLARS
+        env_probe.HOMEBREW_CELLARS = [tmp / "missing", cellar]
+        try:
+            assert brew_packages() == [{'name': 'git', 'version': '2.42.0'}, {'name': 'wget', 'version': '1.21'}]
+        finally:
+            env_probe.HOMEBREW_CELLARS = saved
+
+
+def test_scanners_use_probes():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _with_cache(tmp)
+        envs = tmp / "envs"
+        _fake_venv(envs / "alpha", {"flask": "3.0.0"})
+        _fake_venv(envs / "beta", {})
+
+        saved = (environment_scanner.COMMON_ENV_DIRS, module_tracker.LUCIFERAI_GLOBAL_ENV)
+        environment_scanner.COMMON_ENV_DIRS = [envs]
+        module_tracker.LUCIFERAI_GLOBAL_ENV = envs / "alpha"
+        (envs / "alpha" / "bin" / "pip").write_text("")
+        try:
+            with redirect_stdout(io.StringIO()):
+                scanner = environment_scanner.EnvironmentScanner()
+                scanner.scan_all()
+                tracker = module_tracker.ModuleTracker()
+                tracker.scan_all()
+            found = {env['name']: env['python_version'] for env in scanner.venv_envs}
+            assert found == {"alpha": "3.11.7", "beta": "3.11.7"}
+            assert tracker.luciferai_packages == {"flask": "3.0.0"}
+            assert "pytest" in {name.lower() for name in tracker.system_packages}
+            assert (tmp / "cache.json").exists()
+        finally:
+            environment_scanner.COMMON_ENV_DIRS, module_tracker.LUCIFERAI_GLOBAL_ENV = saved
+
+
+if __name__ == "__main__":
+    test_packages_and_version_cached_by_mtime()
+    test_brew_cellar()
+    test_scanners_use_probes()
+    print("✅ Environment probe tests passed")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test the sharded FixNet ref store: migration, delta sync and change events.
+"""
+import json
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import fixnet_refs
+from core.fixnet_refs import RefShardStore, merge_shards, shard_for
+
+
+def _ref(fix_hash, **fields):
+    return {"fix_hash": fix_hash, "user_id": "u1", "error_type": "NameError",
+            "timestamp": "2024-01-01T00:00:00", **fields}
+
+
+def test_legacy_migration_and_shard_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixnet = Path(tmp)
+        (fixnet / "refs.json").write_text(json.dumps([_ref("aa01"), _ref("aa02"), _ref("bb01")]))
+
+        store = RefShardStore(fixnet)
+        assert len(store) == 3
+        assert sorted(p.name for p in (fixnet / "refs").glob("*.json")) == ["aa.json", "bb.json", "versions.json"]
+        versions = json.loads((fixnet / "refs" / "versions.json").read_text())
+        assert versions["aa"]["version"] == 1
+
+        # Adding a ref only rewrites its own shard
+        bb_before = (fixnet / "refs" / "bb.json").stat().st_mtime_ns
+        changes = store.upsert([_ref("aa03")])
+        assert [c["shard"] for c in changes] == ["aa"]
+        assert (fixnet / "refs" / "bb.json").stat().st_mtime_ns == bb_before
+        assert store.version_vector()["aa"]["version"] == 2
+        assert store.shard_paths(["aa"]) == ["refs/aa.json", "refs/versions.json"]
+
+
+def test_sync_applies_only_changed_shards_and_publishes():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixnet = Path(tmp)
+        writer = RefShardStore(fixnet)
+        writer.upsert([_ref("aa01"), _ref("bb01")])
+
+        reader = RefShardStore(fixnet)
+        shared = reader.refs()
+        kept = reader.get("bb01")
+        events = []
+        reader.subscribe(events.append)
+
+        # Another process (or a git pull) changes shard "aa" only
+        writer.upsert([_ref("aa01", usage_stats={"attempts": 3, "successes": 2}), _ref("aa02")])
+        writer.remove(["bb01"])
+
+        read_shards = []
+        original = reader._read_shard
+        reader._read_shard = lambda prefix: read_shards.append(prefix) or original(prefix)
+
+        changes = reader.sync()
+        assert sorted(read_shards) == ["aa"]  # "bb" was deleted, not re-read
+        by_shard = {c["shard"]: c for c in changes}
+        assert [r["fix_hash"] for r in by_shard["aa"]["added"]] == ["aa02"]
+        assert by_shard["aa"]["updated"][0] is shared[0]  # updated in place
+        assert shared[0]["usage_stats"]["attempts"] == 3
+        assert by_shard["bb"]["removed"] == [kept]
+        assert events == [changes]
+
+        # Nothing new -> nothing read, nothing published
+        read_shards.clear()
+        assert reader.sync() == [] and read_shards == [] and len(events) == 1
+
+
+def test_consensus_index_follows_events():
+    from core.consensus_dictionary import ConsensusDictionary
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RefShardStore(Path(tmp))
+        store.upsert([_ref("aa01", usage_stats={"attempts": 4, "successes": 4})])
+        previous = getattr(fixnet_refs.get_ref_store, '_instance', None)
+        fixnet_refs.get_ref_store._instance = store
+        try:
+            remote_refs = store.refs()
+            cd = ConsensusDictionary(SimpleNamespace(dictionary={}, remote_refs=remote_refs), user_id="t")
+            assert cd.calculate_consensus("aa01")["total_attempts"] == 4
+
+            store.upsert([_ref("cc01", inspired_by="aa01", usage_stats={"attempts": 2, "successes": 0})])
+            assert cd.calculate_consensus("aa01")["total_attempts"] == 6
+            assert len(cd._search_all_fixes("", "NameError")) == 2
+
+            store.remove(["cc01"])
+            assert cd.calculate_consensus("aa01")["total_attempts"] == 4
+        finally:
+            if previous is None:
+                del fixnet_refs.get_ref_store._instance
+            else:
+                fixnet_refs.get_ref_store._instance = previous
+
+
+def test_merge_shards_unions_by_hash():
+    ours = [_ref("aa01"), _ref("aa02", timestamp="2024-02-01T00:00:00")]
+    theirs = [_ref("aa02"), _ref("aa03")]
+    merged = merge_shards(ours, theirs)
+    assert [r["fix_hash"] for r in merged] == ["aa01", "aa02", "aa03"]
+    assert merged[1]["timestamp"] == "2024-02-01T00:00:00"
+    assert shard_for("AB12") == "ab" and len(shard_for("not-hex")) == 2
+
+
+if __name__ == "__main__":
+    test_legacy_migration_and_shard_writes()
+    test_sync_applies_only_changed_shards_and_publishes()
+    test_consensus_index_follows_events()
+    test_merge_shards_unions_by_hash()
+    print("✅ FixNet refs tests passed")
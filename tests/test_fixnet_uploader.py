@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test the batched FixNet encrypt/sign/upload pipeline against a local bare repo.
+"""
+import hashlib
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cryptography.fernet import Fernet
+
+from core.fixnet_uploader import FixNetUploader
+
+
+def _local_fixnet(tmp: Path) -> Path:
+    bare, work = tmp / "fixnet.git", tmp / "fixnet"
+    subprocess.run(["git", "init", "-q", "--bare", str(bare)], check=True)
+    subprocess.run(["git", "clone", "-q", str(bare), str(work)], check=True, capture_output=True)
+    for key, value in (("user.name", "Test"), ("user.email", "test@localhost"), ("push.default", "current")):
+        subprocess.run(["git", "config", key, value], cwd=work, check=True)
+    return work
+
+
+def test_batch_upload_single_commit_and_refs_update():
+    with tempfile.TemporaryDirectory() as tmp:
+        work = _local_fixnet(Path(tmp))
+        uploader = FixNetUploader(user_id="TESTUSER", fixnet_dir=work)
+        uploader.cipher = Fernet(Fernet.generate_key())
+        uploader._save_commit_log = lambda: None
+
+        fixes = [{"script_path": f"s{i}.py", "error": f"NameError: name 'x{i}' is not defined",
+                  "solution": f"x{i} = {i}"} for i in range(20)]
+        fixes.append({"script_path": "s.py", "error": "KeyError: 'a'", "solution": "d.get('a')",
+                      "inspired_by": "ab" * 32, "variation_reason": "dict access"})
+        result = uploader.upload_batch(fixes, max_workers=4, keep_local_copy=False)
+
+        assert result["uploaded"] == 21 and not result["failed"]
+        assert result["commit_url"].startswith("https://")
+        assert result["fixes_per_sec"] > 0
+
+        commits = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=work,
+                                 capture_output=True, text=True).stdout.strip()
+        assert commits == "1"
+        assert len(uploader.ref_store) == 21
+
+        # Each signature covers the ciphertext, which decrypts to the patch
+        ref = uploader.ref_store.get(result["fix_hashes"][0])
+        encrypted = (work / "fixes" / ref["encrypted_file"]).read_bytes()
+        sig = json.loads((work / "signatures" / ref["signature_file"]).read_text())
+        assert sig["sha256"] == hashlib.sha256(encrypted).hexdigest()
+        patch = json.loads(uploader.cipher.decrypt(encrypted))
+        assert patch["fix_hash"] == ref["fix_hash"]
+
+        variant = uploader.ref_store.get(result["fix_hashes"][-1])
+        assert variant["relationship_type"] == "context_variant"
+
+
+class StubFilter:
+    """Uploads only fixes whose solution is not already known."""
+
+    def __init__(self, known):
+        self.known = set(known)
+        self.calls = []
+
+    def should_upload(self, error, solution, error_type, inspired_by=None):
+        self.calls.append((error_type, inspired_by))
+        return (inspired_by is not None or solution not in self.known, "stub")
+
+
+def test_batch_upload_applies_smart_filter():
+    with tempfile.TemporaryDirectory() as tmp:
+        work = _local_fixnet(Path(tmp))
+        smart_filter = StubFilter(known={"x1 = 1", "x3 = 3"})
+        uploader = FixNetUploader(user_id="TESTUSER", smart_filter=smart_filter, fixnet_dir=work)
+        uploader.cipher = Fernet(Fernet.generate_key())
+        uploader._save_commit_log = lambda: None
+
+        fixes = [{"script_path": f"s{i}.py", "error": f"NameError: name 'x{i}' is not defined",
+                  "solution": f"x{i} = {i}"} for i in range(5)]
+        fixes.append({"script_path": "s.py", "error": "KeyError: 'a'", "solution": "x1 = 1",
+                      "inspired_by": "ab" * 32})
+        result = uploader.upload_batch(fixes, max_workers=2, keep_local_copy=False)
+
+        assert result["skipped"] == [1, 3]
+        assert result["uploaded"] == 4 and len(uploader.ref_store) == 4
+        assert smart_filter.calls[0] == ("NameError", None)
+        assert smart_filter.calls[-1] == ("KeyError", {"fix_hash": "ab" * 32})
+
+        forced = uploader.upload_batch(fixes[:2], keep_local_copy=False, force_upload=True)
+        assert forced["skipped"] == [] and forced["uploaded"] == 2
+        assert len(smart_filter.calls) == len(fixes)
+
+
+if __name__ == "__main__":
+    test_batch_upload_single_commit_and_refs_update()
+    test_batch_upload_applies_smart_filter()
+    print("✅ FixNet batch upload tests passed")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test the mmap GGUF metadata reader and the persistent model catalog.
+"""
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import gguf_catalog
+from core.gguf_catalog import ModelCatalog, GGUFFormatError, read_gguf_metadata, guess_model_name
+
+
+def _gguf_string(text):
+    data = text.encode('utf-8')
+    return struct.pack('<Q', len(data)) + data
+
+
+def write_gguf(path, name='TinyLlama Chat'):
+    """Minimal GGUF v3 file: a few KV pairs and two tensor infos."""
+    kv = [
+        (_gguf_string('general.architecture'), 8, _gguf_string('llama')),
+        (_gguf_string('general.name'), 8, _gguf_string(name)),
+        (_gguf_string('llama.context_length'), 4, struct.pack('<I', 2048)),
+        (_gguf_string('general.file_type'), 4, struct.pack('<I', 15)),
+        (_gguf_string('tokenizer.ggml.model'), 8, _gguf_string('llama')),
+        (_gguf_string('tokenizer.ggml.tokens'), 9,
+         struct.pack('<IQ', 8, 3) + _gguf_string('<s>') + _gguf_string('</s>') + _gguf_string('a')),
+    ]
+    tensors = [
+        (_gguf_string('token_embd.weight'), [64, 3]),
+        (_gguf_string('output_norm.weight'), [64]),
+    ]
+    out = b'GGUF' + struct.pack('<IQQ', 3, len(tensors), len(kv))
+    for key, value_type, value in kv:
+        out += key + struct.pack('<I', value_type) + value
+    for tensor_name, dims in tensors:
+        out += tensor_name + struct.pack('<I', len(dims)) + b''.join(struct.pack('<Q', d) for d in dims)
+        out += struct.pack('<IQ', 0, 0)
+    path.write_bytes(out + b'\0' * 64)
+
+
+def test_read_gguf_metadata():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'model.gguf'
+        write_gguf(path)
+        info = read_gguf_metadata(path)
+        assert info['version'] == 3
+        assert info['architecture'] == 'llama'
+        assert info['name'] == 'TinyLlama Chat'
+        assert info['parameters'] == 64 * 3 + 64
+        assert info['quantization'] == 'Q4_K_M'
+        assert info['context_length'] == 2048
+        assert info['tokenizer'] == 'llama'
+        assert info['vocab_size'] == 3
+
+        bad = Path(tmp) / 'bad.gguf'
+        bad.write_bytes(b'NOPE' + b'\0' * 64)
+        try:
+            read_gguf_metadata(bad)
+            assert False, "expected GGUFFormatError"
+        except GGUFFormatError:
+            pass
+
+
+def test_guess_model_name():
+    assert guess_model_name('mixtral-8x22b-instruct.Q4_K_M.gguf') == 'mixtral-8x22b'
+    assert guess_model_name('Meta-Llama-3.1-70B.gguf'.lower()) == 'llama3.1-70b'
+    assert guess_model_name('custom.gguf', 'Mistral 7B Instruct') == 'mistral'
+    assert guess_model_name('custom.gguf') is None
+
+
+def test_catalog_reparses_only_on_change():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        models_dir = tmp / 'models'
+        models_dir.mkdir()
+        model = models_dir / 'tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf'
+        write_gguf(model)
+
+        parses = []
+        original = gguf_catalog.read_gguf_metadata
+
+        def counting(path):
+            parses.append(path)
+            return original(path)
+
+        gguf_catalog.read_gguf_metadata = counting
+        try:
+            catalog = ModelCatalog(tmp / 'catalog.json', [models_dir])
+            assert catalog.refresh()
+            entry = catalog.get('tinyllama')
+            assert entry['valid'] and entry['exact'] and entry['quantization'] == 'Q4_K_M'
+            assert catalog.installed_models(exact_only=True, models_dir=models_dir) == ['tinyllama']
+            assert not catalog.refresh()
+            assert len(parses) == 1
+
+            # A fresh process loads the persisted catalog without reparsing
+            reloaded = ModelCatalog(tmp / 'catalog.json', [models_dir])
+            assert not reloaded.refresh()
+            assert reloaded.get_path('tinyllama') == model
+            assert len(parses) == 1
+
+            # Rewriting the file invalidates its entry
+            write_gguf(model, name='Something Else')
+            st = model.stat()
+            os.utime(model, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            assert reloaded.refresh()
+            assert reloaded.get('tinyllama')['name'] == 'Something Else'
+            assert len(parses) == 2
+
+            model.unlink()
+            assert reloaded.refresh()
+            assert reloaded.get('tinyllama') is None
+        finally:
+            gguf_catalog.read_gguf_metadata = original
+
+
+def test_installed_models_per_directory():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        models_dir, luciferai_dir = tmp / 'models', tmp / '.luciferai' / 'models'
+        filename = 'tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf'
+        for directory in (models_dir, luciferai_dir):
+            directory.mkdir(parents=True)
+            write_gguf(directory / filename)
+        write_gguf(luciferai_dir / 'mistral-7b-instruct-v0.2.Q4_K_M.gguf', name='Mistral 7B')
+
+        catalog = ModelCatalog(tmp / 'catalog.json', [models_dir, luciferai_dir])
+        catalog.refresh()
+        assert catalog.installed_models(models_dir=models_dir) == ['tinyllama']
+        assert catalog.installed_models(models_dir=luciferai_dir) == ['mistral-7b', 'tinyllama']
+        assert catalog.installed_models() == ['mistral-7b', 'tinyllama']
+
+
+if __name__ == "__main__":
+    test_read_gguf_metadata()
+    test_guess_model_name()
+    test_catalog_reparses_only_on_change()
+    test_installed_models_per_directory()
+    print("✅ GGUF catalog tests passed")
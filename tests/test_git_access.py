@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test the in-process git access layer against the git CLI.
+"""
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import fixnet_daemon
+from core.git_access import DULWICH_AVAILABLE, open_repo, close_all
+
+BACKENDS = ["coprocess", "cli"] + (["dulwich"] if DULWICH_AVAILABLE else [])
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+
+def _repo(tmp: Path, name: str) -> Path:
+    work = tmp / name
+    work.mkdir()
+    _git(work, "init", "-q", "-b", "main")
+    _git(work, "config", "user.name", "Test")
+    _git(work, "config", "user.email", "test@localhost")
+    (work / ".gitignore").write_text("*.log\nbuild/\n!keep.log\n")
+    (work / "fixes").mkdir()
+    for i in range(5):
+        (work / "fixes" / f"{i}.json").write_text(f'{{"fix": {i}}}')
+    _git(work, "add", ".")
+    _git(work, "commit", "-q", "-m", "seed")
+    return work
+
+
+def test_status_add_commit_match_git():
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in BACKENDS:
+            work = _repo(Path(tmp), backend)
+            repo = open_repo(work, backend=backend)
+            assert repo.backend == backend
+            assert not repo.has_changes()
+            assert repo.commit("nothing") is None
+
+            (work / "fixes" / "0.json").write_text('{"fix": "changed"}')
+            (work / "fixes" / "1.json").unlink()
+            (work / "fixes" / "new.json").write_text("{}")
+            (work / "debug.log").write_text("ignored")
+            (work / "keep.log").write_text("re-included")
+            (work / "build").mkdir()
+            (work / "build" / "out.bin").write_text("ignored")
+
+            status = repo.status()
+            assert status["modified"] == ["fixes/0.json"], backend
+            assert status["deleted"] == ["fixes/1.json"], backend
+            assert sorted(status["untracked"]) == ["fixes/new.json", "keep.log"], backend
+
+            repo.add()
+            sha = repo.commit("[Auto-sync] test")
+            assert sha and sha == _git(work, "rev-parse", "HEAD").strip(), backend
+            assert _git(work, "status", "--porcelain") == "", backend
+            assert not repo.has_changes(), backend
+            assert _git(work, "log", "-1", "--format=%s") == "[Auto-sync] test\n"
+            assert "keep.log" in _git(work, "ls-files")
+            subprocess.run(["git", "fsck", "--strict"], cwd=work, check=True, capture_output=True)
+
+            # Staging a subset leaves the rest untracked
+            (work / "fixes" / "a.json").write_text("a")
+            (work / "other.txt").write_text("b")
+            repo.add(["fixes"])
+            assert repo.status()["staged"] == ["fixes/a.json"], backend
+            assert repo.status()["untracked"] == ["other.txt"], backend
+            assert repo.read_blob("HEAD:fixes/0.json") == b'{"fix": "changed"}'
+        close_all()
+
+
+def test_upstream_branches_and_conflicts():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        origin = _repo(tmp, "origin")
+        work = tmp / "work"
+        subprocess.run(["git", "clone", "-q", str(origin), str(work)], check=True, capture_output=True)
+        _git(work, "config", "user.name", "Test")
+        _git(work, "config", "user.email", "test@localhost")
+        _git(work, "branch", "-q", "feature")
+        _git(work, "push", "-q", "origin", "feature")
+        _git(work, "pack-refs", "--all")
+        _git(work, "gc", "-q")  # Everything packed: reads go through cat-file
+
+        for backend in BACKENDS:
+            repo = open_repo(work, backend=backend)
+            assert repo.ahead_count() == 0, backend
+            assert set(repo.remote_branches()) == {"origin/main", "origin/feature"}, backend
+            assert repo.commit_time("origin/feature") is not None
+        close_all()
+
+        repo = open_repo(work, backend="coprocess")
+        for i in range(2):
+            (work / "fixes" / "0.json").write_text(f'"local {i}"')
+            repo.add()
+            repo.commit(f"local {i}")
+        assert repo.ahead_count() == 2
+
+        (origin / "fixes" / "0.json").write_text('"remote"')
+        _git(origin, "commit", "-q", "-am", "remote")
+        subprocess.run(["git", "pull", "-q", "--no-rebase"], cwd=work, capture_output=True)
+        assert repo.conflicted_paths() == ["fixes/0.json"]
+        assert repo.read_blob(":2:fixes/0.json") == b'"local 1"'
+        assert repo.read_blob(":3:fixes/0.json") == b'"remote"'
+
+        (work / "fixes" / "0.json").write_text('"merged"')
+        repo.add(["fixes/0.json"])
+        assert repo.conflicted_paths() == []
+        _git(work, "commit", "-q", "--no-edit")
+        assert _git(work, "status", "--porcelain") == ""
+        close_all()
+
+
+def test_filters_and_linked_worktrees():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        work = _repo(tmp, "filters")
+        _git(work, "config", "core.autocrlf", "true")
+        (work / ".gitattributes").write_text("*.txt text\n")
+        (work / "notes.txt").write_bytes(b"a\r\nb\r\n")
+        repo = open_repo(work, backend="coprocess")
+        repo.add()
+        repo.commit("crlf")
+        assert _git(work, "cat-file", "blob", "HEAD:notes.txt") == "a\nb\n"
+        assert _git(work, "status", "--porcelain") == ""
+        assert not repo.has_changes()
+
+        linked = tmp / "linked"
+        _git(work, "worktree", "add", "-q", "-b", "side", str(linked))
+        side = open_repo(linked, backend="coprocess")
+        (linked / "side.json").write_text("{}")
+        side.add()
+        sha = side.commit("side")
+        assert _git(work, "rev-parse", "side").strip() == sha
+        assert repo.head() != sha
+        assert _git(linked, "status", "--porcelain") == ""
+        close_all()
+
+
+def test_fallback_and_daemon_push_cycle():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        v4 = _repo(tmp, "v4")
+        _git(v4, "update-index", "--index-version", "4")
+        assert open_repo(v4).backend != "coprocess"
+
+        bare, work = tmp / "fixnet.git", tmp / "fixnet"
+        _git(tmp, "init", "-q", "--bare", "-b", "main", str(bare))
+        subprocess.run(["git", "clone", "-q", str(bare), str(work)], check=True, capture_output=True)
+        _git(work, "config", "user.name", "Test")
+        _git(work, "config", "user.email", "test@localhost")
+        (work / "fixes").mkdir()
+        (work / "fixes" / "a.json").write_text("{}")
+
+        saved = fixnet_daemon.FIXNET_LOCAL, fixnet_daemon.SYNC_LOG
+        fixnet_daemon.FIXNET_LOCAL, fixnet_daemon.SYNC_LOG = work, tmp / "sync.log"
+        try:
+            daemon = fixnet_daemon.FixNetDaemon.__new__(fixnet_daemon.FixNetDaemon)
+            daemon.config = {"enabled": True}
+            daemon.stats = {"pushes": 0, "last_push": None}
+            daemon._sync_push()
+            assert daemon.stats["pushes"] == 1
+            assert _git(bare, "log", "--format=%s").startswith("[Auto-sync]")
+            daemon._sync_push()  # Clean and not ahead: nothing committed or pushed
+            assert daemon.stats["pushes"] == 1
+            assert "Nothing to push" in (tmp / "sync.log").read_text()
+        finally:
+            fixnet_daemon.FIXNET_LOCAL, fixnet_daemon.SYNC_LOG = saved
+            close_all()
+
+
+if __name__ == "__main__":
+    test_status_add_commit_match_git()
+    test_upstream_branches_and_conflicts()
+    test_filters_and_linked_worktrees()
+    test_fallback_and_daemon_push_cycle()
+    print("✅ Git access tests passed")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed image store and parallel downloads against a local HTTP server.
+"""
+import io
+import json
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from image_store import ImageStore
+from image_retrieval import ImageRetriever
+
+IMAGES = {
+    '/cat.png': (b'\x89PNG' + b'cat' * 500, 'image/png'),
+    '/mirror/cat.png': (b'\x89PNG' + b'cat' * 500, 'image/png'),
+    '/dog.jpeg': (b'\xff\xd8' + b'dog' * 700, 'image/jpeg'),
+    '/owl.gif': (b'GIF89a' + b'owl' * 300, 'application/octet-stream'),
+}
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    delay = 0.3
+    requested = []
+
+    def do_GET(self):
+        type(self).requested.append(self.path)
+        time.sleep(self.delay)
+        if self.path not in IMAGES:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body, content_type = IMAGES[self.path]
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _retriever(tmp: str) -> ImageRetriever:
+    retriever = ImageRetriever(images_dir=Path(tmp))
+    retriever.available = True
+    return retriever
+
+
+def test_store_dedupes_and_evicts_lru():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ImageStore(tmp, max_bytes=2500)
+        a = store.put_bytes('http://x/a.png', b'a' * 1000, 'png')
+        assert store.put_bytes('http://y/a-copy.png', b'a' * 1000, 'png') == a  # Same content, one file
+        assert store.total_bytes() == 1000 and a.name.endswith('.png')
+
+        b = store.put_bytes('http://x/b.jpg', b'b' * 1000, 'jpg')
+        assert store.get_url('http://x/a.png') == a  # Touch a: b is now least recently used
+        c = store.put_bytes('http://x/c.gif', b'c' * 1000, 'gif')
+        assert not b.exists() and store.get_url('http://x/b.jpg') is None
+        assert a.exists() and c.exists() and store.total_bytes() == 2000
+        assert [img['urls'] for img in store.list_images()] == [1, 2]
+
+        store.max_queries = 2
+        for key in ('one:5', 'two:5', 'three:5'):
+            store.put_query(key, [{'url': key}])
+        assert store.get_query('one:5') is None and store.get_query('three:5') == [{'url': 'three:5'}]
+
+        store.clear()
+        assert store.total_bytes() == 0 and not a.exists()
+
+
+def test_fetch_and_download_in_parallel():
+    ImageHandler.requested = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ImageHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Results from the old JSON cache are carried over, no search needed
+            urls = [base + path for path in IMAGES] + [base + '/missing.png']
+            Path(tmp, 'image_cache.json').write_text(json.dumps({'pets:5': [{'url': u} for u in urls]}))
+            retriever = _retriever(tmp)
+            assert not retriever.cache_file.exists()
+
+            out = io.StringIO()
+            start = time.time()
+            with redirect_stdout(out):
+                paths = retriever.fetch_and_download('Pets', num_images=5)
+            elapsed = time.time() - start
+            assert elapsed < 4 * ImageHandler.delay  # One parallel round, not five sequential requests
+            assert len(paths) == 3  # Two URLs serve the same cat
+            assert [Path(p).suffix for p in paths] == ['.png', '.jpg', '.gif']
+            assert "3 new, 0 cached, 1 duplicate, 1 failed" in out.getvalue()
+
+            ImageHandler.requested = []
+            with redirect_stdout(out):
+                assert retriever.fetch_and_download('pets', num_images=5) == paths
+                named = retriever.download_image(urls[2], filename='dog.jpg')
+            assert ImageHandler.requested == ['/missing.png']  # Only the failure is retried
+            assert Path(named).read_bytes() == IMAGES['/dog.jpeg'][0]
+
+            # A stale file under the requested name is replaced, not returned
+            with redirect_stdout(out):
+                named = retriever.download_image(urls[0], filename='dog.jpg')
+            assert Path(named).read_bytes() == IMAGES['/cat.png'][0]
+    finally:
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    test_store_dedupes_and_evicts_lru()
+    test_fetch_and_download_in_parallel()
+    print("✅ Image retrieval tests passed")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test zero-copy part assembly and the (size, mtime, hash) integrity cache.
+"""
+import hashlib
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.integrity_cache import IntegrityCache, concat_files, parts_match_manifest
+
+
+def test_concat_files_and_manifest():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        chunks = [os.urandom(300_000), os.urandom(5), os.urandom(70_000)]
+        parts = []
+        for suffix, data in zip('abc', chunks):
+            part = tmp / f"llamafile.part.a{suffix}"
+            part.write_bytes(data)
+            parts.append(part)
+
+        dest = tmp / "llamafile"
+        manifest = concat_files(parts, dest)
+        assert dest.read_bytes() == b''.join(chunks)
+        assert manifest['sha256'] == hashlib.sha256(b''.join(chunks)).hexdigest()
+        assert parts_match_manifest(parts, manifest)
+
+        parts[1].write_bytes(b'xxxxx')  # Same size, new content
+        assert not parts_match_manifest(parts, manifest)
+
+
+def test_cache_invalidates_on_change_and_memoizes_verdicts():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        cache = IntegrityCache(tmp / "integrity.json")
+        model = tmp / "model.gguf"
+        model.write_bytes(b'GGUF' + b'\0' * 100)
+
+        calls = []
+
+        def check(path):
+            calls.append(path)
+            return 'ok'
+
+        assert cache.verdict(model, check, sha256='abc') == 'ok'
+        assert cache.verdict(model, check) == 'ok'
+        assert len(calls) == 1
+
+        # Persisted for the next startup
+        reloaded = IntegrityCache(tmp / "integrity.json")
+        assert reloaded.lookup(model)['sha256'] == 'abc'
+
+        # Truncation changes size -> record no longer trusted
+        model.write_bytes(b'GGUF')
+        assert reloaded.lookup(model) is None
+        assert reloaded.verdict(model, check) == 'ok'
+        assert len(calls) == 2
+
+        # A verdict made against other inputs is not reused
+        assert reloaded.verdict(model, check, params={'expected_size_mb': 1}) == 'ok'
+        assert reloaded.verdict(model, check, params={'expected_size_mb': 1}) == 'ok'
+        assert len(calls) == 3
+        assert reloaded.verdict(model, check, params={'expected_size_mb': 2}) == 'ok'
+        assert len(calls) == 4
+
+
+if __name__ == "__main__":
+    test_concat_files_and_manifest()
+    test_cache_invalidates_on_change_and_memoizes_verdicts()
+    print("✅ IntegrityCache tests passed")
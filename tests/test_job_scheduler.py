@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test the timer-heap job scheduler: priority order, timeouts, groups and idle deferral.
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.job_scheduler import JobScheduler, job_time_left
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_priority_order_and_metrics():
+    order = []
+    scheduler = JobScheduler(max_workers=1, idle_fn=lambda: float('inf'))
+    scheduler.add_job("maintenance", lambda: order.append("maintenance"), 60, priority=9, run_immediately=True)
+    scheduler.add_job("pull", lambda: order.append("pull"), 60, priority=0, run_immediately=True)
+    scheduler.start()
+    try:
+        assert _wait_for(lambda: len(order) == 2)
+        assert order == ["pull", "maintenance"]
+        metrics = scheduler.get_metrics()
+        assert metrics["pull"]["runs"] == 1
+        assert metrics["pull"]["last_duration"] is not None
+        assert metrics["pull"]["next_run"] is not None
+    finally:
+        scheduler.stop()
+
+
+def test_timeout_frees_worker_for_other_jobs():
+    release = threading.Event()
+    seen_time_left = []
+    pulled = threading.Event()
+
+    def slow_gc():
+        seen_time_left.append(job_time_left())
+        release.wait(3)
+
+    scheduler = JobScheduler(max_workers=1, idle_fn=lambda: float('inf'))
+    scheduler.add_job("gc", slow_gc, 60, priority=9, timeout=0.1, run_immediately=True)
+    scheduler.start()
+    try:
+        assert _wait_for(lambda: seen_time_left)
+        scheduler.add_job("pull", pulled.set, 60, priority=0, run_immediately=True)
+        # The hung gc times out and gives up its worker, so the pull still runs
+        assert pulled.wait(2)
+        assert scheduler.get_metrics()["gc"]["timeouts"] == 1
+        assert 0 < seen_time_left[0] <= 0.1
+        assert scheduler.get_metrics()["gc"]["running"] == 1
+    finally:
+        release.set()
+        scheduler.stop()
+
+
+def test_group_serializes_and_idle_defers():
+    active, overlaps, idle = [0], [], [0.0]
+    lock = threading.Lock()
+
+    def repo_job():
+        with lock:
+            active[0] += 1
+            overlaps.append(active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+
+    ran_heavy = threading.Event()
+    scheduler = JobScheduler(max_workers=3, idle_threshold=1.0, idle_fn=lambda: idle[0])
+    scheduler.add_job("pull", repo_job, 60, priority=0, group="repo", run_immediately=True)
+    scheduler.add_job("push", repo_job, 60, priority=1, group="repo", run_immediately=True)
+    scheduler.add_job("optimize", ran_heavy.set, 60, priority=9, idle_only=True, run_immediately=True)
+    scheduler.start()
+    try:
+        assert _wait_for(lambda: scheduler.get_metrics()["push"]["runs"] == 1)
+        assert max(overlaps) == 1
+        assert not ran_heavy.is_set()
+        assert scheduler.get_metrics()["optimize"]["deferred"] >= 1
+
+        idle[0] = 10.0  # REPL went idle; the deferred job runs on its retry
+        assert ran_heavy.wait(3)
+    finally:
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    test_priority_order_and_metrics()
+    test_timeout_frees_worker_for_other_jobs()
+    test_group_serializes_and_idle_defers()
+    print("✅ JobScheduler tests passed")
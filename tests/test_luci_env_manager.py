@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test LuciEnvironmentManager's wheel cache, package store and environment reuse (offline).
+"""
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.luci_env_manager import LuciEnvironmentManager
+
+
+def _build_wheel(wheel_dir: Path):
+    """Write a minimal pure-Python wheel so installs never touch the network."""
+    wheel_dir.mkdir(parents=True, exist_ok=True)
+    dist_info = "luci_demo_pkg-1.0.dist-info"
+    files = {
+        "luci_demo_pkg/__init__.py": "VALUE = 42\n",
+        f"{dist_info}/METADATA": "Metadata-Version: 2.1\nName: luci-demo-pkg\nVersion: 1.0\n",
+        f"{dist_info}/WHEEL": "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    record = [f"{name},,{len(body)}" for name, body in files.items()] + [f"{dist_info}/RECORD,,"]
+    files[f"{dist_info}/RECORD"] = "\n".join(record) + "\n"
+    with zipfile.ZipFile(wheel_dir / "luci_demo_pkg-1.0-py3-none-any.whl", "w") as whl:
+        for name, body in files.items():
+            whl.writestr(name, body)
+
+
+def _run(env_bin: str, code: str) -> str:
+    return subprocess.run([str(Path(env_bin) / "python3"), "-c", code],
+                          capture_output=True, text=True, check=True).stdout.strip()
+
+
+def test_store_rebuild_and_superset_reuse():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        manager = LuciEnvironmentManager(tmp / "envs")
+        _build_wheel(manager.wheel_cache)
+        script_a = tmp / "a" / "main.py"
+        script_b = tmp / "b" / "main.py"
+        for script in (script_a, script_b):
+            script.parent.mkdir()
+            script.write_text("import luci_demo_pkg\n")
+
+        env_bin, is_new = manager.find_or_create_environment(str(script_a), ["luci-demo-pkg"])
+        assert env_bin and is_new
+        assert _run(env_bin, "import luci_demo_pkg; print(luci_demo_pkg.VALUE)") == "42"
+        assert {name.split("-")[0] for name in (d.name for d in manager.store_dir.iterdir())} >= {
+            "pip", "setuptools", "luci"}
+
+        # Same set again from scratch: venv without ensurepip, everything hard-linked
+        env_name = Path(env_bin).parent.name
+        shutil.rmtree(manager.envs_dir / env_name)
+        del manager.metadata["environments"][env_name]
+        env_bin, is_new = manager.find_or_create_environment(str(script_a), ["luci-demo-pkg"])
+        info = manager.metadata["environments"][env_name]
+        assert is_new and info["linked_packages"] == 3 and info["installed_packages"] == 0
+        assert _run(env_bin, "import luci_demo_pkg; print(luci_demo_pkg.VALUE)") == "42"
+        assert _run(env_bin, "import pip; print('ok')") == "ok"
+        stored = next(manager.store_dir.glob("luci-demo-pkg-*")) / "site" / "luci_demo_pkg" / "__init__.py"
+        assert stored.stat().st_nlink >= 2  # Shared, not copied
+
+        # Another script with a subset of the dependencies reuses the environment
+        reused_bin, is_new = manager.find_or_create_environment(str(script_b), ["luci_demo_pkg"])
+        assert reused_bin == env_bin and not is_new
+        assert str(script_b) in info["scripts"]
+
+        # Shared environments survive until every script using them is gone
+        script_a.unlink()
+        manager.cleanup_orphaned_environments()
+        assert env_name in manager.metadata["environments"]
+        script_b.unlink()
+        manager.cleanup_orphaned_environments()
+        assert env_name not in manager.metadata["environments"]
+        assert stored.exists()
+
+
+def test_plan_from_store_follows_requirements():
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = LuciEnvironmentManager(Path(tmp))
+        for name, version, requires in [("app", "1.0", ["lib>=2", "winonly; sys_platform == 'win32'",
+                                                         "extra-dep; extra == 'full'"]),
+                                        ("lib", "1.5", []), ("lib", "2.1", []), ("extra-dep", "1.0", [])]:
+            dist_info = manager.store_dir / f"{name}-{version}-abc" / "site" / f"{name}-{version}.dist-info"
+            dist_info.mkdir(parents=True)
+            headers = [f"Name: {name}", f"Version: {version}"] + [f"Requires-Dist: {r}" for r in requires]
+            (dist_info / "METADATA").write_text("\n".join(headers) + "\n\nbody\n")
+
+        links, missing = manager._plan_from_store(["app", "lib<2", "unknown"])
+        assert set(links) == {"app", "lib"} and links["lib"].name == "lib-2.1-abc"
+        assert missing == ["lib<2", "unknown"]  # lib<2 conflicts with app's lib>=2
+        links, _ = manager._plan_from_store(["app[full]"])
+        assert set(links) == {"app", "lib", "extra-dep"}
+
+
+if __name__ == "__main__":
+    test_store_rebuild_and_superset_reuse()
+    test_plan_from_store_follows_requirements()
+    print("✅ Luci environment manager tests passed")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test the full-text MemoryIndex used by SessionLogger and MemorySystem.
+"""
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import memory_system
+from core.memory_index import MemoryIndex, KIND_LOG, KIND_ARCHIVE
+
+
+def _write_session(directory: Path, session_id: str, messages):
+    data = {
+        'session_id': session_id,
+        'started_at': f"{session_id[:4]}-{session_id[4:6]}-{session_id[6:8]}T10:00:00",
+        'ended_at': None,
+        'messages': messages,
+        'commands_executed': 2,
+        'files_created': [],
+        'files_modified': [],
+        'events': []
+    }
+    path = directory / f"session_{session_id}.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+def test_sync_and_search():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        sessions_dir = tmp / "sessions"
+        sessions_dir.mkdir()
+        index = MemoryIndex(tmp / "index.db")
+
+        _write_session(sessions_dir, "20250101_100000", [
+            {'role': 'user', 'content': 'how do I install numpy', 'timestamp': '2025-01-01T10:00:01'},
+            {'role': 'assistant', 'content': 'use pip install numpy', 'timestamp': '2025-01-01T10:00:02'},
+        ])
+        _write_session(sessions_dir, "20250301_100000", [
+            {'role': 'user', 'content': 'python virtual environments', 'timestamp': '2025-03-01T10:00:01'},
+        ])
+
+        assert index.sync_directory(KIND_LOG, sessions_dir, prefix='session_') == 2
+        # Unchanged files are not reparsed
+        assert index.sync_directory(KIND_LOG, sessions_dir, prefix='session_') == 0
+
+        hits = index.search("numpy", kinds=[KIND_LOG])
+        assert len(hits) == 2
+        assert all('numpy' in h['content'] for h in hits)
+
+        # Prefix matching and date range filters
+        assert len(index.search("virt")) == 1
+        assert index.search("numpy", since="2025-02-01") == []
+
+        rows = index.list_sessions(KIND_LOG)
+        assert [r['session_id'] for r in rows] == ["20250301_100000", "20250101_100000"]
+        assert rows[1]['message_count'] == 2
+
+        stats = index.session_stats(KIND_LOG)
+        assert stats['total'] == 2 and stats['messages'] == 3
+
+        # Deleted files drop out of the index
+        os.remove(sessions_dir / "session_20250101_100000.json")
+        index.sync_directory(KIND_LOG, sessions_dir, prefix='session_')
+        assert index.search("numpy") == []
+        index.close()
+
+
+def test_live_entries_and_archive_move():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = MemoryIndex(Path(tmp) / "index.db")
+        index.add_entry('memory', '20250101_100000', 'user', 'my favourite colour is teal')
+        index.move_session('memory', '20250101_100000', KIND_ARCHIVE, 'colours',
+                           {'model': 'llama3.2', 'message_count': 1})
+
+        hits = index.search("teal", kinds=[KIND_ARCHIVE])
+        assert len(hits) == 1 and hits[0]['session_id'] == 'colours'
+        assert index.search("teal", kinds=['memory']) == []
+        index.close()
+
+
+def test_search_memory_falls_back_without_index():
+    def broken_index():
+        raise RuntimeError("no such module: fts5")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = memory_system.MemorySystem.__new__(memory_system.MemorySystem)
+        memory.session_memory = [{'role': 'user', 'content': 'Teal again', 'timestamp': '2025-03-01T09:00:00'}]
+        memory.archives_dir = Path(tmp)
+        Path(tmp, "colours.json").write_text(json.dumps({'entries': [
+            {'role': 'user', 'content': 'my favourite colour is teal', 'timestamp': '2025-01-01T10:00:00'},
+            {'role': 'user', 'content': 'teal, still', 'timestamp': '2025-02-01T10:00:00'},
+            {'role': 'assistant', 'content': 'noted', 'timestamp': '2025-01-01T10:00:05'},
+        ]}))
+
+        saved = memory_system.get_memory_index
+        memory_system.get_memory_index = broken_index
+        try:
+            matches = memory.search_memory("TEAL", include_archives=True)
+            assert [m['source'] for m in matches] == ['current_session', 'archive:colours', 'archive:colours']
+            recent = memory.search_memory("teal", include_archives=True, since=datetime(2025, 1, 15))
+            assert [m['entry']['content'] for m in recent] == ['Teal again', 'teal, still']
+            assert len(memory.search_memory("teal", include_archives=True, limit=1)) == 2
+            assert memory.list_archives()[0]['name'] == 'colours'
+        finally:
+            memory_system.get_memory_index = saved
+
+
+if __name__ == "__main__":
+    test_sync_and_search()
+    test_live_entries_and_archive_move()
+    test_search_memory_falls_back_without_index()
+    print("✅ MemoryIndex tests passed")
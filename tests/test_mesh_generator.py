@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test MeshGenerator's vectorized primitives, weld/subdivide kernels and binary exports.
+"""
+import os
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from luci import mesh_generator
+from luci.mesh_generator import MeshGenerator
+
+
+def _generator() -> MeshGenerator:
+    generator = MeshGenerator.__new__(MeshGenerator)
+    generator._last_mesh = None
+    return generator
+
+
+def _python_only(fn, *args):
+    saved = mesh_generator.NUMPY_AVAILABLE
+    mesh_generator.NUMPY_AVAILABLE = False
+    try:
+        return fn(*args)
+    finally:
+        mesh_generator.NUMPY_AVAILABLE = saved
+
+
+def _assert_closed(faces):
+    """Every edge of a watertight triangle mesh is shared by exactly two faces."""
+    edges = Counter(tuple(sorted(edge)) for a, b, c in np.asarray(faces).tolist() for edge in ((a, b), (b, c), (c, a)))
+    assert set(edges.values()) == {2}
+    return len(edges)
+
+
+def test_vectorized_primitives_match_loops():
+    generator = _generator()
+    for name, args in (('_create_sphere', (12,)), ('_create_cylinder', (9,)), ('_create_cone', (7,)),
+                       ('_create_torus', (10, 6))):
+        vertices, faces = getattr(generator, name)(*args)
+        loop_vertices, loop_faces = _python_only(getattr(generator, name), *args)
+        assert np.allclose(vertices, loop_vertices, atol=1e-12), name
+        assert faces.tolist() == [list(face) for face in loop_faces], name
+
+    # Poles weld into single vertices and close the sphere: V - E + F = 2
+    vertices, faces = generator._weld_vertices(*generator._create_sphere(12))
+    assert len(vertices) == 11 * 24 + 2 and len(faces) == 4 * 12 * 11
+    assert len(vertices) - _assert_closed(faces) + len(faces) == 2
+
+
+def test_weld_and_subdivide_without_and_with_numpy():
+    generator = _generator()
+    mesh = generator._weld_vertices(*generator._create_sphere(8))
+    python_mesh = _python_only(generator._weld_vertices, *generator._create_sphere(8))
+    assert np.array_equal(mesh[0], python_mesh[0]) and mesh[1].tolist() == [list(f) for f in python_mesh[1]]
+
+    vertices, faces = generator._subdivide_mesh(*mesh, levels=2, radius=1.0)
+    python_vertices, python_faces = _python_only(generator._subdivide_mesh, *python_mesh, 2, 1.0)
+    assert len(faces) == len(python_faces) == 16 * len(mesh[1])
+    assert len(vertices) == len(python_vertices)
+    assert np.allclose(np.linalg.norm(vertices, axis=1), 1.0)
+    assert len(vertices) - _assert_closed(faces) + len(faces) == 2  # Shared midpoints: no cracks
+    assert np.allclose(np.sort(vertices, axis=0), np.sort(np.array(python_vertices), axis=0))
+
+
+def test_exports_and_obj_round_trip():
+    generator = _generator()
+    vertices, faces = generator._weld_vertices(*generator._create_torus(12, 8))
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ('obj', 'stl', 'ply'):
+            generator.export_mesh(os.path.join(tmp, f"torus.{fmt}"), vertices, faces)
+            _python_only(generator.export_mesh, os.path.join(tmp, f"python.{fmt}"), vertices.tolist(), faces.tolist())
+            assert Path(tmp, f"torus.{fmt}").read_bytes() == Path(tmp, f"python.{fmt}").read_bytes(), fmt
+
+        stl = Path(tmp, "torus.stl").read_bytes()
+        assert int.from_bytes(stl[80:84], 'little') == len(faces) and len(stl) == 84 + 50 * len(faces)
+        records = np.frombuffer(stl[84:], dtype=[('normal', '<f4', 3), ('corners', '<f4', (3, 3)), ('attr', '<u2')])
+        assert np.allclose(records['corners'], vertices[faces - 1], atol=1e-6)
+        assert np.allclose(np.linalg.norm(records['normal'], axis=1), 1.0, atol=1e-5)
+
+        ply = Path(tmp, "torus.ply").read_bytes()
+        header, body = ply.split(b"end_header\n", 1)
+        assert f"element vertex {len(vertices)}".encode() in header
+        assert np.allclose(np.frombuffer(body[:12 * len(vertices)], '<f4').reshape(-1, 3), vertices, atol=1e-6)
+        face_records = np.frombuffer(body[12 * len(vertices):], dtype=[('n', 'u1'), ('i', '<i4', 3)])
+        assert (face_records['n'] == 3).all() and np.array_equal(face_records['i'] + 1, faces)
+
+        read_vertices, read_faces = generator._read_obj_file(os.path.join(tmp, "torus.obj"))
+        assert np.allclose(read_vertices, vertices, atol=1e-6) and np.array_equal(read_faces, faces)
+
+        Path(tmp, "textured.obj").write_text("v 0 0 0\nvn 0 0 1\nv 1 0 0\nv 0 1 0\nv 1 1 0\nf 1/1/1 2/2/1 3/3/1 4/4/1\n")
+        assert generator._read_obj_file(os.path.join(tmp, "textured.obj"))[1].tolist() == [[1, 2, 3]]
+        assert _python_only(generator._read_obj_file, os.path.join(tmp, "textured.obj"))[1] == [(1, 2, 3)]
+
+
+def test_execute_with_binary_exports_and_detail():
+    with tempfile.TemporaryDirectory() as tmp:
+        saved_home = os.environ.get("HOME")
+        os.environ["HOME"] = tmp
+        try:
+            generator = MeshGenerator()
+        finally:
+            os.environ["HOME"] = saved_home
+        success, message = generator.execute("mesh red ball --stl --ply --detail 1")
+        assert success, message
+        assert "STL export:" in message and "PLY export:" in message and 'Prompt: "red ball"' in message
+
+        refined = generator.output_dir / "red_ball_refined.obj"
+        vertices, faces = generator._read_obj_file(str(refined))
+        assert len(faces) == 4 * 4 * 20 * 19
+        assert (generator.output_dir / "red_ball_refined.stl").stat().st_size == 84 + 50 * len(faces)
+        assert (generator.output_dir / "red_ball_refined.mtl").exists()
+
+
+if __name__ == "__main__":
+    test_vectorized_primitives_match_loops()
+    test_weld_and_subdivide_without_and_with_numpy()
+    test_exports_and_obj_round_trip()
+    test_execute_with_binary_exports_and_detail()
+    print("✅ Mesh generator tests passed")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test the model benchmark runner against a local stand-in for llamafile --server.
+"""
+import json
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.model_benchmark import BenchmarkRunner, LlamafileServer, load_corpus, save_results
+
+
+class FakeCompletionHandler(BaseHTTPRequestHandler):
+    """Streams a canned answer the way llama.cpp's /completion does."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        answer = "4, the answer is four" if '2+2' in body['prompt'] else "hello there, python is a programming language"
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for word in answer.split(' '):
+            self.wfile.write(f"data: {json.dumps({'content': word + ' ', 'stop': False})}\n\n".encode())
+        timings = {'prompt_n': 12, 'prompt_per_second': 240.0, 'predicted_n': 6,
+                   'predicted_ms': 60.0, 'predicted_per_second': 100.0}
+        self.wfile.write(f"data: {json.dumps({'content': '', 'stop': True, 'timings': timings})}\n\n".encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(LlamafileServer):
+    """LlamafileServer pointed at the fake HTTP server instead of a real binary."""
+
+    def __init__(self, port):
+        super().__init__(Path('llamafile'), Path('model.gguf'), port=port)
+
+    def start(self, timeout=0):
+        self.load_time = 0.0
+
+    def stop(self):
+        pass
+
+
+def test_benchmark_run():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FakeCompletionHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    port = httpd.server_address[1]
+
+    try:
+        loads = []
+
+        def factory(model_path):
+            loads.append(model_path)
+            return StandInServer(port)
+
+        corpus = load_corpus(max_tier=0)
+        runner = BenchmarkRunner(server_factory=factory, warmup=1, repeats=2)
+        results = runner.run([('tinyllama', Path('a.gguf'), 0), ('mistral', Path('b.gguf'), 2)], corpus)
+
+        # Each model loaded exactly once
+        assert loads == [Path('a.gguf'), Path('b.gguf')]
+        assert len(results['results']) == 2 * 2 * len(corpus)
+
+        summary = results['summary']['tinyllama']
+        assert summary['tokens_per_sec'] == 100.0
+        assert summary['prompt_eval_rate'] == 240.0
+        assert summary['ttft_ms_p50'] is not None
+        assert 0 < summary['pass_rate'] < 100
+
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path, csv_path = save_results(results, Path(tmp))
+            assert json.loads(json_path.read_text())['meta']['python']
+            assert len(csv_path.read_text().strip().splitlines()) == len(results['results']) + 1
+    finally:
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    test_benchmark_run()
+    print("✅ Model benchmark tests passed")
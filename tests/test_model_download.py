@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test the ranged GGUF downloader against a local HTTP stand-in server.
+"""
+import hashlib
+import json
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.model_download import (
+    RangedDownloader, DownloadCancelled, BandwidthLimiter, download_gguf_model, read_recorded_sha256
+)
+
+PAYLOAD = b'GGUF' + (3).to_bytes(4, 'little') + bytes(range(256)) * 1200
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves PAYLOAD, honouring single byte ranges unless `ranges` is off."""
+
+    ranges = True
+    requested = []
+
+    def do_GET(self):
+        header = self.headers.get('Range')
+        type(self).requested.append(header)
+        if header and self.ranges:
+            start, end = header.split('=')[1].split('-')
+            start, end = int(start), int(end) if end else len(PAYLOAD) - 1
+            body = PAYLOAD[start:end + 1]
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{end}/{len(PAYLOAD)}")
+        else:
+            body = PAYLOAD
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(handler):
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}/model.gguf"
+
+
+def _downloader(url, path, **kwargs):
+    downloader = RangedDownloader(url, path, connections=3, chunk_size=4096, show_progress=False,
+                                  cancel_event=threading.Event(), limiter=BandwidthLimiter(), **kwargs)
+    downloader.MIN_RANGE_SIZE = 16 * 1024
+    return downloader
+
+
+def test_ranged_download_and_resume():
+    httpd, url = _serve(RangeHandler)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'model.gguf'
+
+            # Throttle the first attempt and stop it part-way through
+            first = _downloader(url, path)
+            first.limiter = BandwidthLimiter(200 * 1024)
+            first.progress_callback = lambda done, total: done and first._stop.set()
+            try:
+                first.run()
+                assert False, "expected cancellation"
+            except DownloadCancelled:
+                pass
+            manifest = json.loads(first.manifest_path.read_text())
+            assert manifest['size'] == len(PAYLOAD) and len(manifest['ranges']) > 1
+            assert not path.exists()
+
+            # Second attempt resumes from the manifest instead of starting over
+            RangeHandler.requested = []
+            digest = _downloader(url, path).run()
+            assert path.read_bytes() == PAYLOAD
+            assert digest == hashlib.sha256(PAYLOAD).hexdigest()
+            assert read_recorded_sha256(path) == digest
+            assert not first.manifest_path.exists()
+
+            fetched = 0
+            for header in RangeHandler.requested[1:]:  # skip the size probe
+                start, end = header.split('=')[1].split('-')
+                fetched += int(end) - int(start) + 1
+            assert fetched < len(PAYLOAD)
+    finally:
+        httpd.shutdown()
+
+
+def test_falls_back_without_range_support():
+    class NoRanges(RangeHandler):
+        ranges = False
+
+    httpd, url = _serve(NoRanges)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'model.gguf'
+            assert download_gguf_model(url, path, connections=4)
+            assert path.read_bytes() == PAYLOAD
+    finally:
+        httpd.shutdown()
+
+
+def test_empty_range_responses_give_up():
+    class EmptyRanges(RangeHandler):
+        def do_GET(self):
+            if self.headers.get('Range') == 'bytes=0-0':
+                return super().do_GET()
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes 0-0/{len(PAYLOAD)}")
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    httpd, url = _serve(EmptyRanges)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                _downloader(url, Path(tmp) / 'model.gguf', range_retries=0).run()
+                assert False, "expected the download to give up"
+            except IOError as e:
+                assert 'No data' in str(e)
+    finally:
+        httpd.shutdown()
+
+
+def test_ranges_withdrawn_mid_download_restart_single_stream():
+    class ProbeOnlyRanges(RangeHandler):
+        def do_GET(self):
+            self.ranges = self.headers.get('Range') == 'bytes=0-0'
+            super().do_GET()
+
+    httpd, url = _serve(ProbeOnlyRanges)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'model.gguf'
+            assert download_gguf_model(url, path, connections=2)
+            assert path.read_bytes() == PAYLOAD
+            assert sorted(p.name for p in Path(tmp).iterdir()) == ['model.gguf']
+    finally:
+        httpd.shutdown()
+
+
+def test_sha256_mismatch_is_rejected():
+    httpd, url = _serve(RangeHandler)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'model.gguf'
+            assert not download_gguf_model(url, path, connections=2, expected_sha256='0' * 64)
+            assert not path.exists()
+    finally:
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    test_ranged_download_and_resume()
+    test_falls_back_without_range_support()
+    test_empty_range_responses_give_up()
+    test_ranges_withdrawn_mid_download_restart_single_stream()
+    test_sha256_mismatch_is_rejected()
+    print("✅ Model download tests passed")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test PackageManager's concurrent source probing and dependency-ordered installs.
+"""
+import io
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from luci import package_manager
+from luci.package_manager import PackageManager
+
+
+def _manager(tmp: Path) -> PackageManager:
+    package_manager.PROBE_CACHE_FILE = tmp / "probe_cache.json"
+    pm = PackageManager()
+    pm.package_sources = {source: False for source in pm.package_sources}
+    return pm
+
+
+def test_probe_sources_concurrent_cached_with_timeout():
+    saved = package_manager.PROBE_CACHE_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            pm = _manager(Path(tmp))
+            calls = []
+            delays = {'brew': 0.3, 'pip': 0.3, 'npm': 0.3, 'apt': 5.0}
+
+            def fake_check(name, source):
+                calls.append(source)
+                time.sleep(delays[source])
+                return source != 'npm'
+
+            pm._check_package_exists = fake_check
+            start = time.time()
+            found = pm.probe_sources("requests", ['brew', 'pip', 'npm', 'apt'], timeout=1.0)
+            elapsed = time.time() - start
+            assert found == {'brew': True, 'pip': True, 'npm': False, 'apt': None}
+            assert elapsed < 1.5, elapsed  # Not 0.9s + 5s serially
+
+            # Definite answers are cached (also on disk); the timed-out source is asked again
+            calls.clear()
+            delays['apt'] = 0.0
+            found = PackageManager.probe_sources(pm, "requests", ['brew', 'pip', 'npm', 'apt'])
+            assert calls == ['apt'] and found['apt'] is True
+            assert "pip:requests" in _manager(Path(tmp))._probe_cache
+        finally:
+            package_manager.PROBE_CACHE_FILE = saved
+
+
+def test_plan_install_orders_dependencies():
+    saved = package_manager.PROBE_CACHE_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            pm = _manager(Path(tmp))
+            plan = pm.plan_install(["llama3.2", "mistral", "git"])
+            assert list(plan)[0] == "ollama"
+            assert plan["llama3.2"] == ["ollama"] and plan["mistral"] == ["ollama"]
+            assert plan["brew"] == [] and plan["git"] == ["brew"]
+
+            pm.package_sources['ollama'] = True
+            assert pm.plan_install(["llama3.2"]) == {"llama3.2": []}
+        finally:
+            package_manager.PROBE_CACHE_FILE = saved
+
+
+def test_install_many_runs_downloads_in_parallel():
+    saved = package_manager.PROBE_CACHE_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            pm = _manager(Path(tmp))
+            events = []
+            lock = threading.Lock()
+            active = {'downloads': 0, 'peak': 0}
+
+            def fake_install(name, verbose=True):
+                with lock:
+                    events.append(("start", name))
+                    if name != "ollama":
+                        active['downloads'] += 1
+                        active['peak'] = max(active['peak'], active['downloads'])
+                print(f"installing {name}")  # Buffered for download workers
+                time.sleep(0.3)
+                with lock:
+                    if name != "ollama":
+                        active['downloads'] -= 1
+                    events.append(("end", name))
+                return name != "mistral"
+
+            pm.install = fake_install
+            out = io.StringIO()
+            start = time.time()
+            with redirect_stdout(out):
+                results = pm.install_many(["llama3.2", "mistral", "phi"], max_parallel=3)
+            elapsed = time.time() - start
+
+            assert results == {"ollama": True, "llama3.2": True, "mistral": False, "phi": True}
+            assert events.index(("end", "ollama")) < events.index(("start", "llama3.2"))
+            assert active['peak'] == 3
+            assert elapsed < 1.0, elapsed  # ollama, then three models at once
+            assert "installing mistral" in out.getvalue()  # Failed step's output is shown
+            assert "installing phi" not in out.getvalue()
+
+            # A failed dependency skips its dependents
+            assert pm.package_sources['ollama']  # Marked present by the first run
+            pm.package_sources['ollama'] = False
+            pm.install = lambda name, verbose=True: name != "ollama"
+            with redirect_stdout(io.StringIO()):
+                results = pm.install_many(["llama3.2"])
+            assert results == {"ollama": False, "llama3.2": False}
+        finally:
+            package_manager.PROBE_CACHE_FILE = saved
+
+
+if __name__ == "__main__":
+    test_probe_sources_concurrent_cached_with_timeout()
+    test_plan_install_orders_dependencies()
+    test_install_many_runs_downloads_in_parallel()
+    print("✅ Package manager tests passed")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test the persistent performance metrics store (aggregates, trends, regressions).
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import llm_backend
+from core.perf_metrics import (PerfMetricsStore, parse_llama_timings, percentile, sparkline,
+                               KIND_LLM, KIND_ROUTE, KIND_CACHE)
+
+
+def test_aggregates_and_cache_hit_rate():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PerfMetricsStore(Path(tmp) / "perf.db")
+        for latency in (100, 200, 300, 400, 1000):
+            store.record_llm('tinyllama', latency, tier=0, prompt_tokens=10, generated_tokens=20,
+                             eval_ms=latency / 2)
+        store.record_route('GENERAL_QUERY', 50)
+        store.record_cache(True)
+        store.record_cache(False)
+
+        llm = store.aggregate(KIND_LLM)['tinyllama']
+        assert llm['count'] == 5
+        assert llm['p50_ms'] == 300 and llm['p99_ms'] == 1000
+        assert llm['tokens_per_sec'] > 0
+        assert store.aggregate(KIND_ROUTE)['GENERAL_QUERY']['p50_ms'] == 50
+        assert store.aggregate(KIND_CACHE)['response']['hit_rate'] == 50.0
+
+        trend = store.daily_trend(KIND_LLM, 'tinyllama', days=3)
+        assert trend[:2] == [None, None] and trend[-1] == 300
+        store.close()
+
+        # Samples persist across sessions
+        reopened = PerfMetricsStore(Path(tmp) / "perf.db")
+        assert reopened.aggregate(KIND_LLM)['tinyllama']['count'] == 5
+        reopened.close()
+
+
+def test_regression_between_versions():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PerfMetricsStore(Path(tmp) / "perf.db")
+        store._model_versions['mistral'] = 'abc123:model-a'
+        for _ in range(5):
+            store.record_llm('mistral', 1000, generated_tokens=50, eval_ms=800)
+        assert store.detect_regressions() == []
+
+        # Same model after a code/model change: slower and fewer tokens/sec
+        store._model_versions['mistral'] = 'def456:model-a'
+        for _ in range(5):
+            store.record_llm('mistral', 2000, generated_tokens=50, eval_ms=1600)
+
+        regressions = {r['metric']: r for r in store.detect_regressions()}
+        assert set(regressions) == {'p50_ms', 'tokens_per_sec'}
+        assert regressions['p50_ms']['previous_version'] == 'abc123:model-a'
+        assert regressions['p50_ms']['version'] == 'def456:model-a'
+        store.close()
+
+
+def test_tokens_per_sec_excludes_prompt_eval():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PerfMetricsStore(Path(tmp) / "perf.db")
+        store.record_llm('a', 3000, generated_tokens=40, eval_ms=1000)  # 2s of load + prompt eval
+        store.record_llm('b', 3000, generated_tokens=40, ttft_ms=2000)
+        store.record_llm('c', 3000, generated_tokens=40)  # No generation time: no rate
+        stats = store.aggregate(KIND_LLM)
+        assert stats['a']['tokens_per_sec'] == 40.0 and stats['b']['tokens_per_sec'] == 40.0
+        assert stats['c']['tokens_per_sec'] is None and stats['c']['p50_ms'] == 3000
+        store.close()
+
+    stderr = ("llama_print_timings: load time = 900.00 ms\n"
+              "llama_print_timings: prompt eval time =   120.50 ms /    20 tokens\n"
+              "llama_print_timings:        eval time =  1480.00 ms /    37 runs\n")
+    assert parse_llama_timings(stderr) == {
+        'prompt_tokens': 20, 'generated_tokens': 37, 'prompt_eval_ms': 120.5, 'eval_ms': 1480.0}
+    assert parse_llama_timings("")['eval_ms'] == 0.0
+
+
+class StubBackend:
+    """Native-llamafile-like backend: stats only when asked for."""
+
+    def chat(self, messages, **kwargs):
+        stats = {'prompt_tokens': 12, 'generated_tokens': 30, 'eval_ms': 500.0}
+        return ("hi", stats) if kwargs.get('return_stats') else "hi"
+
+
+def test_backend_records_every_request():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PerfMetricsStore(Path(tmp) / "perf.db")
+        saved = llm_backend.get_perf_store
+        llm_backend.get_perf_store = lambda: store
+        try:
+            llm = llm_backend.LLMBackend.__new__(llm_backend.LLMBackend)
+            llm.model, llm.backend = 'mistral', StubBackend()
+            llm.conversation_history, llm.max_history = [], 200
+            messages = [{'role': 'user', 'content': "hello"}]
+            assert llm.chat(messages) == "hi"  # Callers that did not ask for stats still get text
+            assert llm.chat(messages, return_stats=True)[0] == "hi"
+        finally:
+            llm_backend.get_perf_store = saved
+        stats = store.aggregate(KIND_LLM)['mistral']
+        assert stats['count'] == 2 and stats['tokens_per_sec'] == 60.0
+        store.close()
+
+
+def test_helpers():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert sparkline([None, 1, 2]) == "·▁█"
+
+
+if __name__ == "__main__":
+    test_aggregates_and_cache_hit_rate()
+    test_regression_between_versions()
+    test_tokens_per_sec_excludes_prompt_eval()
+    test_backend_records_every_request()
+    test_helpers()
+    print("✅ PerfMetricsStore tests passed")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test the headless batch simulator against the frame-by-frame PhysicsCombatEngine.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import physics_batch_sim
+from core.physics_batch_sim import (BatchCombatSimulator, battle_seeds, build_souls, round_robin,
+                                    simulate_scalar, win_rate_matrix)
+
+FIGHTERS = [('thor', 'celestial', 50), ('krampus', 'demonic', 80), ('phoenix', 'angelic', 120),
+            ('imp', 'uncommon', 30)]
+
+
+def test_seeded_loadouts():
+    matchup = (('thor', 'celestial', 50), ('krampus', 'demonic', 50))
+    first = [sorted(soul.weapons) for soul in build_souls(matchup, 1234)]
+    again = [sorted(soul.weapons) for soul in build_souls(matchup, 1234)]
+    assert first == again
+    assert battle_seeds(5, 3) == battle_seeds(5, 3) != battle_seeds(6, 3)
+
+
+def test_batch_matches_scalar_engine():
+    matchups = round_robin(FIGHTERS, 2)
+    outcomes = BatchCombatSimulator().run(matchups, seed=42)
+    seeds = battle_seeds(42, len(matchups))
+    for matchup, battle_seed, outcome in zip(matchups, seeds, outcomes):
+        assert simulate_scalar(matchup, battle_seed) == outcome  # Winner, time and HP bit for bit
+    assert {o.winner for o in outcomes} >= {1, 2}
+
+
+def test_fallback_without_numpy():
+    matchups = round_robin(FIGHTERS[:2], 2)
+    vectorized = BatchCombatSimulator(max_time=20.0).run(matchups, seed=3)
+    saved = physics_batch_sim.NUMPY_AVAILABLE
+    physics_batch_sim.NUMPY_AVAILABLE = False
+    try:
+        assert BatchCombatSimulator(max_time=20.0).run(matchups, seed=3) == vectorized
+    finally:
+        physics_batch_sim.NUMPY_AVAILABLE = saved
+
+
+def test_win_rate_matrix():
+    outcomes = BatchCombatSimulator().run(round_robin(FIGHTERS, 2), seed=9)
+    by_entity = win_rate_matrix(outcomes, by='entity')
+    assert by_entity['labels'] == ['imp', 'krampus', 'phoenix', 'thor']
+    assert by_entity['games']['thor']['imp'] == 4  # Two battles in each corner
+    for a in by_entity['labels']:
+        for b, rate in by_entity['win_rate'][a].items():
+            assert abs(rate + by_entity['win_rate'][b][a] - 1.0) < 1e-9
+    assert by_entity['win_rate']['imp']['thor'] == 0.0  # Unarmed uncommon vs a celestial
+
+    by_weapon = win_rate_matrix(outcomes, by='weapon')
+    assert 'none' in by_weapon['labels']
+    assert set(win_rate_matrix(outcomes, by='rarity')['labels']) == {'celestial', 'demonic', 'angelic', 'uncommon'}
+
+
+if __name__ == "__main__":
+    test_seeded_loadouts()
+    test_batch_matches_scalar_engine()
+    test_fallback_without_numpy()
+    test_win_rate_matrix()
+    print("✅ Physics batch simulator tests passed")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test the sliding-window RateLimiter, its JSONL log and the callers built on it.
+"""
+import json
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import ban_system, rate_limiter
+from core.github_uploader import GitHubUploader
+from core.rate_limiter import DAY, HOUR, RateLimiter
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StubIdManager:
+    def get_id(self):
+        return "LUC-TEST"
+
+
+def test_sliding_windows_and_retry_after():
+    clock = FakeClock()
+    limiter = RateLimiter(windows=(HOUR, DAY), clock=clock)
+    for _ in range(3):
+        limiter.hit("alice")
+        clock.now += 600
+    assert limiter.count("alice") == 3 and limiter.count("alice", DAY) == 3 and limiter.count("bob") == 0
+
+    # Next slot opens when the oldest of the last `limit` hits is an hour old
+    assert limiter.retry_after("alice", 3, HOUR) == HOUR - 1800
+    assert limiter.retry_after("alice", 4, HOUR) == 0.0
+    assert limiter.acquire("alice", 3) == (False, HOUR - 1800)
+    assert limiter.count("alice") == 3  # Refused attempts are not counted
+
+    clock.now += HOUR - 1800
+    assert limiter.acquire("alice", 3) == (True, 0.0)
+    assert limiter.count("alice") == 3 and limiter.count("alice", DAY) == 4
+
+    clock.now += DAY
+    assert limiter.count("alice", DAY) == 0 and limiter.last_hit("alice") is None
+
+    limiter.hit("carol")
+    limiter.import_hits("carol", [clock.now - 100, clock.now - 2 * DAY])  # Back-dated, one long expired
+    assert list(limiter._hits["carol"][HOUR]) == [clock.now - 100, clock.now]
+
+    try:
+        limiter.count("alice", 60)
+        assert False, "untracked window accepted"
+    except ValueError:
+        pass
+
+
+def test_log_is_lazy_replayed_and_compacted():
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "limits.jsonl")
+        limiter = RateLimiter(path, windows=(HOUR,), clock=clock)
+        limiter.hit("a")
+        assert not path.exists()  # Buffered, not written per hit
+        clock.now += rate_limiter.FLUSH_INTERVAL
+        limiter.hit("b")
+        assert [json.loads(line) for line in path.read_text().splitlines()] == [["a", clock.now - 5], ["b", clock.now]]
+
+        limiter.hit("a")
+        limiter.flush()
+        with open(path, "a") as f:
+            f.write('["torn"')  # Interrupted write
+        reloaded = RateLimiter(path, windows=(HOUR,), clock=clock)
+        assert reloaded.count("a") == 2 and reloaded.count("b") == 1
+
+        # Once most logged hits have expired the log is rewritten with only live ones
+        for _ in range(rate_limiter.COMPACT_RATIO * rate_limiter.FLUSH_BATCH):
+            reloaded.hit("spam")
+        clock.now += 2 * HOUR
+        reloaded.hit("a")
+        reloaded.flush()
+        assert path.read_text().splitlines() == [json.dumps(["a", clock.now])]
+
+
+def test_ban_system_limits_and_legacy_migration():
+    saved = (ban_system.RATE_LIMIT_FILE, ban_system.LEGACY_RATE_LIMIT_FILE, ban_system.BAN_LIST_FILE)
+    with tempfile.TemporaryDirectory() as tmp:
+        ban_system.RATE_LIMIT_FILE = Path(tmp, "rate_limits.jsonl")
+        ban_system.LEGACY_RATE_LIMIT_FILE = Path(tmp, "rate_limits.json")
+        ban_system.BAN_LIST_FILE = Path(tmp, "ban_list.json")
+        try:
+            now = datetime.now()
+            legacy = {"old_user": [(now - timedelta(minutes=m)).isoformat() for m in (5, 10, 2000)]}
+            ban_system.LEGACY_RATE_LIMIT_FILE.write_text(json.dumps(legacy))
+
+            bans = ban_system.BanSystem()
+            assert not ban_system.LEGACY_RATE_LIMIT_FILE.exists()
+            assert bans.rate_limits.count("old_user", HOUR) == 2 and bans.rate_limits.count("old_user", DAY) == 2
+
+            for _ in range(25):
+                bans.record_upload("spammer_user")
+            assert bans.check_rate_limit("spammer_user") == (
+                True, "Mass uploading: 25 fixes in last hour (limit: 20)")
+            assert bans.check_rate_limit("old_user") == (False, None)
+
+            bans._save_rate_limits()
+            assert RateLimiter(ban_system.RATE_LIMIT_FILE, windows=(HOUR, DAY)).count("spammer_user") == 25
+        finally:
+            ban_system.RATE_LIMIT_FILE, ban_system.LEGACY_RATE_LIMIT_FILE, ban_system.BAN_LIST_FILE = saved
+
+
+def test_github_uploader_per_action_limits():
+    with tempfile.TemporaryDirectory() as tmp:
+        uploader = GitHubUploader.__new__(GitHubUploader)
+        uploader.id_manager = StubIdManager()
+        uploader.rate_limit_file = Path(tmp, "github_rate_limits.jsonl")
+        Path(tmp, "github_rate_limits.json").write_text(json.dumps(
+            {"LUC-TEST": {"upload": [(datetime.utcnow() - timedelta(minutes=30)).isoformat()]}}))
+        uploader.rate_limiter = uploader._load_rate_limits()
+
+        results = [uploader._check_rate_limit("upload", max_per_hour=5) for _ in range(5)]
+        assert results[:4] == [(True, None)] * 4
+        assert results[4][0] is False and results[4][1] == "Rate limit exceeded. Try again in 29 minutes."
+        assert uploader._check_rate_limit("update", max_per_hour=10) == (True, None)
+        assert uploader.rate_limiter.count("LUC-TEST:upload") == 5
+
+
+if __name__ == "__main__":
+    test_sliding_windows_and_retry_after()
+    test_log_is_lazy_replayed_and_compacted()
+    test_ban_system_limits_and_legacy_migration()
+    test_github_uploader_per_action_limits()
+    print("✅ Rate limiter tests passed")
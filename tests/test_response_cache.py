@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test the LLM response cache (exact + similar tiers, history, TTL, LRU, batching, opt-outs).
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.response_cache as response_cache
+from core.response_cache import ResponseCache, order_agreement
+
+
+def _cache(tmp, **kwargs):
+    return ResponseCache(Path(tmp) / "responses.json", **kwargs)
+
+
+def test_exact_and_similar_hits():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp)
+        cache.put('tinyllama', "What is 2+2?", "4")
+
+        assert cache.get('tinyllama', "what is 2+2") == ("4", 'exact')
+        assert cache.get('tinyllama', "  What   is 2+2 !") == ("4", 'exact')
+        # Different model or temperature bucket never shares answers
+        assert cache.get('mistral', "What is 2+2?") is None
+        assert cache.get('tinyllama', "What is 2+2?", temperature=0.1) is None
+
+        cache.put('tinyllama', "what is python programming language", "A language.")
+        hit = cache.get('tinyllama', "what is the python programming language")
+        assert hit == ("A language.", 'similar')
+
+        stats = cache.get_stats()
+        assert stats['exact_hits'] == 2 and stats['similar_hits'] == 1
+        assert stats['misses'] == 2
+
+
+def test_similar_tier_is_order_sensitive():
+    assert order_agreement("a b c d".split(), "a b c d".split()) == 1.0
+    assert order_agreement("dog bigger than cat".split(), "cat bigger than dog".split()) < 0.5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        disabled = _cache(tmp, embedder=None)
+        disabled.put('m', "what is python programming language", "A language.")
+        assert disabled.get('m', "what is the python programming language") is None
+
+        cache = _cache(tmp, similarity_threshold=0.5)
+        cache.put('m', "what is 2 divided by 10", "0.2")
+        cache.put('m', "what is 3-7", "-4")
+        cache.put('m', "is 3 > 7", "No")
+        cache.put('m', "is dog bigger than cat", "Usually")
+        # Reordered operands and flipped comparisons are different questions
+        assert cache.get('m', "what is 10 divided by 2") is None
+        assert cache.get('m', "what is 7-3") is None
+        assert cache.get('m', "is 3 < 7") is None
+        assert cache.get('m', "is 7 > 3") is None
+        assert cache.get('m', "is cat bigger than dog") is None
+        # Filler words and rewording that keeps the order may differ
+        assert cache.get('m', "can you tell me what is 2 divided by 10") == ("0.2", 'similar')
+        assert cache.get('m', "please, is the dog bigger than a cat?") == ("Usually", 'similar')
+        cache.put('m', "how do i reverse a list in python", "list.reverse()")
+        assert cache.get('m', "how should i reverse a list in python") == ("list.reverse()", 'similar')
+
+
+def test_history_is_part_of_the_key():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp)
+        first = [{'role': 'user', 'content': "tell me about rust"},
+                 {'role': 'assistant', 'content': "Rust is a language."}]
+        second = [{'role': 'user', 'content': "tell me about iron oxide"},
+                  {'role': 'assistant', 'content': "Rust forms on iron."}]
+        cache.put('m', "how fast does the compiler run", "Systems programming.", history=first)
+
+        assert cache.get('m', "how fast does the compiler run", history=first) == ("Systems programming.", 'exact')
+        assert cache.get('m', "how fast does the compiler run", history=second) is None
+        assert cache.get('m', "how fast does the compiler run") is None
+
+
+def test_opt_outs():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp)
+        cache.put('tinyllama', "what time is it", "3pm")
+        cache.put('tinyllama', "tell me a joke", "...")
+        assert cache.get_stats()['entries'] == 0
+        assert cache.get('tinyllama', "make a script", route='script_creation') is None
+        assert cache.get_stats()['bypassed'] == 1
+
+
+def test_ttl_lru_and_persistence():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp, max_entries=2)
+        cache.put('m', "first question", "1")
+        cache.put('m', "second question", "2")
+        cache.put('m', "third question", "3")
+        assert cache.get('m', "first question") is None
+        assert cache.get('m', "third question") == ("3", 'exact')
+
+        cache.save()
+        reloaded = _cache(tmp, max_entries=2)
+        assert reloaded.get('m', "second question") == ("2", 'exact')
+
+        expired = _cache(tmp, ttl_seconds=0)
+        time.sleep(0.01)
+        assert expired.get('m', "second question") is None
+
+
+def test_stores_are_saved_in_batches():
+    saved_batch = response_cache.SAVE_BATCH
+    response_cache.SAVE_BATCH = 3
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = _cache(tmp)
+            cache.put('m', "first question", "1")
+            cache.put('m', "second question", "2")
+            assert not cache.cache_file.exists()
+            cache.put('m', "third question", "3")
+            assert cache.cache_file.exists()
+            assert _cache(tmp).get_stats()['entries'] == 3
+    finally:
+        response_cache.SAVE_BATCH = saved_batch
+
+
+if __name__ == "__main__":
+    test_exact_and_similar_hits()
+    test_similar_tier_is_order_sensitive()
+    test_history_is_part_of_the_key()
+    test_opt_outs()
+    test_ttl_lru_and_persistence()
+    test_stores_are_saved_in_batches()
+    print("✅ ResponseCache tests passed")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test the tournament engine and the split of soul bouts into simulation and presentation.
+"""
+import io
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import soul_system_v2, soul_tournament
+from core.soul_system_v2 import Soul, simulate_bout, battle_simulation
+from core.soul_tournament import TournamentEngine
+
+
+def _soul(entity_key: str, rarity: str, level: int) -> Soul:
+    soul = Soul(f"test_{entity_key}", entity_key, rarity, 'Test', '2024-01-01', 'hash', rng=random.Random(7))
+    soul.level = level
+    return soul
+
+
+def _roster():
+    return [_soul('azazel', 'celestial', 9999), _soul('baal', 'demonic', 999), _soul('phoenix', 'angelic', 256),
+            _soul('imp', 'uncommon', 99), _soul('creative', 'common', 50)]
+
+
+def test_bout_simulation_is_silent_and_replayable():
+    celestial, demonic = _soul('azazel', 'celestial', 9999), _soul('baal', 'demonic', 999)
+    out = io.StringIO()
+    with redirect_stdout(out):
+        bout = simulate_bout(celestial, demonic)
+    assert out.getvalue() == ""
+    assert bout['winner'] == 1 and bout['rounds'] == bout['events'][-1][0]
+    assert simulate_bout(celestial, demonic, record=False)['events'] == []
+
+    saved_sleep = time.sleep
+    time.sleep = lambda seconds: (_ for _ in ()).throw(AssertionError("paced"))
+    try:
+        with redirect_stdout(out):
+            assert battle_simulation(celestial, demonic, pace=0) is celestial
+            soul_system_v2.test_battles(pace=0)  # Not imported by name: pytest would collect it
+    finally:
+        time.sleep = saved_sleep
+    assert "🏆 WINNER: ✨ Azazel" in out.getvalue()
+
+    # Weaponless level-1 souls deal 0.00 DPS; the bout still ends, as a draw
+    weak1, weak2 = _soul('creative', 'common', 1), _soul('dark', 'common', 1)
+    assert simulate_bout(weak1, weak2, record=False)['winner'] == 0
+    stalemate = simulate_bout(weak1, weak2)
+    assert stalemate['winner'] == 0 and stalemate['rounds'] == soul_system_v2.MAX_BOUT_ROUNDS
+    assert len(stalemate['events']) == soul_system_v2.MAX_BOUT_EVENTS
+    assert stalemate['events'][-1][0] == stalemate['rounds']
+    assert stalemate['events_skipped'] == 2 * stalemate['rounds'] - soul_system_v2.MAX_BOUT_EVENTS
+    out = io.StringIO()
+    with redirect_stdout(out):
+        assert battle_simulation(weak1, weak2, pace=0) is weak1
+    assert "🤝 DRAW" in out.getvalue() and "more attacks" in out.getvalue()
+    assert out.getvalue().count("⚔️  Round") == soul_system_v2.MAX_BOUT_EVENTS
+
+
+def test_round_robin_on_process_pool():
+    saved = soul_tournament.MIN_PARALLEL_BOUTS
+    soul_tournament.MIN_PARALLEL_BOUTS = 2
+    try:
+        parallel = TournamentEngine(workers=2).round_robin(_roster(), bouts_per_pair=3)
+    finally:
+        soul_tournament.MIN_PARALLEL_BOUTS = saved
+    serial = TournamentEngine(workers=1).round_robin(_roster(), bouts_per_pair=3)
+
+    assert [b['winner'] for b in parallel['bouts']] == [b['winner'] for b in serial['bouts']]
+    assert len(parallel['bouts']) == 10 * 3
+    assert [row['name'] for row in parallel['standings']] == ['Azazel', 'Baal', 'Phoenix', 'Imp', 'Creative Soul']
+    assert parallel['standings'][0]['wins'] == 12 and parallel['standings'][-1]['losses'] == 12
+    assert parallel['stats']['bouts'] == 30 and parallel['stats']['bouts_per_sec'] > 0
+
+    out = io.StringIO()
+    with redirect_stdout(out):
+        bout = parallel['bouts'][0]
+        assert TournamentEngine().replay(bout, pace=0) == bout['winner']
+    assert "DIVISION BOUT" in out.getvalue()
+
+
+def test_bracket_with_byes():
+    engine = TournamentEngine(workers=1)
+    result = engine.bracket(_roster())
+    # 5 entrants in an 8-slot bracket: only seeds 4 v 5 fight in round one
+    assert [len(r) for r in result['rounds']] == [1, 2, 1]
+    first = result['rounds'][0][0]
+    assert {first['soul1']['entity_key'], first['soul2']['entity_key']} == {'imp', 'creative'}
+    assert result['champion']['entity_key'] == 'azazel'
+    assert [b['id'] for b in result['bouts']] == [1, 2, 3, 4]
+
+    physics = TournamentEngine(mode='physics', workers=1).bracket(_roster()[:2])
+    assert physics['rounds'][0][0]['duration'] is not None
+
+
+if __name__ == "__main__":
+    test_bout_simulation_is_silent_and_replayable()
+    test_round_robin_on_process_pool()
+    test_bracket_with_byes()
+    print("✅ Soul tournament tests passed")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test the shared BM25 template index and its use by ScriptTemplates/TemplateConsensus.
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.template_index import TemplateIndex, benchmark_search, tokenize
+from core.script_templates import ScriptTemplates
+from core.template_consensus import TemplateConsensus
+
+
+def _template(name, language, keywords, description="", code="pass"):
+    return {'name': name, 'language': language, 'keywords': keywords,
+            'description': description, 'template': code}
+
+
+def test_tokenize():
+    assert tokenize("parseCsvRows for the scraper") == ["pars", "csv", "row", "parsecsvrow", "scrap"]
+    assert tokenize("scrape scraping scrapes") == ["scrap", "scrap", "scrap"]
+    assert tokenize("file files boxes") == ["file", "file", "box"]
+
+
+def test_builtin_ranking():
+    templates = ScriptTemplates(index=TemplateIndex())
+    assert templates.find_template("make a web scraper")[0] == "python_web_scraper"
+    assert templates.find_template("flask rest api")[0] == "python_flask_api"
+    assert templates.find_template("zzzz qqqq") is None
+
+
+def test_index_updates_and_facets():
+    index = TemplateIndex()
+    index.add_many("consensus", {
+        "a": _template("Log Rotator", "Bash", ["log", "rotate"]),
+        "b": _template("Log Parser", "Python", ["log", "parse"], code="def parseLogLine(line): pass"),
+        "c": _template("Image Resizer", "Python", ["image", "resize"]),
+    })
+    assert index.count() == 3
+    assert index.languages() == {"bash": 1, "python": 2}
+
+    hits = index.search("log parser")
+    assert [h['id'] for h in hits][:2] == ["b", "a"]
+    assert all(0 < h['relevance'] <= 10 for h in hits)
+    assert [h['id'] for h in index.search("log", language="bash")] == ["a"]
+    assert index.search("python log")[0]['id'] == "b"
+
+    index.remove("consensus", "b")
+    assert [h['id'] for h in index.search("log parser")] == ["a"]
+    index.add_many("consensus", {"c": _template("Image Resizer", "Python", ["image"])}, replace=True)
+    assert index.count() == 1 and index.search("log") == []
+
+
+def test_partial_matches_score_below_caller_thresholds():
+    templates = ScriptTemplates(index=TemplateIndex())
+    index = templates.index
+    index.add_many("consensus", {
+        "scraper": _template("Web Scraper", "Python", ["web", "scraper", "html"]),
+        "renamer": _template("File Renamer", "Python", ["files", "rename", "batch"]),
+    })
+    # One of several query terms matched: below TemplateConsensus (>= 5) and
+    # SmartTemplateManager offline (>= 2) thresholds
+    for query in ("web browser automation", "delete files"):
+        hits = index.search(query, source='consensus')
+        assert hits and hits[0]['relevance'] < 2, (query, hits[0]['relevance'])
+    assert templates.find_template("web browser automation") is None
+    assert index.search("web scraper", source='consensus')[0]['relevance'] == 10.0
+    assert index.search("rename files", source='consensus')[0]['relevance'] == 10.0
+    # A language name is a facet boost, not a missing term
+    assert index.search("python web scraper", source='consensus')[0]['relevance'] == 10.0
+
+
+def test_template_consensus_search():
+    with tempfile.TemporaryDirectory() as tmp:
+        saved_home = os.environ.get("HOME")
+        os.environ["HOME"] = tmp
+        try:
+            templates_dir = Path(tmp) / ".luciferai" / "consensus" / "templates"
+            templates_dir.mkdir(parents=True)
+            local = {
+                "h1": {**_template("CSV Report", "Python", ["csv", "report"]), 'hash': "h1", 'rating': 4},
+                "h2": {**_template("Port Scanner", "Go", ["network", "port"]), 'hash': "h2", 'rating': 3},
+            }
+            (templates_dir / "local_templates.json").write_text(json.dumps(local))
+
+            consensus = TemplateConsensus("TEST-USER", index=TemplateIndex())
+            hits = consensus.search_templates("csv report")
+            assert [h['hash'] for h in hits] == ["h1"]
+            assert hits[0]['source'] == "local"
+            assert hits[0]['relevance_score'] == 10.0
+            assert consensus.search_templates("csv", language="Go") == []
+
+            assert consensus.search_templates("firewall") == []
+            consensus.merge_keywords("h2", ["firewall"])
+            assert consensus.search_templates("firewall")[0]['hash'] == "h2"
+        finally:
+            os.environ["HOME"] = saved_home
+
+
+def test_search_speed():
+    result = benchmark_search(count=2000, queries=200)
+    assert result['query_ms'] < 5, result
+
+
+if __name__ == "__main__":
+    test_tokenize()
+    test_builtin_ranking()
+    test_index_updates_and_facets()
+    test_partial_matches_score_below_caller_thresholds()
+    test_template_consensus_search()
+    test_search_speed()
+    print("✅ Template index tests passed")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test ThermalAnalytics' ring buffer, incremental stats, background sampler and CSV log.
+"""
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+import thermal_analytics
+from thermal_analytics import ThermalAnalytics, ThermalRingBuffer
+
+
+def test_ring_buffer_rolling_stats():
+    rng = random.Random(3)
+    buffer = ThermalRingBuffer(("CPU", "GPU"), capacity=50)
+    values = []
+    for i in range(537):
+        cpu = round(rng.uniform(30, 95), 2)
+        values.append(cpu)
+        buffer.append(float(i), {"CPU": cpu, "GPU": None if i % 3 else cpu - 5}, context="work" if i % 2 else "idle")
+
+        window = [float(thermal_analytics.array('f', [v])[0]) for v in values[-50:]]
+        mean = sum(window) / len(window)
+        assert buffer.max("CPU") == max(window)
+        assert math.isclose(buffer.mean("CPU"), mean, rel_tol=1e-9)
+        std = math.sqrt(sum((v - mean) ** 2 for v in window) / len(window))
+        assert math.isclose(buffer.std("CPU"), std, rel_tol=1e-6, abs_tol=1e-6)
+
+    assert len(buffer) == 50 and buffer.written == 537
+    assert buffer.stats()["GPU"]["count"] == len([i for i in range(487, 537) if i % 3 == 0])
+    rows = list(buffer.rows(since=530))
+    assert [r[0] for r in rows] == list(range(530, 537))
+    assert rows[-1][2] == "idle" and rows[0][1] == 530.0
+    assert len(list(buffer.rows())) == 50  # Older readings are gone: constant memory
+
+
+def _analytics(tmp: str, **kwargs) -> ThermalAnalytics:
+    saved_home = os.environ.get("HOME")
+    os.environ["HOME"] = tmp
+    try:
+        thermal = ThermalAnalytics("TEST-USER", validated=True, **kwargs)
+    finally:
+        os.environ["HOME"] = saved_home
+    thermal.smc_path = "/fake/smc"
+    temps = iter(range(1000))
+    thermal.get_current_temps = lambda: {"CPU": 40.0 + next(temps) % 20, "GPU": 35.0}
+    thermal.get_fan_speed = lambda: 1800.0
+    return thermal
+
+
+def test_background_sampler_and_summary():
+    with tempfile.TemporaryDirectory() as tmp:
+        thermal = _analytics(tmp, sample_interval=0.01, capacity=8)
+        thermal.baseline_temps = {"CPU": 60.0, "GPU": 40.0}
+        assert thermal.start_sampler()
+        deadline = time.time() + 5
+        while thermal.readings.written < 25 and time.time() < deadline:
+            time.sleep(0.01)
+        thermal.stop_sampler(save=False)
+        assert not thermal.is_sampling()
+
+        count = thermal.readings.written
+        assert count >= 25 and len(thermal.readings) == 8
+        summary = thermal.get_session_summary()
+        assert summary["readings_count"] == count
+        assert summary["min_temp"] == 37.5 and summary["max_temp"] == 47.0
+        assert summary["window_readings"] == 8
+        assert summary["best_dispersion_pct"] > summary["worst_dispersion_pct"]
+        stats = thermal.get_dispersion_stats()
+        assert stats["fan_speed"] == 1800.0 and stats["hottest_sensor"] == "CPU"
+        assert thermal.get_rolling_stats()["FAN"]["max"] == 1800.0
+
+
+def test_csv_log_appends_and_trims():
+    with tempfile.TemporaryDirectory() as tmp:
+        thermal = _analytics(tmp, capacity=600)
+        saved_limit = thermal_analytics.MAX_SAVED_READINGS
+        thermal_analytics.MAX_SAVED_READINGS = 100
+        try:
+            for _ in range(30):
+                thermal.record_reading("request")
+            thermal.save_session(quiet=True)
+            thermal.save_session(quiet=True)  # Nothing new: no duplicate rows
+            lines = thermal.thermal_log.read_text().splitlines()
+            assert len(lines) == 31
+            assert lines[0].startswith("timestamp,context,CPU,GPU,MEM")
+            assert lines[1].split(",")[1:5] == ["request", "40.00", "35.00", ""]
+
+            for _ in range(400):
+                thermal.record_reading("request")
+            thermal.save_session(quiet=True)
+            lines = thermal.thermal_log.read_text().splitlines()
+            assert len(lines) == 101 and lines[-1].split(",")[2] == "49.00"
+        finally:
+            thermal_analytics.MAX_SAVED_READINGS = saved_limit
+
+
+if __name__ == "__main__":
+    test_ring_buffer_rolling_stats()
+    test_background_sampler_and_summary()
+    test_csv_log_appends_and_trims()
+    print("✅ Thermal analytics tests passed")
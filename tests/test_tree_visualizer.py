@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test the scandir listing cache, streamed tree rendering and tracker-driven invalidation.
+"""
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import tree_visualizer
+from core.execution_tracker import ExecutionTracker
+from core.tree_visualizer import TreeVisualizer, get_listing_cache
+from core.universal_task_system import UniversalTaskSystem
+
+
+def _plain(tree: str) -> str:
+    for code in (tree_visualizer.CYAN, tree_visualizer.GREEN, tree_visualizer.BLUE, tree_visualizer.DIM,
+                 tree_visualizer.YELLOW, tree_visualizer.RESET):
+        tree = tree.replace(code, "")
+    return tree
+
+
+def test_listing_cache_and_tracker_invalidation():
+    cache = get_listing_cache()
+    cache.clear()
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "src").mkdir()
+        Path(tmp, "src", "main.py").write_text("print('hi')\n")
+        Path(tmp, "README.md").write_text("# demo\n")
+        viz = TreeVisualizer(max_depth=3)
+
+        first = _plain(viz.generate_tree(tmp))
+        assert first.splitlines()[1:] == ["├── src/", "│   └── main.py", "└── README.md"]
+        misses = cache.misses
+        assert _plain(viz.generate_tree(tmp)) == first and cache.misses == misses  # Served from cache
+
+        # Changes the tracker doesn't hear about wait for the TTL; tracked ones show at once
+        Path(tmp, "src", "util.py").write_text("")
+        assert "util.py" not in viz.generate_tree(tmp)
+        ExecutionTracker().track_file_created(str(Path(tmp, "src", "util.py")))
+        assert "util.py" in viz.generate_tree(tmp)
+
+        Path(tmp, "docs", "api").mkdir(parents=True)
+        os.replace(Path(tmp, "README.md"), Path(tmp, "docs", "api", "README.md"))
+        ExecutionTracker().track_file_moved(str(Path(tmp, "README.md")), str(Path(tmp, "docs", "api", "README.md")))
+        lines = _plain(viz.generate_tree(tmp)).splitlines()
+        assert lines[1:4] == ["├── docs/", "│   └── api/", "│       └── README.md"] and "└── README.md" not in lines
+
+
+def test_huge_directory_streams_and_truncates():
+    cache = get_listing_cache()
+    cache.clear()
+    saved = cache.max_entries
+    cache.max_entries = 100
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(3000):
+                open(os.path.join(tmp, f"f{i:05d}.log"), "w").close()
+            Path(tmp, "zdir").mkdir()
+
+            misses = cache.misses
+            lines = TreeVisualizer().iter_tree(tmp, max_items=5)
+            assert next(lines).endswith(f"{Path(tmp).name}/{tree_visualizer.RESET}")
+            assert cache.misses == misses  # Root line shown before anything is read
+
+            rest = [_plain(line) for line in lines]
+            assert rest == ["├── zdir/", "├── f00000.log", "├── f00001.log", "├── f00002.log", "├── f00003.log",
+                            "└── (... 2996 more items ...)"]
+            assert os.path.abspath(tmp) not in cache._listings  # Too big to cache
+    finally:
+        cache.max_entries = saved
+
+
+def test_task_system_refreshes_listings_after_operations():
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "inbox").mkdir()
+        Path(tmp, "inbox", "notes.txt").write_text("todo\n")
+        system = UniversalTaskSystem()
+        out = io.StringIO()
+        with redirect_stdout(out):
+            system._display_tree(tmp)  # Caches the listings
+            task = system._move_file_explicit_paths(f"move notes.txt from {tmp}/inbox to {tmp}/archive/2024", None)
+            assert task.action() == str(Path(tmp, "archive", "2024"))
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            system._display_tree(tmp, created_items={str(Path(tmp, "archive", "2024"))})
+        assert out.getvalue().splitlines()[1:] == ["├── archive/", "│   └── 2024  ← Created", "└── inbox/"]
+
+
+if __name__ == "__main__":
+    test_listing_cache_and_tracker_invalidation()
+    test_huge_directory_streams_and_truncates()
+    test_task_system_refreshes_listings_after_operations()
+    print("✅ Tree visualizer tests passed")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test UserStatsTracker's incremental leaderboard, cached badge progress and batched rebuild.
+"""
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import user_stats
+from core.user_stats import BADGE_DEFINITIONS, UserStatsTracker
+
+
+class patched_paths:
+    """Point the stats, template and fix files at a temp directory."""
+
+    def __enter__(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.saved = (user_stats.USER_STATS_FILE, user_stats.TEMPLATES_FILE, user_stats.FIX_DICTIONARY)
+        user_stats.USER_STATS_FILE = root / "user_stats.json"
+        user_stats.TEMPLATES_FILE = root / "local_templates.json"
+        user_stats.FIX_DICTIONARY = root / "fix_dictionary.json"
+        return root
+
+    def __exit__(self, *exc):
+        user_stats.USER_STATS_FILE, user_stats.TEMPLATES_FILE, user_stats.FIX_DICTIONARY = self.saved
+        self.tmp.cleanup()
+
+
+def _full_sort_leaderboard(tracker, top_n):
+    board = [{**profile, 'score': tracker.calculate_user_score(user_id)} for user_id, profile in tracker.stats.items()]
+    board.sort(key=lambda x: x['score'], reverse=True)
+    return board[:top_n]
+
+
+def _scanned_levels(profile):
+    """Progress levels the pre-cache implementation computed with a linear threshold scan."""
+    levels = {}
+    for badge_def in BADGE_DEFINITIONS:
+        if badge_def['id'] in profile.get('badges', []):
+            levels[badge_def['id']] = 4
+            continue
+        value = user_stats.BADGE_METRICS[badge_def['id']](profile)
+        level = 0
+        for i, level_def in enumerate(badge_def['levels']):
+            if value >= level_def['threshold']:
+                level = min(i + 1, 3)
+        levels[badge_def['id']] = level
+    return levels
+
+
+def test_incremental_leaderboard_and_badges_match_full_recompute():
+    rng = random.Random(7)
+    with patched_paths():
+        tracker = UserStatsTracker()
+        users = [f"user{i}" for i in range(30)]
+        for step in range(1500):
+            user_id = rng.choice(users[:5] if step % 3 else users)  # A few heavy contributors
+            tracker.update_user_stats(user_id, rng.choice(['template', 'fix']), f"h{step}", f"item {step}",
+                                      save=step % 250 == 0)
+            if step % 97 == 0:
+                for top_n in (1, 10, 50):
+                    assert tracker.get_leaderboard(top_n) == _full_sort_leaderboard(tracker, top_n)
+                tracker.calculate_badge_collection_progress(user_id)  # Warm the cache mid-stream
+
+        assert len(tracker._score_heap) <= user_stats.HEAP_COMPACT_FACTOR * len(users) + 64
+        for user_id in users:
+            profile = tracker.stats[user_id]
+            assert len(profile['badges']) == len(set(profile['badges']))
+            levels = _scanned_levels(profile)
+            statuses = tracker.get_all_badges_status(user_id)
+            assert {b['id']: b['progress_level'] for b in statuses} == levels
+            progress = tracker.calculate_badge_collection_progress(user_id)
+            assert progress['total_levels'] == sum(levels.values())
+            assert progress['unlocked_count'] == sum(1 for level in levels.values() if level == 4)
+
+        # A fresh tracker rebuilds the same indexes from the saved file
+        tracker._save_stats()
+        assert UserStatsTracker().get_leaderboard(10) == tracker.get_leaderboard(10)
+
+
+def test_rebuild_is_one_batched_write():
+    with patched_paths():
+        templates = {f"t{i}": {'author': f"author{i % 3}", 'name': f"Template {i}"} for i in range(12)}
+        templates["anon"] = {'author': 'unknown', 'name': 'Skipped'}
+        user_stats.TEMPLATES_FILE.write_text(json.dumps(templates))
+        fixes = {"NameError": [{'user_id': 'author0', 'fix_hash': f"f{i}", 'error_type': 'NameError',
+                                'script_name': 'a.py'} for i in range(25)]}
+        user_stats.FIX_DICTIONARY.write_text(json.dumps(fixes))
+
+        tracker = UserStatsTracker()
+        writes = []
+        save = tracker._save_stats
+        tracker._save_stats = lambda: (writes.append(1), save())
+        tracker.rebuild_stats_from_consensus()
+
+        assert len(writes) == 1
+        saved = json.loads(user_stats.USER_STATS_FILE.read_text())
+        assert saved['author0']['total_templates'] == 4 and saved['author0']['total_fixes'] == 25
+        assert [user['user_id'] for user in tracker.get_leaderboard(3)] == ['author0', 'author1', 'author2']
+        assert tracker.get_leaderboard(1)[0]['score'] == 4 * 10 + 25 * 5
+        assert 'fix_specialist' in saved['author0']['badges']
+
+
+if __name__ == "__main__":
+    test_incremental_leaderboard_and_badges_match_full_recompute()
+    test_rebuild_is_one_batched_write()
+    print("✅ User stats tests passed")
@@ -9,7 +9,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from tests.response_validator import ResponseValidator
+from core.response_validator import ResponseValidator
 
 def test_query_validation():
     """Test that query validation works correctly."""